@@ -10,25 +10,202 @@ Author: John Shay
 License: MIT
 """
 
-from flask import Flask, render_template, jsonify, request, redirect, session
+from flask import Flask, render_template, jsonify, request, redirect, session, Response, stream_with_context
 import urllib.parse
 from datetime import datetime, timedelta
 import os
 import json
 import csv
 import base64
+import hashlib
 import requests
 import pickle
 import re
+import atexit
+import functools
+import threading
 
 from comp_engine import find_comps, normalize_record, get_config as get_comp_config
+from query_engine import CompIndex, run_query, normalize_spec, normalize_question, heuristic_spec, describe_result
+from state_store import StateStore, LogIndex, load_json_file
+from write_behind import WriteBehind
+from region_cache import CacheRegistry, DependencyGraph, RefreshAhead, WarmSnapshot
+from http_cache import HttpCache, version_tag
+from event_bus import EventBus
+from static_assets import StaticAssets
+import fast_json
+import paging
+from fast_json import FastJSONProvider
 
 app = Flask(__name__, template_folder='templates')
+app.json = FastJSONProvider(app)  # orjson when installed; fast_json.BACKEND says which
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'dataradar-dev-key-change-in-prod')
 
 # Data directory
 DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
 
+# Mutable app state (price history, LLM cache, curation, notifications, comms log,
+# watcher and supply series, saved searches, scheduler config) lives in one SQLite WAL
+# database; the legacy JSON files are imported once by _migrate_json_state().
+STATE_DB_FILE = os.path.join(DATA_DIR, 'state.db')
+state_db = StateStore(STATE_DB_FILE)
+# Other workers/replicas write the same database; in-memory copies of state_db
+# data register with state_db.watch() and are dropped by the per-request poll.
+STATE_POLL_INTERVAL_S = float(os.environ.get('STATE_POLL_INTERVAL_S', '1.0'))
+
+# Remaining JSON files (configs, caches, scrape status) go through a write-behind
+# queue: rapid saves to the same file coalesce into one atomic write per window.
+WRITE_BEHIND_WINDOW_S = float(os.environ.get('WRITE_BEHIND_WINDOW_S', '0.5'))
+persist = WriteBehind(window=WRITE_BEHIND_WINDOW_S)
+atexit.register(persist.close)
+
+# Push channel: background jobs publish progress and notifications to the bus and
+# GET /api/events streams the topics a page subscribes to as Server-Sent Events.
+# Topics and their snapshots are declared next to that route.
+EVENTS_HEARTBEAT_S = float(os.environ.get('EVENTS_HEARTBEAT_S', '15'))
+EVENTS_MAX_STREAM_S = float(os.environ.get('EVENTS_MAX_STREAM_S', '300'))
+bus = EventBus()
+
+# In-process caches: one registry of named regions, each with its TTL, bounds and
+# stale window declared here. /api/cache/stats reports per-region counters and
+# /api/cache/clear drops regions or tags selectively.
+caches = CacheRegistry()
+caches.region('listings', ttl=300, stale_ttl=300, max_entries=1)         # EbayAPI.get_all_listings
+caches.region('sold', ttl=300, max_entries=8)                            # EbayAPI.get_sold_items_cached
+caches.region('traffic', ttl=1800, stale_ttl=1800, max_entries=1)        # fetch_and_cache_traffic
+caches.region('promotions', ttl=1800, max_entries=1)                     # load_promotions_cache
+caches.region('live_deals', ttl=14400, max_entries=1)                    # /api/deals/live
+caches.region('data_files', max_entries=8, max_bytes=256 * 1024 * 1024)  # mtime-versioned JSON indexes
+caches.region('indexes', max_entries=2)                                  # get_comp_index
+caches.region('llm_reviews', max_entries=1)                              # mirror of state_db llm_price_cache
+caches.region('api', ttl=300, max_entries=512, max_bytes=64 * 1024 * 1024)  # cached_get
+caches.region('comp_anchors', max_entries=4096)                          # calculate_comp_anchors
+caches.region('market_assessments', max_entries=4096)                    # get_price_assessment
+caches.region('analytics', max_entries=1)                                # /api/inventory/full-analytics
+caches.region('views', max_entries=16)                                   # materialized dashboard views
+
+# Refresh-ahead: a background thread renews the eBay snapshots REFRESH_AHEAD_LEAD_S
+# before they expire (and syncs sold history), backing off while eBay fails.
+# Requests read the last good snapshot and its age instead of waiting on eBay.
+# Started on the first request; REFRESH_AHEAD=0 restores inline fetching.
+REFRESH_AHEAD = os.environ.get('REFRESH_AHEAD', '1') != '0'
+REFRESH_AHEAD_LEAD_S = int(os.environ.get('REFRESH_AHEAD_LEAD_S', '30'))
+refresher = RefreshAhead(caches, lead=REFRESH_AHEAD_LEAD_S)
+refresher.register('listings', lambda: ebay._fetch_all_listings(), 'listings', 'all', tags=('ebay',))
+refresher.register('traffic', lambda: ebay.get_traffic_report(), 'traffic', 'report', tags=('ebay',))
+refresher.register('promotions', lambda: _fetch_promotions_live(), 'promotions', 'data', tags=('ebay',),
+                   accept=lambda new, old: bool(new.get('campaigns') or new.get('per_listing')) or not old,
+                   store=lambda data: save_promotions_cache(data))
+refresher.register_task('sold', lambda: _sync_sold_task(), interval=60)
+
+# Derived caches above are versioned by their inputs rather than a TTL. Each
+# declares what it reads; when one input moves (the nightly reindex swaps
+# historical_clean.json, a curation mark, a listings refresh) only the results
+# built from it miss. Lambdas resolve names defined further down at call time.
+deps = DependencyGraph(caches)
+deps.file('historical_clean', os.path.join(DATA_DIR, 'historical_clean.json'))
+deps.file('master_pricing_index', os.path.join(DATA_DIR, 'master_pricing_index.json'))
+deps.file('pricing_rules', os.path.join(DATA_DIR, 'pricing_rules.json'), hash=True)
+deps.file('inventory_enriched', os.path.join(DATA_DIR, 'inventory_enriched.json'))
+deps.file('death_nyc_inventory', os.path.join(DATA_DIR, 'death_nyc_inventory.csv'))
+deps.file('purchases', os.path.join(DATA_DIR, 'purchases.json'))
+deps.file('art_deals', os.path.join(DATA_DIR, 'art_deals.json'))
+deps.file('deal_targets', os.path.join(DATA_DIR, 'deal_targets.json'))
+deps.file('live_deals_cache', os.path.join(DATA_DIR, 'live_deals_cache.json'))
+deps.file('index_html', os.path.join(app.root_path, 'templates', 'index.html'))
+deps.file('prices_html', os.path.join(app.root_path, 'templates', 'prices.html'))
+deps.value('curation', lambda: (state_db.version('comp_curation'), state_db.version(CURATION_LOG)))
+deps.value('sold', lambda: state_db.version('sold_txns'))
+deps.value('enrichment', lambda: state_db.version(ENRICHMENT_NS))
+deps.value('supply', lambda: tuple(state_db.version(f'supply_{m}{res}')
+                                   for m in SUPPLY_METRICS for res in ('', ':week', ':month')))
+deps.value('day', lambda: datetime.now().date().isoformat())
+deps.entry('listings', 'listings', 'all')
+deps.entry('traffic', 'traffic', 'report')
+deps.entry('promotions', 'promotions', 'data', ignore=('last_fetched',))
+deps.derived('comp_index', ['historical_clean'], 'indexes')
+deps.derived('comp_anchors', ['historical_clean', 'curation', 'day'], 'comp_anchors')
+deps.derived('market_assessments', ['master_pricing_index'], 'market_assessments')
+deps.derived('full_analytics', [
+    'listings', 'sold', 'traffic', 'promotions', 'enrichment', 'supply', 'pricing_rules',
+    'inventory_enriched', 'death_nyc_inventory', 'comp_anchors', 'day'], 'analytics')
+deps.derived('views', [
+    'listings', 'sold', 'promotions', 'enrichment', 'pricing_rules', 'inventory_enriched',
+    'death_nyc_inventory', 'purchases', 'art_deals', 'day'], 'views')
+
+# Warm snapshot: the regions below (plus the curation index) are pickled to
+# WARM_SNAPSHOT_FILE every WARM_SNAPSHOT_INTERVAL_S and at shutdown, and restored
+# at import when their inputs fingerprint the same, so a redeploy doesn't start
+# with every cache cold. Fetched and parsed data survives a code change; results
+# computed by this code (indexes, anchors, analytics) only the same build.
+# WARM_SNAPSHOT=0 disables it.
+WARM_SNAPSHOT = os.environ.get('WARM_SNAPSHOT', '1') != '0'
+WARM_SNAPSHOT_FILE = os.path.join(DATA_DIR, 'warm_cache.pkl')
+WARM_SNAPSHOT_INTERVAL_S = int(os.environ.get('WARM_SNAPSHOT_INTERVAL_S', '300'))
+WARM_SNAPSHOT_MAX_AGE_S = int(os.environ.get('WARM_SNAPSHOT_MAX_AGE_S', '86400'))
+
+
+def _source_build():
+    """The deployed commit when Railway provides it, else a hash of the modules."""
+    sha = os.environ.get('RAILWAY_GIT_COMMIT_SHA')
+    if sha:
+        return sha[:12]
+    h = hashlib.sha1()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ('app.py', 'comp_engine.py', 'query_engine.py', 'region_cache.py'):
+        with open(os.path.join(here, name), 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:12]
+
+
+warm = WarmSnapshot(caches, deps, WARM_SNAPSHOT_FILE, build=_source_build(),
+                    max_age=WARM_SNAPSHOT_MAX_AGE_S)
+warm.include('listings', 'sold', 'traffic', 'promotions', 'live_deals', 'api', 'data_files',
+             portable=True)
+warm.include('indexes', 'comp_anchors', 'market_assessments', 'analytics')
+
+# HTTP validators and compression: GET responses carry a weak ETag (the route's
+# cache version where it has one, else a body hash) and get 304s on a match;
+# bodies over HTTP_COMPRESS_MIN_BYTES are gzip/brotli encoded per Accept-Encoding,
+# with encoded variants of unchanged payloads reused. /api/system/http has metrics.
+HTTP_COMPRESS_MIN_BYTES = int(os.environ.get('HTTP_COMPRESS_MIN_BYTES', '1024'))
+http_cache = HttpCache(app, min_size=HTTP_COMPRESS_MIN_BYTES)
+
+# Dashboard CSS/JS live in static/ and are served from /assets/ under content-hashed
+# names with immutable cache headers; templates link them with asset_url(), and
+# /sw.js precaches them so a repeat visit only revalidates the HTML shell.
+assets = StaticAssets(app, os.path.join(app.root_path, 'static'))
+
+
+@app.errorhandler(paging.PagingError)
+def _paging_error(e):
+    return jsonify({'error': str(e)}), 400
+
+
+@app.before_request
+def _poll_state_changes():
+    try:
+        state_db.poll_changes(STATE_POLL_INTERVAL_S)
+        deps.sweep(STATE_POLL_INTERVAL_S)
+        if REFRESH_AHEAD and not refresher.running:
+            refresher.start()
+    except Exception as e:
+        print(f"[state] change poll failed: {e}")
+
+
+@app.after_request
+def _snapshot_age_header(response):
+    """X-Snapshot-Age: seconds since each eBay snapshot was fetched."""
+    if refresher.running and request.path.startswith('/api/'):
+        ages = []
+        for name in ('listings', 'traffic', 'promotions', 'sold'):
+            age = refresher.age(name)
+            if age is not None:
+                ages.append(f"{name}={int(age)}")
+        if ages:
+            response.headers['X-Snapshot-Age'] = ', '.join(ages)
+    return response
+
 # Remote data URLs (GitHub Release assets for files too large for git)
 REMOTE_DATA = {
     'shepard_fairey_data.json': 'https://github.com/jjshay/dataradar-listings/releases/download/v1.1-data/shepard_fairey_data.json',
@@ -185,15 +362,15 @@ class EbayAPI:
 
         return self._parse_listings(response.text)
 
-    _listings_cache = None
-    _listings_cache_time = None
-
     def get_all_listings(self):
-        """Fetch ALL active listings from eBay (paginated, cached 5 min)"""
-        now = datetime.now()
-        if self._listings_cache and self._listings_cache_time and (now - self._listings_cache_time).seconds < 300:
-            return self._listings_cache
-
+        """Fetch ALL active listings from eBay (paginated, cached 5 min; renewed
+        ahead of expiry by the refresher, else served stale for 5 more minutes
+        while an inline refresh runs)"""
+        if refresher.handles('listings'):
+            return refresher.read('listings')
+        return caches['listings'].get_or_load('all', self._fetch_all_listings, tags=('ebay',))
+
+    def _fetch_all_listings(self):
         all_listings = []
         page = 1
         while True:
@@ -204,26 +381,11 @@ class EbayAPI:
             if len(batch) < 200:
                 break
             page += 1
-
-        self._listings_cache = all_listings
-        self._listings_cache_time = now
         return all_listings
 
-    _sold_cache = None
-    _sold_cache_time = None
-    _sold_cache_days = 0
-
     def get_sold_items_cached(self, days_back=60):
         """Cached version of get_sold_items"""
-        now = datetime.now()
-        if self._sold_cache and self._sold_cache_time and self._sold_cache_days == days_back and (now - self._sold_cache_time).seconds < 300:
-            return self._sold_cache
-
-        result = self.get_sold_items(days_back)
-        self._sold_cache = result
-        self._sold_cache_time = now
-        self._sold_cache_days = days_back
-        return result
+        return caches['sold'].get_or_load(days_back, lambda: self.get_sold_items(days_back), tags=('ebay',))
 
     def _parse_listings(self, xml_response):
         """Parse eBay XML response into listing objects"""
@@ -258,10 +420,14 @@ class EbayAPI:
         el = element.find(path, ns)
         return el.text if el is not None else None
 
-    def get_sold_items(self, days_back=90, page=1, per_page=100):
-        """Fetch recently sold items from eBay"""
+    def get_sold_items(self, days_back=90, page=1, per_page=100, raise_on_error=False):
+        """Fetch recently sold items from eBay. A missing token, HTTP error,
+        Ack=Failure or unparseable body gives [] — or RuntimeError with
+        raise_on_error so callers can tell them from no sales."""
         token = self.get_access_token()
         if not token:
+            if raise_on_error:
+                raise RuntimeError('no eBay token')
             return []
 
         headers = {
@@ -290,12 +456,15 @@ class EbayAPI:
         response = requests.post(
             'https://api.ebay.com/ws/api.dll',
             headers=headers,
-            data=xml_request
+            data=xml_request,
+            timeout=30,
         )
+        if raise_on_error and response.status_code != 200:
+            raise RuntimeError(f'GetMyeBaySelling HTTP {response.status_code}')
 
-        return self._parse_sold_items(response.text)
+        return self._parse_sold_items(response.text, raise_on_error=raise_on_error)
 
-    def _parse_sold_items(self, xml_response):
+    def _parse_sold_items(self, xml_response, raise_on_error=False):
         """Parse sold items from XML — handles OrderTransaction structure"""
         import xml.etree.ElementTree as ET
         sold = []
@@ -304,6 +473,12 @@ class EbayAPI:
             root = ET.fromstring(xml_response)
             ns = {'ebay': 'urn:ebay:apis:eBLBaseComponents'}
 
+            ack = self._get_text(root, 'ebay:Ack', ns)
+            if ack not in ('Success', 'Warning'):
+                msg = (self._get_text(root, './/ebay:Errors/ebay:LongMessage', ns)
+                       or self._get_text(root, './/ebay:Errors/ebay:ShortMessage', ns) or '')
+                raise RuntimeError(f'Ack={ack}: {msg}'.rstrip(': '))
+
             for ot in root.findall('.//ebay:SoldList//ebay:OrderTransaction', ns):
                 txn = ot.find('ebay:Transaction', ns) or ot.find('ebay:Order', ns)
                 if txn is None:
@@ -328,8 +503,13 @@ class EbayAPI:
                 buyer_el = txn.find('.//ebay:Buyer/ebay:UserID', ns)
                 buyer_id = buyer_el.text if buyer_el is not None else ''
 
+                txn_id = self._get_text(txn, 'ebay:TransactionID', ns) or self._get_text(txn, './/ebay:OrderLineItemID', ns) or ''
+                created = self._get_text(txn, 'ebay:CreatedDate', ns) or ''
+
                 listing = {
                     'id': item_id,
+                    'txn_id': txn_id,
+                    'sold_at': created[:19] if created else '',
                     'title': title,
                     'price': price,
                     'quantity_sold': qty,
@@ -349,6 +529,8 @@ class EbayAPI:
 
                 sold.append(listing)
         except Exception as e:
+            if raise_on_error:
+                raise RuntimeError(f'GetMyeBaySelling: {e}') from e
             print(f"Parse sold error: {e}")
 
         return sold
@@ -489,10 +671,35 @@ def get_browse_token():
     return None
 
 
-def search_ebay(query, max_price, min_price=0, limit=20):
-    """Search eBay for items using Browse API — paginates automatically for limit > 200"""
+# Browse API limiter — every search_ebay call takes a slot and is paced, so
+# concurrent callers (enrichment workers, scans) stay under eBay's call rate.
+EBAY_BROWSE_CONCURRENCY = int(os.environ.get('EBAY_BROWSE_CONCURRENCY', '4'))
+EBAY_BROWSE_MIN_INTERVAL_S = float(os.environ.get('EBAY_BROWSE_MIN_INTERVAL_S', '0.2'))
+_browse_slots = threading.BoundedSemaphore(EBAY_BROWSE_CONCURRENCY)
+_browse_pace_lock = threading.Lock()
+_browse_next_at = 0.0
+
+
+def _browse_pace():
+    """Sleep until this caller's turn; calls start at least MIN_INTERVAL apart."""
+    global _browse_next_at
+    import time
+    with _browse_pace_lock:
+        now = time.monotonic()
+        wait = _browse_next_at - now
+        _browse_next_at = max(now, _browse_next_at) + EBAY_BROWSE_MIN_INTERVAL_S
+    if wait > 0:
+        time.sleep(wait)
+
+
+def search_ebay(query, max_price, min_price=0, limit=20, raise_on_error=False):
+    """Search eBay for items using Browse API — paginates automatically for limit > 200.
+    Failures (no token, non-200, network) return what was found so far, or raise
+    RuntimeError with raise_on_error so callers can tell them from no results."""
     token = get_browse_token()
     if not token:
+        if raise_on_error:
+            raise RuntimeError('no Browse API token')
         return []
 
     headers = {
@@ -521,13 +728,18 @@ def search_ebay(query, max_price, min_price=0, limit=20):
         }
 
         try:
-            response = requests.get(
-                'https://api.ebay.com/buy/browse/v1/item_summary/search',
-                headers=headers,
-                params=params
-            )
+            with _browse_slots:
+                _browse_pace()
+                response = requests.get(
+                    'https://api.ebay.com/buy/browse/v1/item_summary/search',
+                    headers=headers,
+                    params=params,
+                    timeout=30,
+                )
 
             if response.status_code != 200:
+                if raise_on_error:
+                    raise RuntimeError(f'Browse API HTTP {response.status_code}')
                 break
 
             data = response.json()
@@ -568,6 +780,8 @@ def search_ebay(query, max_price, min_price=0, limit=20):
 
         except Exception as e:
             print(f"Search error page {page}: {e}")
+            if raise_on_error:
+                raise
             break
 
     return all_deals[:limit]
@@ -577,9 +791,7 @@ def search_ebay(query, max_price, min_price=0, limit=20):
 # =============================================================================
 
 PROMOTIONS_FILE = os.path.join(DATA_DIR, 'promotions_cache.json')
-_promotions_cache = None
-_promotions_cache_time = None
-PROMO_CACHE_TTL = 1800  # 30 minutes
+PROMO_CACHE_TTL = caches['promotions'].ttl  # 30 minutes
 
 
 def get_marketing_headers():
@@ -739,49 +951,53 @@ def fetch_coupons():
 
 def load_promotions_cache():
     """Load promotions data from cache file"""
-    global _promotions_cache, _promotions_cache_time
+    cached = caches['promotions'].get('data')
+    if cached:
+        return cached
 
-    if _promotions_cache and _promotions_cache_time:
-        age = (datetime.now() - _promotions_cache_time).total_seconds()
-        if age < PROMO_CACHE_TTL:
-            return _promotions_cache
-
-    if os.path.exists(PROMOTIONS_FILE):
-        try:
-            with open(PROMOTIONS_FILE, 'r') as f:
-                data = json.load(f)
-            fetched = data.get('last_fetched', '')
-            if fetched:
-                fetched_dt = datetime.fromisoformat(fetched)
-                age = (datetime.now() - fetched_dt).total_seconds()
-                if age < PROMO_CACHE_TTL:
-                    _promotions_cache = data
-                    _promotions_cache_time = fetched_dt
-                    return data
-        except Exception:
-            pass
+    try:
+        # read_json also sees a save still queued in the write-behind window
+        data = persist.read_json(PROMOTIONS_FILE) or {}
+        fetched = data.get('last_fetched', '')
+        if fetched:
+            fetched_dt = datetime.fromisoformat(fetched)
+            age = (datetime.now() - fetched_dt).total_seconds()
+            if age < PROMO_CACHE_TTL:
+                # the file's fetch time, not our read time, bounds freshness
+                return caches['promotions'].set('data', data, ttl=PROMO_CACHE_TTL - age, tags=('ebay',))
+    except Exception:
+        pass
 
     return None
 
 
 def save_promotions_cache(data):
     """Save promotions data to cache file"""
-    global _promotions_cache, _promotions_cache_time
     data['last_fetched'] = datetime.now().isoformat()
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(PROMOTIONS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-    _promotions_cache = data
-    _promotions_cache_time = datetime.now()
+    persist.write_json(PROMOTIONS_FILE, data, indent=2)
+    caches['promotions'].set('data', data, tags=('ebay',))
 
 
 def fetch_all_promotions(force=False):
     """Fetch all promotion data from eBay, using cache if fresh"""
     if not force:
+        if refresher.handles('promotions'):
+            # the refresher owns renewal; serve the last good copy whatever its
+            # age (peek first: load_promotions_cache's get() drops an expired entry)
+            cached, _age = caches['promotions'].peek('data')
+            if cached:
+                return cached
         cached = load_promotions_cache()
         if cached:
             return cached
 
+    result = _fetch_promotions_live()
+    save_promotions_cache(result)
+    return result
+
+
+def _fetch_promotions_live():
+    """Campaigns, ads, item promotions and coupons straight from eBay."""
     # Fetch campaigns
     campaigns = fetch_ad_campaigns()
 
@@ -836,8 +1052,6 @@ def fetch_all_promotions(force=False):
             'total_coupons': len(coupons),
         }
     }
-
-    save_promotions_cache(result)
     return result
 
 
@@ -952,9 +1166,9 @@ WATCHLIST_FILE = os.path.join(DATA_DIR, 'watchlist.json')
 def load_watchlist():
     """Load watchlist from JSON file"""
     try:
-        if os.path.exists(WATCHLIST_FILE):
-            with open(WATCHLIST_FILE, 'r') as f:
-                return json.load(f)
+        items = persist.read_json(WATCHLIST_FILE)
+        if items is not None:
+            return items
     except Exception:
         pass
     return []
@@ -962,8 +1176,7 @@ def load_watchlist():
 
 def save_watchlist(items):
     """Save watchlist to JSON file"""
-    with open(WATCHLIST_FILE, 'w') as f:
-        json.dump(items, f, indent=2)
+    persist.write_json(WATCHLIST_FILE, items, indent=2)
 
 # =============================================================================
 # Feature: Sold Items Tracking (#8), Sell-Through (#1), Traffic (#7)
@@ -974,181 +1187,317 @@ SUPPLY_SNAPSHOTS_FILE = os.path.join(DATA_DIR, 'supply_snapshots.json')
 ALERTS_FILE = os.path.join(DATA_DIR, 'price_alerts.json')
 AB_TESTS_FILE = os.path.join(DATA_DIR, 'ab_tests.json')
 
-_sold_cache = None
-_sold_cache_time = None
-_traffic_cache = None
-_traffic_cache_time = None
 
+# Sold transactions are kept in state_db (namespace 'sold_txns', one row per
+# transaction) and never expire. sync_sold_history() asks eBay only for the
+# days since the last-synced watermark (plus one day of overlap, deduped by
+# key), at most once per SOLD_SYNC_INTERVAL_S. Routes read load_sold_history().
+# The watermark moves only after a complete pull: a failed page or a window
+# that hit SOLD_SYNC_MAX_PAGES is asked for again on the next sync.
+SOLD_SYNC_INTERVAL_S = 1800
+SOLD_INITIAL_DAYS = 180  # widest reader window (buyer_crm)
+SOLD_SYNC_MAX_PAGES = 10
+SOLD_PAGE_SIZE = 100
+_SOLD_VIEW = None  # {'version', 'items'} newest first
 
-def fetch_and_cache_sold():
-    """Fetch sold items and cache to disk"""
-    global _sold_cache, _sold_cache_time
 
-    if _sold_cache and _sold_cache_time and (datetime.now() - _sold_cache_time).seconds < 1800:
-        return _sold_cache
+def _sold_key(item):
+    """Transaction id when eBay gave one, else item id + end time."""
+    return item.get('txn_id') or f"{item.get('id', '')}:{item.get('end_time', '')}"
 
-    # Try cache file first
-    if os.path.exists(SOLD_HISTORY_FILE):
-        try:
-            with open(SOLD_HISTORY_FILE, 'r') as f:
-                data = json.load(f)
-            fetched = data.get('last_fetched', '')
-            if fetched:
-                age = (datetime.now() - datetime.fromisoformat(fetched)).total_seconds()
-                if age < 1800:
-                    _sold_cache = data
-                    _sold_cache_time = datetime.now()
-                    return data
-        except Exception:
-            pass
 
-    # Fetch from eBay
-    sold_items = ebay.get_sold_items(days_back=90)
+def _sold_sync_due(watermark, now):
+    if not watermark:
+        return True
+    return (now - datetime.fromisoformat(watermark)).total_seconds() >= SOLD_SYNC_INTERVAL_S
 
-    data = {
-        'last_fetched': datetime.now().isoformat(),
-        'items': sold_items,
-        'count': len(sold_items),
-    }
 
-    # Merge with historical data
-    if os.path.exists(SOLD_HISTORY_FILE):
+def sync_sold_history(force=False):
+    """Pull new sales since the watermark into the sold_txns table. One process
+    at a time holds the sold_sync lock; the others skip and read the table."""
+    watermark = state_db.get('meta', 'sold_watermark')
+    now = datetime.now()
+    if not force and not _sold_sync_due(watermark, now):
+        return {'skipped': True, 'watermark': watermark}
+    with state_db.lock('sold_sync', timeout=0) as held:
+        if not held:
+            return {'skipped': True, 'watermark': watermark}
+        # another worker may have finished a sync while we waited on the check
+        watermark = state_db.get('meta', 'sold_watermark')
+        if not force and not _sold_sync_due(watermark, now):
+            return {'skipped': True, 'watermark': watermark}
         try:
-            with open(SOLD_HISTORY_FILE, 'r') as f:
-                old = json.load(f)
-            old_ids = {i['id'] for i in old.get('items', [])}
-            for item in sold_items:
-                if item['id'] not in old_ids:
-                    old.get('items', []).append(item)
-            data['items'] = old.get('items', []) + [i for i in sold_items if i['id'] not in old_ids]
-            data['items'] = sold_items  # Use fresh data as authoritative
-        except Exception:
-            pass
-
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(SOLD_HISTORY_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-
-    _sold_cache = data
-    _sold_cache_time = datetime.now()
-    return data
+            # No token means no data — leave the watermark where it is
+            if not ebay.get_access_token():
+                return {'skipped': True, 'error': 'no eBay token', 'watermark': watermark}
+            if watermark:
+                days = max(1, (now - datetime.fromisoformat(watermark)).days + 1)
+            else:
+                days = SOLD_INITIAL_DAYS
+            fetched = []
+            complete = False
+            for page in range(1, SOLD_SYNC_MAX_PAGES + 1):
+                batch = ebay.get_sold_items(days_back=days, page=page, per_page=SOLD_PAGE_SIZE,
+                                            raise_on_error=True)
+                fetched.extend(batch)
+                if len(batch) < SOLD_PAGE_SIZE:
+                    complete = True
+                    break
+            known = set(state_db.all('sold_txns')) if fetched else set()
+            rows = {}
+            legacy = []
+            for item in fetched:
+                key = _sold_key(item)
+                rows[key] = item
+                legacy_key = f"{item.get('id', '')}:{item.get('end_time', '')}"
+                if item.get('txn_id') and legacy_key in known:
+                    legacy.append(legacy_key)
+            with state_db.transaction():
+                state_db.put_many('sold_txns', rows)
+                if legacy:
+                    state_db.delete('sold_txns', *legacy)
+                if complete:
+                    state_db.put('meta', 'sold_watermark', now.isoformat())
+            new = len(set(rows) - known)
+            if not complete:
+                print(f"[sold-sync] {days}d window hit {SOLD_SYNC_MAX_PAGES} pages; watermark kept")
+            print(f"[sold-sync] {days}d window: fetched {len(fetched)}, new {new}")
+            return {'skipped': False, 'days': days, 'fetched': len(fetched), 'new': new,
+                    'complete': complete, 'watermark': now.isoformat() if complete else watermark}
+        except Exception as e:
+            print(f"[sold-sync] error: {e}")
+            return {'skipped': False, 'error': str(e)[:200], 'watermark': watermark}
+
+
+def _sync_sold_task():
+    result = sync_sold_history()
+    if result.get('error'):
+        raise RuntimeError(result['error'])
+
+
+def load_sold_history(days_back=None, sync=True):
+    """Sold transactions newest first, optionally limited to the last N days."""
+    global _SOLD_VIEW
+    if sync and not refresher.handles('sold'):
+        sync_sold_history()
+    version = state_db.version('sold_txns')
+    if _SOLD_VIEW is None or _SOLD_VIEW['version'] != version:
+        items = list(state_db.all('sold_txns').values())
+        items.sort(key=lambda i: i.get('sold_at') or i.get('end_time') or '', reverse=True)
+        _SOLD_VIEW = {'version': version, 'items': items}
+    items = _SOLD_VIEW['items']
+    if days_back:
+        cutoff = (datetime.now() - timedelta(days=days_back)).isoformat()[:19]
+        items = [i for i in items if (i.get('sold_at') or i.get('end_time') or '') >= cutoff]
+    return [dict(i) for i in items]
+
+
+def fetch_and_cache_sold(days_back=90):
+    """Sold items from the last days_back days, synced incrementally from eBay"""
+    items = load_sold_history(days_back)
+    return {
+        'last_fetched': state_db.get('meta', 'sold_watermark'),
+        'items': items,
+        'count': len(items),
+    }
 
 
 def fetch_and_cache_traffic():
     """Fetch traffic data and cache"""
-    global _traffic_cache, _traffic_cache_time
-
-    if _traffic_cache and _traffic_cache_time and (datetime.now() - _traffic_cache_time).seconds < 1800:
-        return _traffic_cache
-
-    traffic = ebay.get_traffic_report()
-    _traffic_cache = traffic
-    _traffic_cache_time = datetime.now()
-    return traffic
-
-
-def load_supply_snapshots():
-    """Load supply snapshot history"""
-    if os.path.exists(SUPPLY_SNAPSHOTS_FILE):
-        with open(SUPPLY_SNAPSHOTS_FILE, 'r') as f:
-            return json.load(f)
-    return {'snapshots': [], 'last_snapshot': None}
+    if refresher.handles('traffic'):
+        return refresher.read('traffic')
+    return caches['traffic'].get_or_load('report', ebay.get_traffic_report, tags=('ebay',))
+
+
+# Supply history lives in state_db series, one per metric, at three resolutions:
+#   supply_<metric>        daily points, kept SUPPLY_DAILY_DAYS
+#   supply_<metric>:week   weekly averages (t = Monday), kept SUPPLY_WEEKLY_DAYS
+#   supply_<metric>:month  monthly averages (t = 1st of month), kept forever
+# Rollups are refreshed on every snapshot while the daily points still exist,
+# so pruning old days never loses the seasonal picture.
+SUPPLY_METRICS = {'count': 'ebay_count', 'price': 'ebay_avg_price', 'watchers': 'watchers'}
+SUPPLY_DAILY_DAYS = int(os.environ.get('SUPPLY_DAILY_DAYS', '90'))
+SUPPLY_WEEKLY_DAYS = int(os.environ.get('SUPPLY_WEEKLY_DAYS', '730'))
+SUPPLY_TREND_DAYS = 84  # default /api/supply-trends window (12 weeks)
+
+
+def _supply_buckets(t):
+    d = datetime.fromordinal(t)
+    return t - d.weekday(), d.replace(day=1).toordinal()
+
+
+def _supply_bucket_end(res, bucket):
+    """Last day (ordinal) of the week or month starting at bucket."""
+    if res == 'week':
+        return bucket + 6
+    d = datetime.fromordinal(bucket)
+    first_next = d.replace(year=d.year + d.month // 12, month=d.month % 12 + 1)
+    return first_next.toordinal() - 1
+
+
+def _supply_rollup(t_from, t_to=None):
+    """Recompute the weekly/monthly averages of every bucket overlapping
+    t_from..t_to, each over its whole week (Mon-Sun) or month."""
+    t_to = t_from if t_to is None else t_to
+    week_from, month_from = _supply_buckets(t_from)
+    week_to, month_to = _supply_buckets(t_to)
+    spans = {'week': (week_from, _supply_bucket_end('week', week_to)),
+             'month': (month_from, _supply_bucket_end('month', month_to))}
+    start = min(lo for lo, _hi in spans.values())
+    end = max(hi for _lo, hi in spans.values())
+    for metric in SUPPLY_METRICS:
+        sums = {'week': {}, 'month': {}}
+        for key, t, v in state_db.series_range(f'supply_{metric}', t_from=start, t_to=end):
+            week, month = _supply_buckets(t)
+            for res, bucket in (('week', week), ('month', month)):
+                lo, hi = spans[res]
+                if not lo <= t <= hi:
+                    continue  # a bucket outside the touched range keeps its stored average
+                acc = sums[res].setdefault((key, bucket), [0.0, 0])
+                acc[0] += v or 0
+                acc[1] += 1
+        for res, buckets in sums.items():
+            state_db.series_put(f'supply_{metric}:{res}', [
+                (key, bucket, round(total / n, 2)) for (key, bucket), (total, n) in buckets.items()
+            ])
+
+
+def _supply_days():
+    """Days held at daily resolution, kept in meta by save_supply_snapshot so
+    readers don't scan the series (filled from it once if the key is missing)."""
+    days = state_db.get('meta', 'supply_days')
+    if days is None:
+        days = state_db.series_times('supply_count')
+        state_db.put('meta', 'supply_days', days)
+    return days
 
 
 def save_supply_snapshot(inventory_items):
     """Take a snapshot of current supply levels (#9)"""
-    data = load_supply_snapshots()
-    today = datetime.now().strftime('%Y-%m-%d')
+    today = datetime.now().date().toordinal()
 
     # Don't snapshot more than once per day
-    if data.get('last_snapshot') == today:
-        return data
-
-    snapshot = {
-        'date': today,
-        'items': {}
-    }
+    if state_db.get('meta', 'supply_last_snapshot') == today:
+        return {'date': datetime.fromordinal(today).strftime('%Y-%m-%d'), 'items': 0}
 
+    points = {metric: [] for metric in SUPPLY_METRICS}
+    names = {}
     for item in inventory_items:
         supply = item.get('ebay_supply', {})
-        snapshot['items'][item['id']] = {
-            'name': item['name'][:60],
-            'ebay_count': supply.get('ebay_count', 0),
-            'ebay_avg_price': supply.get('ebay_avg_price', 0),
-            'watchers': item.get('watchers', 0) or 0,
-        }
-
-    data['snapshots'].append(snapshot)
-    # Keep last 12 weeks
-    data['snapshots'] = data['snapshots'][-12:]
-    data['last_snapshot'] = today
+        values = {**supply, 'watchers': item.get('watchers', 0) or 0}
+        for metric, field in SUPPLY_METRICS.items():
+            points[metric].append((item['id'], today, values.get(field, 0) or 0))
+        names[item['id']] = item['name'][:60]
+
+    with state_db.transaction():
+        days = {d for d in _supply_days() if d >= today - SUPPLY_DAILY_DAYS}
+        if points['count']:
+            days.add(today)
+        for metric, pts in points.items():
+            state_db.series_put(f'supply_{metric}', pts)
+            state_db.series_delete_before(f'supply_{metric}', today - SUPPLY_DAILY_DAYS)
+            state_db.series_delete_before(f'supply_{metric}:week', today - SUPPLY_WEEKLY_DAYS)
+        state_db.put_many('supply_names', names)
+        _supply_rollup(today)
+        state_db.put('meta', 'supply_last_snapshot', today)
+        state_db.put('meta', 'supply_days', sorted(days))
+
+    return {'date': datetime.fromordinal(today).strftime('%Y-%m-%d'), 'items': len(names)}
+
+
+def _supply_points(metric, t_from, key=None):
+    """{item_id: [(t, value, resolution)]} from t_from to today, stitching
+    monthly, weekly and daily resolution by age."""
+    today = datetime.now().date().toordinal()
+    daily_from = today - SUPPLY_DAILY_DAYS
+    weekly_from = today - SUPPLY_WEEKLY_DAYS
+    spans = (
+        (f'supply_{metric}:month', 'month', t_from, weekly_from - 1),
+        (f'supply_{metric}:week', 'week', max(t_from, weekly_from), daily_from - 1),
+        (f'supply_{metric}', 'day', max(t_from, daily_from), None),
+    )
+    out = {}
+    for name, res, lo, hi in spans:
+        if hi is not None and lo > hi:
+            continue
+        for k, t, v in state_db.series_range(name, t_from=lo, t_to=hi, key=key):
+            out.setdefault(k, []).append((t, v, res))
+    for pts in out.values():
+        pts.sort()
+    return out
 
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(SUPPLY_SNAPSHOTS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
 
-    return data
+def get_supply_trends(item_id, days=None):
+    """Get supply trend for an item over time (#9)"""
+    t_from = datetime.now().date().toordinal() - int(days or SUPPLY_TREND_DAYS)
+    counts = _supply_points('count', t_from, key=item_id).get(str(item_id), [])
+    prices = {t: v for t, v, _res in _supply_points('price', t_from, key=item_id).get(str(item_id), [])}
+    return [{
+        'date': datetime.fromordinal(t).strftime('%Y-%m-%d'),
+        'count': int(v or 0),
+        'avg_price': prices.get(t, 0),
+        'resolution': res,
+    } for t, v, res in counts]
+
+
+def get_supply_changes(days=None):
+    """First vs latest supply count per item over the window, for all items at once:
+    {'first_date', 'latest_date', 'items': {id: {'current', 'previous'}}}"""
+    t_from = datetime.now().date().toordinal() - int(days or SUPPLY_TREND_DAYS)
+    series = _supply_points('count', t_from)
+    items = {}
+    first = latest = None
+    for item_id, pts in series.items():
+        items[item_id] = {'previous': int(pts[0][1] or 0), 'current': int(pts[-1][1] or 0)}
+        first = pts[0][0] if first is None else min(first, pts[0][0])
+        latest = pts[-1][0] if latest is None else max(latest, pts[-1][0])
+    fmt = lambda t: datetime.fromordinal(t).strftime('%Y-%m-%d') if t else None
+    return {'first_date': fmt(first), 'latest_date': fmt(latest), 'items': items,
+            'days_tracked': len(_supply_days())}
 
 
 WATCHER_HISTORY_FILE = os.path.join(DATA_DIR, 'watcher_history.json')
 
+# Daily watcher counts live in the 'watchers' series (key=listing id, t=date
+# ordinal). Retention is independent of query cost: velocity only reads the
+# last WATCHER_WINDOW_DAYS days through the (name, t) index.
+WATCHER_RETENTION_DAYS = int(os.environ.get('WATCHER_RETENTION_DAYS', '730'))
+WATCHER_WINDOW_DAYS = 30
 
-def load_watcher_history():
-    if os.path.exists(WATCHER_HISTORY_FILE):
-        try:
-            with open(WATCHER_HISTORY_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {'snapshots': {}, 'last_snapshot': None}
+# Columnar frame of the recent window, rebuilt only when the series version changes:
+#   {'version', 'days': [iso dates], 'values': {listing_id: [watchers or None per day]},
+#    'velocity': {listing_id: velocity dict}}
+_WATCHER_FRAME = None
 
 
 def save_watcher_snapshot(listings):
     """Snapshot watcher counts for all listings — runs once per day"""
-    data = load_watcher_history()
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    if data.get('last_snapshot') == today:
-        return data
-
-    for l in listings:
-        lid = l.get('id', '')
-        watchers = l.get('watchers', 0) or 0
-        if lid:
-            if lid not in data['snapshots']:
-                data['snapshots'][lid] = {'title': l.get('title', '')[:60], 'history': []}
-            data['snapshots'][lid]['history'].append({'date': today, 'watchers': watchers})
-            # Keep last 90 days
-            data['snapshots'][lid]['history'] = data['snapshots'][lid]['history'][-90:]
-
-    data['last_snapshot'] = today
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(WATCHER_HISTORY_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
-    return data
+    today = datetime.now().date()
+    if state_db.get('meta', 'watcher_last_snapshot') == today.isoformat():
+        return
+    points = [(l['id'], today.toordinal(), l.get('watchers', 0) or 0) for l in listings if l.get('id')]
+    with state_db.transaction():
+        state_db.series_put('watchers', points)
+        state_db.series_delete_before('watchers', today.toordinal() - WATCHER_RETENTION_DAYS)
+        state_db.put('meta', 'watcher_last_snapshot', today.isoformat())
 
 
-def get_watcher_velocity(listing_id):
-    """Get watcher velocity for a listing — daily change, 7d trend, acceleration"""
-    data = load_watcher_history()
-    item = data.get('snapshots', {}).get(listing_id)
-    if not item or not item.get('history'):
+def _watcher_velocity(history):
+    """Velocity from a chronological [{'date', 'watchers'}] history."""
+    if not history:
         return {'daily_change': 0, 'weekly_change': 0, 'trend': 'unknown', 'history': []}
-
-    history = item['history']
-    current = history[-1]['watchers'] if history else 0
+    counts = [h['watchers'] for h in history]
+    current = counts[-1]
 
     # Daily change (today vs yesterday)
-    daily_change = 0
-    if len(history) >= 2:
-        daily_change = history[-1]['watchers'] - history[-2]['watchers']
+    daily_change = counts[-1] - counts[-2] if len(counts) >= 2 else 0
 
-    # Weekly change (today vs 7 days ago)
+    # Weekly change (today vs 7 snapshots ago)
     weekly_change = 0
-    if len(history) >= 7:
-        weekly_change = history[-1]['watchers'] - history[-7]['watchers']
-    elif len(history) >= 2:
-        weekly_change = history[-1]['watchers'] - history[0]['watchers']
+    if len(counts) >= 7:
+        weekly_change = counts[-1] - counts[-7]
+    elif len(counts) >= 2:
+        weekly_change = counts[-1] - counts[0]
 
     # Trend
     if weekly_change > 3: trend = 'hot'
@@ -1166,6 +1515,43 @@ def get_watcher_velocity(listing_id):
     }
 
 
+def _watcher_frame():
+    """Load the recent watcher window once per series version and compute
+    velocity for every listing in a single pass."""
+    global _WATCHER_FRAME
+    version = state_db.version('watchers')
+    if _WATCHER_FRAME is not None and _WATCHER_FRAME['version'] == version:
+        return _WATCHER_FRAME
+    first = datetime.now().date().toordinal() - WATCHER_WINDOW_DAYS + 1
+    rows = state_db.series_range('watchers', t_from=first)
+    day_ords = sorted({t for _k, t, _v in rows})
+    col = {t: i for i, t in enumerate(day_ords)}
+    values = {}
+    for lid, t, v in rows:
+        values.setdefault(lid, [None] * len(day_ords))[col[t]] = int(v or 0)
+    days = [datetime.fromordinal(t).strftime('%Y-%m-%d') for t in day_ords]
+    velocity = {}
+    for lid, column in values.items():
+        history = [{'date': days[i], 'watchers': w} for i, w in enumerate(column) if w is not None]
+        velocity[lid] = _watcher_velocity(history)
+    _WATCHER_FRAME = {'version': version, 'days': days, 'values': values, 'velocity': velocity}
+    return _WATCHER_FRAME
+
+
+def get_watcher_velocities():
+    """{listing_id: velocity} for every listing with watcher history."""
+    try:
+        return _watcher_frame()['velocity']
+    except Exception as e:
+        print(f"[watchers] frame error: {e}")
+        return {}
+
+
+def get_watcher_velocity(listing_id):
+    """Get watcher velocity for a listing — daily change, 7d trend, acceleration"""
+    return get_watcher_velocities().get(listing_id) or _watcher_velocity([])
+
+
 @app.route('/api/watcher-trends')
 def watcher_trends():
     """Get watcher velocity for all listings with watchers"""
@@ -1174,10 +1560,11 @@ def watcher_trends():
     # Take snapshot (once per day)
     save_watcher_snapshot(listings)
 
+    velocities = get_watcher_velocities()
     results = []
     for l in listings:
         watchers = l.get('watchers', 0) or 0
-        vel = get_watcher_velocity(l['id'])
+        vel = velocities.get(l['id']) or _watcher_velocity([])
 
         results.append({
             'id': l['id'],
@@ -1211,34 +1598,17 @@ def watcher_trends():
     })
 
 
-def get_supply_trends(item_id):
-    """Get supply trend for an item over time (#9)"""
-    data = load_supply_snapshots()
-    trend = []
-    for snap in data.get('snapshots', []):
-        item_data = snap.get('items', {}).get(item_id)
-        if item_data:
-            trend.append({
-                'date': snap['date'],
-                'count': item_data.get('ebay_count', 0),
-                'avg_price': item_data.get('ebay_avg_price', 0),
-            })
-    return trend
-
-
 def load_alerts():
     """Load price alert rules (#3)"""
-    if os.path.exists(ALERTS_FILE):
-        with open(ALERTS_FILE, 'r') as f:
-            return json.load(f)
+    data = persist.read_json(ALERTS_FILE)
+    if data is not None:
+        return data
     return {'rules': [], 'triggered': []}
 
 
 def save_alerts(data):
     """Save alert rules"""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(ALERTS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    persist.write_json(ALERTS_FILE, data, indent=2)
 
 
 def check_alerts(deals, inventory):
@@ -1297,17 +1667,15 @@ def check_alerts(deals, inventory):
 
 def load_ab_tests():
     """Load A/B test configurations (#4)"""
-    if os.path.exists(AB_TESTS_FILE):
-        with open(AB_TESTS_FILE, 'r') as f:
-            return json.load(f)
+    data = persist.read_json(AB_TESTS_FILE)
+    if data is not None:
+        return data
     return {'tests': [], 'results': []}
 
 
 def save_ab_tests(data):
     """Save A/B test configs"""
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(AB_TESTS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    persist.write_json(AB_TESTS_FILE, data, indent=2)
 
 
 def get_seasonal_promo_suggestions():
@@ -1358,7 +1726,7 @@ def load_art_deals():
         mtime = os.path.getmtime(art_path)
         if _art_deals is None or _art_deals_loaded != mtime:
             with open(art_path, 'r') as f:
-                _art_deals = json.load(f)
+                _art_deals = fast_json.load(f)
             _art_deals_loaded = mtime
 
     return _art_deals or []
@@ -1367,13 +1735,16 @@ def load_art_deals():
 # Deal Targets
 # =============================================================================
 
+DEAL_TARGETS_FILE = os.path.join(DATA_DIR, 'deal_targets.json')
+
+
 def load_deal_targets():
     """Load deal search targets from JSON file"""
-    targets_path = os.path.join(DATA_DIR, 'deal_targets.json')
-    if os.path.exists(targets_path):
-        with open(targets_path, 'r') as f:
-            return json.load(f)
-    return []
+    return persist.read_json(DEAL_TARGETS_FILE) or []
+
+
+def save_deal_targets(targets):
+    persist.write_json(DEAL_TARGETS_FILE, targets, indent=2)
 
 # =============================================================================
 # Pricing Engine
@@ -1384,7 +1755,7 @@ def load_pricing_rules():
     rules_path = os.path.join(DATA_DIR, 'pricing_rules.json')
     if os.path.exists(rules_path):
         with open(rules_path, 'r') as f:
-            return json.load(f)
+            return fast_json.load(f)
     return []
 
 
@@ -1408,7 +1779,8 @@ def get_active_events(date=None):
 
 
 def calculate_comp_anchors(title, artist=''):
-    """Pull historical comps and return pricing anchors.
+    """Pull historical comps and return pricing anchors (cached until the comp
+    store, curation or the date changes; callers get their own copy).
 
     Returns None if fewer than 3 usable comps. Otherwise:
       {count, median, p75, trailing_12mo_median, signed_only, source_count_all}
@@ -1416,6 +1788,11 @@ def calculate_comp_anchors(title, artist=''):
     Signed gate: if title contains "signed", comps are restricted to signed=True.
     Falls back to the full pool (signed_only=False) if <3 signed comps exist.
     """
+    anchors = deps.cached('comp_anchors', (title, artist), lambda: _compute_comp_anchors(title, artist))
+    return dict(anchors) if anchors else anchors
+
+
+def _compute_comp_anchors(title, artist):
     raw = lookup_historical_prices(title, artist, limit=500)
     if not raw:
         return None
@@ -1538,24 +1915,16 @@ def get_matching_events(title):
 # Market Pricing (from Master Index)
 # =============================================================================
 
-_market_index = None
-_market_index_loaded = None
-
 MASTER_INDEX_PATH = os.path.join(DATA_DIR, 'master_pricing_index.json')
 
 
 def load_market_index():
     """Load or reload the master pricing index"""
-    global _market_index, _market_index_loaded
-
-    if os.path.exists(MASTER_INDEX_PATH):
-        mtime = os.path.getmtime(MASTER_INDEX_PATH)
-        if _market_index is None or _market_index_loaded != mtime:
-            with open(MASTER_INDEX_PATH, 'r') as f:
-                _market_index = json.load(f)
-            _market_index_loaded = mtime
-
-    return _market_index
+    if not os.path.exists(MASTER_INDEX_PATH):
+        return None
+    return caches['data_files'].get_or_load(
+        'master_pricing_index', lambda: persist.read_json(MASTER_INDEX_PATH),
+        version=deps.version('master_pricing_index'))
 
 
 def categorize_for_market(title):
@@ -1643,6 +2012,12 @@ def get_market_price(title):
 
 def get_price_assessment(current_price, title):
     """Assess if current price is good compared to market"""
+    assessment = deps.cached('market_assessments', (current_price, title),
+                             lambda: _compute_price_assessment(current_price, title))
+    return dict(assessment) if assessment else assessment
+
+
+def _compute_price_assessment(current_price, title):
     market = get_market_price(title)
     if not market or market['sold_median'] == 0:
         return None
@@ -1699,7 +2074,7 @@ def load_personal_inventory():
     # Load Shepard Fairey inventory
     if os.path.exists(sf_path):
         with open(sf_path, 'r') as f:
-            sf_data = json.load(f)
+            sf_data = fast_json.load(f)
         for rec in sf_data:
             market = rec.get('market_data', {})
             ebay_supply = rec.get('ebay_supply', {})
@@ -1786,33 +2161,46 @@ def load_kaws_data():
         return _kaws_data
 
     with open(path, 'r') as f:
-        _kaws_data = json.load(f)
+        _kaws_data = fast_json.load(f)
     _kaws_data_loaded = mtime
     return _kaws_data
 _historical_prices_loaded = None
 
 
-_historical_clean = None
-_historical_clean_loaded = None
-
-
 def load_historical_clean():
-    """Load cleaned historical data — optimized, indexed, quality-filtered"""
-    global _historical_clean, _historical_clean_loaded
+    """Load cleaned historical data — optimized, indexed, quality-filtered.
+    Reloads when the file is replaced (the nightly reindex swaps it in with an
+    atomic rename, which every worker sees as a new inode/mtime)."""
     path = os.path.join(DATA_DIR, 'historical_clean.json')
     if not os.path.exists(path):
         # Fallback to raw if clean doesn't exist
         return load_historical_prices_raw()
 
-    mtime = os.path.getmtime(path)
-    if _historical_clean is not None and _historical_clean_loaded == mtime:
-        return _historical_clean
+    def _load():
+        try:
+            with open(path, 'r') as f:
+                data = fast_json.load(f)
+        except ValueError as e:
+            # a writer that isn't using rename; keep serving the last good copy
+            previous, _age = caches['data_files'].peek('historical_clean')
+            if previous is not None:
+                print(f"[Data] historical_clean.json unreadable ({e}), keeping previous load")
+                return previous
+            raise
+        print(f"[Data] Loaded {len(data)} clean historical records")
+        return data
+
+    return caches['data_files'].get_or_load('historical_clean', _load,
+                                            version=deps.version('historical_clean'))
 
-    with open(path, 'r') as f:
-        _historical_clean = json.load(f)
-    _historical_clean_loaded = mtime
-    print(f"[Data] Loaded {len(_historical_clean)} clean historical records")
-    return _historical_clean
+
+def get_comp_index():
+    """Aggregate-query index over the comp store, rebuilt when the data reloads."""
+    def _build():
+        index = CompIndex(load_historical_clean())
+        print(f"[Query] Indexed {len(index)} comp records")
+        return index
+    return deps.cached('comp_index', 'all', _build)
 
 
 def load_historical_prices_raw():
@@ -1821,7 +2209,7 @@ def load_historical_prices_raw():
     if not os.path.exists(path):
         return []
     with open(path, 'r') as f:
-        return json.load(f)
+        return fast_json.load(f)
 
 
 def load_historical_prices():
@@ -1846,7 +2234,7 @@ def load_worthpoint_data():
         return _worthpoint_data
 
     with open(path, 'r') as f:
-        _worthpoint_data = json.load(f)
+        _worthpoint_data = fast_json.load(f)
     _worthpoint_data_loaded = mtime
     return _worthpoint_data
 
@@ -1868,7 +2256,7 @@ def load_artist_summaries():
         return _artist_summaries
 
     with open(path, 'r') as f:
-        _artist_summaries = json.load(f)
+        _artist_summaries = fast_json.load(f)
     _artist_summaries_loaded = mtime
     return _artist_summaries
 
@@ -2024,24 +2412,32 @@ def is_likely_fake(title, price, category=''):
 # =============================================================================
 #
 # Design:
-# - Two files: COMP_CURATION_REJECTIONS_FILE and COMP_CURATION_APPROVALS_FILE.
-#   New filenames (not comp_rejections.json) because that file already exists
-#   with a different schema used by the older auto-reject rules pipeline.
-# - Each file: {"<item_signature>": ["<comp_key>", ...]}
+# - Each click appends {sig, ck, action} to the 'comp_curation_log' event log
+#   and mutates the in-memory per-signature index in place — O(1) per click.
+# - Every CURATION_COMPACT_EVERY events the log is folded into the compacted
+#   snapshot, namespace 'comp_curation', one row per live mark:
+#   "<item_signature>#<comp_key>" -> 'reject' | 'approve'.
+# - Legacy files COMP_CURATION_REJECTIONS_FILE / COMP_CURATION_APPROVALS_FILE
+#   ({"<item_signature>": ["<comp_key>", ...]}) are imported once at startup.
+#   (Not comp_rejections.json — that file has a different schema used by the
+#   older auto-reject rules pipeline.)
 # - item_signature = "<artist>|<title_first_40_chars>" normalized
 #   (lowercased, non-alnum -> '_').
 # - comp_key = sha1(name|price|date)[:12] — stable across runs, 12 hex chars
 #   gives ~6e14 keyspace which is comfortably collision-free for 54k comps.
 # =============================================================================
 
-import hashlib
-
 COMP_CURATION_REJECTIONS_FILE = os.path.join(DATA_DIR, 'comp_curation_rejections.json')
 COMP_CURATION_APPROVALS_FILE = os.path.join(DATA_DIR, 'comp_curation_approvals.json')
 
-# Lazy-loaded module index keyed by (signature, comp_key) -> 'reject' | 'approve'.
-# Refreshed any time _save_curation is called so subsequent reads see fresh state.
+CURATION_LOG = 'comp_curation_log'
+CURATION_COMPACT_EVERY = 200
+
+# Lazy-loaded index: {signature: {'rejected': set(comp_keys), 'approved': set(comp_keys)}}
+# plus the last log seq applied and the store version it was checked against.
 _CURATION_INDEX = None
+_CURATION_SEQ = 0
+_CURATION_VERSION = None
 
 
 def _item_signature(title, artist):
@@ -2066,111 +2462,105 @@ def _comp_key(rec):
         return hashlib.sha1(b'').hexdigest()[:12]
 
 
-def _load_curation_file(path):
-    """Load a single curation file, returning {} on any error."""
-    if not os.path.exists(path):
-        return {}
-    try:
-        with open(path, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            return {}
-    except Exception as e:
-        print(f"[curation] load error {path}: {e}")
-        return {}
-
-
-def _write_curation_file(path, data):
-    try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        print(f"[curation] write error {path}: {e}")
+def _curation_doc_key(sig, comp_key):
+    return f"{sig}#{comp_key}"
 
 
-def _load_curation():
-    """Load both files as a merged dict:
-      {<sig>: {'rejected': [comp_keys], 'approved': [comp_keys]}}
-    """
-    rej = _load_curation_file(COMP_CURATION_REJECTIONS_FILE)
-    appr = _load_curation_file(COMP_CURATION_APPROVALS_FILE)
-    merged = {}
-    for sig, keys in rej.items():
-        if not isinstance(keys, list):
-            continue
-        merged.setdefault(sig, {'rejected': [], 'approved': []})['rejected'] = list(keys)
-    for sig, keys in appr.items():
-        if not isinstance(keys, list):
-            continue
-        merged.setdefault(sig, {'rejected': [], 'approved': []})['approved'] = list(keys)
-    return merged
+def _curation_apply(idx, sig, comp_key, action):
+    """Apply one mark to the index in place; approve/reject replace each other."""
+    entry = idx.setdefault(sig, {'rejected': set(), 'approved': set()})
+    entry['rejected'].discard(comp_key)
+    entry['approved'].discard(comp_key)
+    if action == 'reject':
+        entry['rejected'].add(comp_key)
+    elif action == 'approve':
+        entry['approved'].add(comp_key)
 
 
 def _rebuild_curation_index():
-    """Refresh the module-level (sig, comp_key) -> action index."""
-    global _CURATION_INDEX
+    """Build the index from the compacted snapshot plus the log tail."""
+    global _CURATION_INDEX, _CURATION_SEQ, _CURATION_VERSION
+    version = state_db.version(CURATION_LOG)
     idx = {}
-    merged = _load_curation()
-    for sig, entry in merged.items():
-        for ck in entry.get('rejected', []):
-            idx[(sig, ck)] = 'reject'
-        for ck in entry.get('approved', []):
-            # Reject wins on collision (more conservative)
-            idx.setdefault((sig, ck), 'approve')
-    _CURATION_INDEX = idx
+    for doc_key, action in state_db.all('comp_curation').items():
+        sig, _, ck = doc_key.rpartition('#')
+        _curation_apply(idx, sig, ck, action)
+    seq = state_db.get('meta', 'curation_compacted_seq', 0)
+    for seq, sig, ev in state_db.events(CURATION_LOG, since=seq):
+        _curation_apply(idx, sig, ev['ck'], ev['action'])
+    _CURATION_INDEX, _CURATION_SEQ, _CURATION_VERSION = idx, seq, version
     return idx
 
 
 def _get_curation_index():
+    """Current index, catching up on marks written by other processes."""
+    global _CURATION_SEQ, _CURATION_VERSION
     if _CURATION_INDEX is None:
         return _rebuild_curation_index()
+    version = state_db.version(CURATION_LOG)
+    if version != _CURATION_VERSION:
+        if state_db.get('meta', 'curation_compacted_seq', 0) > _CURATION_SEQ:
+            return _rebuild_curation_index()
+        for seq, sig, ev in state_db.events(CURATION_LOG, since=_CURATION_SEQ):
+            _curation_apply(_CURATION_INDEX, sig, ev['ck'], ev['action'])
+            _CURATION_SEQ = seq
+        _CURATION_VERSION = version
     return _CURATION_INDEX
 
 
+def _restore_curation_index(saved):
+    global _CURATION_INDEX, _CURATION_SEQ, _CURATION_VERSION
+    _CURATION_INDEX, _CURATION_SEQ, _CURATION_VERSION = saved
+
+
+warm.extra('curation_index',
+           lambda: None if _CURATION_INDEX is None else (_CURATION_INDEX, _CURATION_SEQ, _CURATION_VERSION),
+           _restore_curation_index, node='curation')
+
+
+def _curation_for(sig):
+    """{'rejected': set, 'approved': set} for one item signature."""
+    return _get_curation_index().get(sig) or {'rejected': set(), 'approved': set()}
+
+
+def _compact_curation():
+    """Fold the log into the 'comp_curation' snapshot and drop folded events."""
+    with state_db.transaction():
+        rows = state_db.events(CURATION_LOG)
+        if not rows:
+            return 0
+        latest = {}
+        for _seq, sig, ev in rows:
+            latest[_curation_doc_key(sig, ev['ck'])] = ev['action']
+        state_db.put_many('comp_curation', {k: a for k, a in latest.items() if a != 'unmark'})
+        state_db.delete('comp_curation', *[k for k, a in latest.items() if a == 'unmark'])
+        state_db.put('meta', 'curation_compacted_seq', rows[-1][0])
+        state_db.trim(CURATION_LOG, 0)
+    print(f"[curation] compacted {len(rows)} events")
+    return len(rows)
+
+
 def _save_curation(sig, action, comp_key):
     """Persist (sig, comp_key) with action in ('reject','approve','unmark').
-    'unmark' removes the comp_key from BOTH files.
+    Appends one event and updates the in-memory index in place.
     """
     if not sig or not comp_key:
         return
-    rej = _load_curation_file(COMP_CURATION_REJECTIONS_FILE)
-    appr = _load_curation_file(COMP_CURATION_APPROVALS_FILE)
-
-    def _remove(store, sig, ck):
-        if sig in store and isinstance(store[sig], list) and ck in store[sig]:
-            store[sig] = [k for k in store[sig] if k != ck]
-            if not store[sig]:
-                store.pop(sig, None)
-
-    # Always remove from opposite (or both for unmark) before applying
-    if action == 'reject':
-        _remove(appr, sig, comp_key)
-        bucket = rej.setdefault(sig, [])
-        if not isinstance(bucket, list):
-            bucket = []
-            rej[sig] = bucket
-        if comp_key not in bucket:
-            bucket.append(comp_key)
-    elif action == 'approve':
-        _remove(rej, sig, comp_key)
-        bucket = appr.setdefault(sig, [])
-        if not isinstance(bucket, list):
-            bucket = []
-            appr[sig] = bucket
-        if comp_key not in bucket:
-            bucket.append(comp_key)
-    elif action == 'unmark':
-        _remove(rej, sig, comp_key)
-        _remove(appr, sig, comp_key)
-    else:
+    if action not in ('reject', 'approve', 'unmark'):
         print(f"[curation] unknown action: {action}")
         return
-
-    _write_curation_file(COMP_CURATION_REJECTIONS_FILE, rej)
-    _write_curation_file(COMP_CURATION_APPROVALS_FILE, appr)
-    _rebuild_curation_index()
+    idx = _get_curation_index()
+    try:
+        state_db.append(CURATION_LOG, {'ck': comp_key, 'action': action}, key=sig)
+    except Exception as e:
+        print(f"[curation] write error: {e}")
+        return
+    _curation_apply(idx, sig, comp_key, action)
+    if state_db.count_events(CURATION_LOG) >= CURATION_COMPACT_EVERY:
+        try:
+            _compact_curation()
+        except Exception as e:
+            print(f"[curation] compaction error: {e}")
 
 
 def lookup_historical_prices(title, artist='', limit=50):
@@ -2190,11 +2580,14 @@ def lookup_historical_prices(title, artist='', limit=50):
     # Pre-compute curation for this item signature once per call.
     try:
         sig = _item_signature(title, artist)
-        cur_index = _get_curation_index()
+        curation = _curation_for(sig)
     except Exception as e:
         print(f"[curation] lookup pre-compute failed: {e}")
         sig = ''
-        cur_index = {}
+        curation = {'rejected': set(), 'approved': set()}
+    rejected_keys = curation['rejected']
+    approved_keys = curation['approved']
+    curated = bool(rejected_keys or approved_keys)
 
     data = load_historical_clean()
     results = []
@@ -2226,10 +2619,9 @@ def lookup_historical_prices(title, artist='', limit=50):
 
         # Manual curation — skip rejections, flag approvals.
         ck = _comp_key(rec) if sig else ''
-        action = cur_index.get((sig, ck)) if sig and ck else None
-        if action == 'reject':
+        if curated and ck in rejected_keys:
             continue
-        approved = (action == 'approve')
+        approved = curated and ck in approved_keys
 
         results.append({
             'name': rec.get('name', ''),
@@ -2267,42 +2659,60 @@ def lookup_historical_prices(title, artist='', limit=50):
 # =============================================================================
 
 @app.route('/')
+@http_cache.conditional(lambda: (deps.version('index_html'), assets.version()))
 def index():
     """Render main dashboard"""
     return render_template('index.html')
 
 
+LISTING_ENRICHED_FIELDS = {'suggested_price', 'suggested_source', 'event_boost_pct', 'comp_evidence',
+                           'matching_events', 'market_data', 'price_assessment'}
+
+
+def _add_listing_pricing(listing):
+    """Add suggested prices, comp evidence, and market data"""
+    detail = calculate_suggested_price_detailed(
+        listing['price'],
+        listing['title'],
+        listing.get('artist', '')
+    )
+    listing['suggested_price'] = detail['suggested']
+    listing['suggested_source'] = detail['source']
+    listing['event_boost_pct'] = detail['event_boost_pct']
+    if detail['comps']:
+        listing['comp_evidence'] = detail['comps']
+    listing['matching_events'] = get_matching_events(listing['title'])
+
+    # Add market pricing data
+    market = get_market_price(listing['title'])
+    if market:
+        listing['market_data'] = market
+        listing['price_assessment'] = get_price_assessment(
+            listing['price'],
+            listing['title']
+        )
+    return listing
+
+
 @app.route('/api/listings')
 def get_listings():
-    """Get all active eBay listings"""
+    """Get all active eBay listings. With fields/where/sort/limit/cursor
+    (see paging.py) returns one page; pricing is added to that page only
+    unless where/sort reads a pricing field."""
     search = request.args.get('search', '').lower()
     listings = ebay.get_all_listings()
 
     if search:
         listings = [l for l in listings if search in l['title'].lower()]
 
-    # Add suggested prices, comp evidence, and market data
+    if paging.requested(request.args):
+        if paging.referenced(request.args) & LISTING_ENRICHED_FIELDS:
+            listings = [_add_listing_pricing(l) for l in listings]
+            return jsonify(paging.paginate(listings, request.args, key='id'))
+        return jsonify(paging.paginate(listings, request.args, key='id', prepare=_add_listing_pricing))
+
     for listing in listings:
-        detail = calculate_suggested_price_detailed(
-            listing['price'],
-            listing['title'],
-            listing.get('artist', '')
-        )
-        listing['suggested_price'] = detail['suggested']
-        listing['suggested_source'] = detail['source']
-        listing['event_boost_pct'] = detail['event_boost_pct']
-        if detail['comps']:
-            listing['comp_evidence'] = detail['comps']
-        listing['matching_events'] = get_matching_events(listing['title'])
-
-        # Add market pricing data
-        market = get_market_price(listing['title'])
-        if market:
-            listing['market_data'] = market
-            listing['price_assessment'] = get_price_assessment(
-                listing['price'],
-                listing['title']
-            )
+        _add_listing_pricing(listing)
 
     return jsonify(listings)
 
@@ -2490,8 +2900,8 @@ def get_alerts():
 
 @app.route('/api/update-price', methods=['POST'])
 def update_price():
-    """Update item price on eBay. Logs every successful push to
-    data/price_history.json via _append_price_change().
+    """Update item price on eBay. Logs every successful push to the
+    'price_history' event log in state_db via _append_price_change().
 
     Request body:
       item_id: str          (required)
@@ -2562,6 +2972,15 @@ def pwa_manifest():
     })
 
 
+@app.route('/sw.js')
+@http_cache.conditional(lambda: assets.version())
+def service_worker():
+    """Service worker precaching the hashed static bundles"""
+    body = render_template('sw.js', version=assets.version(), precache=assets.precache(),
+                           prefix=assets.url_prefix)
+    return Response(body, mimetype='text/javascript', headers={'Cache-Control': 'no-cache'})
+
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
@@ -2759,7 +3178,6 @@ def update_deal_targets():
     data = request.get_json()
     action = data.get('action', '')
 
-    targets_path = os.path.join(DATA_DIR, 'deal_targets.json')
     targets = load_deal_targets()
 
     if action == 'add':
@@ -2781,13 +3199,10 @@ def update_deal_targets():
     elif action == 'replace_all':
         targets = data.get('targets', [])
 
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(targets_path, 'w') as f:
-        json.dump(targets, f, indent=2)
+    save_deal_targets(targets)
 
     # Clear live deals cache
-    global _live_deals_cache
-    _live_deals_cache = None
+    caches['live_deals'].clear()
 
     return jsonify({'success': True, 'total': len(targets)})
 
@@ -2849,19 +3264,15 @@ SAVED_SEARCHES_FILE = os.path.join(DATA_DIR, 'saved_searches.json')
 
 
 def load_saved_searches():
-    if os.path.exists(SAVED_SEARCHES_FILE):
-        try:
-            with open(SAVED_SEARCHES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        return state_db.get('config', 'saved_searches', [])
+    except Exception as e:
+        print(f"[saved-searches] load error: {e}")
     return []
 
 
 def save_saved_searches(searches):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(SAVED_SEARCHES_FILE, 'w') as f:
-        json.dump(searches, f, indent=2)
+    state_db.put('config', 'saved_searches', searches)
 
 
 @app.route('/api/saved-searches', methods=['GET'])
@@ -2978,19 +3389,17 @@ DEAL_PREFS_FILE = os.path.join(DATA_DIR, 'deal_preferences.json')
 
 
 def load_deal_prefs():
-    if os.path.exists(DEAL_PREFS_FILE):
-        try:
-            with open(DEAL_PREFS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(DEAL_PREFS_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {'likes': [], 'passes': [], 'learned': {}, 'stats': {'total_likes': 0, 'total_passes': 0}}
 
 
 def save_deal_prefs(prefs):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(DEAL_PREFS_FILE, 'w') as f:
-        json.dump(prefs, f, indent=2)
+    persist.write_json(DEAL_PREFS_FILE, prefs, indent=2)
 
 
 def learn_deal_preferences(prefs):
@@ -3140,8 +3549,6 @@ def get_deal_prefs():
 
 
 LIVE_DEALS_FILE = os.path.join(DATA_DIR, 'live_deals_cache.json')
-_live_deals_cache = None
-_live_deals_time = None
 
 # Background scraper state
 SCRAPE_STATUS_FILE = os.path.join(DATA_DIR, 'scrape_status.json')
@@ -3149,24 +3556,28 @@ _scrape_running = False
 
 
 def _save_scrape_status(status):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(SCRAPE_STATUS_FILE, 'w') as f:
-        json.dump(status, f, indent=2)
+    bus.publish('scrape', dict(status))
+    persist.write_json(SCRAPE_STATUS_FILE, status, indent=2)
 
 
 def _load_scrape_status():
-    if os.path.exists(SCRAPE_STATUS_FILE):
-        try:
-            with open(SCRAPE_STATUS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    if _scrape_running:
+        # this worker is scraping: its last published status is the live one
+        live = bus.latest('scrape')
+        if live is not None:
+            return live
+    try:
+        data = persist.read_json(SCRAPE_STATUS_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {'running': False, 'progress': 0, 'total': 0, 'found': 0, 'last_query': '', 'last_run': None, 'errors': 0}
 
 
 def run_background_scrape():
     """Run full scrape of all deal targets with pagination — called in background thread"""
-    global _scrape_running, _live_deals_cache, _live_deals_time
+    global _scrape_running
 
     if _scrape_running:
         return
@@ -3229,14 +3640,11 @@ def run_background_scrape():
     }
 
     try:
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(LIVE_DEALS_FILE, 'w') as f:
-            json.dump(result, f)
+        persist.write_json(LIVE_DEALS_FILE, result)
     except Exception:
         pass
 
-    _live_deals_cache = result
-    _live_deals_time = datetime.now()
+    caches['live_deals'].set('deals', result)
     _scrape_running = False
 
     status = {
@@ -3274,24 +3682,28 @@ def scrape_status():
 
 @app.route('/api/deals/live')
 def get_live_deals():
-    """Search eBay LIVE for deals from all deal targets. Cached for 4 hours."""
-    global _live_deals_cache, _live_deals_time
+    """Search eBay LIVE for deals from all deal targets. Cached for 4 hours.
+    fields/where/sort/limit/cursor page the 'deals' list (see paging.py)."""
     force = request.args.get('refresh', '').lower() == 'true'
 
+    def respond(result):
+        if paging.requested(request.args):
+            result = paging.page_of(result, 'deals', request.args, key='id')
+        return jsonify(result)
+
     # Check cache — 4 hour TTL (was 30 min)
-    if not force and _live_deals_cache and _live_deals_time and (datetime.now() - _live_deals_time).seconds < 14400:
-        return jsonify(_live_deals_cache)
+    cached = None if force else caches['live_deals'].get('deals')
+    if cached:
+        return respond(cached)
 
-    if not force and os.path.exists(LIVE_DEALS_FILE):
+    if not force:
         try:
-            with open(LIVE_DEALS_FILE, 'r') as f:
-                cached = json.load(f)
+            cached = persist.read_json(LIVE_DEALS_FILE) or {}
             if cached.get('fetched'):
                 age = (datetime.now() - datetime.fromisoformat(cached['fetched'])).total_seconds()
                 if age < 1800:
-                    _live_deals_cache = cached
-                    _live_deals_time = datetime.now()
-                    return jsonify(cached)
+                    caches['live_deals'].set('deals', cached)
+                    return respond(cached)
         except Exception:
             pass
 
@@ -3339,20 +3751,20 @@ def get_live_deals():
 
     # Save cache
     try:
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(LIVE_DEALS_FILE, 'w') as f:
-            json.dump(result, f)
+        persist.write_json(LIVE_DEALS_FILE, result)
     except Exception:
         pass
 
-    _live_deals_cache = result
-    _live_deals_time = datetime.now()
-    return jsonify(result)
+    caches['live_deals'].set('deals', result)
+    return respond(result)
 
 
 @app.route('/api/deals/enhanced')
+@http_cache.conditional(lambda: tuple(deps.version(n) for n in (
+    'art_deals', 'deal_targets', 'live_deals_cache', 'master_pricing_index')))
 def get_enhanced_deals():
-    """Get deals with full market context — static + live eBay merged"""
+    """Get deals with full market context — static + live eBay merged.
+    fields/where/sort/limit/cursor page the 'deals' list (see paging.py)."""
     # Load static art deals — filter to active categories only
     active_targets = load_deal_targets()
     active_categories = set(t.get('category', '') for t in active_targets if t.get('active', True))
@@ -3370,10 +3782,7 @@ def get_enhanced_deals():
     # Load live deals from Browse API (all new categories)
     live_deals = []
     try:
-        live_cache = None
-        if os.path.exists(LIVE_DEALS_FILE):
-            with open(LIVE_DEALS_FILE, 'r') as f:
-                live_cache = json.load(f)
+        live_cache = persist.read_json(LIVE_DEALS_FILE)
         if live_cache and live_cache.get('deals'):
             for ld in live_cache['deals']:
                 live_deals.append({
@@ -3522,11 +3931,14 @@ def get_enhanced_deals():
     for cat in cat_summary:
         cat_summary[cat]['avg_hotness'] = round(cat_summary[cat]['avg_hotness'] / cat_summary[cat]['count'])
 
-    return jsonify({
+    result = {
         'deals': enhanced,
         'categories': cat_summary,
         'total': len(enhanced),
-    })
+    }
+    if paging.requested(request.args):
+        result = paging.page_of(result, 'deals', request.args, key='url')
+    return jsonify(result)
 
 
 @app.route('/api/deals/product-search')
@@ -3895,6 +4307,12 @@ def get_sold_items_api():
     return jsonify(data)
 
 
+@app.route('/api/sold-items/sync', methods=['POST'])
+def sync_sold_items_api():
+    """Force an incremental sold-history sync from the watermark"""
+    return jsonify(sync_sold_history(force=True))
+
+
 @app.route('/api/traffic')
 def get_traffic_api():
     """Get listing traffic data — impressions, views, CTR, conversion (#7)"""
@@ -3951,31 +4369,28 @@ def get_seasonal_suggestions():
 def take_supply_snapshot():
     """Take a supply snapshot for competitor monitoring (#9)"""
     inventory = load_personal_inventory()
-    data = save_supply_snapshot(inventory)
-    return jsonify({'success': True, 'snapshots': len(data.get('snapshots', []))})
+    save_supply_snapshot(inventory)
+    return jsonify({'success': True, 'snapshots': len(_supply_days())})
 
 
 @app.route('/api/supply-trends')
 def get_supply_trends_api():
-    """Get supply trends over time (#9)"""
+    """Get supply trends over time (#9). ?days= widens the window; points older
+    than SUPPLY_DAILY_DAYS come back as weekly/monthly averages."""
+    days = request.args.get('days', type=int) or SUPPLY_TREND_DAYS
     item_id = request.args.get('item_id')
     if item_id:
-        return jsonify(get_supply_trends(item_id))
+        return jsonify(get_supply_trends(item_id, days))
 
     # Return all trends summary
-    data = load_supply_snapshots()
-    if not data.get('snapshots'):
+    changes = get_supply_changes(days)
+    if not changes['items']:
         return jsonify({'snapshots': 0, 'message': 'No snapshots yet. Take first snapshot.'})
 
-    latest = data['snapshots'][-1] if data['snapshots'] else {}
-    oldest = data['snapshots'][0] if data['snapshots'] else {}
-
+    names = state_db.all('supply_names')
     trends = {}
-    for item_id, latest_data in latest.get('items', {}).items():
-        oldest_data = oldest.get('items', {}).get(item_id, {})
-        old_count = oldest_data.get('ebay_count', latest_data.get('ebay_count', 0))
-        new_count = latest_data.get('ebay_count', 0)
-        change = new_count - old_count
+    for item_id, c in changes['items'].items():
+        change = c['current'] - c['previous']
 
         if change > 0:
             direction = 'increasing'
@@ -3985,16 +4400,17 @@ def get_supply_trends_api():
             direction = 'stable'
 
         trends[item_id] = {
-            'name': latest_data.get('name', ''),
-            'current_supply': new_count,
-            'previous_supply': old_count,
+            'name': names.get(item_id, ''),
+            'current_supply': c['current'],
+            'previous_supply': c['previous'],
             'change': change,
             'direction': direction,
         }
 
     return jsonify({
-        'snapshots': len(data['snapshots']),
-        'period': f"{oldest.get('date', '?')} to {latest.get('date', '?')}",
+        'snapshots': changes['days_tracked'],
+        'period': f"{changes['first_date'] or '?'} to {changes['latest_date'] or '?'}",
+        'days': days,
         'trends': trends,
     })
 
@@ -4289,7 +4705,36 @@ Respond in this exact JSON format:
 def get_full_inventory_analytics():
     """Inventory = eBay active listings as source of truth, enriched with market data.
 
-    Fallback: when eBay OAuth is broken or returns 0 listings, synthesize the
+    Served from the 'analytics' cache until one of its declared inputs changes
+    (see deps.derived('full_analytics', ...)); ?fresh=1 rebuilds now.
+    """
+    fresh = request.args.get('fresh', '').lower() in ('1', 'true')
+    if fresh:
+        caches['analytics'].clear()
+    # touch the upstream caches first so the fingerprint below matches what the build reads
+    for touch in (ebay.get_all_listings, sync_sold_history, fetch_and_cache_traffic, fetch_all_promotions):
+        try:
+            touch()
+        except Exception as e:
+            print(f"[full-analytics] {touch.__name__} raised: {e}")
+    # content fingerprint, not cache generations: those restart per process, so
+    # another worker (or this one after a restart) could reuse a tag
+    etag = version_tag(request.full_path, deps.fingerprint('full_analytics'))
+    if not fresh:
+        not_modified = http_cache.check(etag)
+        if not_modified is not None:
+            return not_modified
+    result = deps.cached('full_analytics', 'full', _build_full_analytics)
+    if paging.requested(request.args):
+        result = paging.page_of(result, 'items', request.args, key='id')
+    response = jsonify(result)
+    # the build may have loaded an input that was still cold above
+    response.set_etag(version_tag(request.full_path, deps.fingerprint('full_analytics')), weak=True)
+    return response
+
+
+def _build_full_analytics():
+    """Fallback: when eBay OAuth is broken or returns 0 listings, synthesize the
     inventory from data/inventory_enriched.json (the personal-inventory cache,
     same source as /api/stats my_inventory). This keeps the dashboard usable
     while OAuth is being repaired.
@@ -4334,7 +4779,7 @@ def get_full_inventory_analytics():
     promo_data = fetch_all_promotions()
     per_listing_promos = promo_data.get('per_listing', {})
     seasonal = get_seasonal_promo_suggestions()
-    supply_data = load_supply_snapshots()
+    supply_changes = get_supply_changes()
 
     # Build enrichment lookup — fuzzy match enriched items to eBay listings
     # Use word overlap matching since names are different formats
@@ -4360,15 +4805,8 @@ def get_full_inventory_analytics():
                 best_match = item
         return best_match
 
-    # Auto-enrichment cache
-    ENRICHMENT_FILE = os.path.join(DATA_DIR, 'auto_enrichment.json')
-    enrichment_cache = {}
-    if os.path.exists(ENRICHMENT_FILE):
-        try:
-            with open(ENRICHMENT_FILE, 'r') as f:
-                enrichment_cache = json.load(f)
-        except Exception:
-            pass
+    # Auto-enrichment results (entries without comps are misses, kept only for the TTL)
+    enrichment_cache = {k: v for k, v in state_db.all(ENRICHMENT_NS).items() if v.get('market_data')}
 
     # Build inventory from eBay listings (source of truth)
     inventory = []
@@ -4496,9 +4934,8 @@ def get_full_inventory_analytics():
     save_supply_snapshot(enriched_inventory)
     save_watcher_snapshot(listings)
 
-    # Get latest supply snapshot for trends
-    latest_snap = supply_data['snapshots'][-1] if supply_data.get('snapshots') else {}
-    oldest_snap = supply_data['snapshots'][0] if len(supply_data.get('snapshots', [])) > 1 else {}
+    # Supply at the start of the trend window, per item
+    supply_baseline = supply_changes['items'] if supply_changes['first_date'] != supply_changes['latest_date'] else {}
 
     enhanced = []
     for item in inventory:
@@ -4586,8 +5023,8 @@ def get_full_inventory_analytics():
         # #9: Supply trend
         supply_trend = 'stable'
         supply_change = 0
-        if oldest_snap and latest_snap:
-            old_supply = oldest_snap.get('items', {}).get(str(item['id']), {}).get('ebay_count', ebay_count)
+        if supply_baseline:
+            old_supply = supply_baseline.get(str(item['id']), {}).get('previous', ebay_count)
             supply_change = ebay_count - old_supply
             if supply_change > 2:
                 supply_trend = 'increasing'
@@ -4796,7 +5233,7 @@ def get_full_inventory_analytics():
     avg_roi = round(sum(i['roi_est'] for i in enhanced) / max(len(enhanced), 1), 1)
     avg_days = round(sum(i['days_listed'] for i in enhanced) / max(len(enhanced), 1))
 
-    return jsonify({
+    return {
         'items': enhanced,
         'total': len(enhanced),
         'total_value': round(total_value, 2),
@@ -4821,7 +5258,7 @@ def get_full_inventory_analytics():
         'seasonal_suggestions': seasonal,
         'comp_summary': _build_comp_summary(enhanced),
         'inventory_source': inventory_source,
-    })
+    }
 
 
 # =============================================================================
@@ -4831,34 +5268,41 @@ def get_full_inventory_analytics():
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 LLM_PRICE_CACHE_FILE = os.path.join(DATA_DIR, 'llm_price_cache.json')
-_LLM_PRICE_CACHE = None  # lazy-loaded module-level dict
 
 
 def _load_llm_cache():
-    """Lazy-load the LLM price review cache from disk."""
-    global _LLM_PRICE_CACHE
-    if _LLM_PRICE_CACHE is not None:
-        return _LLM_PRICE_CACHE
+    """Whole LLM price review cache as a dict, mirrored from the state store
+    in the 'llm_reviews' region and dropped when any process writes it."""
+    def _load():
+        try:
+            return state_db.all('llm_price_cache')
+        except Exception as e:
+            print(f"[LLM] cache load error: {e}")
+            return {}
+    return caches['llm_reviews'].get_or_load('all', _load)
+
+
+state_db.watch('llm_price_cache', lambda _ns: caches['llm_reviews'].clear())
+
+
+def _llm_cache_put(entries):
+    """Write {cache_key: review} rows through to the store (one row each)."""
+    cache = _load_llm_cache()
+    cache.update(entries)
     try:
-        if os.path.exists(LLM_PRICE_CACHE_FILE):
-            with open(LLM_PRICE_CACHE_FILE, 'r') as f:
-                _LLM_PRICE_CACHE = json.load(f)
-        else:
-            _LLM_PRICE_CACHE = {}
+        state_db.put_many('llm_price_cache', entries)
     except Exception as e:
-        print(f"[LLM] cache load error: {e}")
-        _LLM_PRICE_CACHE = {}
-    return _LLM_PRICE_CACHE
+        print(f"[LLM] cache save error: {e}")
 
 
-def _save_llm_cache(cache):
-    """Persist the LLM price review cache to disk."""
+def _llm_cache_delete(keys):
+    cache = _load_llm_cache()
+    for k in keys:
+        cache.pop(k, None)
     try:
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(LLM_PRICE_CACHE_FILE, 'w') as f:
-            json.dump(cache, f)
+        state_db.delete('llm_price_cache', *keys)
     except Exception as e:
-        print(f"[LLM] cache save error: {e}")
+        print(f"[LLM] cache delete error: {e}")
 
 
 def _coerce_int(v):
@@ -4882,33 +5326,39 @@ def _parse_llm_json(text):
         m = re.search(r'\{[^{}]*("recommended"|"price")[^{}]*\}', text, re.DOTALL)
         if not m:
             return {**blank, 'reason': f'parse_error: {text[:150]}'}
-        parsed = json.loads(m.group(0))
-        low = _coerce_int(parsed.get('low'))
-        high = _coerce_int(parsed.get('high'))
-        rec = _coerce_int(parsed.get('recommended') or parsed.get('price'))
-        # Legacy fallback — single price returned
-        if rec and not low:
-            low = int(round(rec * 0.9))
-        if rec and not high:
-            high = int(round(rec * 1.1))
-        # Sanity: low <= rec <= high
-        if low and high and rec and not (low <= rec <= high):
-            low, high = min(low, rec), max(high, rec)
-        reason = str(parsed.get('reason', ''))[:320]
-        if not rec:
+        out = _normalize_llm_price(json.loads(m.group(0)))
+        if not out:
             return {**blank, 'reason': f'parse_error: missing price fields in {text[:120]}'}
-        return {
-            'low': low,
-            'high': high,
-            'recommended': rec,
-            'price': rec,  # back-compat
-            'reason': reason,
-            'status': 'ok',
-        }
+        return out
     except Exception as e:
         return {**blank, 'reason': f'parse_error: {str(e)[:120]}'}
 
 
+def _normalize_llm_price(parsed):
+    """Coerce one parsed {low, high, recommended|price, reason} dict; None if no price."""
+    low = _coerce_int(parsed.get('low'))
+    high = _coerce_int(parsed.get('high'))
+    rec = _coerce_int(parsed.get('recommended') or parsed.get('price'))
+    if not rec:
+        return None
+    # Legacy fallback — single price returned
+    if not low:
+        low = int(round(rec * 0.9))
+    if not high:
+        high = int(round(rec * 1.1))
+    # Sanity: low <= rec <= high
+    if not (low <= rec <= high):
+        low, high = min(low, rec), max(high, rec)
+    return {
+        'low': low,
+        'high': high,
+        'recommended': rec,
+        'price': rec,  # back-compat
+        'reason': str(parsed.get('reason', ''))[:320],
+        'status': 'ok',
+    }
+
+
 # Per-artist expert context blocks — injected into the LLM pricing prompt.
 # Keyed by the artist label produced by the detect logic in
 # get_full_inventory_analytics (see ~line 4117). 'default' is the safe fallback
@@ -4992,6 +5442,33 @@ def _build_llm_prompt(listing, comp_stats, recent_comps, active_comps):
     active_comps is a list of CURRENT eBay listings competing for this item.
     Each entry: {title, price, url}.
     """
+    artist = listing.get('_artist', 'Unknown')
+    artist_fragment = _artist_fragment(artist)
+
+    return (
+        "You are pricing an eBay listing for an authenticated art reseller. "
+        "Your job is to return a PRICE RANGE — floor (fast-sale), recommended (best balance), "
+        "and ceiling (patient-seller maximum).\n\n"
+        f"{_llm_listing_context(listing, comp_stats, recent_comps, active_comps)}\n\n"
+        f"Artist-specific context:\n  {artist_fragment}\n\n"
+        "Considering (a) historical comp distribution, (b) recency/trend, "
+        "(c) current live competition and their pricing, and (d) the signed/edition nature of this piece, "
+        "what range of eBay prices makes sense?\n\n"
+        f"{_LLM_RANGE_DEFINITIONS}\n"
+        "Respond in STRICT JSON only, no prose, no markdown code fences:\n"
+        '{"low": <int>, "recommended": <int>, "high": <int>, "reason": "<1-2 sentences, max 35 words>"}'
+    )
+
+
+_LLM_RANGE_DEFINITIONS = (
+    "- `low` = price to sell within 48 hours (aggressive floor)\n"
+    "- `recommended` = best balance of speed and margin\n"
+    "- `high` = patient-seller ceiling (willing to wait 30+ days)\n"
+)
+
+
+def _llm_listing_context(listing, comp_stats, recent_comps, active_comps):
+    """Per-listing block of the pricing prompt: item, comp stats, recent sales, live competition."""
     title = listing.get('title', '') or listing.get('name', '')
     artist = listing.get('_artist', 'Unknown')
     your_price = listing.get('price', 0) or 0
@@ -5045,35 +5522,33 @@ def _build_llm_prompt(listing, comp_stats, recent_comps, active_comps):
     else:
         active_section = "Current eBay competition: none visible right now (low supply or narrow match)."
 
-    artist_fragment = _artist_fragment(artist)
-
     return (
-        "You are pricing an eBay listing for an authenticated art reseller. "
-        "Your job is to return a PRICE RANGE — floor (fast-sale), recommended (best balance), "
-        "and ceiling (patient-seller maximum).\n\n"
         f"Artist: {artist}\n"
         f"Title: {title}\n"
         f"Current listing price: ${your_price}\n\n"
         f"{comp_section}\n"
         f"Recent closed sales (top 5):\n{recent_text}\n\n"
-        f"{active_section}\n\n"
-        f"Artist-specific context:\n  {artist_fragment}\n\n"
-        "Considering (a) historical comp distribution, (b) recency/trend, "
-        "(c) current live competition and their pricing, and (d) the signed/edition nature of this piece, "
-        "what range of eBay prices makes sense?\n\n"
-        "- `low` = price to sell within 48 hours (aggressive floor)\n"
-        "- `recommended` = best balance of speed and margin\n"
-        "- `high` = patient-seller ceiling (willing to wait 30+ days)\n\n"
-        "Respond in STRICT JSON only, no prose, no markdown code fences:\n"
-        '{"low": <int>, "recommended": <int>, "high": <int>, "reason": "<1-2 sentences, max 35 words>"}'
+        f"{active_section}"
     )
 
 
-def _llm_claude(prompt, listing_id=''):
-    """Call Claude (Anthropic) and return {price, reason, status}."""
+def _llm_result(name, text, usage, error):
+    """Turn a raw (text, usage, error) model reply into {low, high, recommended, reason, status}."""
+    if error == 'not_configured':
+        return {'price': None, 'reason': '', 'status': 'not_configured'}
+    if error:
+        return {'price': None, 'reason': f'error: {error}', 'status': 'error'}
+    parsed = _parse_llm_json(text)
+    parsed['usage'] = usage
+    print(f"[LLM] {name} done: ${parsed.get('price')}")
+    return parsed
+
+
+def _llm_claude_text(prompt, listing_id='', max_tokens=500, timeout=20):
+    """Call Claude (Anthropic) and return (text, usage, error)."""
     key = ENV.get('ANTHROPIC_API_KEY', '') or ENV.get('CLAUDE_API_KEY', '')
     if not key:
-        return {'price': None, 'reason': '', 'status': 'not_configured'}
+        return None, None, 'not_configured'
     print(f"[LLM] claude start for {listing_id}")
     try:
         resp = requests.post(
@@ -5085,29 +5560,28 @@ def _llm_claude(prompt, listing_id=''):
             },
             json={
                 'model': 'claude-sonnet-4-6',
-                'max_tokens': 500,
+                'max_tokens': max_tokens,
                 'messages': [{'role': 'user', 'content': prompt}],
             },
-            timeout=20,
+            timeout=timeout,
         )
         if resp.status_code != 200:
             msg = f"http_{resp.status_code}: {resp.text[:120]}"
             print(f"[LLM] claude error: {msg}")
-            return {'price': None, 'reason': f'error: {msg}', 'status': 'error'}
-        text = resp.json()['content'][0]['text']
-        parsed = _parse_llm_json(text)
-        print(f"[LLM] claude done: ${parsed.get('price')}")
-        return parsed
+            return None, None, msg
+        body = resp.json()
+        u = body.get('usage') or {}
+        return body['content'][0]['text'], {'in': u.get('input_tokens', 0), 'out': u.get('output_tokens', 0)}, None
     except Exception as e:
         print(f"[LLM] claude exception: {e}")
-        return {'price': None, 'reason': f'error: {str(e)[:120]}', 'status': 'error'}
+        return None, None, str(e)[:120]
 
 
-def _llm_openai(prompt, listing_id=''):
-    """Call OpenAI GPT-4o and return {price, reason, status}."""
+def _llm_openai_text(prompt, listing_id='', max_tokens=500, timeout=20):
+    """Call OpenAI GPT-4o and return (text, usage, error)."""
     key = ENV.get('OPENAI_API_KEY', '')
     if not key:
-        return {'price': None, 'reason': '', 'status': 'not_configured'}
+        return None, None, 'not_configured'
     print(f"[LLM] gpt start for {listing_id}")
     try:
         resp = requests.post(
@@ -5120,53 +5594,52 @@ def _llm_openai(prompt, listing_id=''):
                 'model': 'gpt-4o',
                 'messages': [{'role': 'user', 'content': prompt}],
                 'temperature': 0.3,
+                'max_tokens': max_tokens,
             },
-            timeout=20,
+            timeout=timeout,
         )
         if resp.status_code != 200:
             msg = f"http_{resp.status_code}: {resp.text[:120]}"
             print(f"[LLM] gpt error: {msg}")
-            return {'price': None, 'reason': f'error: {msg}', 'status': 'error'}
-        text = resp.json()['choices'][0]['message']['content']
-        parsed = _parse_llm_json(text)
-        print(f"[LLM] gpt done: ${parsed.get('price')}")
-        return parsed
+            return None, None, msg
+        body = resp.json()
+        u = body.get('usage') or {}
+        return body['choices'][0]['message']['content'], {'in': u.get('prompt_tokens', 0), 'out': u.get('completion_tokens', 0)}, None
     except Exception as e:
         print(f"[LLM] gpt exception: {e}")
-        return {'price': None, 'reason': f'error: {str(e)[:120]}', 'status': 'error'}
+        return None, None, str(e)[:120]
 
 
-def _llm_gemini(prompt, listing_id=''):
-    """Call Gemini 2.0 Flash and return {price, reason, status}."""
+def _llm_gemini_text(prompt, listing_id='', max_tokens=500, timeout=20):
+    """Call Gemini 2.5 Flash and return (text, usage, error)."""
     key = ENV.get('GEMINI_API_KEY', '')
     if not key:
-        return {'price': None, 'reason': '', 'status': 'not_configured'}
+        return None, None, 'not_configured'
     print(f"[LLM] gemini start for {listing_id}")
     try:
         resp = requests.post(
             f'https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={key}',
             headers={'Content-Type': 'application/json'},
             json={'contents': [{'parts': [{'text': prompt}]}]},
-            timeout=20,
+            timeout=timeout,
         )
         if resp.status_code != 200:
             msg = f"http_{resp.status_code}: {resp.text[:120]}"
             print(f"[LLM] gemini error: {msg}")
-            return {'price': None, 'reason': f'error: {msg}', 'status': 'error'}
-        text = resp.json()['candidates'][0]['content']['parts'][0]['text']
-        parsed = _parse_llm_json(text)
-        print(f"[LLM] gemini done: ${parsed.get('price')}")
-        return parsed
+            return None, None, msg
+        body = resp.json()
+        u = body.get('usageMetadata') or {}
+        return body['candidates'][0]['content']['parts'][0]['text'], {'in': u.get('promptTokenCount', 0), 'out': u.get('candidatesTokenCount', 0)}, None
     except Exception as e:
         print(f"[LLM] gemini exception: {e}")
-        return {'price': None, 'reason': f'error: {str(e)[:120]}', 'status': 'error'}
+        return None, None, str(e)[:120]
 
 
-def _llm_grok(prompt, listing_id=''):
-    """Call xAI Grok (OpenAI-compatible) and return {price, reason, status}."""
+def _llm_grok_text(prompt, listing_id='', max_tokens=500, timeout=20):
+    """Call xAI Grok (OpenAI-compatible) and return (text, usage, error)."""
     key = ENV.get('XAI_API_KEY', '') or ENV.get('GROK_API_KEY', '')
     if not key:
-        return {'price': None, 'reason': '', 'status': 'not_configured'}
+        return None, None, 'not_configured'
     print(f"[LLM] grok start for {listing_id}")
     try:
         resp = requests.post(
@@ -5179,20 +5652,40 @@ def _llm_grok(prompt, listing_id=''):
                 'model': 'grok-3',
                 'messages': [{'role': 'user', 'content': prompt}],
                 'temperature': 0.3,
+                'max_tokens': max_tokens,
             },
-            timeout=20,
+            timeout=timeout,
         )
         if resp.status_code != 200:
             msg = f"http_{resp.status_code}: {resp.text[:120]}"
             print(f"[LLM] grok error: {msg}")
-            return {'price': None, 'reason': f'error: {msg}', 'status': 'error'}
-        text = resp.json()['choices'][0]['message']['content']
-        parsed = _parse_llm_json(text)
-        print(f"[LLM] grok done: ${parsed.get('price')}")
-        return parsed
+            return None, None, msg
+        body = resp.json()
+        u = body.get('usage') or {}
+        return body['choices'][0]['message']['content'], {'in': u.get('prompt_tokens', 0), 'out': u.get('completion_tokens', 0)}, None
     except Exception as e:
         print(f"[LLM] grok exception: {e}")
-        return {'price': None, 'reason': f'error: {str(e)[:120]}', 'status': 'error'}
+        return None, None, str(e)[:120]
+
+
+def _llm_claude(prompt, listing_id=''):
+    """Call Claude (Anthropic) and return {price, reason, status}."""
+    return _llm_result('claude', *_llm_claude_text(prompt, listing_id))
+
+
+def _llm_openai(prompt, listing_id=''):
+    """Call OpenAI GPT-4o and return {price, reason, status}."""
+    return _llm_result('gpt', *_llm_openai_text(prompt, listing_id))
+
+
+def _llm_gemini(prompt, listing_id=''):
+    """Call Gemini 2.5 Flash and return {price, reason, status}."""
+    return _llm_result('gemini', *_llm_gemini_text(prompt, listing_id))
+
+
+def _llm_grok(prompt, listing_id=''):
+    """Call xAI Grok (OpenAI-compatible) and return {price, reason, status}."""
+    return _llm_result('grok', *_llm_grok_text(prompt, listing_id))
 
 
 def _detect_artist(title):
@@ -5219,33 +5712,8 @@ def _detect_artist(title):
     return 'Other'
 
 
-@app.route('/api/inventory/llm-price-review/<listing_id>')
-def llm_price_review(listing_id):
-    """4-LLM consensus price review for a single eBay listing.
-
-    Queries Claude, GPT-4o, Gemini 2.0 Flash, and Grok 2 in parallel.
-    Each returns an integer price + 1-2 sentence reasoning.
-    Consensus = median of valid prices. Cached per (listing_id, comp_median/10).
-    Pass ?force=1 to bypass cache.
-    """
-    force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
-
-    # 1. Find listing
-    try:
-        listings = ebay.get_all_listings()
-    except Exception as e:
-        return jsonify({'error': f'failed to load listings: {e}'}), 500
-
-    listing = next((l for l in listings if str(l.get('id')) == str(listing_id)), None)
-    if not listing:
-        return jsonify({'error': f'listing {listing_id} not found'}), 404
-
-    title = listing.get('title', '')
-    your_price = listing.get('price', 0) or 0
-    artist = _detect_artist(title)
-    listing['_artist'] = artist
-
-    # 2. Comp anchors
+def _review_comp_stats(title, artist):
+    """Comp anchors for a price review, with p25 filled in from the raw pool."""
     try:
         comp_stats = calculate_comp_anchors(title, artist)
     except Exception as e:
@@ -5266,76 +5734,60 @@ def llm_price_review(listing_id):
                 comp_stats['p25'] = None
         except Exception:
             comp_stats['p25'] = None
+    return comp_stats
 
-    comp_median = (comp_stats or {}).get('median', 0) or 0
-    cache_bucket = int(round(comp_median / 10)) * 10
-    cache_key = f"{listing_id}:{cache_bucket}"
-
-    # 3. Cache hit?
-    cache = _load_llm_cache()
-    if not force and cache_key in cache:
-        cached = cache[cache_key]
-        print(f"[LLM] cache hit for {cache_key}")
-        return jsonify(cached)
-
-    # 4. Recent comps (top 5)
-    try:
-        recent_comps = lookup_historical_prices(title, artist, limit=5)
-    except Exception as e:
-        print(f"[LLM] recent_comps error: {e}")
-        recent_comps = []
 
-    # 5. Current competition — search eBay Browse API for active listings matching this title
-    active_comps = []
+def _review_active_comps(title, your_price):
+    """Current competition — active eBay listings matching this title."""
     try:
         # Price filter: within 0.3x-3x of your price (or $10-$5000 if no price)
         max_p = int((your_price * 3) if your_price else 5000)
         min_p = int((your_price * 0.3) if your_price else 10)
         raw_active = search_ebay(title, max_price=max_p, min_price=min_p, limit=15)
-        active_comps = [
+        return [
             {'title': c.get('title', ''), 'price': c.get('price', 0), 'url': c.get('url', '')}
             for c in raw_active if c.get('price', 0) > 0
         ]
     except Exception as e:
         print(f"[LLM] search_ebay error: {e}")
-        active_comps = []
-    supply_count = len(active_comps)
+        return []
 
-    # 6. Build prompt + fan out to 4 LLMs in parallel
-    prompt = _build_llm_prompt(listing, comp_stats, recent_comps, active_comps)
 
-    model_callers = {
-        'claude': _llm_claude,
-        'gpt': _llm_openai,
-        'gemini': _llm_gemini,
-        'grok': _llm_grok,
+def _active_competition_summary(active_comps):
+    """Active competition summary for the UI (None when nothing is listed)."""
+    ap = sorted([c['price'] for c in active_comps if c.get('price', 0) > 0])
+    if not ap:
+        return None
+    return {
+        'count': len(ap),
+        'min': round(ap[0], 2),
+        'max': round(ap[-1], 2),
+        'median': round(ap[len(ap) // 2], 2),
+        'top5': active_comps[:5],
     }
-    models_out = {
-        name: {'low': None, 'high': None, 'recommended': None, 'price': None, 'reason': '', 'status': 'error'}
-        for name in model_callers
+
+
+_LLM_MODEL_CALLERS = {
+    'claude': _llm_claude,
+    'gpt': _llm_openai,
+    'gemini': _llm_gemini,
+    'grok': _llm_grok,
+}
+
+
+def _llm_model_error(reason):
+    return {
+        'low': None,
+        'high': None,
+        'recommended': None,
+        'price': None,
+        'reason': reason,
+        'status': 'error',
     }
 
-    with ThreadPoolExecutor(max_workers=4) as ex:
-        future_to_name = {
-            ex.submit(fn, prompt, listing_id): name
-            for name, fn in model_callers.items()
-        }
-        for fut in as_completed(future_to_name, timeout=25):
-            name = future_to_name[fut]
-            try:
-                models_out[name] = fut.result(timeout=1)
-            except Exception as e:
-                print(f"[LLM] {name} future error: {e}")
-                models_out[name] = {
-                    'low': None,
-                    'high': None,
-                    'recommended': None,
-                    'price': None,
-                    'reason': f'error: {str(e)[:120]}',
-                    'status': 'error',
-                }
 
-    # 7. Consensus — median of each column (low, recommended, high) across valid models
+def _review_consensus(listing_id, comp_stats, models_out, active_summary):
+    """Median consensus + 0-100 confidence score with its reasoning chain."""
     def _median(vals):
         vs = sorted([v for v in vals if isinstance(v, int) and v > 0])
         if not vs:
@@ -5354,20 +5806,6 @@ def llm_price_review(listing_id):
     # Back-compat scalar for any older caller
     consensus_median = consensus['recommended']
 
-    # Active competition summary for the UI
-    active_summary = None
-    if active_comps:
-        ap = sorted([c['price'] for c in active_comps if c.get('price', 0) > 0])
-        if ap:
-            active_summary = {
-                'count': len(ap),
-                'min': round(ap[0], 2),
-                'max': round(ap[-1], 2),
-                'median': round(ap[len(ap) // 2], 2),
-                'top5': active_comps[:5],
-            }
-
-    # 7b. Confidence score (0-100) with reasoning chain
     import statistics as _stats_mod
     comp_count_val = (comp_stats or {}).get('count') or 0
 
@@ -5415,14 +5853,172 @@ def llm_price_review(listing_id):
     else:
         confidence_level = 'LOW'
 
-    reasoning_chain = [
-        f"Comp density: {comp_count_val} comps -> +{int(round(density_pts))} pts",
-        f"LLM agreement: sigma=${stdev_val:.0f} across {len(valid_recs)} models -> +{int(round(llm_pts))} pts",
-        f"12mo trend: {trend_note} -> +{int(round(recency_pts))} pts",
-        f"Live competition: {'yes (' + str(active_summary['count']) + ' active)' if active_summary else 'none'} -> +{int(round(live_pts))} pts",
-    ]
-    print(f"[LLM] confidence for {listing_id}: {confidence_score} ({confidence_level})")
+    reasoning_chain = [
+        f"Comp density: {comp_count_val} comps -> +{int(round(density_pts))} pts",
+        f"LLM agreement: sigma=${stdev_val:.0f} across {len(valid_recs)} models -> +{int(round(llm_pts))} pts",
+        f"12mo trend: {trend_note} -> +{int(round(recency_pts))} pts",
+        f"Live competition: {'yes (' + str(active_summary['count']) + ' active)' if active_summary else 'none'} -> +{int(round(live_pts))} pts",
+    ]
+    print(f"[LLM] confidence for {listing_id}: {confidence_score} ({confidence_level})")
+
+    return {
+        'consensus': consensus,
+        'consensus_median': consensus_median,  # back-compat
+        'consensus_count': len(ok_models),
+        'confidence_score': confidence_score,
+        'confidence_level': confidence_level,
+        'reasoning_chain': reasoning_chain,
+    }
+
+
+LLM_REVIEW_INPUTS_FILE = os.path.join(DATA_DIR, 'llm_review_inputs.json')
+LLM_REVIEW_INPUTS_TTL_HOURS = 24
+_LLM_REVIEW_INPUTS = None  # listing_id -> precomputed prompt inputs
+
+
+def _load_review_inputs():
+    """Lazy-load precomputed price-review prompt inputs from disk."""
+    global _LLM_REVIEW_INPUTS
+    if _LLM_REVIEW_INPUTS is not None:
+        return _LLM_REVIEW_INPUTS
+    try:
+        _LLM_REVIEW_INPUTS = persist.read_json(LLM_REVIEW_INPUTS_FILE) or {}
+    except Exception as e:
+        print(f"[LLM] review inputs load error: {e}")
+        _LLM_REVIEW_INPUTS = {}
+    return _LLM_REVIEW_INPUTS
+
+
+def _save_review_inputs(inputs):
+    try:
+        persist.write_json(LLM_REVIEW_INPUTS_FILE, inputs)
+    except Exception as e:
+        print(f"[LLM] review inputs save error: {e}")
+
+
+def _get_review_inputs(listing_id, title):
+    """Precomputed inputs for a listing, or None if missing, stale or retitled."""
+    entry = _load_review_inputs().get(str(listing_id))
+    if not entry or entry.get('title') != title:
+        return None
+    try:
+        age = (datetime.utcnow() - datetime.fromisoformat(entry['computed_at'])).total_seconds()
+    except Exception:
+        return None
+    if age > LLM_REVIEW_INPUTS_TTL_HOURS * 3600:
+        return None
+    return entry
+
+
+def _compute_review_inputs(listing):
+    """Everything _build_llm_prompt needs that doesn't involve an LLM call."""
+    title = listing.get('title', '')
+    artist = _detect_artist(title)
+    comp_stats = _review_comp_stats(title, artist)
+    try:
+        recent_comps = lookup_historical_prices(title, artist, limit=5)
+    except Exception as e:
+        print(f"[LLM] recent_comps error: {e}")
+        recent_comps = []
+    return {
+        'title': title,
+        'comp_stats': comp_stats,
+        'recent_comps': recent_comps,
+        'active_comps': _review_active_comps(title, listing.get('price', 0) or 0),
+        'computed_at': datetime.utcnow().isoformat(),
+    }
+
+
+def _iter_llm_price_review(listing_id, force=False):
+    """Run the 4-LLM price review as a sequence of (event, payload) stages.
+
+    Stages are yielded as soon as each one finishes, in this order:
+      comp_stats          — comp anchors (calculate_comp_anchors + p25)
+      active_competition  — live eBay summary once search_ebay returns
+      model               — one per LLM, in completion order
+      consensus           — the full review response (also what gets cached)
+    A cache hit skips straight to 'consensus' with cached=True. Failures to
+    find the listing yield a single 'error' event carrying an HTTP status.
+    Prompt inputs precomputed by the warm-cache task are reused unless force.
+    """
+    # 1. Find listing
+    try:
+        listings = ebay.get_all_listings()
+    except Exception as e:
+        yield 'error', {'error': f'failed to load listings: {e}', 'status': 500}
+        return
+
+    listing = next((l for l in listings if str(l.get('id')) == str(listing_id)), None)
+    if not listing:
+        yield 'error', {'error': f'listing {listing_id} not found', 'status': 404}
+        return
+
+    title = listing.get('title', '')
+    your_price = listing.get('price', 0) or 0
+    artist = _detect_artist(title)
+    listing['_artist'] = artist
+
+    # 2. Comp anchors (precomputed overnight by warm_llm_price_cache when fresh)
+    inputs = None if force else _get_review_inputs(listing_id, title)
+    comp_stats = inputs['comp_stats'] if inputs else _review_comp_stats(title, artist)
+
+    comp_median = (comp_stats or {}).get('median', 0) or 0
+    cache_bucket = int(round(comp_median / 10)) * 10
+    cache_key = f"{listing_id}:{cache_bucket}"
+
+    # 3. Cache hit?
+    cache = _load_llm_cache()
+    if not force and cache_key in cache:
+        print(f"[LLM] cache hit for {cache_key}")
+        yield 'consensus', {**cache[cache_key], 'cached': True}
+        return
+
+    yield 'comp_stats', {
+        'listing_id': listing_id,
+        'title': title,
+        'artist': artist,
+        'your_price': your_price,
+        'comp_stats': comp_stats,
+    }
+
+    # 4. Recent comps (top 5)
+    if inputs:
+        recent_comps = inputs['recent_comps']
+    else:
+        try:
+            recent_comps = lookup_historical_prices(title, artist, limit=5)
+        except Exception as e:
+            print(f"[LLM] recent_comps error: {e}")
+            recent_comps = []
+
+    # 5. Current competition — search eBay Browse API for active listings matching this title
+    active_comps = inputs['active_comps'] if inputs else _review_active_comps(title, your_price)
+    active_summary = _active_competition_summary(active_comps)
+    yield 'active_competition', {'listing_id': listing_id, 'active_competition': active_summary}
+
+    # 6. Build prompt + fan out to 4 LLMs in parallel
+    prompt = _build_llm_prompt(listing, comp_stats, recent_comps, active_comps)
+
+    models_out = {name: _llm_model_error('') for name in _LLM_MODEL_CALLERS}
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        future_to_name = {
+            ex.submit(fn, prompt, listing_id): name
+            for name, fn in _LLM_MODEL_CALLERS.items()
+        }
+        try:
+            for fut in as_completed(future_to_name, timeout=25):
+                name = future_to_name[fut]
+                try:
+                    models_out[name] = fut.result(timeout=1)
+                except Exception as e:
+                    print(f"[LLM] {name} future error: {e}")
+                    models_out[name] = _llm_model_error(f'error: {str(e)[:120]}')
+                yield 'model', {'listing_id': listing_id, 'model': name, 'result': models_out[name]}
+        except Exception as e:
+            print(f"[LLM] fan-out timeout for {listing_id}: {e}")
 
+    # 7. Consensus + confidence score
     response = {
         'listing_id': listing_id,
         'title': title,
@@ -5431,24 +6027,403 @@ def llm_price_review(listing_id):
         'comp_stats': comp_stats,
         'active_competition': active_summary,
         'models': models_out,
-        'consensus': consensus,
-        'consensus_median': consensus_median,  # back-compat
-        'consensus_count': len(ok_models),
-        'confidence_score': confidence_score,
-        'confidence_level': confidence_level,
-        'reasoning_chain': reasoning_chain,
+        **_review_consensus(listing_id, comp_stats, models_out, active_summary),
         'cached_at': None,
     }
 
     # 8. Save to cache with ISO timestamp for future reads
     try:
-        cache[cache_key] = dict(response)
-        cache[cache_key]['cached_at'] = datetime.utcnow().isoformat()
-        _save_llm_cache(cache)
+        _llm_cache_put({cache_key: {**response, 'cached_at': datetime.utcnow().isoformat()}})
     except Exception as e:
         print(f"[LLM] cache write error: {e}")
 
-    return jsonify(response)
+    yield 'consensus', response
+
+
+@app.route('/api/inventory/llm-price-review/<listing_id>')
+def llm_price_review(listing_id):
+    """4-LLM consensus price review for a single eBay listing.
+
+    Queries Claude, GPT-4o, Gemini 2.0 Flash, and Grok 2 in parallel.
+    Each returns an integer price + 1-2 sentence reasoning.
+    Consensus = median of valid prices. Cached per (listing_id, comp_median/10).
+    Pass ?force=1 to bypass cache.
+    """
+    force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
+
+    for event, payload in _iter_llm_price_review(listing_id, force=force):
+        if event == 'error':
+            return jsonify({'error': payload['error']}), payload['status']
+        if event == 'consensus':
+            payload.pop('cached', None)
+            return jsonify(payload)
+    return jsonify({'error': 'price review produced no result'}), 500
+
+
+def _sse_event(event, payload):
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+@app.route('/api/inventory/llm-price-review/<listing_id>/stream')
+def llm_price_review_stream(listing_id):
+    """Server-Sent Events variant of the 4-LLM price review.
+
+    Pushes comp_stats, active_competition, one model event per LLM as it
+    finishes, then consensus (same body as the JSON endpoint). Failures are
+    sent as 'review_error' (a plain 'error' would be taken for EventSource's
+    own connection-error event). Ends with a 'done' event. Pass ?force=1 to
+    bypass cache.
+    """
+    force = request.args.get('force', '').lower() in ('1', 'true', 'yes')
+
+    def generate():
+        try:
+            for event, payload in _iter_llm_price_review(listing_id, force=force):
+                yield _sse_event('review_error' if event == 'error' else event, payload)
+        except Exception as e:
+            print(f"[LLM] stream error for {listing_id}: {e}")
+            yield _sse_event('review_error', {'error': str(e)[:200], 'status': 500})
+        yield _sse_event('done', {'listing_id': listing_id})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+_llm_warm_running = False
+
+
+def warm_llm_price_cache(max_reviews=25, max_seconds=900, include_unreviewed=False):
+    """Precompute prompt inputs for every listing and refresh stale consensus entries.
+
+    Consensus is re-run only for listings whose comp-median bucket moved since
+    their last review (or, with include_unreviewed, that were never reviewed),
+    capped at max_reviews LLM fan-outs and max_seconds of wall time. Entries for
+    the old bucket are dropped once the new one is cached.
+    """
+    global _llm_warm_running
+    import time
+    if _llm_warm_running:
+        return {'status': 'already_running'}
+    _llm_warm_running = True
+    started = time.time()
+    stats = {'listings': 0, 'inputs_computed': 0, 'reviewed': 0, 'already_cached': 0,
+             'skipped_unreviewed': 0, 'budget_exhausted': False}
+    try:
+        listings = ebay.get_all_listings()
+        stats['listings'] = len(listings)
+        inputs_store = _load_review_inputs()
+        cache = _load_llm_cache()
+        reviewed_ids = {k.rsplit(':', 1)[0] for k in cache}
+
+        for listing in listings:
+            if time.time() - started > max_seconds:
+                stats['budget_exhausted'] = True
+                break
+            listing_id = str(listing.get('id'))
+            try:
+                inputs = _compute_review_inputs(listing)
+            except Exception as e:
+                print(f"[LLM warm] inputs error for {listing_id}: {e}")
+                continue
+            inputs_store[listing_id] = inputs
+            stats['inputs_computed'] += 1
+
+            comp_median = (inputs['comp_stats'] or {}).get('median', 0) or 0
+            cache_key = f"{listing_id}:{int(round(comp_median / 10)) * 10}"
+            if cache_key in cache:
+                stats['already_cached'] += 1
+                continue
+            if listing_id not in reviewed_ids and not include_unreviewed:
+                stats['skipped_unreviewed'] += 1
+                continue
+            if stats['reviewed'] >= max_reviews:
+                stats['budget_exhausted'] = True
+                continue
+
+            for event, _payload in _iter_llm_price_review(listing_id):
+                if event in ('consensus', 'error'):
+                    break
+            stale = [k for k in cache if k.rsplit(':', 1)[0] == listing_id and k != cache_key]
+            if stale:
+                _llm_cache_delete(stale)
+            stats['reviewed'] += 1
+
+        _save_review_inputs(inputs_store)
+    finally:
+        _llm_warm_running = False
+    stats['elapsed_s'] = round(time.time() - started, 1)
+    print(f"[LLM warm] {stats}")
+    return stats
+
+
+@app.route('/api/inventory/llm-warm', methods=['POST'])
+def llm_warm_cache():
+    """Run the LLM price-review warm-up now. Body overrides the scheduler budget."""
+    body = request.get_json(silent=True) or {}
+    task = load_scheduler_config().get('tasks', {}).get('llm_warm', {})
+    stats = warm_llm_price_cache(
+        max_reviews=int(body.get('max_reviews', task.get('max_reviews', 25))),
+        max_seconds=int(body.get('max_seconds', task.get('max_seconds', 900))),
+        include_unreviewed=bool(body.get('include_unreviewed', task.get('include_unreviewed', False))),
+    )
+    return jsonify(stats)
+
+
+# -----------------------------------------------------------------------------
+# Batched consensus — N listings per prompt per model (bulk repricing)
+# -----------------------------------------------------------------------------
+
+_LLM_TEXT_CALLERS = {
+    'claude': _llm_claude_text,
+    'gpt': _llm_openai_text,
+    'gemini': _llm_gemini_text,
+    'grok': _llm_grok_text,
+}
+
+# USD per million tokens (input, output) — used only for the cost report
+LLM_TOKEN_PRICES = {
+    'claude': (3.00, 15.00),
+    'gpt': (2.50, 10.00),
+    'gemini': (0.30, 2.50),
+    'grok': (3.00, 15.00),
+}
+LLM_BATCH_SIZE = 10
+LLM_BATCH_MAX_SIZE = 25
+
+
+def _llm_cost(name, usage):
+    if not usage:
+        return 0.0
+    p_in, p_out = LLM_TOKEN_PRICES.get(name, (0.0, 0.0))
+    return (usage.get('in', 0) * p_in + usage.get('out', 0) * p_out) / 1e6
+
+
+def _build_llm_batch_prompt(entries):
+    """One prompt covering several listings; entries carry listing + prompt inputs."""
+    fragments = {}
+    blocks = []
+    for e in entries:
+        listing = e['listing']
+        artist = listing.get('_artist', 'Unknown')
+        fragments.setdefault(artist, _artist_fragment(artist))
+        blocks.append(
+            f"### Listing id={e['id']}\n"
+            + _llm_listing_context(listing, e['comp_stats'], e['recent_comps'], e['active_comps'])
+        )
+    fragment_text = '\n'.join(f"  {a}: {f}" for a, f in fragments.items())
+    return (
+        "You are pricing several eBay listings for an authenticated art reseller. "
+        "For EACH listing return a PRICE RANGE — floor (fast-sale), recommended (best balance), "
+        "and ceiling (patient-seller maximum).\n\n"
+        f"Artist-specific context:\n{fragment_text}\n\n"
+        "Consider (a) historical comp distribution, (b) recency/trend, "
+        "(c) current live competition and their pricing, and (d) the signed/edition nature of each piece.\n\n"
+        f"{_LLM_RANGE_DEFINITIONS}\n"
+        + '\n\n'.join(blocks)
+        + "\n\nRespond in STRICT JSON only, no prose, no markdown code fences, one result per listing id:\n"
+        '{"results": [{"id": "<listing id>", "low": <int>, "recommended": <int>, "high": <int>, '
+        '"reason": "<1-2 sentences, max 35 words>"}]}'
+    )
+
+
+def _parse_llm_batch_json(text, ids):
+    """Parse a batched reply into {listing_id: result}. Missing/invalid ids are omitted."""
+    if not text:
+        return {}
+    try:
+        start, end = text.index('{'), text.rindex('}')
+        results = json.loads(text[start:end + 1]).get('results') or []
+    except Exception:
+        return {}
+    wanted = {str(i) for i in ids}
+    out = {}
+    for r in results:
+        if not isinstance(r, dict):
+            continue
+        rid = str(r.get('id', ''))
+        norm = _normalize_llm_price(r)
+        if rid in wanted and norm:
+            out[rid] = norm
+    return out
+
+
+def _run_batch_for_model(name, entries):
+    """One batched call for a model, falling back to per-listing calls for gaps.
+
+    Returns ({listing_id: result}, stats) where stats counts API calls, token
+    usage, cost and how many listings needed the per-item fallback.
+    """
+    ids = [e['id'] for e in entries]
+    stats = {'calls': 1, 'fallback_items': 0, 'usage': {'in': 0, 'out': 0}, 'cost': 0.0}
+
+    def _add_usage(usage):
+        if usage:
+            stats['usage']['in'] += usage.get('in', 0)
+            stats['usage']['out'] += usage.get('out', 0)
+            stats['cost'] += _llm_cost(name, usage)
+
+    text, usage, error = _LLM_TEXT_CALLERS[name](
+        _build_llm_batch_prompt(entries), f'batch[{len(ids)}]',
+        max_tokens=120 * len(ids) + 200, timeout=60,
+    )
+    if error == 'not_configured':
+        stats['calls'] = 0
+        return {i: _llm_result(name, None, None, error) for i in ids}, stats
+    _add_usage(usage)
+    results = _parse_llm_batch_json(text, ids) if not error else {}
+    for r in results.values():
+        r['batched'] = True
+
+    missing = [e for e in entries if e['id'] not in results]
+    if missing:
+        print(f"[LLM batch] {name}: {len(missing)}/{len(ids)} unparsed — per-item fallback")
+    for e in missing:
+        prompt = _build_llm_prompt(e['listing'], e['comp_stats'], e['recent_comps'], e['active_comps'])
+        ftext, fusage, ferror = _LLM_TEXT_CALLERS[name](prompt, e['id'])
+        results[e['id']] = _llm_result(name, ftext, fusage, ferror)
+        _add_usage(fusage)
+        stats['calls'] += 1
+        stats['fallback_items'] += 1
+    return results, stats
+
+
+def run_llm_consensus_batch(listing_ids=None, batch_size=LLM_BATCH_SIZE, force=False):
+    """Batched 4-model consensus over many listings.
+
+    Packs batch_size listings (with their comp stats) into one prompt per model,
+    parses per-listing JSON, falls back to per-item calls on parse failure, then
+    scores and caches each listing exactly like the single-listing review.
+    Returns per-listing results plus throughput and cost versus per-item mode.
+    """
+    import time
+    started = time.time()
+    batch_size = max(1, min(LLM_BATCH_MAX_SIZE, int(batch_size or LLM_BATCH_SIZE)))
+    listings = ebay.get_all_listings()
+    if listing_ids:
+        wanted = {str(i) for i in listing_ids}
+        listings = [l for l in listings if str(l.get('id')) in wanted]
+
+    cache = _load_llm_cache()
+    entries = []
+    skipped_cached = 0
+    for listing in listings:
+        listing_id = str(listing.get('id'))
+        title = listing.get('title', '')
+        listing['_artist'] = _detect_artist(title)
+        inputs = None if force else _get_review_inputs(listing_id, title)
+        inputs = inputs or _compute_review_inputs(listing)
+        comp_median = (inputs['comp_stats'] or {}).get('median', 0) or 0
+        cache_key = f"{listing_id}:{int(round(comp_median / 10)) * 10}"
+        if not force and cache_key in cache:
+            skipped_cached += 1
+            continue
+        entries.append({'id': listing_id, 'listing': listing, 'cache_key': cache_key, **inputs})
+
+    models_by_id = {e['id']: {} for e in entries}
+    totals = {'calls': 0, 'fallback_items': 0, 'usage': {'in': 0, 'out': 0}, 'cost': 0.0}
+    for start in range(0, len(entries), batch_size):
+        chunk = entries[start:start + batch_size]
+        with ThreadPoolExecutor(max_workers=len(_LLM_TEXT_CALLERS)) as ex:
+            futures = {ex.submit(_run_batch_for_model, name, chunk): name for name in _LLM_TEXT_CALLERS}
+            for fut in as_completed(futures):
+                name = futures[fut]
+                try:
+                    results, stats = fut.result()
+                except Exception as e:
+                    print(f"[LLM batch] {name} error: {e}")
+                    results = {e_['id']: _llm_model_error(f'error: {str(e)[:120]}') for e_ in chunk}
+                    stats = {'calls': 1, 'fallback_items': 0, 'usage': {}, 'cost': 0.0}
+                for listing_id, r in results.items():
+                    models_by_id[listing_id][name] = r
+                totals['calls'] += stats['calls']
+                totals['fallback_items'] += stats['fallback_items']
+                totals['usage']['in'] += stats['usage'].get('in', 0)
+                totals['usage']['out'] += stats['usage'].get('out', 0)
+                totals['cost'] += stats['cost']
+
+    out = []
+    fresh = {}
+    now_iso = datetime.utcnow().isoformat()
+    for e in entries:
+        listing = e['listing']
+        models_out = {name: models_by_id[e['id']].get(name) or _llm_model_error('') for name in _LLM_TEXT_CALLERS}
+        active_summary = _active_competition_summary(e['active_comps'])
+        response = {
+            'listing_id': e['id'],
+            'title': listing.get('title', ''),
+            'artist': listing['_artist'],
+            'your_price': listing.get('price', 0) or 0,
+            'comp_stats': e['comp_stats'],
+            'active_competition': active_summary,
+            'models': models_out,
+            **_review_consensus(e['id'], e['comp_stats'], models_out, active_summary),
+            'cached_at': now_iso,
+            'batched': True,
+        }
+        fresh[e['cache_key']] = response
+        out.append(response)
+    if fresh:
+        _llm_cache_put(fresh)
+
+    # Per-item baseline: 4 calls per listing, each carrying the full single prompt
+    est_in_tokens = sum(
+        len(_build_llm_prompt(e['listing'], e['comp_stats'], e['recent_comps'], e['active_comps'])) // 4
+        for e in entries
+    )
+    configured = [n for n in _LLM_TEXT_CALLERS if any(
+        (models_by_id[e['id']].get(n) or {}).get('status') != 'not_configured' for e in entries)]
+    per_item_cost = sum(
+        _llm_cost(n, {'in': est_in_tokens, 'out': 80 * len(entries)}) for n in configured
+    )
+    elapsed = time.time() - started
+    n = len(entries)
+    metrics = {
+        'listings_reviewed': n,
+        'skipped_cached': skipped_cached,
+        'batch_size': batch_size,
+        'elapsed_s': round(elapsed, 2),
+        'listings_per_minute': round(n / elapsed * 60, 1) if elapsed > 0 and n else 0,
+        'api_calls': totals['calls'],
+        'fallback_items': totals['fallback_items'],
+        'tokens': totals['usage'],
+        'cost_usd': round(totals['cost'], 4),
+        'cost_per_listing': round(totals['cost'] / n, 5) if n else 0,
+        'per_item_mode': {
+            'api_calls': n * len(configured),
+            'est_input_tokens': est_in_tokens * len(configured),
+            'est_cost_usd': round(per_item_cost, 4),
+            'est_cost_per_listing': round(per_item_cost / n, 5) if n else 0,
+        },
+    }
+    print(f"[LLM batch] {metrics}")
+    return {'results': out, 'metrics': metrics}
+
+
+@app.route('/api/inventory/llm-price-review-batch', methods=['POST'])
+def llm_price_review_batch():
+    """Batched consensus review for many listings at once.
+
+    Body: {"ids": [...] (default: all listings), "batch_size": 10, "force": false}
+    Cached listings are skipped unless force. Returns results + throughput/cost metrics.
+    """
+    body = request.get_json(silent=True) or {}
+    try:
+        batch_size = int(body.get('batch_size', LLM_BATCH_SIZE))
+    except Exception:
+        batch_size = LLM_BATCH_SIZE
+    try:
+        result = run_llm_consensus_batch(
+            listing_ids=body.get('ids') or None,
+            batch_size=batch_size,
+            force=bool(body.get('force')),
+        )
+    except Exception as e:
+        return jsonify({'error': f'batch review failed: {e}'}), 500
+    return jsonify(result)
 
 
 # =============================================================================
@@ -5551,6 +6526,8 @@ def bulk_consensus_preview():
       artist — optional substring match on artist
       force_llm (default 0) — if 1, run fresh /api/inventory/llm-price-review for
         items without a cache hit (expensive).
+      batch (default 0) — with force_llm, review uncached items N per prompt via
+        run_llm_consensus_batch instead of one review per item.
     """
     print("[bulk-preview] entry")
     try:
@@ -5563,6 +6540,10 @@ def bulk_consensus_preview():
         min_comp_count = 5
     artist_filter = (request.args.get('artist') or '').strip() or None
     force_llm = request.args.get('force_llm', '0').lower() in ('1', 'true', 'yes')
+    try:
+        batch_size = int(request.args.get('batch', 0))
+    except Exception:
+        batch_size = 0
 
     filters = {
         'min_upside_pct': min_upside_pct,
@@ -5582,6 +6563,21 @@ def bulk_consensus_preview():
             'error': str(e)[:200],
         })
 
+    batch_metrics = None
+    if force_llm and batch_size > 0:
+        uncached = []
+        cache = _load_llm_cache()
+        for it in items:
+            comp_median = float(it.get('comp_median') or 0)
+            bucket = int(round(comp_median / 10)) * 10 if comp_median else 0
+            if (it.get('comp_count') or 0) >= min_comp_count and f"{it.get('id')}:{bucket}" not in cache:
+                uncached.append(it.get('id'))
+        if uncached:
+            try:
+                batch_metrics = run_llm_consensus_batch(uncached, batch_size=batch_size)['metrics']
+            except Exception as e:
+                print(f"[bulk-preview] batch review failed: {e}")
+
     cache = _load_llm_cache()
     threshold = 1.0 + (min_upside_pct / 100.0)
     candidates = []
@@ -5672,6 +6668,7 @@ def bulk_consensus_preview():
         'total_candidates': len(candidates),
         'total_upside': total_upside,
         'filters_applied': filters,
+        'batch_metrics': batch_metrics,
     })
 
 
@@ -5833,51 +6830,55 @@ def bulk_consensus_apply():
 PRICE_HISTORY_FILE = os.path.join(DATA_DIR, 'price_history.json')
 
 
+# Per-listing compaction: once a listing is PRICE_HISTORY_TRIM_BATCH events over
+# PRICE_HISTORY_KEEP its oldest are dropped in one trim. Batching matters because a
+# trim can't be applied incrementally, so the index below rebuilds after each one.
+PRICE_HISTORY_KEEP = 50
+PRICE_HISTORY_TRIM_BATCH = 25
+
+# In-memory {listing_id: [event, ...]} view of the 'price_history' log, built on
+# first use and caught up with only the new rows after each append.
+_PRICE_HISTORY_INDEX = LogIndex(state_db, 'price_history')
+
+
 def _load_price_history():
-    """Load price_history.json. Returns {} on any error or missing file."""
-    if not os.path.exists(PRICE_HISTORY_FILE):
-        return {}
+    """All price events grouped by listing: {<listing_id>: [event, ...]}.
+    Served from the in-memory index; returns {} on any error."""
     try:
-        with open(PRICE_HISTORY_FILE, 'r') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return data
-            return {}
+        return _PRICE_HISTORY_INDEX.grouped()
     except Exception as e:
         print(f"[price-history] load error: {e}")
         return {}
 
 
-def _save_price_history(hist):
+def _price_history_for(listing_id):
+    """The newest PRICE_HISTORY_KEEP events for one listing, oldest first."""
     try:
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(PRICE_HISTORY_FILE, 'w') as f:
-            json.dump(hist, f, indent=2)
+        return list(_PRICE_HISTORY_INDEX.get(listing_id)[-PRICE_HISTORY_KEEP:])
     except Exception as e:
-        print(f"[price-history] save error: {e}")
+        print(f"[price-history] load error {listing_id}: {e}")
+        return []
 
 
 def _append_price_change(listing_id, prev_price, new_price, source):
-    """Append one price change event to price_history.json.
+    """Append one price change event to the 'price_history' log.
 
-    Schema: {<listing_id>: [{price, prev_price, at, source}, ...]}
+    Event: {price, prev_price, at, source}, keyed by listing id.
     Never raises — all errors get logged.
     """
     if not listing_id:
         return
     try:
-        hist = _load_price_history()
-        entries = hist.setdefault(str(listing_id), [])
-        if not isinstance(entries, list):
-            entries = []
-            hist[str(listing_id)] = entries
-        entries.append({
-            'price': float(new_price) if new_price is not None else None,
-            'prev_price': float(prev_price) if prev_price is not None else None,
-            'at': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'source': str(source or 'user_manual'),
-        })
-        _save_price_history(hist)
+        count = len(_PRICE_HISTORY_INDEX.get(listing_id)) + 1
+        with state_db.transaction():
+            state_db.append('price_history', {
+                'price': float(new_price) if new_price is not None else None,
+                'prev_price': float(prev_price) if prev_price is not None else None,
+                'at': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'source': str(source or 'user_manual'),
+            }, key=str(listing_id))
+            if count >= PRICE_HISTORY_KEEP + PRICE_HISTORY_TRIM_BATCH:
+                state_db.trim('price_history', PRICE_HISTORY_KEEP, key=str(listing_id))
         print(f"[price-history] logged {listing_id}: {prev_price} -> {new_price} ({source})")
     except Exception as e:
         print(f"[price-history] append error {listing_id}: {e}")
@@ -6035,10 +7036,9 @@ def comps_train_queue():
 
     try:
         sig = _item_signature(title, artist)
-        merged = _load_curation()
-        entry = merged.get(sig, {'rejected': [], 'approved': []})
-        approved_keys = set(entry.get('approved') or [])
-        rejected_keys = set(entry.get('rejected') or [])
+        entry = _curation_for(sig)
+        approved_keys = set(entry['approved'])
+        rejected_keys = set(entry['rejected'])
     except Exception as e:
         print(f"[comps-train-queue] curation load failed: {e}")
         approved_keys, rejected_keys = set(), set()
@@ -6088,10 +7088,9 @@ def comps_train_status():
 
     try:
         sig = _item_signature(title, artist)
-        merged = _load_curation()
-        entry = merged.get(sig, {'rejected': [], 'approved': []})
-        approved_keys = set(entry.get('approved') or [])
-        rejected_keys = set(entry.get('rejected') or [])
+        entry = _curation_for(sig)
+        approved_keys = set(entry['approved'])
+        rejected_keys = set(entry['rejected'])
     except Exception as e:
         print(f"[comps-train-status] curation load failed: {e}")
         approved_keys, rejected_keys = set(), set()
@@ -6241,8 +7240,7 @@ def ebay_auth_callback():
             ebay._token_expires = datetime.now() + timedelta(seconds=expires_in - 300)
 
             # Invalidate promo cache
-            global _promotions_cache
-            _promotions_cache = None
+            caches['promotions'].clear()
 
         return f"""<html><body style="background:#000;color:#fff;font-family:system-ui;padding:40px;text-align:center;">
             <h2 style="color:#30d158;">eBay Authorization Successful</h2>
@@ -6855,8 +7853,7 @@ def apply_promo_changes():
             errors.append(f'Campaign error: {str(e)}')
 
     # Invalidate cache
-    global _promotions_cache
-    _promotions_cache = None
+    caches['promotions'].clear()
 
     return jsonify({
         'success': True,
@@ -7072,8 +8069,7 @@ def create_campaign():
                     added += 1
 
         # Invalidate cache
-        global _promotions_cache
-        _promotions_cache = None
+        caches['promotions'].clear()
 
         return jsonify({
             'success': True,
@@ -7109,8 +8105,7 @@ def update_ad_rate():
         )
 
         if resp.status_code in (200, 204):
-            global _promotions_cache
-            _promotions_cache = None
+            caches['promotions'].clear()
             return jsonify({'success': True})
 
         return jsonify({'error': f'Update failed: {resp.text[:200]}'}), resp.status_code
@@ -7126,7 +8121,7 @@ def update_ad_rate():
 @app.route('/api/sold/history')
 def get_sold_history():
     """Get real sold items with revenue, velocity, DOM"""
-    sold = ebay.get_sold_items(days_back=90)
+    sold = load_sold_history(days_back=90)
 
     total_revenue = sum(s.get('price', 0) * s.get('quantity_sold', 1) for s in sold)
     avg_dom = 0
@@ -7209,23 +8204,24 @@ AUTOPRICING_FILE = os.path.join(DATA_DIR, 'autopricing_rules.json')
 
 
 def load_autopricing_rules():
-    if os.path.exists(AUTOPRICING_FILE):
-        try:
-            with open(AUTOPRICING_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(AUTOPRICING_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {'enabled': False, 'rules': [], 'log': []}
 
 
+def save_autopricing_rules(data):
+    persist.write_json(AUTOPRICING_FILE, data, indent=2)
+
+
 @app.route('/api/autopricing', methods=['GET', 'POST'])
 def manage_autopricing():
     """Get or update auto-repricing rules"""
     if request.method == 'POST':
-        data = request.get_json()
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(AUTOPRICING_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        save_autopricing_rules(request.get_json())
         return jsonify({'success': True})
 
     return jsonify(load_autopricing_rules())
@@ -7268,9 +8264,7 @@ def run_autopricing():
                     log.append(f"Boosted {listing['title'][:40]} ${price} -> ${new_price} ({rule['name']} +{boost_pct}%)")
 
     rules_data['log'] = log[-50:]
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(AUTOPRICING_FILE, 'w') as f:
-        json.dump(rules_data, f, indent=2)
+    save_autopricing_rules(rules_data)
 
     return jsonify({'applied': applied, 'log': log})
 
@@ -7327,20 +8321,24 @@ COST_BASIS_FILE = os.path.join(DATA_DIR, 'cost_basis.json')
 
 
 def load_cost_basis():
-    if os.path.exists(COST_BASIS_FILE):
-        try:
-            with open(COST_BASIS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(COST_BASIS_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {}
 
 
+def save_cost_basis(cb):
+    persist.write_json(COST_BASIS_FILE, cb, indent=2)
+
+
 @app.route('/api/pnl')
 def get_pnl():
     """Real P&L per item — revenue - costs - fees - ads - shipping"""
     listings = ebay.get_all_listings()
-    sold = ebay.get_sold_items(days_back=90)
+    sold = load_sold_history(days_back=90)
     cost_basis = load_cost_basis()
     promo_data = fetch_all_promotions()
     per_listing_promos = promo_data.get('per_listing', {})
@@ -7416,9 +8414,7 @@ def update_cost_basis():
     cb = load_cost_basis()
     cb[lid] = {'cost': cost, 'updated': datetime.now().isoformat()}
 
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(COST_BASIS_FILE, 'w') as f:
-        json.dump(cb, f, indent=2)
+    save_cost_basis(cb)
 
     return jsonify({'success': True})
 
@@ -7587,8 +8583,7 @@ def batch_set_ad_rate():
             except Exception:
                 failed += 1
 
-        global _promotions_cache
-        _promotions_cache = None
+        caches['promotions'].clear()
 
         return jsonify({'success': True, 'campaign_id': campaign_id, 'added': added, 'failed': failed})
     except Exception as e:
@@ -7619,54 +8614,82 @@ def batch_update_price():
 NOTIFICATIONS_FILE = os.path.join(DATA_DIR, 'notifications.json')
 
 
+# Notifications are rows in the 'notifications' event log (seq = global
+# monotonic id). "Mark all read" is a single high-water mark in the
+# 'notifications_state' namespace: anything with seq <= read_seq is read.
+# The view below is recomputed only when either version moves, and the sum of
+# the two versions is the poll cursor.
+NOTIFICATIONS_KEEP = 100
+_NOTIF_VIEW = None
+
+
+def _notifications_cursor():
+    return state_db.version('notifications') + state_db.version('notifications_state')
+
+
+def _notification_view():
+    """{'cursor', 'items' (newest first), 'unread', 'latest_seq'}, cached per cursor."""
+    global _NOTIF_VIEW
+    cursor = _notifications_cursor()
+    if _NOTIF_VIEW is not None and _NOTIF_VIEW['cursor'] == cursor:
+        return _NOTIF_VIEW
+    read_seq = state_db.get('notifications_state', 'read_seq', 0)
+    items = []
+    for seq, _key, n in state_db.events('notifications', newest_first=True):
+        items.append({**n, 'seq': seq, 'read': bool(n.get('read')) or seq <= read_seq})
+    unread = [n for n in items if not n['read']]
+    _NOTIF_VIEW = {
+        'cursor': cursor,
+        'items': items,
+        'unread': unread,
+        'latest_seq': items[0]['seq'] if items else 0,
+    }
+    return _NOTIF_VIEW
+
+
 def load_notifications():
-    if os.path.exists(NOTIFICATIONS_FILE):
-        try:
-            with open(NOTIFICATIONS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    """Newest-first list of notifications (each tagged with its log seq)."""
+    try:
+        return list(_notification_view()['items'])
+    except Exception as e:
+        print(f"[notifications] load error: {e}")
     return []
 
 
 def add_notification(ntype, title, message, severity='info', data=None):
     """Add a notification"""
-    notifs = load_notifications()
-    notifs.insert(0, {
-        'id': f"n-{datetime.now().strftime('%Y%m%d%H%M%S')}",
-        'type': ntype,
-        'title': title,
-        'message': message,
-        'severity': severity,
-        'data': data or {},
-        'read': False,
-        'created': datetime.now().isoformat(),
-    })
-    # Keep last 100
-    notifs = notifs[:100]
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(NOTIFICATIONS_FILE, 'w') as f:
-        json.dump(notifs, f, indent=2)
-    return notifs
+    with state_db.transaction():
+        state_db.append('notifications', {
+            'id': f"n-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            'type': ntype,
+            'title': title,
+            'message': message,
+            'severity': severity,
+            'data': data or {},
+            'read': False,
+            'created': datetime.now().isoformat(),
+        })
+        # Keep last 100
+        if state_db.count_events('notifications') > NOTIFICATIONS_KEEP:
+            state_db.trim('notifications', NOTIFICATIONS_KEEP)
+    _publish_notifications()
 
 
 @app.route('/api/notifications')
 def get_notifications():
     """Get all notifications"""
-    notifs = load_notifications()
-    unread = len([n for n in notifs if not n.get('read')])
-    return jsonify({'notifications': notifs[:50], 'unread': unread})
+    view = _notification_view()
+    return jsonify({'notifications': view['items'][:50], 'unread': len(view['unread']),
+                    'cursor': view['cursor']})
 
 
 @app.route('/api/notifications/read', methods=['POST'])
 def mark_notifications_read():
     """Mark all notifications as read"""
-    notifs = load_notifications()
-    for n in notifs:
-        n['read'] = True
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(NOTIFICATIONS_FILE, 'w') as f:
-        json.dump(notifs, f, indent=2)
+    latest = state_db.last_seq('notifications')
+    if latest > state_db.get('notifications_state', 'read_seq', 0):
+        state_db.put('notifications_state', 'read_seq', latest)
+        _publish_notifications()
     return jsonify({'success': True})
 
 
@@ -7721,7 +8744,7 @@ def generate_notifications():
 @app.route('/api/reports/vs-market')
 def report_vs_market():
     """Compare your sales performance against market category comps"""
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     listings = ebay.get_all_listings()
     index = load_market_index()
     promo_data = fetch_all_promotions()
@@ -7944,15 +8967,158 @@ td {{ padding: 8px; border-bottom: 1px solid rgba(255,255,255,0.04); }}
     return html, 200, {'Content-Type': 'text/html'}
 
 
+# =============================================================================
+# Materialized dashboard views
+# =============================================================================
+# The heavy dashboard routes are materialized: the scheduler's materialize stage
+# rebuilds each view every MATERIALIZE_INTERVAL_S and whenever the 'views' inputs
+# (deps.derived('views', ...)) change, storing {data, computed_at, inputs} in
+# state_db ns 'views'. `inputs` is deps.fingerprint('views'), built from content
+# hashes, so every worker computes the same value for the same data and a
+# refresh that fetched identical listings doesn't count as a change. The eBay
+# inputs are loaded before fingerprinting, so a worker whose caches are still
+# cold fingerprints what the build will read rather than None. Requests serve
+# the stored document with its computed_at stamp. Without the stage enabled, a
+# request rebuilds inline only when the inputs changed; ?fresh=1 always rebuilds.
+
+MATERIALIZE_INTERVAL_S = int(os.environ.get('MATERIALIZE_INTERVAL_S', '600'))
+MATERIALIZE_MAX_AGE_S = 3 * MATERIALIZE_INTERVAL_S
+MATERIALIZED_VIEWS = {}  # name -> (path, builder)
+
+
+def _materialize_stage_enabled():
+    config = load_scheduler_config()
+    return bool(config.get('enabled') and config.get('tasks', {}).get('materialize', {}).get('enabled', True))
+
+
+def _view_inputs():
+    """deps.fingerprint('views') after loading the eBay caches it covers."""
+    for touch in (ebay.get_all_listings, sync_sold_history, fetch_all_promotions):
+        try:
+            touch()
+        except Exception as e:
+            print(f"[materialize] {touch.__name__} raised: {e}")
+    return deps.fingerprint('views')
+
+
+def _view_snapshot(name):
+    """Stored document for a view, read through the 'views' region."""
+    return caches['views'].get_or_load(name, lambda: state_db.get('views', name),
+                                       version=state_db.version('views'))
+
+
+def _view_age(doc):
+    return (datetime.now() - datetime.fromisoformat(doc['computed_at'])).total_seconds()
+
+
+def materialize_view(name, inputs=None):
+    """Build one view through its route function and store it; None if the
+    build did not produce a JSON object (errors are served live instead)."""
+    import time
+    path, builder = MATERIALIZED_VIEWS[name]
+    if inputs is None:
+        inputs = _view_inputs()
+    started = time.perf_counter()
+    with app.test_request_context(path):
+        rv = builder()
+    resp = app.make_response(rv)
+    data = resp.get_json(silent=True) if resp.status_code == 200 else None
+    if not isinstance(data, dict):
+        return None
+    doc = {
+        'data': data,
+        'computed_at': datetime.now().isoformat(),
+        'inputs': inputs,
+        'build_ms': round((time.perf_counter() - started) * 1000, 1),
+    }
+    state_db.put('views', name, doc)
+    return doc
+
+
+def materialize_views(force=False):
+    """Scheduler stage: rebuild views that are older than the interval or
+    whose inputs changed. One process at a time; returns names rebuilt."""
+    rebuilt = []
+    with state_db.lock('materialize', timeout=0) as held:
+        if not held:
+            return rebuilt
+        inputs = _view_inputs()
+        for name in MATERIALIZED_VIEWS:
+            doc = state_db.get('views', name)
+            stale = (force or not doc or doc.get('inputs') != inputs
+                     or _view_age(doc) >= MATERIALIZE_INTERVAL_S)
+            if not stale:
+                continue
+            try:
+                if materialize_view(name, inputs):
+                    rebuilt.append(name)
+            except Exception as e:
+                print(f"[materialize] {name} failed: {e}")
+    return rebuilt
+
+
+def materialized(name, path):
+    """Route decorator: serve the stored view for `name` in O(1)."""
+    def wrap(builder):
+        MATERIALIZED_VIEWS[name] = (path, builder)
+
+        @functools.wraps(builder)
+        def route():
+            fresh = request.args.get('fresh', '').lower() in ('1', 'true')
+            doc = None if fresh else _view_snapshot(name)
+            inputs = None
+            if doc:
+                if _materialize_stage_enabled():
+                    usable = _view_age(doc) < MATERIALIZE_MAX_AGE_S
+                else:
+                    inputs = _view_inputs()
+                    usable = doc.get('inputs') == inputs
+                if not usable:
+                    doc = None
+            if not doc:
+                doc = materialize_view(name, inputs)
+            if not doc:
+                return builder()
+            etag = version_tag(name, doc['computed_at'])
+            not_modified = http_cache.check(etag)
+            if not_modified is not None:
+                return not_modified
+            response = jsonify({**doc['data'], 'computed_at': doc['computed_at']})
+            response.set_etag(etag, weak=True)
+            response.last_modified = datetime.fromisoformat(doc['computed_at']).astimezone()
+            return response
+        return route
+    return wrap
+
+
+@app.route('/api/views/status')
+def views_status():
+    """computed_at, build time and input match for each materialized view"""
+    inputs = deps.fingerprint('views')
+    out = {}
+    for name, (path, _builder) in MATERIALIZED_VIEWS.items():
+        doc = state_db.get('views', name) or {}
+        out[name] = {
+            'path': path,
+            'computed_at': doc.get('computed_at'),
+            'age_s': round(_view_age(doc)) if doc else None,
+            'build_ms': doc.get('build_ms'),
+            'inputs_current': doc.get('inputs') == inputs if doc else None,
+        }
+    return jsonify({'views': out, 'interval_s': MATERIALIZE_INTERVAL_S,
+                    'stage_enabled': _materialize_stage_enabled()})
+
+
 # =============================================================================
 # Feature: Executive Dashboard, Forecast, Quick Wins, Competitor Map
 # =============================================================================
 
 @app.route('/api/executive')
+@materialized('executive', '/api/executive')
 def get_executive_dashboard():
     """One-screen executive summary with health score, forecast, quick wins"""
     listings = ebay.get_all_listings()
-    sold = [s for s in ebay.get_sold_items(days_back=60) if s['price'] >= 25]
+    sold = [s for s in load_sold_history(days_back=60) if s['price'] >= 25]
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
     enriched = load_personal_inventory()
@@ -8237,7 +9403,7 @@ def ai_strategy_recommendations():
     """AI-powered strategic recommendations from all inventory, sales, scoring, and capital data"""
     # Gather all data
     listings = ebay.get_all_listings()
-    sold = [s for s in ebay.get_sold_items(days_back=60) if s['price'] >= 25]
+    sold = [s for s in load_sold_history(days_back=60) if s['price'] >= 25]
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
 
@@ -8459,7 +9625,7 @@ def drill_down(drill_type):
     elif drill_type == 'sold_history':
         """Full sold history with details"""
         cat = request.args.get('category', '')
-        sold = ebay.get_sold_items(days_back=60)
+        sold = load_sold_history(days_back=60)
         items = []
         for s in sold:
             if s['price'] < 25: continue
@@ -8610,9 +9776,10 @@ def drill_down(drill_type):
 # =============================================================================
 
 @app.route('/api/analytics/deep')
+@materialized('analytics_deep', '/api/analytics/deep')
 def get_deep_analytics():
     """All 12 deep analytics in one call"""
-    sold = [s for s in ebay.get_sold_items(days_back=60) if s['price'] >= 25]
+    sold = [s for s in load_sold_history(days_back=60) if s['price'] >= 25]
     listings = ebay.get_all_listings()
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
@@ -8974,19 +10141,17 @@ COMP_REJECTIONS_FILE = os.path.join(DATA_DIR, 'comp_rejections.json')
 
 
 def load_comp_rejections():
-    if os.path.exists(COMP_REJECTIONS_FILE):
-        try:
-            with open(COMP_REJECTIONS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(COMP_REJECTIONS_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {'rejected_titles': [], 'rejected_patterns': [], 'learned_rules': [], 'stats': {'total_rejected': 0, 'total_learned': 0}}
 
 
 def save_comp_rejections(data):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(COMP_REJECTIONS_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    persist.write_json(COMP_REJECTIONS_FILE, data, indent=2)
 
 
 def learn_from_rejections(rejections_data):
@@ -9342,12 +10507,12 @@ AUTOMATION_FILE = os.path.join(DATA_DIR, 'automation_config.json')
 
 
 def load_automation_config():
-    if os.path.exists(AUTOMATION_FILE):
-        try:
-            with open(AUTOMATION_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(AUTOMATION_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {
         'enabled': False,
         'auto_event_boost': True,       # 1. Auto-boost when event <7 days
@@ -9362,14 +10527,15 @@ def load_automation_config():
     }
 
 
+def save_automation_config(config):
+    persist.write_json(AUTOMATION_FILE, config, indent=2)
+
+
 @app.route('/api/automation', methods=['GET', 'POST'])
 def manage_automation():
     """Get or update automation config"""
     if request.method == 'POST':
-        data = request.get_json()
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(AUTOMATION_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        save_automation_config(request.get_json())
         return jsonify({'success': True})
     return jsonify(load_automation_config())
 
@@ -9454,9 +10620,7 @@ def run_automation():
 
     # Save log
     config['log'] = [{'time': now.isoformat(), 'actions': len(actions)}] + config.get('log', [])[:20]
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(AUTOMATION_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    save_automation_config(config)
 
     return jsonify({
         'actions': actions,
@@ -9555,7 +10719,7 @@ def get_watchers_analysis():
 @app.route('/api/analytics/seasonality')
 def get_seasonality_analysis():
     """Analyze seasonal patterns from historical sales and calendar events"""
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     rules = load_pricing_rules()
     now = datetime.now()
 
@@ -9648,7 +10812,7 @@ def get_seasonality_analysis():
 def get_pricing_rationale():
     """Generate qualitative pricing rationale per item with AI"""
     listings = ebay.get_all_listings()
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     enriched = load_personal_inventory()
     promo_data = fetch_all_promotions()
     per_listing = promo_data.get('per_listing', {})
@@ -9822,7 +10986,7 @@ def get_pricing_rationale():
 def sell_this_week():
     """Pick 7 items most likely to sell this week with AI-optimized titles"""
     listings = ebay.get_all_listings()
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
     enriched = load_personal_inventory()
@@ -10370,7 +11534,7 @@ def report_active_listings():
 @app.route('/api/reports/sales-analysis')
 def report_sales_analysis():
     """Historical sales with full expense breakdown and HTML summary"""
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     promo_data = fetch_all_promotions()
     per_listing = promo_data.get('per_listing', {})
     cost_basis = load_cost_basis()
@@ -10769,15 +11933,19 @@ COMP_MAP_FILE = os.path.join(DATA_DIR, 'comp_mappings.json')
 
 
 def load_comp_mappings():
-    if os.path.exists(COMP_MAP_FILE):
-        try:
-            with open(COMP_MAP_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(COMP_MAP_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {}
 
 
+def save_comp_mappings(mappings):
+    persist.write_json(COMP_MAP_FILE, mappings, indent=2)
+
+
 @app.route('/api/comp-map', methods=['GET', 'POST'])
 def manage_comp_map():
     """Get or set manual comp title mappings for top items"""
@@ -10790,9 +11958,7 @@ def manage_comp_map():
             'min_price': data.get('min_price', 0),
             'updated': datetime.now().isoformat(),
         }
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(COMP_MAP_FILE, 'w') as f:
-            json.dump(mappings, f, indent=2)
+        save_comp_mappings(mappings)
         return jsonify({'success': True})
 
     return jsonify(load_comp_mappings())
@@ -10802,33 +11968,42 @@ def manage_comp_map():
 # Fix 3: Aggressive Caching Layer
 # =============================================================================
 
-_cache = {}
-_cache_times = {}
-CACHE_TTL = 300  # 5 minutes
+CACHE_TTL = caches['api'].ttl  # 5 minutes
 
 
 def cached_get(key, fetch_fn, ttl=CACHE_TTL):
     """Cache any API call result for TTL seconds"""
-    now = datetime.now()
-    if key in _cache and key in _cache_times:
-        age = (now - _cache_times[key]).total_seconds()
-        if age < ttl:
-            return _cache[key]
-    result = fetch_fn()
-    _cache[key] = result
-    _cache_times[key] = now
-    return result
+    return caches['api'].get_or_load(key, fetch_fn, ttl=ttl)
+
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Per-region hit/miss/eviction counters and current size, plus the
+    dependency graph of the derived caches with each node's current version"""
+    return jsonify({'regions': caches.stats(), 'dependencies': deps.describe(),
+                    'warm_snapshot': warm.status()})
 
 
 @app.route('/api/cache/clear', methods=['POST'])
 def clear_cache():
-    """Clear all caches"""
-    global _cache, _cache_times, _promotions_cache, _live_deals_cache
-    _cache = {}
-    _cache_times = {}
-    _promotions_cache = None
-    _live_deals_cache = None
-    return jsonify({'success': True})
+    """Clear caches: ?region=a,b and/or ?tag=ebay (also accepted in the JSON
+    body as 'regions' / 'tags'); with neither, every region is cleared."""
+    body = request.get_json(silent=True) or {}
+    regions = body.get('regions') or [r for r in request.args.get('region', '').split(',') if r]
+    tags = body.get('tags') or [t for t in request.args.get('tag', '').split(',') if t]
+    unknown = [r for r in regions if r not in caches]
+    if unknown:
+        return jsonify({'success': False, 'error': f"unknown region(s): {', '.join(unknown)}",
+                        'regions': caches.names()}), 400
+    cleared = {}
+    if regions:
+        cleared.update(caches.clear(regions))
+    for tag in tags:
+        for name, n in caches.invalidate_tag(tag).items():
+            cleared[name] = cleared.get(name, 0) + n
+    if not regions and not tags:
+        cleared = caches.clear()
+    return jsonify({'success': True, 'cleared': cleared})
 
 
 # =============================================================================
@@ -10859,9 +12034,7 @@ def bulk_cost_basis():
                 cb[l['id']] = {'cost': cost, 'updated': datetime.now().isoformat()}
                 count += 1
 
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(COST_BASIS_FILE, 'w') as f:
-            json.dump(cb, f, indent=2)
+        save_cost_basis(cb)
         return jsonify({'success': True, 'updated': count})
 
     elif data.get('items'):
@@ -10869,9 +12042,7 @@ def bulk_cost_basis():
         for item in data['items']:
             cb[item['listing_id']] = {'cost': float(item['cost']), 'updated': datetime.now().isoformat()}
 
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(COST_BASIS_FILE, 'w') as f:
-            json.dump(cb, f, indent=2)
+        save_cost_basis(cb)
         return jsonify({'success': True, 'updated': len(data['items'])})
 
     return jsonify({'error': 'Missing category_cost or items'}), 400
@@ -10881,48 +12052,118 @@ def bulk_cost_basis():
 # Fix 6: Natural Language Query on Historical Data
 # =============================================================================
 
-@app.route('/api/query', methods=['POST'])
-def natural_query():
-    """Ask a question about historical data — LLM translates to data query"""
-    data = request.get_json()
-    question = data.get('question', '')
-    if not question:
-        return jsonify({'error': 'Missing question'}), 400
+QUERY_SPEC_CACHE_FILE = os.path.join(DATA_DIR, 'query_spec_cache.json')
+_QUERY_SPEC_CACHE = None  # normalized question -> query spec
+
+
+def _load_query_spec_cache():
+    """Lazy-load the question -> query spec translation cache."""
+    global _QUERY_SPEC_CACHE
+    if _QUERY_SPEC_CACHE is not None:
+        return _QUERY_SPEC_CACHE
+    try:
+        _QUERY_SPEC_CACHE = persist.read_json(QUERY_SPEC_CACHE_FILE) or {}
+    except Exception as e:
+        print(f"[Query] spec cache load error: {e}")
+        _QUERY_SPEC_CACHE = {}
+    return _QUERY_SPEC_CACHE
+
+
+def _save_query_spec_cache(cache):
+    try:
+        persist.write_json(QUERY_SPEC_CACHE_FILE, cache)
+    except Exception as e:
+        print(f"[Query] spec cache save error: {e}")
+
+
+def _llm_question_to_spec(question, index):
+    """Ask Claude to translate a question into a query spec. None on failure."""
+    key = ENV.get('ANTHROPIC_API_KEY', '') or ENV.get('CLAUDE_API_KEY', '')
+    if not key:
+        return None
+    prompt = f"""Translate this question about historical art sales into a JSON query spec.
+
+Keys (all optional): artist, work_id, signed (bool), medium, source, title (words that must appear),
+date_from / date_to (YYYY-MM-DD), price_min / price_max (numbers),
+group_by (list, up to 2 of: year, month, medium, source, artist, work_id, signed),
+percentiles (list of ints), top (int, sample sales to return).
+
+Known artists: {', '.join(index.distinct('artist'))}
+Known mediums: {', '.join(index.distinct('medium')[:30])}
+
+Question: {question}
+
+Respond with the JSON object only."""
+    try:
+        resp = requests.post('https://api.anthropic.com/v1/messages',
+            headers={'x-api-key': key, 'anthropic-version': '2023-06-01', 'content-type': 'application/json'},
+            json={'model': 'claude-3-haiku-20240307', 'max_tokens': 300, 'messages': [{'role': 'user', 'content': prompt}]},
+            timeout=20)
+        if resp.status_code != 200:
+            print(f"[Query] spec translation http_{resp.status_code}")
+            return None
+        text = resp.json().get('content', [{}])[0].get('text', '')
+        m = re.search(r'\{.*\}', text, re.DOTALL)
+        return normalize_spec(json.loads(m.group(0))) if m else None
+    except Exception as e:
+        print(f"[Query] spec translation error: {e}")
+        return None
 
-    # Build context from historical data
-    historical = load_historical_prices()
-    total = len(historical)
 
-    # Sample data for LLM context
-    sample = historical[:100]
-    prices = [r['price'] for r in historical if r.get('price') and r['price'] > 0]
-    signed_prices = [r['price'] for r in historical if r.get('signed') and r.get('price') and r['price'] > 0]
+def _question_to_spec(question, index):
+    """Resolve a question to a spec: cache first, then LLM, then keyword heuristics.
 
-    context = f"""You have access to {total:,} Shepard Fairey historical sales records.
-Fields: name, price, date, medium, signed (bool), source.
-Price range: ${min(prices):.0f} — ${max(prices):.0f}, median ${sorted(prices)[len(prices)//2]:.0f}.
-{len(signed_prices):,} are signed (median ${sorted(signed_prices)[len(signed_prices)//2]:.0f} vs unsigned).
+    Returns (spec, source) where source is 'cache', 'llm' or 'heuristic'.
+    Only LLM translations are cached — heuristics are cheap to recompute.
+    """
+    qkey = normalize_question(question)
+    cache = _load_query_spec_cache()
+    if qkey in cache:
+        return cache[qkey], 'cache'
+    spec = _llm_question_to_spec(question, index)
+    if spec is not None:
+        cache[qkey] = spec
+        _save_query_spec_cache(cache)
+        return spec, 'llm'
+    return heuristic_spec(question, index), 'heuristic'
 
-Sample titles: {', '.join(set(r['name'][:30] for r in sample[:20]))}
 
-User question: {question}
+@app.route('/api/query', methods=['POST'])
+def natural_query():
+    """Ask a question about historical data — answered by the local query engine.
 
-Answer the question using the data. Be specific with numbers. If the question asks for items matching criteria, list up to 10 with prices and dates. Keep response under 200 words."""
+    Body: {question} and/or {spec}. A supplied spec runs directly; otherwise the
+    question is translated to a spec (cached per normalized question) and the
+    aggregates are computed locally over the full comp store.
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Body must be a JSON object'}), 400
+    question = data.get('question') or ''
+    spec = data.get('spec')
+    if not isinstance(question, str):
+        return jsonify({'error': 'question must be a string'}), 400
+    if spec is not None and not isinstance(spec, dict):
+        return jsonify({'error': 'spec must be an object'}), 400
+    if not question and not spec:
+        return jsonify({'error': 'Missing question'}), 400
 
-    claude_key = ENV.get('CLAUDE_API_KEY', '')
-    answer = ''
-    if claude_key:
-        try:
-            resp = requests.post('https://api.anthropic.com/v1/messages',
-                headers={'x-api-key': claude_key, 'anthropic-version': '2023-06-01', 'content-type': 'application/json'},
-                json={'model': 'claude-3-haiku-20240307', 'max_tokens': 300, 'messages': [{'role': 'user', 'content': context}]},
-                timeout=20)
-            if resp.status_code == 200:
-                answer = resp.json().get('content', [{}])[0].get('text', '')
-        except Exception as e:
-            answer = f'Query failed: {str(e)[:50]}'
+    index = get_comp_index()
+    if spec:
+        spec, spec_source = normalize_spec(spec), 'client'
+    else:
+        spec, spec_source = _question_to_spec(question, index)
 
-    return jsonify({'question': question, 'answer': answer, 'records_searched': total})
+    result = run_query(index, spec)
+    return jsonify({
+        'question': question,
+        'answer': describe_result(result),
+        'spec': result['spec'],
+        'spec_source': spec_source,
+        'result': result,
+        'records_searched': result['records_searched'],
+        'elapsed_ms': result['elapsed_ms'],
+    })
 
 
 @app.route('/api/feedback/overview')
@@ -11031,7 +12272,7 @@ def feedback_overview():
 @app.route('/api/feedback/pending')
 def get_pending_feedback():
     """Get sold items that may need feedback"""
-    sold = ebay.get_sold_items(days_back=30)
+    sold = load_sold_history(days_back=30)
     items = []
     for s in sold:
         items.append({
@@ -11221,7 +12462,7 @@ def submit_feedback():
 @app.route('/reports/levers')
 def levers_report():
     """What you can CONTROL — analysis of every variable that drives sales"""
-    sold = [s for s in ebay.get_sold_items(days_back=60) if s['price'] >= 25]
+    sold = [s for s in load_sold_history(days_back=60) if s['price'] >= 25]
     listings = ebay.get_all_listings()
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
@@ -11427,7 +12668,7 @@ td {{ padding:9px 8px; border-bottom:1px solid rgba(255,255,255,0.03); }}
 @app.route('/reports/what-worked')
 def what_worked_report():
     """Line-by-line analysis of every sale — what worked, what didn't, by category"""
-    sold = [s for s in ebay.get_sold_items(days_back=60) if s['price'] >= 25]
+    sold = [s for s in load_sold_history(days_back=60) if s['price'] >= 25]
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
     cost_basis = load_cost_basis()
@@ -11629,7 +12870,7 @@ td {{ padding:7px 6px; border-bottom:1px solid rgba(255,255,255,0.03); }}
 @app.route('/reports/performance')
 def performance_report():
     """Full visual performance analysis — what worked, what didn't"""
-    sold = [s for s in ebay.get_sold_items(days_back=60) if s['price'] >= 25]
+    sold = [s for s in load_sold_history(days_back=60) if s['price'] >= 25]
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
 
@@ -12252,7 +13493,7 @@ Respond in JSON:
 @app.route('/api/analytics/sales-history')
 def get_sales_history():
     """Analyze sold items — posting date, time to sale, promo type, rate impact"""
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     promo_data = fetch_all_promotions()
     per_listing = promo_data.get('per_listing', {})
 
@@ -12366,17 +13607,21 @@ AD_STRATEGY_PRESETS = {
 CATEGORY_STRATEGY_FILE = os.path.join(DATA_DIR, 'category_strategies.json')
 
 
+def load_category_strategies():
+    try:
+        data = persist.read_json(CATEGORY_STRATEGY_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
+    return {}
+
+
 @app.route('/api/promotions/strategy')
 def get_ad_strategies():
     """Get strategy presets + per-category overrides"""
     # Load saved category strategies
-    cat_strats = {}
-    if os.path.exists(CATEGORY_STRATEGY_FILE):
-        try:
-            with open(CATEGORY_STRATEGY_FILE, 'r') as f:
-                cat_strats = json.load(f)
-        except Exception:
-            pass
+    cat_strats = load_category_strategies()
 
     return jsonify({
         'presets': AD_STRATEGY_PRESETS,
@@ -12391,9 +13636,7 @@ def set_category_strategy():
     data = request.get_json()
     # data = {category: strategy_level, ...}
 
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(CATEGORY_STRATEGY_FILE, 'w') as f:
-        json.dump(data, f, indent=2)
+    persist.write_json(CATEGORY_STRATEGY_FILE, data, indent=2)
 
     return jsonify({'success': True})
 
@@ -12403,13 +13646,7 @@ def apply_category_strategies():
     """Apply per-category strategies to all listings and push to eBay"""
     import sys; print("[Promo] apply_category_strategies CALLED", file=sys.stderr, flush=True)
     sys.stderr.flush()
-    cat_strats = {}
-    if os.path.exists(CATEGORY_STRATEGY_FILE):
-        try:
-            with open(CATEGORY_STRATEGY_FILE, 'r') as f:
-                cat_strats = json.load(f)
-        except Exception:
-            pass
+    cat_strats = load_category_strategies()
 
     listings = ebay.get_all_listings()
     headers = get_marketing_headers()
@@ -12505,16 +13742,16 @@ def apply_category_strategies():
             print(f"[Promo] Error: {e}", file=sys.stderr, flush=True)
             failed += len(group['listings'])
 
-    global _promotions_cache
-    _promotions_cache = None
+    caches['promotions'].clear()
 
     return jsonify({'success': True, 'applied': applied, 'failed': failed, 'campaigns': campaigns})
 
 
 @app.route('/api/analytics/insights')
+@materialized('analytics_insights', '/api/analytics/insights')
 def get_data_insights():
     """Mine historical data for actionable insights"""
-    sold = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=60)
     listings = ebay.get_all_listings()
 
     def detect_cat(title):
@@ -12866,7 +14103,7 @@ def apply_price_changes():
 def get_ad_performance():
     """Ad spend analytics — correlate spend with views, CTR, sales"""
     listings = ebay.get_all_listings()
-    sold_items = ebay.get_sold_items(days_back=60)
+    sold_items = load_sold_history(days_back=60)
     promo_data = fetch_all_promotions()
     per_listing = promo_data.get('per_listing', {})
 
@@ -12986,10 +14223,11 @@ def get_ad_performance():
 # =============================================================================
 
 @app.route('/api/dashboard')
+@materialized('dashboard', '/api/dashboard')
 def get_dashboard():
     """Command center data — everything you need in one call"""
     listings = ebay.get_all_listings()
-    sold = ebay.get_sold_items(days_back=30)
+    sold = load_sold_history(days_back=30)
     promo_data = fetch_all_promotions()
     per_listing = promo_data.get('per_listing', {})
     rules = load_pricing_rules()
@@ -13067,12 +14305,12 @@ PURCHASES_FILE = os.path.join(DATA_DIR, 'purchases.json')
 
 
 def load_purchases():
-    if os.path.exists(PURCHASES_FILE):
-        try:
-            with open(PURCHASES_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(PURCHASES_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return []
 
 
@@ -13099,12 +14337,9 @@ def manage_purchases():
         if purchase['listing_id'] and purchase['cost']:
             cb = load_cost_basis()
             cb[purchase['listing_id']] = {'cost': purchase['cost'], 'updated': datetime.now().isoformat()}
-            with open(COST_BASIS_FILE, 'w') as f:
-                json.dump(cb, f, indent=2)
+            save_cost_basis(cb)
 
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(PURCHASES_FILE, 'w') as f:
-            json.dump(purchases, f, indent=2)
+        persist.write_json(PURCHASES_FILE, purchases, indent=2)
         return jsonify({'success': True, 'purchase': purchase})
 
     purchases = load_purchases()
@@ -13120,97 +14355,205 @@ def manage_purchases():
 # Feature: Background Enrichment
 # =============================================================================
 
+# Results live in state_db ns 'enrichment', one doc per listing id with an
+# enriched_at timestamp. The job checkpoints its remaining queue to
+# meta/enrichment_job, so a restart resumes where it stopped, and only
+# entries older than ENRICHMENT_TTL_S are re-queried.
+ENRICHMENT_NS = 'enrichment'
+ENRICHMENT_FILE = os.path.join(DATA_DIR, 'auto_enrichment.json')  # legacy, migrated
+ENRICHMENT_TTL_S = int(os.environ.get('ENRICHMENT_TTL_S', str(7 * 86400)))
+ENRICHMENT_WORKERS = int(os.environ.get('ENRICHMENT_WORKERS', '3'))
+ENRICHMENT_CHECKPOINT_EVERY = 10
+
 _enrichment_progress = {'running': False, 'done': 0, 'total': 0, 'status': ''}
 
 
-@app.route('/api/enrichment/start', methods=['POST'])
-def start_enrichment():
-    """Start background enrichment of eBay listings"""
-    import threading
+def _enrichment_fresh(entry, now):
+    try:
+        at = datetime.fromisoformat(entry.get('enriched_at') or '')
+    except (TypeError, ValueError):
+        return False
+    return (now - at).total_seconds() < ENRICHMENT_TTL_S
 
-    if _enrichment_progress['running']:
-        return jsonify({'message': 'Already running', **_enrichment_progress})
 
-    def run_enrichment():
-        _enrichment_progress['running'] = True
-        _enrichment_progress['done'] = 0
-        _enrichment_progress['status'] = 'Starting...'
+def _enrichment_query(title):
+    stop_words = {'the', 'a', 'an', 'and', 'or', 'for', 'in', 'on', 'at', 'to', 'of', 'is', 'by', 'with', 'new', 'lot', 'rare', 'free', 'shipping'}
+    words = [w for w in re.findall(r'\w+', title.lower()) if w not in stop_words and len(w) > 2]
+    return ' '.join(words[:5])
 
-        listings = ebay.get_all_listings()
-        enriched = load_personal_inventory()
-        enriched_titles = set(i['name'].lower()[:40] for i in enriched)
 
-        to_enrich = [l for l in listings if l['title'].lower()[:40] not in enriched_titles]
-        _enrichment_progress['total'] = len(to_enrich)
+def _enrich_listing(listing):
+    """Comp lookup for one listing. A miss (no query or no comps) is still an
+    entry so it waits out the TTL; a search error raises and is retried next run."""
+    entry = {'enriched_at': datetime.now().isoformat(), 'title': listing['title'][:80]}
+    query = _enrichment_query(listing['title'])
+    if not query:
+        return entry
+    comps = search_ebay(query, listing['price'] * 3, max(listing['price'] * 0.2, 10), limit=10,
+                        raise_on_error=True)
+    cp = [c['price'] for c in comps if c['price'] > 0]
+    if not cp:
+        return entry
+    median = sorted(cp)[len(cp) // 2]
+    avg_p = sum(cp) / len(cp)
+    ec = len(comps)
+    rec = 'GOOD TO SELL' if ec <= 3 else 'HOLD' if ec >= 8 else 'GOOD TO SELL'
+    reason = f'{ec} comps, median ${median:.0f}'
+    entry.update({
+        'market_data': {'count': len(cp), 'min': min(cp), 'max': max(cp), 'avg': round(avg_p, 2), 'median': median, 'suggested_price': round(median, 2)},
+        'ebay_supply': {'ebay_count': ec, 'ebay_avg_price': round(avg_p, 2), 'recommendation': rec, 'reason': reason,
+            'competing_listings': [{'title': c['title'], 'price': c['price'], 'url': c.get('url', '')} for c in comps[:5]]},
+        'recommendation': rec, 'recommendation_reason': reason,
+    })
+    return entry
 
-        ENRICHMENT_FILE = os.path.join(DATA_DIR, 'auto_enrichment.json')
-        cache = {}
-        if os.path.exists(ENRICHMENT_FILE):
-            try:
-                with open(ENRICHMENT_FILE, 'r') as f:
-                    cache = json.load(f)
-            except Exception:
-                pass
 
-        for i, listing in enumerate(to_enrich):
-            if listing['id'] in cache:
-                _enrichment_progress['done'] = i + 1
-                continue
+def _enrichment_queue():
+    """Listings not in personal inventory whose entry is missing or stale."""
+    now = datetime.now()
+    listings = ebay.get_all_listings()
+    enriched_titles = set(i['name'].lower()[:40] for i in load_personal_inventory())
+    existing = state_db.all(ENRICHMENT_NS)
+    return [
+        {'id': l['id'], 'title': l['title'], 'price': l['price']}
+        for l in listings
+        if l['title'].lower()[:40] not in enriched_titles
+        and not _enrichment_fresh(existing.get(l['id']) or {}, now)
+    ]
 
-            _enrichment_progress['status'] = f'Enriching: {listing["title"][:40]}...'
-            stop_words = {'the', 'a', 'an', 'and', 'or', 'for', 'in', 'on', 'at', 'to', 'of', 'is', 'by', 'with', 'new', 'lot', 'rare', 'free', 'shipping'}
-            words = [w for w in re.findall(r'\w+', listing['title'].lower()) if w not in stop_words and len(w) > 2]
-            query = ' '.join(words[:5])
 
-            if query:
-                try:
-                    comps = search_ebay(query, listing['price'] * 3, max(listing['price'] * 0.2, 10), limit=10)
-                    if comps:
-                        cp = [c['price'] for c in comps if c['price'] > 0]
-                        if cp:
-                            median = sorted(cp)[len(cp) // 2]
-                            avg_p = sum(cp) / len(cp)
-                            ec = len(comps)
-                            rec = 'GOOD TO SELL' if ec <= 3 else 'HOLD' if ec >= 8 else 'GOOD TO SELL'
-                            reason = f'{ec} comps, median ${median:.0f}'
-
-                            cache[listing['id']] = {
-                                'market_data': {'count': len(cp), 'min': min(cp), 'max': max(cp), 'avg': round(avg_p, 2), 'median': median, 'suggested_price': round(median, 2)},
-                                'ebay_supply': {'ebay_count': ec, 'ebay_avg_price': round(avg_p, 2), 'recommendation': rec, 'reason': reason,
-                                    'competing_listings': [{'title': c['title'], 'price': c['price'], 'url': c.get('url', '')} for c in comps[:5]]},
-                                'recommendation': rec, 'recommendation_reason': reason,
-                            }
-                except Exception:
-                    pass
+def _set_enrichment_progress(**fields):
+    _enrichment_progress.update(fields)
+    bus.publish('enrichment', _enrichment_status())
 
-            _enrichment_progress['done'] = i + 1
 
-            # Save periodically
-            if (i + 1) % 10 == 0:
-                try:
-                    with open(ENRICHMENT_FILE, 'w') as f:
-                        json.dump(cache, f)
-                except Exception:
-                    pass
+def _enrichment_resumable(job):
+    """An interrupted job has a checkpointed queue to resume. A finished one may
+    still list listings that failed; the next run's fresh queue includes those."""
+    return bool(job.get('pending')) and job.get('status') != 'done'
+
+
+def _save_enrichment_job(**fields):
+    job = state_db.get('meta', 'enrichment_job') or {}
+    job.update(fields)
+    job['updated_at'] = datetime.now().isoformat()
+    state_db.put('meta', 'enrichment_job', job)
+    return job
 
-        # Final save
-        try:
-            with open(ENRICHMENT_FILE, 'w') as f:
-                json.dump(cache, f)
-        except Exception:
-            pass
 
+def run_enrichment(fresh=False):
+    """Enrich the checkpointed queue (or a newly built one) with a small worker
+    pool; every search goes through the Browse API limiter in search_ebay.
+    The enrichment lock keeps it to one worker across processes."""
+    _set_enrichment_progress(running=True, done=0, total=0, status='Starting...')
+    with state_db.lock('enrichment', timeout=0) as held:
+        if not held:
+            _set_enrichment_progress(running=False, status='Already running in another worker')
+            return
+        _run_enrichment_locked(fresh)
+    # published after the lock is released so the status doesn't report it held
+    bus.publish('enrichment', _enrichment_status())
+
+
+def _run_enrichment_locked(fresh):
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    try:
+        job = state_db.get('meta', 'enrichment_job') or {}
+        resumed = _enrichment_resumable(job) and not fresh
+        if resumed:
+            queue = job['pending']
+            # entries written after the last checkpoint are fresh now; skip them
+            now = datetime.now()
+            existing = state_db.all(ENRICHMENT_NS)
+            queue = [l for l in queue if not _enrichment_fresh(existing.get(l['id']) or {}, now)]
+            done, total = job.get('done', 0), job.get('total', len(queue))
+            done = max(done, total - len(queue))
+        else:
+            queue = _enrichment_queue()
+            done, total = 0, len(queue)
+        _save_enrichment_job(status='running', pending=queue, done=done, total=total,
+                             errors=0, started_at=datetime.now().isoformat(), resumed=resumed)
+        _set_enrichment_progress(done=done, total=total,
+                                 status=f"{'Resuming' if resumed else 'Enriching'} {len(queue)} listings...")
+
+        pending = {l['id']: l for l in queue}
+        hits = errors = 0
+        with ThreadPoolExecutor(max_workers=max(1, ENRICHMENT_WORKERS)) as pool:
+            futures = {pool.submit(_enrich_listing, l): l for l in queue}
+            for n, fut in enumerate(as_completed(futures), 1):
+                listing = futures[fut]
+                try:
+                    entry = fut.result()
+                    state_db.put(ENRICHMENT_NS, listing['id'], entry)
+                    hits += 1 if entry.get('market_data') else 0
+                    pending.pop(listing['id'], None)
+                except Exception as e:
+                    # no entry is written, so the listing stays pending for the next run
+                    errors += 1
+                    print(f"[Enrichment] {listing['id']} failed: {e}")
+                done += 1
+                _set_enrichment_progress(done=done, status=f'Enriched: {listing["title"][:40]}')
+                if n % ENRICHMENT_CHECKPOINT_EVERY == 0:
+                    _save_enrichment_job(pending=list(pending.values()), done=done, errors=errors)
+
+        _save_enrichment_job(status='done', pending=list(pending.values()), done=done, errors=errors,
+                             finished_at=datetime.now().isoformat())
+        failed = f', {errors} failed and will be retried' if errors else ''
+        _set_enrichment_progress(status=f'Done — {hits} of {len(queue)} listings found comps{failed}')
+    except Exception as e:
+        print(f"[Enrichment] job failed: {e}")
+        _save_enrichment_job(status='failed', error=str(e))
+        _set_enrichment_progress(status=f'Failed: {e}')
+    finally:
         _enrichment_progress['running'] = False
-        _enrichment_progress['status'] = f'Done — enriched {len(cache)} items'
 
-    threading.Thread(target=run_enrichment, daemon=True).start()
-    return jsonify({'message': 'Enrichment started', 'total': _enrichment_progress.get('total', 0)})
+
+@app.route('/api/enrichment/start', methods=['POST'])
+def start_enrichment():
+    """Start background enrichment of eBay listings; resumes an interrupted
+    job from its checkpoint unless ?fresh=1."""
+    if _enrichment_progress['running']:
+        return jsonify({'message': 'Already running', **_enrichment_progress})
+    if state_db.locked('enrichment'):
+        return jsonify({'message': 'Already running in another worker'})
+
+    fresh = request.args.get('fresh', '').lower() in ('1', 'true', 'yes')
+    job = state_db.get('meta', 'enrichment_job') or {}
+    resuming = _enrichment_resumable(job) and not fresh
+    _enrichment_progress['running'] = True
+    threading.Thread(target=run_enrichment, kwargs={'fresh': fresh}, name='dataradar-enrichment', daemon=True).start()
+    return jsonify({
+        'message': 'Enrichment resumed' if resuming else 'Enrichment started',
+        'pending': len(job.get('pending') or []) if resuming else None,
+    })
+
+
+def _enrichment_status():
+    """Progress of this worker's run merged with the persisted checkpoint."""
+    job = state_db.get('meta', 'enrichment_job') or {}
+    running = _enrichment_progress['running']
+    elsewhere = not running and state_db.locked('enrichment')
+    return {
+        **_enrichment_progress,
+        'running': running or elsewhere,
+        'done': _enrichment_progress['done'] if running else job.get('done', 0),
+        'total': _enrichment_progress['total'] if running else job.get('total', 0),
+        'job_status': job.get('status'),
+        'pending': len(job.get('pending') or []),
+        # a job left 'running' by a process that is gone is resumable
+        'resumable': not running and not elsewhere and _enrichment_resumable(job),
+        'errors': job.get('errors', 0),
+        'updated_at': job.get('updated_at'),
+        'entries': state_db.count(ENRICHMENT_NS),
+        'ttl_s': ENRICHMENT_TTL_S,
+    }
 
 
 @app.route('/api/enrichment/progress')
 def get_enrichment_progress():
-    """Get background enrichment progress"""
-    return jsonify(_enrichment_progress)
+    """Get background enrichment progress, including the persisted checkpoint"""
+    return jsonify(_enrichment_status())
 
 
 # =============================================================================
@@ -13224,9 +14567,7 @@ def manage_cost_basis():
         data = request.get_json()
         cb = load_cost_basis()
         cb[data['listing_id']] = {'cost': float(data['cost']), 'updated': datetime.now().isoformat()}
-        os.makedirs(DATA_DIR, exist_ok=True)
-        with open(COST_BASIS_FILE, 'w') as f:
-            json.dump(cb, f, indent=2)
+        save_cost_basis(cb)
         return jsonify({'success': True})
 
     return jsonify(load_cost_basis())
@@ -13238,40 +14579,26 @@ def manage_cost_basis():
 PRICE_HISTORY_FILE = os.path.join(DATA_DIR, 'price_history.json')
 
 
-def load_price_history():
-    if os.path.exists(PRICE_HISTORY_FILE):
-        try:
-            with open(PRICE_HISTORY_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {}
-
-
 def record_price_change(listing_id, price):
     """Record a price change for a listing"""
-    hist = load_price_history()
-    if listing_id not in hist:
-        hist[listing_id] = []
+    entries = _price_history_for(listing_id)
     # Don't record duplicates
-    if hist[listing_id] and hist[listing_id][-1].get('price') == price:
+    if entries and entries[-1].get('price') == price:
         return
-    hist[listing_id].append({
-        'price': float(price),
-        'date': datetime.now().isoformat(),
-    })
-    # Keep last 50 changes per item
-    hist[listing_id] = hist[listing_id][-50:]
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(PRICE_HISTORY_FILE, 'w') as f:
-        json.dump(hist, f)
+    with state_db.transaction():
+        state_db.append('price_history', {
+            'price': float(price),
+            'date': datetime.now().isoformat(),
+        }, key=listing_id)
+        # Keep last 50 changes per item, trimmed in batches
+        if len(_PRICE_HISTORY_INDEX.get(listing_id)) + 1 >= PRICE_HISTORY_KEEP + PRICE_HISTORY_TRIM_BATCH:
+            state_db.trim('price_history', PRICE_HISTORY_KEEP, key=listing_id)
 
 
 @app.route('/api/listing/price-history/<listing_id>')
 def get_price_history(listing_id):
     """Get price change history for a listing"""
-    hist = load_price_history()
-    return jsonify({'history': hist.get(listing_id, []), 'listing_id': listing_id})
+    return jsonify({'history': _price_history_for(listing_id), 'listing_id': listing_id})
 
 
 # =============================================================================
@@ -13279,11 +14606,96 @@ def get_price_history(listing_id):
 # =============================================================================
 import base64 as _b64
 
+PHOTO_EXTRACT_CACHE_FILE = os.path.join(DATA_DIR, 'photo_extract_cache.json')
+PHOTO_MAX_DIM = 1568          # long edge sent to the vision model
+PHOTO_JPEG_QUALITY = 85
+PHOTO_HASH_MAX_DISTANCE = 6   # dHash bits that may differ for a near-duplicate
+PHOTO_CACHE_MAX_ENTRIES = 500
+_PHOTO_EXTRACT_CACHE = None   # lazy-loaded {phash_hex: {result, cached_at}}
+
+
+def _load_photo_cache():
+    """Lazy-load the perceptual-hash keyed photo extraction cache."""
+    global _PHOTO_EXTRACT_CACHE
+    if _PHOTO_EXTRACT_CACHE is not None:
+        return _PHOTO_EXTRACT_CACHE
+    try:
+        _PHOTO_EXTRACT_CACHE = persist.read_json(PHOTO_EXTRACT_CACHE_FILE) or {}
+    except Exception as e:
+        print(f"[Photo] cache load error: {e}")
+        _PHOTO_EXTRACT_CACHE = {}
+    return _PHOTO_EXTRACT_CACHE
+
+
+def _save_photo_cache(cache):
+    try:
+        if len(cache) > PHOTO_CACHE_MAX_ENTRIES:
+            newest = sorted(cache.items(), key=lambda kv: kv[1].get('cached_at', ''), reverse=True)
+            cache.clear()
+            cache.update(newest[:PHOTO_CACHE_MAX_ENTRIES])
+        persist.write_json(PHOTO_EXTRACT_CACHE_FILE, cache)
+    except Exception as e:
+        print(f"[Photo] cache save error: {e}")
+
+
+def _preprocess_photo(raw_bytes):
+    """Downsize + re-encode an upload to a bounded JPEG and compute its dHash.
+
+    Returns (jpeg_bytes, phash_hex, media_type). Without Pillow the original
+    bytes go through untouched and the hash degrades to an exact-match sha1.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        import hashlib
+        return raw_bytes, 'sha1:' + hashlib.sha1(raw_bytes).hexdigest(), 'image/jpeg'
+
+    import io
+    img = Image.open(io.BytesIO(raw_bytes))
+    img = ImageOps.exif_transpose(img).convert('RGB')
+    img.thumbnail((PHOTO_MAX_DIM, PHOTO_MAX_DIM))
+
+    # dHash: 9x8 grayscale, one bit per left>right neighbour comparison
+    small = img.convert('L').resize((9, 8), Image.LANCZOS)
+    px = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (px[row * 9 + col] > px[row * 9 + col + 1])
+
+    out = io.BytesIO()
+    img.save(out, format='JPEG', quality=PHOTO_JPEG_QUALITY, optimize=True)
+    return out.getvalue(), f'{bits:016x}', 'image/jpeg'
+
+
+def _photo_cache_lookup(cache, phash):
+    """Exact hash hit first, then the nearest dHash within the distance budget."""
+    if phash in cache:
+        return cache[phash], 0
+    if phash.startswith('sha1:'):
+        return None, None
+    target = int(phash, 16)
+    best, best_dist = None, None
+    for key, entry in cache.items():
+        if key.startswith('sha1:'):
+            continue
+        dist = bin(target ^ int(key, 16)).count('1')
+        if dist <= PHOTO_HASH_MAX_DISTANCE and (best_dist is None or dist < best_dist):
+            best, best_dist = entry, dist
+    return best, best_dist
+
+
 @app.route('/api/photo/extract', methods=['POST'])
 def extract_from_photo():
-    """Upload a photo, AI extracts artist/title/edition/medium info"""
-    data = request.get_json()
+    """Upload a photo, AI extracts artist/title/edition/medium info
+
+    The upload is downsized to PHOTO_MAX_DIM and re-encoded as JPEG before it
+    goes to Claude. Results are cached by perceptual hash, so the same print
+    photographed again returns instantly. Pass force=true to bypass the cache.
+    """
+    data = request.get_json() or {}
     image_data = data.get('image', '')  # base64 data URL
+    force = str(data.get('force', '')).lower() in ('1', 'true', 'yes')
 
     if not image_data:
         return jsonify({'error': 'No image'}), 400
@@ -13292,6 +14704,19 @@ def extract_from_photo():
     if ',' in image_data:
         image_data = image_data.split(',', 1)[1]
 
+    try:
+        raw_bytes = base64.b64decode(image_data)
+        jpeg_bytes, phash, media_type = _preprocess_photo(raw_bytes)
+    except Exception as e:
+        return jsonify({'error': f'Unreadable image: {str(e)[:80]}'}), 400
+
+    cache = _load_photo_cache()
+    if not force:
+        hit, dist = _photo_cache_lookup(cache, phash)
+        if hit:
+            print(f"[Photo] cache hit {phash} (distance {dist})")
+            return jsonify({**hit['result'], 'cached': True, 'phash': phash, 'hash_distance': dist})
+
     claude_key = ENV.get('CLAUDE_API_KEY', '')
     if not claude_key:
         return jsonify({'error': 'No Claude API key'}), 500
@@ -13306,6 +14731,7 @@ def extract_from_photo():
 
 Return ONLY JSON: {"artist": "...", "title": "...", "edition": "...", "medium": "...", "year": "...", "category": "...", "confidence": "high/medium/low", "notes": "brief observation"}"""
 
+    print(f"[Photo] extracting {phash}: {len(raw_bytes) // 1024} KB upload -> {len(jpeg_bytes) // 1024} KB sent")
     try:
         resp = requests.post('https://api.anthropic.com/v1/messages',
             headers={'x-api-key': claude_key, 'anthropic-version': '2023-06-01', 'content-type': 'application/json'},
@@ -13315,7 +14741,7 @@ Return ONLY JSON: {"artist": "...", "title": "...", "edition": "...", "medium":
                 'messages': [{
                     'role': 'user',
                     'content': [
-                        {'type': 'image', 'source': {'type': 'base64', 'media_type': 'image/jpeg', 'data': image_data}},
+                        {'type': 'image', 'source': {'type': 'base64', 'media_type': media_type, 'data': base64.b64encode(jpeg_bytes).decode()}},
                         {'type': 'text', 'text': prompt}
                     ]
                 }]
@@ -13327,7 +14753,9 @@ Return ONLY JSON: {"artist": "...", "title": "...", "edition": "...", "medium":
             match = re.search(r'\{[^}]+\}', text, re.DOTALL)
             if match:
                 parsed = json.loads(match.group())
-                return jsonify(parsed)
+                cache[phash] = {'result': parsed, 'cached_at': datetime.utcnow().isoformat()}
+                _save_photo_cache(cache)
+                return jsonify({**parsed, 'cached': False, 'phash': phash})
         return jsonify({'error': f'API error: {resp.status_code}', 'detail': resp.text[:200]}), 500
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -13376,9 +14804,7 @@ def import_cost_basis():
                     imported += 1
                     break
 
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(COST_BASIS_FILE, 'w') as f:
-        json.dump(cb, f, indent=2)
+    save_cost_basis(cb)
 
     return jsonify({'imported': imported, 'total_items': len(items), 'total_costs': len(cb)})
 
@@ -13388,11 +14814,12 @@ def import_cost_basis():
 # =============================================================================
 
 @app.route('/api/daily-ops')
+@materialized('daily_ops', '/api/daily-ops')
 def daily_ops():
     """Single view: today's sales, pending shipments, promo changes, AI insights, action items"""
     listings = ebay.get_all_listings()
-    sold = ebay.get_sold_items(days_back=7)
-    sold_60 = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=7)
+    sold_60 = load_sold_history(days_back=60)
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
     rules = load_pricing_rules()
@@ -13507,8 +14934,8 @@ def daily_ops():
 def build_daily_email_html():
     """Build a beautiful HTML email summary from all app data."""
     listings = ebay.get_all_listings()
-    sold = ebay.get_sold_items(days_back=7)
-    sold_60 = ebay.get_sold_items(days_back=60)
+    sold = load_sold_history(days_back=7)
+    sold_60 = load_sold_history(days_back=60)
     promo = fetch_all_promotions()
     per_listing = promo.get('per_listing', {})
     now = datetime.now()
@@ -13671,7 +15098,9 @@ def send_daily_email(to_email='jjshay@gmail.com'):
 
 @app.route('/api/database/search', methods=['POST'])
 def database_search():
-    """Search 54k+ historical sales by artwork name. Pure database, fast, no eBay calls."""
+    """Search 54k+ historical sales by artwork name. Pure database, fast, no eBay calls.
+    fields/where/sort/limit/cursor in the query string page 'records' over every
+    match instead of the first 500 (see paging.py)."""
     data = request.get_json()
     query = (data.get('query', '') or '').strip()
     artist_filter = (data.get('artist', '') or '').strip()
@@ -13757,11 +15186,8 @@ def database_search():
     # Signed vs unsigned
     signed_count = sum(1 for m in matches if m.get('signed', False))
 
-    return jsonify({
-        'query': query,
-        'artist': artist_filter,
-        'count': len(matches),
-        'records': [{
+    def as_record(m):
+        return {
             'name': m.get('name', '')[:100],
             'price': m.get('price', 0),
             'date': m.get('date', ''),
@@ -13769,7 +15195,20 @@ def database_search():
             'signed': m.get('signed', False),
             'medium': m.get('medium', ''),
             'url': m.get('url', ''),
-        } for m in matches[:500]],
+        }
+
+    page = None
+    if paging.requested(request.args):
+        page = paging.paginate(matches, request.args, prepare=as_record)
+        records = page.pop('items')
+    else:
+        records = [as_record(m) for m in matches[:500]]
+
+    result = {
+        'query': query,
+        'artist': artist_filter,
+        'count': len(matches),
+        'records': records,
         'stats': {
             'count': len(matches),
             'min': prices[0] if prices else None,
@@ -13783,7 +15222,10 @@ def database_search():
         },
         'by_year': year_stats,
         'by_medium': by_medium,
-    })
+    }
+    if page is not None:
+        result['page'] = page
+    return jsonify(result)
 
 
 @app.route('/api/lookup', methods=['POST'])
@@ -13817,7 +15259,7 @@ def artwork_lookup():
     results = {'artist': artist, 'query': query}
 
     # 0. YOUR OWN SOLD HISTORY — the best comp source
-    my_sold = ebay.get_sold_items(days_back=60)
+    my_sold = load_sold_history(days_back=60)
     query_words = set(w.lower() for w in re.findall(r'\w+', query) if len(w) > 2)
     my_matches = []
     for s in my_sold:
@@ -14366,12 +15808,12 @@ REPRICE_CONFIG_FILE = os.path.join(DATA_DIR, 'reprice_config.json')
 
 
 def load_reprice_config():
-    if os.path.exists(REPRICE_CONFIG_FILE):
-        try:
-            with open(REPRICE_CONFIG_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(REPRICE_CONFIG_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {
         'enabled': False,
         'stale_threshold_days': 21,
@@ -14392,9 +15834,7 @@ def load_reprice_config():
 
 
 def save_reprice_config(config):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(REPRICE_CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    persist.write_json(REPRICE_CONFIG_FILE, config, indent=2)
 
 
 @app.route('/api/reprice/config', methods=['GET', 'POST'])
@@ -14683,12 +16123,12 @@ WATCHER_OFFERS_FILE = os.path.join(DATA_DIR, 'watcher_offers_config.json')
 
 
 def load_watcher_offers_config():
-    if os.path.exists(WATCHER_OFFERS_FILE):
-        try:
-            with open(WATCHER_OFFERS_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        data = persist.read_json(WATCHER_OFFERS_FILE)
+        if data is not None:
+            return data
+    except Exception:
+        pass
     return {
         'enabled': False,
         'category_discounts': {
@@ -14710,9 +16150,7 @@ def load_watcher_offers_config():
 
 
 def save_watcher_offers_config(config):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(WATCHER_OFFERS_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    persist.write_json(WATCHER_OFFERS_FILE, config, indent=2)
 
 
 def generate_offer_message(title, category, discount_pct, price, offer_price):
@@ -14905,13 +16343,24 @@ def send_watcher_offers():
 SCHEDULER_CONFIG_FILE = os.path.join(DATA_DIR, 'scheduler_config.json')
 
 
+# Idle-hours warm-up of LLM price-review inputs + consensus (see warm_llm_price_cache).
+# Runs once a day inside [start_hour, end_hour) under a review-count and time budget.
+LLM_WARM_TASK_DEFAULTS = {
+    'enabled': False, 'start_hour': 2, 'end_hour': 6,
+    'max_reviews': 25, 'max_seconds': 900, 'include_unreviewed': False,
+    'last_run': None,
+}
+
+
 def load_scheduler_config():
-    if os.path.exists(SCHEDULER_CONFIG_FILE):
-        try:
-            with open(SCHEDULER_CONFIG_FILE, 'r') as f:
-                return json.load(f)
-        except Exception:
-            pass
+    try:
+        config = state_db.get('config', 'scheduler')
+        if config is not None:
+            config.setdefault('tasks', {}).setdefault('llm_warm', dict(LLM_WARM_TASK_DEFAULTS))
+            config['tasks'].setdefault('materialize', {'enabled': True, 'last_run': None})
+            return config
+    except Exception as e:
+        print(f"[Scheduler] config load error: {e}")
     return {
         'enabled': False,
         'tasks': {
@@ -14919,26 +16368,24 @@ def load_scheduler_config():
             'reprice': {'enabled': True, 'day': 'monday', 'hour': 9, 'last_run': None},
             'offers': {'enabled': True, 'day': 'tuesday', 'hour': 10, 'last_run': None},
             'deal_alerts': {'enabled': True, 'interval_hours': 4, 'last_run': None},
+            'llm_warm': dict(LLM_WARM_TASK_DEFAULTS),
+            'materialize': {'enabled': True, 'last_run': None},
         },
         'log': [],
     }
 
 
 def save_scheduler_config(config):
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(SCHEDULER_CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    state_db.put('config', 'scheduler', config)
 
 
 def check_deal_alerts():
     """Check scraped deals for hot ones and create notifications"""
     try:
-        if not os.path.exists(LIVE_DEALS_FILE):
+        cache = persist.read_json(LIVE_DEALS_FILE)
+        if cache is None:
             return 0
 
-        with open(LIVE_DEALS_FILE, 'r') as f:
-            cache = json.load(f)
-
         deals = cache.get('deals', [])
         alerts = 0
 
@@ -14981,6 +16428,7 @@ def scheduler_loop():
             now = datetime.now()
             tasks = config.get('tasks', {})
             ran_something = False
+            last_runs = {name: t.get('last_run') for name, t in tasks.items()}
 
             # Scrape — every N hours
             scrape_task = tasks.get('scrape', {})
@@ -15070,6 +16518,34 @@ def scheduler_loop():
                         print(f"Saved search check error: {e}")
                     ran_something = True
 
+            # LLM price-review warm-up — once a day during idle hours
+            warm_task = tasks.get('llm_warm', {})
+            if warm_task.get('enabled'):
+                start_h = warm_task.get('start_hour', 2)
+                end_h = warm_task.get('end_hour', 6)
+                last = warm_task.get('last_run')
+                already_ran = last and last[:10] == now.strftime('%Y-%m-%d')
+                if start_h <= now.hour < end_h and not already_ran and not _llm_warm_running:
+                    print(f"[Scheduler] Starting LLM warm-up at {now.isoformat()}")
+                    thread = threading.Thread(target=warm_llm_price_cache, kwargs={
+                        'max_reviews': warm_task.get('max_reviews', 25),
+                        'max_seconds': warm_task.get('max_seconds', 900),
+                        'include_unreviewed': warm_task.get('include_unreviewed', False),
+                    }, daemon=True)
+                    thread.start()
+                    tasks['llm_warm']['last_run'] = now.isoformat()
+                    config['log'] = ([f"{now.strftime('%m/%d %H:%M')} LLM warm-up started"] + config.get('log', []))[:50]
+                    ran_something = True
+
+            # Materialize dashboard views — on a cadence and when their inputs change
+            mat_task = tasks.get('materialize', {})
+            if mat_task.get('enabled', True):
+                rebuilt = materialize_views()
+                if rebuilt:
+                    tasks['materialize']['last_run'] = now.isoformat()
+                    print(f"[Scheduler] Materialized {', '.join(rebuilt)}")
+                    ran_something = True
+
             # Daily email — send at 8am
             email_task = tasks.get('daily_email', {'enabled': True, 'hour': 8, 'last_run': None})
             if email_task.get('enabled', True):
@@ -15085,6 +16561,13 @@ def scheduler_loop():
 
             if ran_something:
                 save_scheduler_config(config)
+                bus.publish('scheduler', {
+                    'at': now.isoformat(),
+                    'ran': [name for name, t in tasks.items() if t.get('last_run') != last_runs.get(name)],
+                    'enabled': True,
+                    'tasks': {name: {'last_run': t.get('last_run')} for name, t in tasks.items()},
+                    'log': config.get('log', [])[:10],
+                })
 
         except Exception as e:
             print(f"[Scheduler] Error: {e}")
@@ -15147,31 +16630,94 @@ def subscribe_push():
     # This endpoint stores the subscription for future use.
     data = request.get_json()
     sub_file = os.path.join(DATA_DIR, 'push_subscriptions.json')
-    subs = []
-    if os.path.exists(sub_file):
-        try:
-            with open(sub_file, 'r') as f:
-                subs = json.load(f)
-        except Exception:
-            pass
+    try:
+        subs = persist.read_json(sub_file) or []
+    except Exception:
+        subs = []
     subs.append({'subscription': data, 'created': datetime.now().isoformat()})
     subs = subs[-10:]  # Keep last 10
-    os.makedirs(DATA_DIR, exist_ok=True)
-    with open(sub_file, 'w') as f:
-        json.dump(subs, f, indent=2)
+    persist.write_json(sub_file, subs, indent=2)
     return jsonify({'success': True})
 
 
 @app.route('/api/notifications/poll')
 def poll_notifications():
-    """Poll for new notifications — lightweight endpoint for frequent checks"""
-    notifs = load_notifications()
-    unread = [n for n in notifs if not n.get('read')]
-    return jsonify({
+    """Poll for new notifications — lightweight endpoint for frequent checks.
+    ?since=<cursor> returns 304 when nothing was added or read since then."""
+    since = request.args.get('since', type=int)
+    if since is not None and since == _notifications_cursor():
+        return Response(status=304)
+    return jsonify(_notification_summary())
+
+
+# =============================================================================
+# Event stream — one Server-Sent Events channel instead of per-panel polling
+# =============================================================================
+# Topics (payload = what the matching polling endpoint returns):
+#   scrape         /api/scrape/status, on every target and at the end
+#   enrichment     /api/enrichment/progress, on every listing
+#   notifications  /api/notifications/poll, when one is added or read
+#   scheduler      task last_run times and the log, after a loop that ran something
+# A new connection gets each topic's current state first. Notifications written
+# by another worker arrive through the state_db watch, polled per request and at
+# every heartbeat of an open stream.
+_NOTIF_PUBLISHED = None
+
+
+def _notification_summary():
+    view = _notification_view()
+    unread = view['unread']
+    return {
+        'cursor': view['cursor'],
+        'latest_seq': view['latest_seq'],
         'unread': len(unread),
         'latest': unread[:5] if unread else [],
         'has_alerts': any(n.get('severity') == 'high' for n in unread),
-    })
+    }
+
+
+def _publish_notifications(_ns=None):
+    """Publish the notification summary if its cursor moved since the last one."""
+    global _NOTIF_PUBLISHED
+    summary = _notification_summary()
+    if summary['cursor'] != _NOTIF_PUBLISHED:
+        _NOTIF_PUBLISHED = summary['cursor']
+        bus.publish('notifications', summary)
+
+
+bus.topic('scrape', snapshot=lambda: _load_scrape_status())
+bus.topic('enrichment', snapshot=lambda: _enrichment_status())
+bus.topic('notifications', snapshot=lambda: _notification_summary())
+bus.topic('scheduler')
+state_db.watch('notifications', _publish_notifications)
+state_db.watch('notifications_state', _publish_notifications)
+
+
+@app.route('/api/events')
+def event_stream():
+    """Server-Sent Events for ?topics=scrape,enrichment,notifications,scheduler
+    (all when omitted). The stream closes after EVENTS_MAX_STREAM_S; EventSource
+    reconnects with Last-Event-ID and gets only what it missed."""
+    try:
+        topics = bus.parse_topics(request.args.get('topics'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    last_id = int(last_id) if last_id and last_id.isdigit() else None
+    stream = bus.stream(topics, last_id=last_id, heartbeat=EVENTS_HEARTBEAT_S,
+                        max_age=EVENTS_MAX_STREAM_S,
+                        idle=lambda: state_db.poll_changes(STATE_POLL_INTERVAL_S))
+    return Response(
+        stream,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+@app.route('/api/events/stats')
+def event_stats():
+    """Event bus counters: publishes per topic, live subscribers, dropped events."""
+    return jsonify(bus.stats())
 
 
 # =============================================================================
@@ -15181,59 +16727,7 @@ def poll_notifications():
 @app.route('/api/buyers/crm')
 def buyer_crm():
     """Build buyer CRM from sold items + feedback overview — repeat buyers, total spend"""
-    sold = ebay.get_sold_items(days_back=90)
-
-    # Also pull from longer window for more complete buyer history
-    sold_extended = ebay.get_sold_items(days_back=180)
-    # Merge without duplicates
-    seen_ids = set(s.get('id','') for s in sold)
-    for s in sold_extended:
-        if s.get('id','') not in seen_ids:
-            sold.append(s)
-            seen_ids.add(s.get('id',''))
-
-    # Also pull buyer data from feedback overview (has buyer IDs reliably)
-    try:
-        token = ebay.get_access_token()
-        if token:
-            import xml.etree.ElementTree as ET
-            fb_headers = {
-                'X-EBAY-API-SITEID': '0', 'X-EBAY-API-COMPATIBILITY-LEVEL': '967',
-                'X-EBAY-API-IAF-TOKEN': token, 'Content-Type': 'text/xml',
-                'X-EBAY-API-CALL-NAME': 'GetMyeBaySelling'
-            }
-            xml_req = '''<?xml version="1.0" encoding="utf-8"?>
-            <GetMyeBaySellingRequest xmlns="urn:ebay:apis:eBLBaseComponents">
-                <SoldList><Include>true</Include><DurationInDays>60</DurationInDays>
-                <Pagination><EntriesPerPage>100</EntriesPerPage><PageNumber>1</PageNumber></Pagination>
-                </SoldList></GetMyeBaySellingRequest>'''
-            r = requests.post('https://api.ebay.com/ws/api.dll', headers=fb_headers, data=xml_req)
-            ns = {'e': 'urn:ebay:apis:eBLBaseComponents'}
-            root = ET.fromstring(r.text)
-            for ot in root.findall('.//e:SoldList//e:OrderTransaction', ns):
-                txn = ot.find('e:Transaction', ns) or ot.find('e:Order', ns)
-                if txn is None: continue
-                item = txn.find('e:Item', ns) or txn.find('.//e:Item', ns)
-                buyer_el = txn.find('e:Buyer', ns)
-                if item is None: continue
-                buyer_id = ''
-                if buyer_el is not None:
-                    uid = buyer_el.find('e:UserID', ns)
-                    if uid is not None: buyer_id = uid.text
-                if buyer_id:
-                    iid = item.find('e:ItemID', ns)
-                    title_el = item.find('e:Title', ns)
-                    price_el = txn.find('.//e:TransactionPrice', ns) or item.find('.//e:BuyItNowPrice', ns)
-                    end_el = txn.find('e:CreatedDate', ns) or item.find('.//e:EndTime', ns)
-                    sold.append({
-                        'id': iid.text if iid is not None else '',
-                        'title': (title_el.text if title_el is not None else '')[:60],
-                        'price': float(price_el.text) if price_el is not None and price_el.text else 0,
-                        'buyer': buyer_id,
-                        'end_time': end_el.text[:19] if end_el is not None and end_el.text else '',
-                    })
-    except Exception as e:
-        print(f"CRM buyer fetch error: {e}")
+    sold = load_sold_history(days_back=180)
 
     buyers = {}
 
@@ -15496,6 +16990,7 @@ def listing_quality_report():
 # =============================================================================
 
 @app.route('/prices')
+@http_cache.conditional(lambda: (deps.version('prices_html'), assets.version()))
 def prices_page():
     return render_template('prices.html')
 
@@ -15533,7 +17028,9 @@ def _stats(prices):
 
 @app.route('/api/prices/search')
 def api_prices_search():
-    """Search historical prices. Returns stats + sample comps + per-year trend."""
+    """Search historical prices. Returns stats + sample comps + per-year trend.
+    fields/where/sort/limit/cursor page 'comps' (see paging.py); limit alone
+    keeps its old meaning with a next_cursor added."""
     title = request.args.get('title', '').strip()
     artist = request.args.get('artist', '').strip()
     signed_only = request.args.get('signed', '').lower() in ('1', 'true', 'yes')
@@ -15607,15 +17104,28 @@ def api_prices_search():
         key=lambda x: -x['count'],
     )[:10]
 
-    # Sort comps by date desc then limit for display
-    comps.sort(key=lambda c: c.get('date', '') or '', reverse=True)
-    return jsonify({
+    result = {
         'stats': stats,
         'trend': trend,
         'top_works': top_works,
-        'comps': comps[:limit],
         'total_matches': len(comps),
-    })
+    }
+    if paging.requested(request.args):
+        args = request.args
+        if 'limit' in args:
+            # limit predates paging here: clamp it rather than reject it
+            args = args.copy()
+            args['limit'] = str(max(1, min(paging.MAX_LIMIT, limit)))
+        # newest first unless ?sort= says otherwise; only the page is serialized
+        page = paging.paginate(comps, args, default_sort='-date')
+        result['comps'] = page.pop('items')
+        result['page'] = page
+        return jsonify(result)
+
+    # Sort comps by date desc then limit for display
+    comps.sort(key=lambda c: c.get('date', '') or '', reverse=True)
+    result['comps'] = comps[:limit]
+    return jsonify(result)
 
 
 @app.route('/api/prices/work/<path:work_id>')
@@ -15676,9 +17186,9 @@ COMMS_DEFAULT_STORE = {
 def _load_comm_rules():
     """Load communications rules config from data/comm_rules.json."""
     try:
-        if os.path.exists(COMM_RULES_FILE):
-            with open(COMM_RULES_FILE, 'r') as f:
-                return json.load(f)
+        data = persist.read_json(COMM_RULES_FILE)
+        if data is not None:
+            return data
     except Exception as e:
         print(f"[comms] _load_comm_rules error: {e}")
     return {'schema_version': 1, 'policy': {}, 'rules': []}
@@ -15686,30 +17196,35 @@ def _load_comm_rules():
 
 def _save_comm_rules(data):
     """Persist the full comm_rules.json structure atomically."""
-    tmp = COMM_RULES_FILE + '.tmp'
-    with open(tmp, 'w') as f:
-        json.dump(data, f, indent=2)
-    os.replace(tmp, COMM_RULES_FILE)
+    persist.write_json(COMM_RULES_FILE, data, indent=2)
+
 
+# Retention for the comms fire-log: once it is COMMS_LOG_COMPACT_EVERY entries over
+# COMMS_LOG_KEEP it is trimmed back, i.e. one compaction per that many appends.
+COMMS_LOG_KEEP = 5000
+COMMS_LOG_COMPACT_EVERY = 100
 
-def _load_comms_log():
-    """Load the comms fire-log (append-only) from data/comms_log.json."""
+# In-memory view of the 'comms_log' event log, indexed by rule_id.
+_COMMS_LOG_INDEX = LogIndex(state_db, 'comms_log')
+
+
+def _load_comms_log(rule_id=None):
+    """Comms fire-log entries (oldest first), optionally for one rule only."""
     try:
-        if os.path.exists(COMMS_LOG_FILE):
-            with open(COMMS_LOG_FILE, 'r') as f:
-                return json.load(f)
+        if rule_id:
+            return list(_COMMS_LOG_INDEX.get(rule_id))
+        return list(_COMMS_LOG_INDEX.all())
     except Exception as e:
         print(f"[comms] _load_comms_log error: {e}")
     return []
 
 
 def _append_comms_log(entry):
-    """Append a single log entry to data/comms_log.json and persist."""
-    log = _load_comms_log()
-    log.append(entry)
+    """Append a single log entry to the 'comms_log' event log."""
     try:
-        with open(COMMS_LOG_FILE, 'w') as f:
-            json.dump(log, f, indent=2)
+        state_db.append('comms_log', entry, key=entry.get('rule_id'))
+        if state_db.count_events('comms_log') >= COMMS_LOG_KEEP + COMMS_LOG_COMPACT_EVERY:
+            state_db.trim('comms_log', COMMS_LOG_KEEP)
     except Exception as e:
         print(f"[comms] _append_comms_log persist error: {e}")
     return entry
@@ -16180,9 +17695,7 @@ def api_comms_log():
     rule_id = request.args.get('rule_id')
     since = request.args.get('since')
 
-    log = _load_comms_log()
-    if rule_id:
-        log = [e for e in log if e.get('rule_id') == rule_id]
+    log = _load_comms_log(rule_id)
     if since:
         log = [e for e in log if (e.get('fired_at') or '') >= since]
     # Newest first
@@ -16246,6 +17759,181 @@ def api_comms_simulate_event():
     })
 
 
+# =============================================================================
+# State Store — one-shot import of the legacy JSON state files
+# =============================================================================
+
+def _import_events(store, log, rows, key_field=None):
+    for row in rows:
+        if isinstance(row, dict):
+            store.append(log, row, key=row.get(key_field) if key_field else None)
+
+
+def _migrate_price_history(store):
+    for lid, events in (load_json_file(PRICE_HISTORY_FILE, {}) or {}).items():
+        for event in events if isinstance(events, list) else []:
+            store.append('price_history', event, key=lid)
+
+
+def _migrate_curation(store):
+    marks = {}
+    for path, action in ((COMP_CURATION_APPROVALS_FILE, 'approve'),
+                         (COMP_CURATION_REJECTIONS_FILE, 'reject')):
+        for sig, keys in (load_json_file(path, {}) or {}).items():
+            for ck in keys if isinstance(keys, list) else []:
+                # Rejections applied last so reject wins on collision
+                marks[_curation_doc_key(sig, ck)] = action
+    store.put_many('comp_curation', marks)
+
+
+def _migrate_watcher_history(store):
+    data = load_json_file(WATCHER_HISTORY_FILE, {}) or {}
+    store.put_many('watcher_history', data.get('snapshots') or {})
+    if data.get('last_snapshot'):
+        store.put('meta', 'watcher_last_snapshot', data['last_snapshot'])
+
+
+def _migrate_watcher_series(store):
+    """Per-listing history docs -> 'watchers' series points."""
+    docs = store.all('watcher_history')
+    points = []
+    for lid, item in docs.items():
+        for h in (item or {}).get('history') or []:
+            try:
+                day = datetime.strptime(h['date'], '%Y-%m-%d').toordinal()
+            except (KeyError, TypeError, ValueError):
+                continue
+            points.append((lid, day, h.get('watchers', 0) or 0))
+    store.series_put('watchers', points)
+    store.delete('watcher_history', *docs.keys())
+
+
+def _migrate_supply_snapshots(store):
+    data = load_json_file(SUPPLY_SNAPSHOTS_FILE, {}) or {}
+    points = {metric: [] for metric in SUPPLY_METRICS}
+    names = {}
+    for snap in data.get('snapshots') or []:
+        try:
+            t = datetime.strptime(snap['date'], '%Y-%m-%d').toordinal()
+        except (KeyError, TypeError, ValueError):
+            continue
+        for item_id, row in (snap.get('items') or {}).items():
+            for metric, field in SUPPLY_METRICS.items():
+                points[metric].append((item_id, t, row.get(field, 0) or 0))
+            names[item_id] = row.get('name', '')
+    for metric, pts in points.items():
+        store.series_put(f'supply_{metric}', pts)
+    store.put_many('supply_names', names)
+    if names:
+        times = [t for _k, t, _v in points['count']]
+        _supply_rollup(min(times), max(times))
+        store.put('meta', 'supply_last_snapshot', max(times))
+        store.put('meta', 'supply_days', sorted(set(times)))
+
+
+def _migrate_sold_history(store):
+    data = load_json_file(SOLD_HISTORY_FILE, {}) or {}
+    store.put_many('sold_txns', {_sold_key(i): i for i in data.get('items') or [] if isinstance(i, dict)})
+
+
+def _migrate_enrichment(store):
+    data = load_json_file(ENRICHMENT_FILE, {}) or {}
+    # the old cache had no per-entry times; the file mtime is the best bound
+    at = datetime.fromtimestamp(os.path.getmtime(ENRICHMENT_FILE)).isoformat() if data else None
+    store.put_many(ENRICHMENT_NS, {k: {'enriched_at': at, **v} for k, v in data.items() if isinstance(v, dict)})
+
+
+def _migrate_config_doc(key, path):
+    def _run(store):
+        doc = load_json_file(path)
+        if doc is not None:
+            store.put('config', key, doc)
+    return _run
+
+
+def _migrate_json_state():
+    """Import each legacy JSON state file into state_db exactly once.
+    The JSON files stay on disk as a backup but are no longer read or written."""
+    migrations = (
+        ('price_history', _migrate_price_history),
+        ('llm_price_cache', lambda store: store.put_many(
+            'llm_price_cache', load_json_file(LLM_PRICE_CACHE_FILE, {}) or {})),
+        ('comp_curation', _migrate_curation),
+        # notifications.json is newest-first; the log is append order
+        ('notifications', lambda store: _import_events(
+            store, 'notifications', list(reversed(load_json_file(NOTIFICATIONS_FILE, []) or [])))),
+        ('comms_log', lambda store: _import_events(
+            store, 'comms_log', load_json_file(COMMS_LOG_FILE, []) or [], key_field='rule_id')),
+        ('watcher_history', _migrate_watcher_history),
+        ('watcher_series', _migrate_watcher_series),
+        ('supply_snapshots', _migrate_supply_snapshots),
+        ('sold_history', _migrate_sold_history),
+        ('auto_enrichment', _migrate_enrichment),
+        ('saved_searches', _migrate_config_doc('saved_searches', SAVED_SEARCHES_FILE)),
+        ('scheduler_config', _migrate_config_doc('scheduler', SCHEDULER_CONFIG_FILE)),
+    )
+    for name, fn in migrations:
+        try:
+            if state_db.migrate(name, fn):
+                print(f"[state] migrated {name} -> {STATE_DB_FILE}")
+        except Exception as e:
+            print(f"[state] migration {name} failed: {e}")
+
+
+_migrate_json_state()
+
+
+def save_warm_snapshot(force=False):
+    """Pickle the warm caches if they changed; one worker at a time writes."""
+    if not WARM_SNAPSHOT:
+        return None
+    with state_db.lock('warm_snapshot', timeout=0) as held:
+        if not held:
+            return None
+        report = warm.save(force=force)
+    if report:
+        print(f"[warm] saved {sum(report['entries'].values())} entries "
+              f"({report['bytes'] // 1024} KB) in {report['duration_s']}s")
+    return report
+
+
+if WARM_SNAPSHOT:
+    _warm = warm.restore()
+    if _warm.get('restored') or _warm.get('extras'):
+        print(f"[warm] restored {_warm['restored']} {_warm['extras']} "
+              f"from a {_warm.get('snapshot_age_s')}s old snapshot in {_warm['duration_s']}s")
+    refresher.register_task('warm_snapshot', lambda: save_warm_snapshot(), interval=WARM_SNAPSHOT_INTERVAL_S)
+    atexit.register(save_warm_snapshot)
+
+
+@app.route('/api/system/warm-snapshot', methods=['GET', 'POST'])
+def warm_snapshot_status():
+    """Warm cache snapshot: file, last save and last restore; POST saves now."""
+    if request.method == 'POST':
+        save_warm_snapshot(force=True)
+    return jsonify(warm.status())
+
+
+@app.route('/api/system/refresh')
+def refresh_status():
+    """Refresh-ahead jobs: snapshot age, failures and backoff per job."""
+    return jsonify(refresher.status())
+
+
+@app.route('/api/system/http')
+def http_status():
+    """ETag/304 and compression counters: 304 rate, bytes before and after encoding."""
+    return jsonify(http_cache.stats())
+
+
+@app.route('/api/system/persistence', methods=['GET', 'POST'])
+def persistence_status():
+    """Write-behind queue counters; POST flushes pending writes to disk now."""
+    if request.method == 'POST':
+        persist.flush()
+    return jsonify({'write_behind': persist.stats(), 'state_db': STATE_DB_FILE})
+
+
 # =============================================================================
 # Main
 # =============================================================================
@@ -298,8 +298,10 @@ def clean_data():
 
     # Save
     out_path = os.path.join(DATA_DIR, 'historical_clean.json')
-    with open(out_path, 'w') as f:
+    # write-then-rename so running app workers never read a half-written file
+    with open(out_path + '.tmp', 'w') as f:
         json.dump(cleaned, f)
+    os.replace(out_path + '.tmp', out_path)
     size_mb = os.path.getsize(out_path) / 1024 / 1024
 
     # Report
@@ -458,8 +458,10 @@ for r in deduped:
 cleaned.sort(key=lambda x: (x['artist'], x.get('date', '') or ''), reverse=True)
 
 clean_path = os.path.join(DATA_DIR, 'historical_clean.json')
-with open(clean_path, 'w') as f:
+# write-then-rename so running app workers never read a half-written file
+with open(clean_path + '.tmp', 'w') as f:
     json.dump(cleaned, f)
+os.replace(clean_path + '.tmp', clean_path)
 clean_mb = os.path.getsize(clean_path) / 1024 / 1024
 
 print(f'\nClean results:')
@@ -0,0 +1,219 @@
+"""
+DATARADAR Event Bus — in-process publish/subscribe behind one SSE endpoint.
+
+Background jobs publish(topic, payload) where the UI used to poll for it
+(scrape progress, enrichment progress, notifications, scheduler runs); each
+connected browser holds a Subscription for the topics it asked for and gets
+the events pushed as Server-Sent Events by stream().
+
+  1. Topics — declared with topic(name, snapshot=None). The newest event per
+     topic is retained, so a client connecting mid-scrape gets the current
+     progress at once; snapshot() covers a topic nothing has published to
+     since boot (the scrape status file, the notification summary).
+  2. Replay — every event gets a sequence number, sent as the SSE id. A
+     reconnecting EventSource sends Last-Event-ID and receives the retained
+     history newer than it; when that id is unknown (too old, or from before
+     a restart) it gets the per-topic snapshot instead.
+  3. Back-pressure — a subscriber's queue is bounded and drops its oldest
+     event when full, so a stalled client never blocks a publisher. The
+     topics are state, not a log: the newest event is the one that matters.
+  4. Streams — a comment line every `heartbeat` seconds keeps proxies from
+     timing the connection out and notices a closed socket; a stream ends
+     after `max_age` seconds and the browser reconnects (with its id), so
+     no worker thread is held by one client indefinitely.
+
+publish() is in-process. A job running in another worker reaches clients on
+this one only through state it writes to the shared database (the app wires
+the notifications namespaces through state_db.watch for that).
+"""
+
+import threading
+import time
+from collections import deque
+
+import fast_json
+
+SEQ_EPOCH = int(time.time() * 1000)  # ids stay increasing across restarts
+
+
+class Subscription:
+    """One client's bounded queue of events for a set of topics."""
+
+    def __init__(self, bus, topics, maxlen):
+        self.bus = bus
+        self.topics = frozenset(topics)
+        self.dropped = 0
+        self._events = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+
+    def offer(self, event):
+        with self._cond:
+            if len(self._events) == self._events.maxlen:
+                self.dropped += 1
+            self._events.append(event)
+            self._cond.notify()
+
+    def get(self, timeout):
+        """Every queued event (oldest first), waiting up to timeout for one."""
+        with self._cond:
+            if not self._events:
+                self._cond.wait(timeout)
+            events = list(self._events)
+            self._events.clear()
+        return events
+
+    def close(self):
+        self.bus._unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class EventBus:
+    """Topic registry, retained events and the live subscriptions."""
+
+    def __init__(self, queue_size=256, history=512):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._topics = {}              # name -> snapshot fn or None
+        self._latest = {}              # name -> event
+        self._history = deque(maxlen=history)
+        self._subs = set()
+        self._seq = SEQ_EPOCH
+        self._counters = dict.fromkeys(('published', 'delivered', 'dropped', 'streams'), 0)
+        self._by_topic = {}
+
+    # -------------------------------------------------------------------------
+    # Topics and publishing
+    # -------------------------------------------------------------------------
+
+    def topic(self, name, snapshot=None):
+        """Declare a topic; snapshot() -> payload for clients when none is retained."""
+        self._topics[name] = snapshot
+
+    @property
+    def topics(self):
+        return list(self._topics)
+
+    def publish(self, topic, payload):
+        """Push payload to every subscriber of topic. Never blocks on clients."""
+        if topic not in self._topics:
+            raise KeyError(f"unknown event topic {topic!r}")
+        with self._lock:
+            self._seq += 1
+            event = (self._seq, topic, payload, time.time())
+            self._latest[topic] = event
+            self._history.append(event)
+            subs = [s for s in self._subs if topic in s.topics]
+            self._counters['published'] += 1
+            self._counters['delivered'] += len(subs)
+            self._by_topic[topic] = self._by_topic.get(topic, 0) + 1
+        for sub in subs:
+            sub.offer(event)
+        return event[0]
+
+    def latest(self, topic):
+        """Payload of the newest event on topic since boot, or None."""
+        event = self._latest.get(topic)
+        return event[2] if event else None
+
+    # -------------------------------------------------------------------------
+    # Subscribing
+    # -------------------------------------------------------------------------
+
+    def parse_topics(self, value):
+        """Topic list from a comma-separated query value; all topics when empty."""
+        names = [t.strip() for t in (value or '').split(',') if t.strip()]
+        unknown = [t for t in names if t not in self._topics]
+        if unknown:
+            raise ValueError(f"unknown topic(s): {', '.join(unknown)}; available: {', '.join(self._topics)}")
+        return names or self.topics
+
+    def subscribe(self, topics, last_id=None):
+        """(Subscription, backlog): the backlog is what the client missed since
+        last_id, or the current state of each topic when last_id can't be replayed."""
+        sub = Subscription(self, topics, self.queue_size)
+        with self._lock:
+            self._subs.add(sub)
+            self._counters['streams'] += 1
+            oldest = self._history[0][0] if self._history else self._seq + 1
+            if last_id is not None and oldest - 1 <= last_id <= self._seq:
+                backlog = [e for e in self._history if e[0] > last_id and e[1] in sub.topics]
+                return sub, backlog
+            retained = [self._latest[t] for t in topics if t in self._latest]
+        backlog = sorted(retained)
+        have = {e[1] for e in backlog}
+        for name in topics:
+            snapshot = self._topics.get(name)
+            if name in have or snapshot is None:
+                continue
+            try:
+                payload = snapshot()
+            except Exception as e:
+                print(f"[Events] snapshot for {name} failed: {e}")
+                continue
+            if payload is not None:
+                # id 0: state, not an event; a reconnect gets the snapshot again
+                backlog.append((0, name, payload, time.time()))
+        return sub, backlog
+
+    def _unsubscribe(self, sub):
+        with self._lock:
+            if sub in self._subs:
+                self._subs.discard(sub)
+                self._counters['dropped'] += sub.dropped
+
+    # -------------------------------------------------------------------------
+    # Server-Sent Events
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def frame(event):
+        seq, topic, payload, _at = event
+        head = f"id: {seq}\n" if seq else ''
+        return f"{head}event: {topic}\ndata: {fast_json.dumps(payload, default=str)}\n\n"
+
+    def stream(self, topics, last_id=None, heartbeat=15.0, max_age=300.0, retry_ms=3000, idle=None):
+        """Generator of SSE text for one client: the backlog, then live events
+        until max_age. idle() runs at each heartbeat (e.g. to poll other workers)."""
+        sub, backlog = self.subscribe(topics, last_id)
+        deadline = time.monotonic() + max_age
+        try:
+            yield f"retry: {retry_ms}\n\n"
+            for event in backlog:
+                yield self.frame(event)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                events = sub.get(min(heartbeat, remaining))
+                if events:
+                    yield ''.join(self.frame(e) for e in events)
+                    continue
+                if idle is not None:
+                    try:
+                        idle()
+                    except Exception as e:
+                        print(f"[Events] idle hook failed: {e}")
+                    events = sub.get(0)
+                    if events:
+                        yield ''.join(self.frame(e) for e in events)
+                        continue
+                yield ': keepalive\n\n'
+        finally:
+            sub.close()
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._counters)
+            out['dropped'] += sum(s.dropped for s in self._subs)
+            out['subscribers'] = len(self._subs)
+            out['by_topic'] = dict(self._by_topic)
+            out['last_id'] = self._seq
+            out['retained'] = {t: time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(e[3]))
+                               for t, e in self._latest.items()}
+        out['topics'] = self.topics
+        return out
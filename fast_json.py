@@ -0,0 +1,94 @@
+"""
+DATARADAR Fast JSON — one JSON codec for responses, data files and state.db.
+
+orjson when it is installed, the stdlib json module otherwise, and the stdlib
+again for anything orjson refuses (ints over 64 bits, NaN/Infinity literals
+in a legacy file, an indent other than 2), so callers see the same values and
+the same exception types either way.
+
+Output stays interchangeable with json.dumps:
+  - datetimes go through `default` (Flask's HTTP date, str() for files)
+    instead of orjson's native ISO format
+  - non-str dict keys are stringified, sort_keys is honoured
+  - differences: non-ASCII is written as UTF-8 rather than \\u escapes, and
+    NaN/Infinity floats become null (json.dumps emits tokens browsers reject)
+
+  dumps / dumpb(obj, indent=None, sort_keys=False, default=None) -> str / bytes
+  loads(s), load(f), dump(obj, f, indent=None, default=None)
+  FastJSONProvider — Flask JSON provider: app.json = FastJSONProvider(app)
+  BACKEND — 'orjson' or 'json'
+"""
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib codec is used throughout
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+if orjson is not None:
+    _OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def dumpb(obj, indent=None, sort_keys=False, default=None):
+    """Serialize to UTF-8 bytes; indent is None (compact) or a space count."""
+    if orjson is not None and indent in (None, 2):
+        option = _OPTS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except orjson.JSONEncodeError:
+            pass  # retried below so the stdlib raises (or copes) as it always did
+    separators = (',', ':') if indent is None else None
+    return json.dumps(obj, indent=indent, sort_keys=sort_keys, default=default,
+                      separators=separators).encode()
+
+
+def dumps(obj, indent=None, sort_keys=False, default=None):
+    return dumpb(obj, indent=indent, sort_keys=sort_keys, default=default).decode()
+
+
+def loads(s):
+    if orjson is not None:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass  # NaN literals, lone surrogates: the stdlib decides and raises its own errors
+    return json.loads(s)
+
+
+def load(f):
+    return loads(f.read())
+
+
+def dump(obj, f, indent=None, default=None):
+    data = dumpb(obj, indent=indent, default=default)
+    f.write(data if 'b' in getattr(f, 'mode', '') else data.decode())
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's default provider with the encoding done by dumpb(); keeps its
+    sort_keys, compact/debug indent and default() handling."""
+
+    def dumps(self, obj, **kwargs):
+        if set(kwargs) - {'separators'}:
+            return super().dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys, default=self.default)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+        body = dumpb(obj, indent=indent, sort_keys=self.sort_keys, default=self.default)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,195 @@
+"""
+DATARADAR HTTP Cache — validators and compression for Flask responses.
+
+  1. ETags — every 200 GET with a compressible type gets a weak ETag: the
+     route's cache version when it declared one with conditional() (or set
+     one itself), else a hash of the body. If-None-Match and If-Modified-Since
+     hits become 304s; with a declared version the route doesn't run at all.
+  2. Compression — brotli (when the `brotli` package is installed) or gzip,
+     negotiated from Accept-Encoding for bodies over min_size. Encoded bodies
+     are kept per (ETag, encoding) in a small LRU, so an unchanged payload
+     (the dashboard HTML, a materialized view) is compressed once and served
+     precompressed after that.
+  3. Metrics — eligible responses, 304s (and how many skipped the handler),
+     bytes before and after encoding, per-encoding counts; stats() adds the
+     304 rate and bytes saved.
+
+Weak ETags are used throughout: they stay valid across content codings, so
+one validator covers the identity, gzip and brotli variants.
+"""
+
+import gzip
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, make_response, request
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+COMPRESSIBLE = ('application/json', 'text/html', 'text/css', 'text/plain', 'text/csv',
+                'application/javascript', 'text/javascript', 'image/svg+xml')
+
+
+def version_tag(*parts):
+    """Opaque ETag value for a cache version (anything with a stable repr)."""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+
+class HttpCache:
+    """after_request hook adding validators, 304s and content negotiation."""
+
+    def __init__(self, app=None, min_size=1024, gzip_level=6, brotli_quality=5,
+                 max_variants=64, max_variant_bytes=32 * 1024 * 1024):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_variants = max_variants
+        self.max_variant_bytes = max_variant_bytes
+        self._variants = OrderedDict()  # (etag, encoding) -> encoded body
+        self._variant_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ('responses', 'not_modified', 'not_modified_early', 'compressed', 'variant_hits',
+             'bytes_raw', 'bytes_sent', 'bytes_not_sent'), 0)
+        self._encodings = {}
+        self._started = time.time()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.after_request(self._after_request)
+        app.extensions['http_cache'] = self
+
+    @property
+    def encodings(self):
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def _count(self, **deltas):
+        with self._lock:
+            for key, n in deltas.items():
+                self._counters[key] += n
+
+    # -------------------------------------------------------------------------
+    # Validators
+    # -------------------------------------------------------------------------
+
+    def check(self, etag):
+        """304 response if the request already holds etag, else None."""
+        if request.method not in ('GET', 'HEAD') or not request.if_none_match.contains_weak(etag):
+            return None
+        self._count(not_modified_early=1)
+        return self._not_modified(etag)
+
+    def _not_modified(self, etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def conditional(self, version_fn):
+        """Route decorator: version_fn() -> the route's current cache version
+        (None when it has none, e.g. ?fresh=1). A matching If-None-Match gets a
+        304 before the route runs; otherwise the response carries the tag."""
+        def wrap(view):
+            @wraps(view)
+            def route(*args, **kwargs):
+                version = version_fn() if request.method in ('GET', 'HEAD') else None
+                if version is None:
+                    return view(*args, **kwargs)
+                etag = version_tag(request.full_path, version)
+                early = self.check(etag)
+                if early is not None:
+                    return early
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    response.set_etag(etag, weak=True)
+                return response
+            return route
+        return wrap
+
+    # -------------------------------------------------------------------------
+    # after_request
+    # -------------------------------------------------------------------------
+
+    def _after_request(self, response):
+        if (request.method not in ('GET', 'HEAD') or response.status_code != 200
+                or response.direct_passthrough or response.is_streamed
+                or response.mimetype not in COMPRESSIBLE):
+            return response
+        body = response.get_data()
+        etag, _weak = response.get_etag()
+        if not etag:
+            etag = hashlib.sha1(body).hexdigest()[:20]
+            response.set_etag(etag, weak=True)
+        response.vary.add('Accept-Encoding')
+        self._count(responses=1, bytes_raw=len(body))
+
+        if request.if_none_match:
+            fresh = request.if_none_match.contains_weak(etag)
+        else:
+            fresh = (request.if_modified_since is not None and response.last_modified is not None
+                     and response.last_modified <= request.if_modified_since)
+        if fresh:
+            self._count(not_modified=1, bytes_not_sent=len(body))
+            not_modified = self._not_modified(etag)
+            if response.last_modified is not None:
+                not_modified.last_modified = response.last_modified
+            return not_modified
+
+        encoding = None
+        if len(body) >= self.min_size and 'Content-Encoding' not in response.headers:
+            encoding = request.accept_encodings.best_match(self.encodings)
+        if encoding:
+            encoded = self._encoded(etag, encoding, body)
+            response.set_data(encoded)
+            response.headers['Content-Encoding'] = encoding
+            with self._lock:
+                self._counters['compressed'] += 1
+                self._encodings[encoding] = self._encodings.get(encoding, 0) + 1
+            body = encoded
+        self._count(bytes_sent=len(body))
+        return response
+
+    def _encoded(self, etag, encoding, body):
+        key = (etag, encoding)
+        with self._lock:
+            cached = self._variants.get(key)
+            if cached is not None:
+                self._variants.move_to_end(key)
+                self._counters['variant_hits'] += 1
+                return cached
+        if encoding == 'br':
+            encoded = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            encoded = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+        with self._lock:
+            if key not in self._variants and len(encoded) <= self.max_variant_bytes:
+                self._variants[key] = encoded
+                self._variant_bytes += len(encoded)
+                while len(self._variants) > 1 and (len(self._variants) > self.max_variants
+                                                   or self._variant_bytes > self.max_variant_bytes):
+                    _key, dropped = self._variants.popitem(last=False)
+                    self._variant_bytes -= len(dropped)
+        return encoded
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._counters)
+            out['by_encoding'] = dict(self._encodings)
+            out['variants_cached'] = len(self._variants)
+            out['variant_bytes'] = self._variant_bytes
+        total_304 = out['not_modified'] + out['not_modified_early']
+        requests = out['responses'] + out['not_modified_early']
+        out['not_modified_rate'] = round(total_304 / requests, 3) if requests else None
+        out['bytes_saved'] = out['bytes_raw'] - out['bytes_sent']
+        out['compression_ratio'] = (round(out['bytes_sent'] / (out['bytes_raw'] - out['bytes_not_sent']), 3)
+                                    if out['bytes_raw'] > out['bytes_not_sent'] else None)
+        out['encodings_available'] = list(self.encodings)
+        out['since'] = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self._started))
+        return out
@@ -0,0 +1,253 @@
+"""
+DATARADAR Paging — field projection, filtering, sorting and cursor
+pagination for the large list endpoints.
+
+Query parameters (all optional; a route answers exactly as before when none
+of them is present):
+
+  fields=id,title,price,market_data.median   keep only these; dotted = nested
+  where=price>=100,title~hope,signed=true    every condition must hold;
+                                             ops: = != >= <= > < and ~ (contains),
+                                             string compares are case-insensitive
+  sort=-hotness,price                        comma list, '-' for descending;
+                                             rows missing the field sort last
+  limit=50                                   page size (per-route default, max MAX_LIMIT)
+  cursor=...                                 next_cursor from the previous page
+
+Cursors are keyset cursors: the sort values and key of the last row served
+plus a hash of sort/where/key. The next page is the rows strictly after that
+position, so inserts and deletes elsewhere don't shift it, and a page costs
+one filter pass plus a heap selection of `limit` rows rather than a full sort.
+Only the rows on the page are prepared (enriched, reshaped) and projected.
+Bad parameters (including a non-numeric value compared with a numeric field),
+or a cursor minted for another sort/filter, raise PagingError.
+"""
+
+import base64
+import hashlib
+import heapq
+import operator
+import re
+
+import fast_json
+
+PARAMS = ('fields', 'where', 'sort', 'limit', 'cursor')
+MAX_LIMIT = 5000
+DEFAULT_LIMIT = 100
+
+_FIELD = re.compile(r'^[A-Za-z_][\w]*(\.[A-Za-z_][\w]*)*$')
+_COND = re.compile(r'^\s*([A-Za-z_][\w.]*)\s*(!=|>=|<=|=|>|<|~)\s*(.*?)\s*$')
+_OPS = {'=': operator.eq, '!=': operator.ne, '>=': operator.ge, '<=': operator.le,
+        '>': operator.gt, '<': operator.lt}
+_MISSING = object()
+
+
+class PagingError(ValueError):
+    """Malformed fields/where/sort/limit/cursor; routes answer 400."""
+
+
+def requested(args):
+    """True when the request uses any paging parameter."""
+    return any(p in args for p in PARAMS)
+
+
+def referenced(args):
+    """Top-level fields that where/sort read (to decide what must exist before paging)."""
+    names = set()
+    for part in _split(args.get('sort')):
+        names.add(part.lstrip('-').split('.')[0])
+    for part in _split(args.get('where')):
+        m = _COND.match(part)
+        if m:
+            names.add(m.group(1).split('.')[0])
+    return names
+
+
+def _split(value):
+    return [p.strip() for p in (value or '').split(',') if p.strip()]
+
+
+# =============================================================================
+# Rows
+# =============================================================================
+
+def _get(row, path):
+    v = row
+    for part in path.split('.'):
+        if not isinstance(v, dict) or part not in v:
+            return _MISSING
+        v = v[part]
+    return v
+
+
+def project(row, fields):
+    """Copy of row with only the given (possibly dotted) fields; absent ones are skipped."""
+    if not fields:
+        return row
+    out = {}
+    for path in fields:
+        v = _get(row, path)
+        if v is _MISSING:
+            continue
+        parts = path.split('.')
+        node = out
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = v
+    return out
+
+
+def _matches(row, conds):
+    for path, op, raw in conds:
+        v = _get(row, path)
+        if op == '~':
+            if v is _MISSING or v is None or raw.lower() not in str(v).lower():
+                return False
+            continue
+        if v is _MISSING or v is None:
+            if op == '!=':
+                continue
+            return False
+        if isinstance(v, bool):
+            target = raw.lower() in ('1', 'true', 'yes')
+        elif isinstance(v, (int, float)):
+            try:
+                target = float(raw)
+            except ValueError:
+                raise PagingError(f"bad where condition: {path}{op}{raw}: {path} is numeric")
+        else:
+            v, target = str(v).lower(), raw.lower()
+        if not _OPS[op](v, target):
+            return False
+    return True
+
+
+# =============================================================================
+# Ordering
+# =============================================================================
+
+class _Desc:
+    """Inverts the order of the wrapped key part."""
+    __slots__ = ('v',)
+
+    def __init__(self, v):
+        self.v = v
+
+    def __lt__(self, other):
+        return other.v < self.v
+
+    def __gt__(self, other):
+        return other.v > self.v
+
+    def __eq__(self, other):
+        return self.v == other.v
+
+
+def _norm(v):
+    if isinstance(v, (bool, int, float)):
+        return (0, float(v))
+    return (1, str(v).lower())
+
+
+def _key(values, tiebreak, sort):
+    """Comparable key from raw sort values; missing values last either way."""
+    parts = []
+    for (path, desc), v in zip(sort, values):
+        if v is _MISSING or v is None:
+            parts.append((1, 0))
+        else:
+            n = _norm(v)
+            parts.append((0, _Desc(n) if desc else n))
+    parts.append(_norm(tiebreak))
+    return tuple(parts)
+
+
+# =============================================================================
+# Pages
+# =============================================================================
+
+def parse(args, default_sort=None, default_limit=DEFAULT_LIMIT):
+    fields = _split(args.get('fields'))
+    bad = [f for f in fields if not _FIELD.match(f)]
+    if bad:
+        raise PagingError(f"bad field name(s): {', '.join(bad)}")
+    conds = []
+    for part in _split(args.get('where')):
+        m = _COND.match(part)
+        if not m:
+            raise PagingError(f"bad where condition: {part!r} (use field op value, op one of = != >= <= > < ~)")
+        conds.append(m.groups())
+    sort = []
+    for part in _split(args.get('sort') or default_sort):
+        path = part.lstrip('-')
+        if not _FIELD.match(path):
+            raise PagingError(f"bad sort field: {part!r}")
+        sort.append((path, part.startswith('-')))
+    try:
+        limit = int(args.get('limit') or default_limit)
+    except ValueError:
+        raise PagingError('limit must be an integer')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise PagingError(f'limit must be between 1 and {MAX_LIMIT}')
+    return fields, conds, sort, limit, args.get('cursor') or None
+
+
+def _encode_cursor(doc):
+    return base64.urlsafe_b64encode(fast_json.dumpb(doc)).rstrip(b'=').decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        return fast_json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception:
+        raise PagingError('malformed cursor')
+
+
+def paginate(rows, args, key=None, default_sort=None, default_limit=DEFAULT_LIMIT, prepare=None):
+    """One page of rows: {'items', 'total', 'limit', 'next_cursor'}.
+
+    key names a unique field used to break sort ties (row position otherwise,
+    and always when there is no sort, which keeps the input order).
+    prepare(row) -> row runs on the page only, before projection."""
+    fields, conds, sort, limit, cursor = parse(args, default_sort, default_limit)
+    sig = hashlib.sha1(repr((sort, conds, key)).encode()).hexdigest()[:10]
+    use_key = key if sort else None
+
+    def raw(i, row):
+        values = [_get(row, path) for path, _desc in sort]
+        tiebreak = _get(row, use_key) if use_key else i
+        return values, (i if tiebreak is _MISSING else tiebreak)
+
+    matched = [(i, r) for i, r in enumerate(rows) if not conds or _matches(r, conds)]
+    keyed = [(_key(*raw(i, r), sort), i, r) for i, r in matched]
+    if cursor:
+        doc = _decode_cursor(cursor)
+        if not isinstance(doc, dict) or doc.get('s') != sig:
+            raise PagingError('cursor does not match this sort/where; start again without it')
+        values = [_MISSING if v is None else v for v in doc.get('v', [])]
+        after = _key(values, doc.get('t'), sort)
+        keyed = [k for k in keyed if k[0] > after]
+    page = heapq.nsmallest(limit + 1, keyed, key=lambda k: k[0])
+    more = len(page) > limit
+    page = page[:limit]
+    next_cursor = None
+    if more:
+        _k, i, row = page[-1]
+        values, tiebreak = raw(i, row)
+        next_cursor = _encode_cursor({'s': sig, 't': tiebreak,
+                                      'v': [None if v is _MISSING else v for v in values]})
+    items = []
+    for _k, _i, row in page:
+        if prepare is not None:
+            row = prepare(row)
+        items.append(project(row, fields))
+    return {'items': items, 'total': len(matched), 'limit': limit, 'next_cursor': next_cursor}
+
+
+def page_of(doc, array_key, args, **opts):
+    """doc with doc[array_key] replaced by one page and the paging state under 'page'."""
+    page = paginate(doc.get(array_key) or [], args, **opts)
+    out = dict(doc)
+    out[array_key] = page.pop('items')
+    out['page'] = page
+    return out
@@ -0,0 +1,353 @@
+"""
+DATARADAR Query Engine — local aggregate queries over the comp store.
+
+Answers questions like "median signed Shepard Fairey screenprint by year since
+2020" in milliseconds without an LLM round-trip.
+
+Architecture:
+  1. CompIndex — built once per load of historical_clean.json; keeps the
+     records plus posting lists for the low-cardinality columns (artist,
+     work_id, medium, source) so filters narrow before any row scan
+  2. Query spec — a small JSON dict (filters + group_by + percentiles),
+     validated by normalize_spec()
+  3. run_query() — filter -> group -> count/median/percentiles per group
+
+Spec shape (every key optional):
+  {
+    "artist": "shepard fairey",        # case-insensitive substring
+    "work_id": "...",                  # exact
+    "signed": true,
+    "medium": "screenprint",           # case-insensitive substring
+    "source": "worthpoint",            # case-insensitive substring
+    "title": "hope",                   # every word must appear in the title
+    "date_from": "2020-01-01",         # inclusive, ISO prefix compare
+    "date_to": "2023-12-31",
+    "price_min": 100, "price_max": 5000,
+    "group_by": ["year", "medium"],    # year, month, medium, source, artist, work_id, signed
+    "percentiles": [10, 25, 75, 90],
+    "top": 5                           # sample sales returned per result
+  }
+"""
+
+import heapq
+import re
+import time
+
+GROUP_FIELDS = ('year', 'month', 'medium', 'source', 'artist', 'work_id', 'signed')
+DEFAULT_PERCENTILES = (10, 25, 75, 90)
+MAX_GROUPS = 200
+
+
+# =============================================================================
+# Index
+# =============================================================================
+
+class CompIndex:
+    """Columnar view of the comp store with posting lists per categorical field."""
+
+    POSTED_FIELDS = ('artist', 'work_id', 'medium', 'source')
+
+    def __init__(self, records):
+        self.records = records
+        self.prices = []
+        self.dates = []
+        self.signed = []
+        self.postings = {f: {} for f in self.POSTED_FIELDS}
+        self._columns = {}
+        for i, r in enumerate(records):
+            try:
+                self.prices.append(float(r.get('price') or 0))
+            except (TypeError, ValueError):
+                self.prices.append(0.0)
+            self.dates.append((r.get('date') or '')[:10])
+            self.signed.append(bool(r.get('signed')))
+            for f in self.POSTED_FIELDS:
+                v = (r.get(f) or '').strip().lower()
+                self.postings[f].setdefault(v, []).append(i)
+
+    def __len__(self):
+        return len(self.records)
+
+    def rows_for(self, field, value, exact=False):
+        """Row ids whose field matches value (substring unless exact)."""
+        value = (value or '').strip().lower()
+        posting = self.postings[field]
+        if exact:
+            return set(posting.get(value, ()))
+        rows = set()
+        for key, ids in posting.items():
+            if value in key:
+                rows.update(ids)
+        return rows
+
+    def distinct(self, field):
+        return sorted(k for k in self.postings[field] if k)
+
+    def column(self, field):
+        """Group-by key per row for field, materialized on first use."""
+        col = self._columns.get(field)
+        if col is None:
+            col = [_group_value(self, i, field) for i in range(len(self.records))]
+            self._columns[field] = col
+        return col
+
+
+# =============================================================================
+# Spec
+# =============================================================================
+
+def _as_date(v):
+    v = str(v or '').strip()
+    return v[:10] if re.match(r'^\d{4}(-\d{2}){0,2}', v) else ''
+
+
+def _as_float(v):
+    try:
+        return float(v) if v not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def normalize_spec(spec):
+    """Validate a raw query spec into a canonical dict; unknown keys are dropped
+    and malformed values fall back to their defaults."""
+    spec = spec if isinstance(spec, dict) else {}
+    out = {}
+    for key in ('artist', 'work_id', 'medium', 'source', 'title'):
+        v = spec.get(key)
+        if v not in (None, ''):
+            out[key] = str(v).strip()
+    if spec.get('signed') is not None:
+        s = spec['signed']
+        out['signed'] = s if isinstance(s, bool) else str(s).lower() in ('1', 'true', 'yes')
+    for key in ('date_from', 'date_to'):
+        d = _as_date(spec.get(key))
+        if d:
+            out[key] = d
+    for key in ('price_min', 'price_max'):
+        p = _as_float(spec.get(key))
+        if p is not None:
+            out[key] = p
+    group_by = spec.get('group_by') or []
+    if isinstance(group_by, str):
+        group_by = [g.strip() for g in group_by.split(',')]
+    elif not isinstance(group_by, (list, tuple)):
+        group_by = []
+    out['group_by'] = [g for g in group_by if isinstance(g, str) and g in GROUP_FIELDS][:2]
+    percentiles = spec.get('percentiles') or DEFAULT_PERCENTILES
+    if not isinstance(percentiles, (list, tuple)):
+        percentiles = DEFAULT_PERCENTILES
+    pcts = set()
+    for p in percentiles:
+        try:
+            if 0 < int(p) < 100:
+                pcts.add(int(p))
+        except (TypeError, ValueError):
+            continue
+    out['percentiles'] = sorted(pcts)
+    try:
+        out['top'] = max(0, min(25, int(spec.get('top', 5))))
+    except (TypeError, ValueError):
+        out['top'] = 5
+    return out
+
+
+def normalize_question(question):
+    """Cache key for a natural-language question: lowercase, no punctuation."""
+    q = re.sub(r'[^a-z0-9$/ ]+', ' ', str(question or '').lower())
+    return ' '.join(q.split())
+
+
+# =============================================================================
+# Execution
+# =============================================================================
+
+def _group_value(index, i, field):
+    if field == 'year':
+        return index.dates[i][:4] or 'unknown'
+    if field == 'month':
+        return index.dates[i][:7] if len(index.dates[i]) >= 7 else 'unknown'
+    if field == 'signed':
+        return 'signed' if index.signed[i] else 'unsigned'
+    return (index.records[i].get(field) or '').strip() or 'unspecified'
+
+
+def summarize(prices, percentiles=DEFAULT_PERCENTILES):
+    """count/min/max/avg/median + requested percentiles (nearest-rank)."""
+    if not prices:
+        return {'count': 0}
+    s = sorted(prices)
+    n = len(s)
+
+    def pct(p):
+        return round(s[min(n - 1, int(n * p / 100))], 2)
+
+    out = {
+        'count': n,
+        'min': round(s[0], 2),
+        'max': round(s[-1], 2),
+        'avg': round(sum(s) / n, 2),
+        'median': pct(50),
+    }
+    for p in percentiles:
+        out[f'p{p}'] = pct(p)
+    return out
+
+
+def run_query(index, spec):
+    """Execute a normalized spec against a CompIndex."""
+    t0 = time.perf_counter()
+    spec = normalize_spec(spec)
+
+    candidates = None
+    for field in ('artist', 'work_id', 'medium', 'source'):
+        if field in spec:
+            rows = index.rows_for(field, spec[field], exact=(field == 'work_id'))
+            candidates = rows if candidates is None else candidates & rows
+    rows = sorted(candidates) if candidates is not None else range(len(index))
+
+    title_words = spec.get('title', '').lower().split()
+    signed = spec.get('signed')
+    d_from, d_to = spec.get('date_from'), spec.get('date_to')
+    p_min, p_max = spec.get('price_min'), spec.get('price_max')
+
+    matched = []
+    for i in rows:
+        price = index.prices[i]
+        if price <= 0:
+            continue
+        if p_min is not None and price < p_min:
+            continue
+        if p_max is not None and price > p_max:
+            continue
+        if signed is not None and index.signed[i] != signed:
+            continue
+        if d_from or d_to:
+            d = index.dates[i]
+            if not d or (d_from and d < d_from) or (d_to and d[:len(d_to)] > d_to):
+                continue
+        if title_words:
+            name = (index.records[i].get('name') or '').lower()
+            if not all(w in name for w in title_words):
+                continue
+        matched.append(i)
+
+    pcts = spec['percentiles']
+    result = {
+        'spec': spec,
+        'overall': summarize([index.prices[i] for i in matched], pcts),
+        'groups': [],
+    }
+
+    if spec['group_by']:
+        cols = [index.column(f) for f in spec['group_by']]
+        prices = index.prices
+        buckets = {}
+        if len(cols) == 1:
+            col = cols[0]
+            for i in matched:
+                buckets.setdefault((col[i],), []).append(prices[i])
+        else:
+            a, b = cols
+            for i in matched:
+                buckets.setdefault((a[i], b[i]), []).append(prices[i])
+        groups = [
+            {**dict(zip(spec['group_by'], key)), **summarize(ps, pcts)}
+            for key, ps in buckets.items()
+        ]
+        if spec['group_by'][0] in ('year', 'month'):
+            groups.sort(key=lambda g: tuple(str(g[f]) for f in spec['group_by']))
+        else:
+            groups.sort(key=lambda g: -g['count'])
+        result['groups'] = groups[:MAX_GROUPS]
+        result['group_count'] = len(groups)
+
+    if spec['top']:
+        recent = heapq.nlargest(spec['top'], matched, key=index.dates.__getitem__)
+        result['sales'] = [
+            {
+                'name': index.records[i].get('name', ''),
+                'price': index.prices[i],
+                'date': index.dates[i],
+                'source': index.records[i].get('source', ''),
+                'signed': index.signed[i],
+            }
+            for i in recent
+        ]
+
+    result['records_searched'] = len(index)
+    result['elapsed_ms'] = round((time.perf_counter() - t0) * 1000, 2)
+    return result
+
+
+# =============================================================================
+# Question -> spec (local heuristics; the LLM path lives in app.py)
+# =============================================================================
+
+_MEDIUM_WORDS = ('screenprint', 'lithograph', 'giclee', 'letterpress', 'stencil',
+                 'poster', 'painting', 'offset', 'serigraph', 'canvas')
+
+
+def heuristic_spec(question, index):
+    """Best-effort spec from keywords when no LLM is configured."""
+    q = normalize_question(question)
+    spec = {}
+    for artist in index.distinct('artist'):
+        first = artist.split()[0] if artist.split() else artist
+        if artist in q or (len(first) > 3 and first in q.split()):
+            spec['artist'] = artist
+            break
+    if re.search(r'\bunsigned\b', q):
+        spec['signed'] = False
+    elif re.search(r'\bsigned\b', q):
+        spec['signed'] = True
+    for m in _MEDIUM_WORDS:
+        if m in q:
+            spec['medium'] = m
+            break
+    years = re.findall(r'\b(19\d{2}|20\d{2})\b', q)
+    if years:
+        if re.search(r'\b(since|after|from)\b', q) and len(years) == 1:
+            spec['date_from'] = f'{years[0]}-01-01'
+        else:
+            spec['date_from'] = f'{min(years)}-01-01'
+            spec['date_to'] = f'{max(years)}-12-31'
+    over = re.search(r'\b(?:over|above|more than)\s+\$?(\d+)', q)
+    under = re.search(r'\b(?:under|below|less than)\s+\$?(\d+)', q)
+    if over:
+        spec['price_min'] = float(over.group(1))
+    if under:
+        spec['price_max'] = float(under.group(1))
+    group_by = []
+    for word, field in (('month', 'month'), ('year', 'year'), ('medium', 'medium'),
+                        ('source', 'source')):
+        if re.search(rf'\b(by|per|each)\s+{word}', q):
+            group_by.append(field)
+    spec['group_by'] = group_by
+    return normalize_spec(spec)
+
+
+def describe_result(result):
+    """Plain-English summary of a query result for the dashboard answer box."""
+    o = result.get('overall') or {}
+    if not o.get('count'):
+        return 'No matching sales found.'
+    spec = result.get('spec') or {}
+    scope = []
+    if spec.get('signed') is not None:
+        scope.append('signed' if spec['signed'] else 'unsigned')
+    if spec.get('artist'):
+        scope.append(spec['artist'].title())
+    if spec.get('medium'):
+        scope.append(spec['medium'])
+    if spec.get('title'):
+        scope.append(f'"{spec["title"]}"')
+    label = ' '.join(scope) or 'all'
+    lines = [
+        f"{o['count']:,} {label} sales — median ${o['median']:,.0f}, "
+        f"range ${o['min']:,.0f}–${o['max']:,.0f}, avg ${o['avg']:,.0f}."
+    ]
+    for g in result.get('groups', [])[:12]:
+        key = ' / '.join(str(g[f]) for f in spec.get('group_by', []))
+        lines.append(f"{key}: {g['count']} sales, median ${g['median']:,.0f}")
+    return '\n'.join(lines)
@@ -0,0 +1,911 @@
+"""
+DATARADAR Region Cache — named, bounded in-process caches with metrics.
+
+Replaces the hand-rolled `_x_cache` / `_x_cache_time` globals in app.py, each
+with its own TTL math, with one subsystem:
+
+  1. CacheRegion — an LRU map with a default TTL, optional entry and byte
+     bounds, and an optional stale window. get_or_load() is single-flight per
+     key: concurrent misses share one load. Inside the stale window an
+     expired entry is still returned while a background thread reloads it
+     (stale-while-revalidate).
+  2. Tags — each entry can carry tags ('ebay', 'listings', ...) and
+     invalidate_tag() drops every entry carrying one, in every region.
+  3. Versions — an entry can be stored with a version (file mtime, state_db
+     namespace version); a lookup with a different version is a miss, so
+     data-dependent entries invalidate themselves.
+  4. Metrics — hits, stale hits, misses, loads, load errors, evictions,
+     expirations and invalidations per region, plus current entries/bytes.
+  5. RefreshAhead — a background thread that renews registered entries
+     shortly before they expire, with exponential backoff while the
+     upstream fails, so requests read the last good snapshot and never wait.
+  6. DependencyGraph — derived caches declare their inputs (data files,
+     state_db namespaces, other cache entries, the date) and are stored with
+     the graph's version for them, so swapping one input file invalidates
+     exactly the results built from it.
+  7. WarmSnapshot — pickles chosen regions to disk periodically and at
+     shutdown; on boot restores the entries whose inputs still hash the same,
+     so a restart doesn't begin with every cache cold.
+
+Byte sizes are estimates (approx_size samples large containers) — good enough
+to keep one region from holding the whole comp store twice, not an exact
+accounting.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+_DEFAULT = object()
+_SAMPLE = 32
+_MAX_DEPTH = 6
+
+
+def approx_size(value, _depth=0):
+    """Rough deep size in bytes; containers are sampled and extrapolated."""
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if value is None or isinstance(value, (bool, int, float)):
+        return 24
+    if _depth >= _MAX_DEPTH:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        n = len(value)
+        if not n:
+            return sys.getsizeof(value)
+        sample = list(value.items())[:_SAMPLE]
+        per = sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1) for k, v in sample) / len(sample)
+        return sys.getsizeof(value) + int(per * n)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        n = len(value)
+        if not n:
+            return sys.getsizeof(value)
+        sample = list(value)[:_SAMPLE] if not isinstance(value, (list, tuple)) else value[:_SAMPLE]
+        per = sum(approx_size(v, _depth + 1) for v in sample) / len(sample)
+        return sys.getsizeof(value) + int(per * n)
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    __slots__ = ('value', 'stored_at', 'expires_at', 'size', 'tags', 'version', 'generation')
+
+    def __init__(self, value, stored_at, expires_at, size, tags, version, generation):
+        self.value = value
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+        self.size = size
+        self.tags = tags
+        self.version = version
+        self.generation = generation
+
+
+# =============================================================================
+# Region
+# =============================================================================
+
+class CacheRegion:
+    """One named LRU cache with TTL, optional bounds and a stale window."""
+
+    def __init__(self, name, ttl=None, max_entries=None, max_bytes=None, stale_ttl=0, sizer=approx_size):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.sizer = sizer
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stripes = [threading.Lock() for _ in range(16)]
+        self._refreshing = set()
+        self._generation = 0
+        self._counters = dict.fromkeys(
+            ('hits', 'stale_hits', 'misses', 'loads', 'load_errors',
+             'evictions', 'expirations', 'invalidations'), 0)
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def _state(self, key, version, now):
+        """(entry, 'fresh' | 'stale' | None) without touching counters."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None, None
+        if version is not None and entry.version != version:
+            return entry, None
+        if entry.expires_at is None or now < entry.expires_at:
+            return entry, 'fresh'
+        if self.stale_ttl and now < entry.expires_at + self.stale_ttl:
+            return entry, 'stale'
+        return entry, None
+
+    def get(self, key, default=None, version=None):
+        """Fresh value for key, else default. Expired entries are dropped."""
+        now = time.monotonic()
+        with self._lock:
+            entry, state = self._state(key, version, now)
+            if state == 'fresh':
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry.value
+            if entry is not None and state is None:
+                self._remove(key)
+                self._counters['expirations'] += 1
+            self._counters['misses'] += 1
+            return default
+
+    def peek(self, key):
+        """(value, age_seconds) for whatever is stored, expired or not; (None, None) if absent."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, None
+            return entry.value, time.monotonic() - entry.stored_at
+
+    def generation(self, key):
+        """Counter of the set() that stored key (None if absent); changes on every store."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.generation if entry is not None else None
+
+    def get_or_load(self, key, loader, ttl=_DEFAULT, tags=(), version=None):
+        """Fresh value, or stale value plus a background reload, or load now.
+        Concurrent misses on the same key wait for a single loader call."""
+        now = time.monotonic()
+        with self._lock:
+            entry, state = self._state(key, version, now)
+            if state == 'fresh':
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                return entry.value
+            if state == 'stale':
+                self._entries.move_to_end(key)
+                self._counters['stale_hits'] += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, loader, ttl, tags, version),
+                                     name=f'cache-refresh-{self.name}', daemon=True).start()
+                return entry.value
+        with self._stripes[hash(key) % len(self._stripes)]:
+            with self._lock:
+                entry, state = self._state(key, version, time.monotonic())
+                if state == 'fresh':
+                    self._counters['hits'] += 1
+                    return entry.value
+                self._counters['misses'] += 1
+            value = self._load(loader)
+            self.set(key, value, ttl=ttl, tags=tags, version=version)
+            return value
+
+    def _load(self, loader):
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                self._counters['load_errors'] += 1
+            raise
+        with self._lock:
+            self._counters['loads'] += 1
+        return value
+
+    def _refresh(self, key, loader, ttl, tags, version):
+        try:
+            self.set(key, self._load(loader), ttl=ttl, tags=tags, version=version)
+        except Exception as e:
+            print(f"[cache] {self.name} refresh of {key!r} failed, serving stale: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    # -------------------------------------------------------------------------
+    # Mutation
+    # -------------------------------------------------------------------------
+
+    def set(self, key, value, ttl=_DEFAULT, tags=(), version=None):
+        ttl = self.ttl if ttl is _DEFAULT else ttl
+        now = time.monotonic()
+        size = self.sizer(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._generation += 1
+            self._entries[key] = _Entry(value, now, None if ttl is None else now + ttl,
+                                        size, frozenset(tags), version, self._generation)
+            self._bytes += size
+            self._evict()
+        return value
+
+    def export(self):
+        """[(key, value, age, expires_in, tags, version)] for every entry, expired or not."""
+        now = time.monotonic()
+        with self._lock:
+            return [(key, e.value, now - e.stored_at,
+                     None if e.expires_at is None else e.expires_at - now,
+                     tuple(e.tags), e.version)
+                    for key, e in self._entries.items()]
+
+    def restore(self, key, value, age, expires_in, tags=(), version=None):
+        """Store an exported entry, keeping its age and remaining TTL."""
+        now = time.monotonic()
+        self.set(key, value, tags=tags, version=version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.value is value:
+                entry.stored_at = now - age
+                entry.expires_at = None if expires_in is None else now + expires_in
+        return value
+
+    def _evict(self):
+        # never evict the entry just stored, even if it alone is over max_bytes
+        while len(self._entries) > 1 and (
+                (self.max_entries and len(self._entries) > self.max_entries)
+                or (self.max_bytes and self._bytes > self.max_bytes)):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self._counters['evictions'] += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def invalidate(self, *keys):
+        with self._lock:
+            n = 0
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+                    n += 1
+            self._counters['invalidations'] += n
+            return n
+
+    def invalidate_tag(self, tag):
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if tag in e.tags]
+            return self.invalidate(*keys)
+
+    def invalidate_version(self, version):
+        """Drop entries stored under any version other than this one."""
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if e.version is not None and e.version != version]
+            return self.invalidate(*keys)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+            return self.invalidate(*keys)
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._counters)
+            lookups = out['hits'] + out['stale_hits'] + out['misses']
+            out.update({
+                'entries': len(self._entries),
+                'bytes': self._bytes if self.max_bytes else None,
+                'hit_rate': round((out['hits'] + out['stale_hits']) / lookups, 3) if lookups else None,
+                'ttl_s': self.ttl,
+                'stale_ttl_s': self.stale_ttl or None,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            })
+        return out
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+class CacheRegistry:
+    """Named regions plus cross-region tag invalidation and stats."""
+
+    def __init__(self):
+        self._regions = {}
+        self._lock = threading.Lock()
+
+    def region(self, name, **opts):
+        """Create a region (or return the existing one with that name)."""
+        with self._lock:
+            region = self._regions.get(name)
+            if region is None:
+                region = self._regions[name] = CacheRegion(name, **opts)
+            return region
+
+    def __getitem__(self, name):
+        return self._regions[name]
+
+    def __contains__(self, name):
+        return name in self._regions
+
+    def names(self):
+        return sorted(self._regions)
+
+    def invalidate_tag(self, tag):
+        """{region: entries dropped} for every region holding the tag."""
+        out = {}
+        for name, region in list(self._regions.items()):
+            n = region.invalidate_tag(tag)
+            if n:
+                out[name] = n
+        return out
+
+    def clear(self, names=None):
+        """Clear the named regions (all when names is None); {region: entries dropped}."""
+        targets = self.names() if names is None else [n for n in names if n in self._regions]
+        return {name: self._regions[name].clear() for name in targets}
+
+    def stats(self):
+        return {name: region.stats() for name, region in sorted(self._regions.items())}
+
+
+# =============================================================================
+# Dependency graph
+# =============================================================================
+
+class DependencyGraph:
+    """Named inputs and the derived caches built from them.
+
+    Sources each report a version:
+      file(name, path)        (mtime_ns, size, inode); with hash=True, a sha1
+                              of the contents, recomputed only when the stat
+                              changes, so a touch without an edit is no change
+      value(name, fn)         whatever fn() returns (state_db.version, today)
+      entry(name, region, k)  the generation of another cache entry
+    derived(name, inputs, region) versions as the tuple of its inputs'
+    versions, resolved recursively. Its results are stored in region under
+    that version, so a lookup misses exactly when one of its inputs moved.
+    sweep() drops the superseded entries eagerly and reports what changed.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._nodes = {}  # name -> (kind, spec)
+        self._hashes = {}  # path -> (stat signature, sha1)
+        self._tokens = {}  # (region, key) -> (generation, sha1 of the pickled value)
+        self._ignore = {}  # (region, key) -> top-level keys left out of that sha1
+        self._swept = {}  # derived name -> version at last sweep
+        self._swept_at = 0.0
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Declaration
+    # -------------------------------------------------------------------------
+
+    def file(self, name, path, hash=False):
+        self._nodes[name] = ('file', (path, hash))
+
+    def value(self, name, fn):
+        self._nodes[name] = ('value', fn)
+
+    def entry(self, name, region, key, ignore=()):
+        """ignore: top-level keys of a dict value (fetch stamps) that don't count
+        as a content change for fingerprint()."""
+        self._nodes[name] = ('entry', (region, key))
+        if ignore:
+            self._ignore[(region, key)] = frozenset(ignore)
+
+    def derived(self, name, inputs, region):
+        unknown = [i for i in inputs if i not in self._nodes]
+        if unknown:
+            raise KeyError(f"{name}: undeclared input(s) {unknown}")
+        self._nodes[name] = ('derived', (tuple(inputs), region))
+
+    # -------------------------------------------------------------------------
+    # Versions
+    # -------------------------------------------------------------------------
+
+    def _file_version(self, path, hash):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if not hash:
+            return sig
+        known = self._hashes.get(path)
+        if known and known[0] == sig:
+            return known[1]
+        h = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                h.update(chunk)
+        self._hashes[path] = (sig, h.hexdigest())
+        return self._hashes[path][1]
+
+    def version(self, name):
+        kind, spec = self._nodes[name]
+        if kind == 'file':
+            return self._file_version(*spec)
+        if kind == 'value':
+            return spec()
+        if kind == 'entry':
+            region, key = spec
+            return self.registry[region].generation(key)
+        return tuple(self.version(i) for i in spec[0])
+
+    def digest(self, name):
+        """Short hash of name's current version; only meaningful in this process."""
+        return hashlib.sha1(repr(self.version(name)).encode()).hexdigest()[:12]
+
+    def fingerprint(self, name):
+        """Like digest(), but comparable across processes and restarts: files by
+        content hash, cache entries by a hash of their value rather than a
+        generation. Use this for anything stored outside memory."""
+        return hashlib.sha1(repr(self._stable(name)).encode()).hexdigest()[:12]
+
+    def _stable(self, name):
+        kind, spec = self._nodes[name]
+        if kind == 'file':
+            return self._file_version(spec[0], True)
+        if kind == 'value':
+            return spec()
+        if kind == 'entry':
+            return self._entry_token(*spec)
+        return tuple(self._stable(i) for i in spec[0])
+
+    def _entry_token(self, region, key):
+        cache = self.registry[region]
+        generation = cache.generation(key)
+        if generation is None:
+            return None
+        known = self._tokens.get((region, key))
+        if known and known[0] == generation:
+            return known[1]
+        value, _age = cache.peek(key)
+        ignore = self._ignore.get((region, key))
+        if ignore and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k not in ignore}
+        token = hashlib.sha1(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)).hexdigest()
+        self._tokens[(region, key)] = (generation, token)
+        return token
+
+    def prime_token(self, region, key, token):
+        """Record the value hash of an entry just restored from a snapshot."""
+        generation = self.registry[region].generation(key)
+        if generation is not None:
+            self._tokens[(region, key)] = (generation, token)
+
+    def entry_nodes(self):
+        """{name: (region, key)} for the entry inputs."""
+        return {n: spec for n, (kind, spec) in self._nodes.items() if kind == 'entry'}
+
+    def producer(self, region, version):
+        """Node whose current version an entry in region was stored under:
+        the derived node backed by region, else a file node; None if stale."""
+        if version is None:
+            return None
+        for name, (kind, spec) in list(self._nodes.items()):
+            if kind == 'derived' and spec[1] == region and self.version(name) == version:
+                return name
+        for name, (kind, spec) in list(self._nodes.items()):
+            if kind == 'file' and self.version(name) == version:
+                return name
+        return None
+
+    def cached(self, name, key, loader, **opts):
+        """get_or_load on name's region, versioned by its inputs."""
+        _inputs, region = self._nodes[name][1]
+        return self.registry[region].get_or_load(key, loader, version=self.version(name), **opts)
+
+    def sweep(self, min_interval=0.0):
+        """Drop entries of derived caches whose inputs changed since the last
+        sweep; {name: entries dropped}. Lookups are correct without it — this
+        only frees the memory early."""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._swept_at < min_interval:
+                return {}
+            self._swept_at = now
+        dropped = {}
+        for name, (kind, spec) in list(self._nodes.items()):
+            if kind != 'derived':
+                continue
+            version = self.version(name)
+            if name in self._swept and self._swept[name] != version:
+                dropped[name] = self.registry[spec[1]].invalidate_version(version)
+            self._swept[name] = version
+        return dropped
+
+    def describe(self):
+        """{name: {kind, inputs, version}} with versions shortened to a hash."""
+        out = {}
+        for name, (kind, spec) in self._nodes.items():
+            node = {'kind': kind}
+            if kind == 'derived':
+                node['inputs'] = list(spec[0])
+                node['region'] = spec[1]
+            elif kind == 'file':
+                node['path'] = os.path.basename(spec[0])
+            try:
+                node['version'] = self.digest(name)
+            except Exception as e:
+                node['error'] = str(e)
+            out[name] = node
+        return out
+
+
+# =============================================================================
+# Refresh-ahead
+# =============================================================================
+
+def keep_last_good(new, old):
+    """Default acceptance test: an empty result never replaces a non-empty one
+    (the eBay helpers return []/{} instead of raising when a call fails)."""
+    return bool(new) or not old
+
+
+class _Job:
+    def __init__(self, name, loader, region, key, interval, accept, store, tags=()):
+        self.name = name
+        self.loader = loader
+        self.region = region
+        self.key = key
+        self.tags = tuple(tags)
+        self.interval = interval
+        self.accept = accept
+        self.store = store
+        self.failures = 0
+        self.next_try = 0.0
+        self.last_run = None
+        self.last_ok = None
+        self.last_error = None
+        self.last_duration = None
+        self.running = False
+
+
+class RefreshAhead:
+    """Renews cache entries `lead` seconds before their TTL runs out.
+
+    register() binds a name to (loader, region, key); read(name) returns the
+    stored snapshot whatever its age, loading synchronously only when there is
+    none yet (cold start). register_task() runs a function every `interval`
+    seconds with the same backoff, for refreshes that write elsewhere (state_db).
+    A failed or rejected refresh keeps the old snapshot and retries after
+    backoff_base * 2**(failures-1) seconds, capped at backoff_max.
+    """
+
+    def __init__(self, registry, lead=30, tick=5, backoff_base=30, backoff_max=900):
+        self.registry = registry
+        self.lead = lead
+        self.tick = tick
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._stopped = False
+
+    def register(self, name, loader, region, key, accept=keep_last_good, store=None, tags=()):
+        """store(value) replaces region.set when the entry has a custom writer;
+        tags are set on the entry like the inline loader sets them."""
+        self._jobs[name] = _Job(name, loader, region, key, None, accept, store, tags)
+
+    def register_task(self, name, fn, interval):
+        self._jobs[name] = _Job(name, fn, None, None, interval, None, None)
+
+    # -------------------------------------------------------------------------
+    # Readers
+    # -------------------------------------------------------------------------
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def handles(self, name):
+        return self.running and name in self._jobs
+
+    def read(self, name):
+        """Last good snapshot for name (any age); a cold read loads it once,
+        single-flight, and lets loader errors propagate."""
+        job = self._jobs[name]
+        region = self.registry[job.region]
+        value, _age = region.peek(job.key)
+        if value is not None:
+            return value
+        return region.get_or_load(job.key, job.loader, tags=job.tags)
+
+    def age(self, name):
+        job = self._jobs[name]
+        if job.region is None:
+            return None if job.last_ok is None else time.time() - job.last_ok
+        return self.registry[job.region].peek(job.key)[1]
+
+    # -------------------------------------------------------------------------
+    # Background loop
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        with self._lock:
+            if self.running or self._stopped:
+                return False
+            self._thread = threading.Thread(target=self._run, name='refresh-ahead', daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def _due(self, job, now):
+        if job.running or now < job.next_try:
+            return False
+        if job.region is None:
+            return job.last_run is None or time.time() - job.last_run >= job.interval
+        region = self.registry[job.region]
+        _value, age = region.peek(job.key)
+        return age is None or region.ttl is None or age >= region.ttl - self.lead
+
+    def _run(self):
+        while not self._stopped:
+            now = time.monotonic()
+            for job in list(self._jobs.values()):
+                if self._due(job, now):
+                    self._refresh(job)
+            self._wake.wait(self.tick)
+
+    def _refresh(self, job):
+        with self._lock:
+            if job.running:
+                return
+            job.running = True
+        started = time.monotonic()
+        job.last_run = time.time()
+        try:
+            value = job.loader()
+            if job.region is not None:
+                old, _age = self.registry[job.region].peek(job.key)
+                if not job.accept(value, old):
+                    raise ValueError('empty result rejected, keeping last good snapshot')
+                if job.store:
+                    job.store(value)
+                else:
+                    self.registry[job.region].set(job.key, value, tags=job.tags)
+            job.failures = 0
+            job.next_try = 0.0
+            job.last_ok = time.time()
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (job.failures - 1))
+            job.next_try = time.monotonic() + delay
+            job.last_error = str(e)[:200]
+            print(f"[refresh] {job.name} failed ({job.failures}x), retry in {delay:.0f}s: {e}")
+        finally:
+            job.last_duration = round(time.monotonic() - started, 3)
+            job.running = False
+
+    def status(self):
+        out = {}
+        now = time.monotonic()
+        for name, job in self._jobs.items():
+            age = self.age(name)
+            out[name] = {
+                'age_s': round(age, 1) if age is not None else None,
+                'failures': job.failures,
+                'retry_in_s': round(job.next_try - now, 1) if job.next_try > now else None,
+                'last_error': job.last_error,
+                'last_duration_s': job.last_duration,
+                'refreshing': job.running,
+            }
+        return {'running': self.running, 'lead_s': self.lead, 'jobs': out}
+
+
+# =============================================================================
+# Warm snapshot
+# =============================================================================
+
+class WarmSnapshot:
+    """Pickles selected regions to one file and restores them on boot.
+
+    Entries without a version (TTL'd upstream data) come back with their age,
+    so TTLs, stale windows and refresh-ahead pick up where they stopped.
+    Versioned entries are saved with the graph node whose version they carry
+    and that node's fingerprint (content hashes of input files, state_db
+    versions, hashes of input entries), and are restored only if the inputs
+    fingerprint the same at boot. Regions included without portable=True hold
+    values computed by this code and are restored only into the same build.
+    extra() covers process state kept outside the registry.
+    """
+
+    FORMAT = 1
+
+    def __init__(self, registry, graph, path, build='', max_age=86400):
+        self.registry = registry
+        self.graph = graph
+        self.path = path
+        self.build = build
+        self.max_age = max_age
+        self._regions = {}  # name -> portable across builds
+        self._extras = {}  # name -> (dump, load, node)
+        self._saved_sig = None
+        self._lock = threading.Lock()
+        self.last_save = None
+        self.last_restore = None
+
+    def include(self, *names, portable=False):
+        for name in names:
+            self._regions[name] = portable
+
+    def extra(self, name, dump, load, node):
+        """dump() -> picklable value (None to skip), load(value) on restore;
+        restored only when graph node `node` fingerprints the same."""
+        self._extras[name] = (dump, load, node)
+
+    def _signature(self):
+        regions = tuple((n, self.registry[n]._generation) for n in sorted(self._regions))
+        extras = tuple((n, repr(self.graph.version(node))) for n, (_d, _l, node) in sorted(self._extras.items()))
+        return regions + extras
+
+    # -------------------------------------------------------------------------
+    # Save
+    # -------------------------------------------------------------------------
+
+    def save(self, force=False):
+        """Write the snapshot if anything changed since the last save or
+        restore; returns the report, or None when there was nothing new."""
+        with self._lock:
+            sig = self._signature()
+            if not force and sig == self._saved_sig:
+                return None
+            started = time.monotonic()
+            fingerprints = {}
+
+            def fingerprint(node):
+                if node not in fingerprints:
+                    fingerprints[node] = self.graph.fingerprint(node)
+                return fingerprints[node]
+
+            regions, counts, dropped = {}, {}, 0
+            for name in self._regions:
+                rows = []
+                for key, value, age, expires_in, tags, version in self.registry[name].export():
+                    node = self.graph.producer(name, version)
+                    if version is not None and node is None:
+                        dropped += 1  # superseded, would never be served again
+                        continue
+                    rows.append((key, value, age, expires_in, tags, node,
+                                 fingerprint(node) if node else None))
+                regions[name] = rows
+                counts[name] = len(rows)
+            tokens = {}
+            for name, (region, key) in self.graph.entry_nodes().items():
+                if region in self._regions and self.registry[region].generation(key) is not None:
+                    fingerprint(name)
+                    tokens[(region, key)] = self.graph._tokens[(region, key)][1]
+            extras = {}
+            for name, (dump, _load, node) in self._extras.items():
+                value = dump()
+                if value is not None:
+                    extras[name] = (value, node, fingerprint(node))
+            doc = {'format': self.FORMAT, 'build': self.build, 'saved_at': time.time(),
+                   'regions': regions, 'tokens': tokens, 'extras': extras}
+            size = _atomic_write_bytes(self.path, pickle.dumps(doc, pickle.HIGHEST_PROTOCOL))
+            self._saved_sig = sig
+            self.last_save = {
+                'at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'entries': counts,
+                'extras': sorted(extras),
+                'dropped_stale': dropped,
+                'bytes': size,
+                'duration_s': round(time.monotonic() - started, 3),
+            }
+            return self.last_save
+
+    # -------------------------------------------------------------------------
+    # Restore
+    # -------------------------------------------------------------------------
+
+    def restore(self):
+        """Load the snapshot file into the registry; returns the report."""
+        with self._lock:
+            started = time.monotonic()
+            report = {'at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'status': 'restored'}
+            try:
+                with open(self.path, 'rb') as f:
+                    doc = pickle.load(f)
+            except FileNotFoundError:
+                doc, report['status'] = None, 'no snapshot'
+            except Exception as e:
+                doc, report['status'] = None, f'unreadable: {e}'
+            if doc is not None and doc.get('format') != self.FORMAT:
+                doc, report['status'] = None, 'format changed'
+            if doc is not None:
+                elapsed = max(0.0, time.time() - doc['saved_at'])
+                report['snapshot_age_s'] = round(elapsed)
+                report['same_build'] = doc.get('build') == self.build
+                if elapsed > self.max_age:
+                    doc, report['status'] = None, 'too old'
+            if doc is not None:
+                report.update(self._apply(doc, elapsed, report['same_build']))
+            report['duration_s'] = round(time.monotonic() - started, 3)
+            self._saved_sig = self._signature()
+            self.last_restore = report
+            return report
+
+    def _apply(self, doc, elapsed, same_build):
+        restored, rejected = {}, {}
+        versioned = []
+        for name, rows in doc['regions'].items():
+            if name not in self._regions:
+                continue
+            if not (same_build or self._regions[name]):
+                if rows:
+                    rejected[name] = len(rows)
+                continue
+            region = self.registry[name]
+            for row in rows:
+                key, value, age, expires_in, tags, node, _fp = row
+                if node is not None:
+                    versioned.append((name, row))
+                    continue
+                region.restore(key, value, age + elapsed,
+                               None if expires_in is None else expires_in - elapsed, tags)
+                restored[name] = restored.get(name, 0) + 1
+        for (region, key), token in doc['tokens'].items():
+            if region in restored:
+                self.graph.prime_token(region, key, token)
+
+        current = {}
+
+        def matches(node, fp):
+            if node not in current:
+                try:
+                    current[node] = self.graph.fingerprint(node)
+                except Exception as e:
+                    print(f"[warm] fingerprint {node} failed: {e}")
+                    current[node] = None
+            return current[node] == fp
+
+        for name, (key, value, age, expires_in, tags, node, fp) in versioned:
+            if node not in self.graph._nodes or not matches(node, fp):
+                rejected[name] = rejected.get(name, 0) + 1
+                continue
+            self.registry[name].restore(key, value, age + elapsed,
+                                        None if expires_in is None else expires_in - elapsed,
+                                        tags, version=self.graph.version(node))
+            restored[name] = restored.get(name, 0) + 1
+        extras = []
+        for name, (value, node, fp) in doc['extras'].items():
+            if name in self._extras and node in self.graph._nodes and matches(node, fp):
+                try:
+                    self._extras[name][1](value)
+                    extras.append(name)
+                except Exception as e:
+                    print(f"[warm] restoring {name} failed: {e}")
+        return {'restored': restored, 'rejected': rejected, 'extras': extras}
+
+    def status(self):
+        try:
+            st = os.stat(self.path)
+            on_disk = {'bytes': st.st_size,
+                       'saved_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(st.st_mtime))}
+        except FileNotFoundError:
+            on_disk = None
+        return {'path': os.path.basename(self.path), 'build': self.build, 'file': on_disk,
+                'regions': sorted(self._regions), 'extras': sorted(self._extras),
+                'last_save': self.last_save, 'last_restore': self.last_restore}
+
+
+def _atomic_write_bytes(path, data):
+    """temp file in the same directory -> fsync -> rename over the target."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return len(data)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON codec on real payloads: stdlib json vs fast_json
+(orjson when installed) encode and decode times for every data/*.json file
+and, with --routes, the bodies of the heavy API routes captured through the
+Flask test client.
+
+    python scripts/bench_json.py [--routes] [--repeat 5]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import fast_json  # noqa: E402
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
+ROUTES = [
+    '/api/inventory/full-analytics',
+    '/api/deals/enhanced',
+    '/api/prices/search?artist=shepard%20fairey&limit=5000',
+    '/api/dashboard',
+    '/api/analytics/deep',
+]
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def file_payloads():
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.json'))):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        try:
+            yield os.path.basename(path), json.loads(raw), raw
+        except ValueError:
+            continue
+
+
+def route_payloads():
+    import app as dataradar
+    client = dataradar.app.test_client()
+    for route in ROUTES:
+        resp = client.get(route)
+        if resp.status_code == 200:
+            yield route, resp.get_json(), resp.data
+        else:
+            print(f"  (skipped {route}: HTTP {resp.status_code})")
+
+
+def bench(name, obj, raw, repeat):
+    # encode the way jsonify does: sorted keys, compact separators
+    enc_std = best_of(lambda: json.dumps(obj, sort_keys=True, separators=(',', ':'), default=str), repeat)
+    enc_fast = best_of(lambda: fast_json.dumpb(obj, sort_keys=True, default=str), repeat)
+    dec_std = best_of(lambda: json.loads(raw), repeat)
+    dec_fast = best_of(lambda: fast_json.loads(raw), repeat)
+    print(f"{name[:40]:40} {len(raw) / 1024:9.0f} KB  "
+          f"encode {enc_std:8.2f} -> {enc_fast:7.2f} ms ({enc_std / max(enc_fast, 1e-6):5.1f}x)  "
+          f"decode {dec_std:8.2f} -> {dec_fast:7.2f} ms ({dec_std / max(dec_fast, 1e-6):5.1f}x)")
+    return enc_std, enc_fast, dec_std, dec_fast
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--routes', action='store_true', help='also capture and time API route bodies')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"fast_json backend: {fast_json.BACKEND}\n")
+    totals = [0.0, 0.0, 0.0, 0.0]
+    sources = [('data files', file_payloads())]
+    if args.routes:
+        sources.append(('routes', route_payloads()))
+    for label, payloads in sources:
+        print(f"== {label}")
+        for name, obj, raw in payloads:
+            for i, t in enumerate(bench(name, obj, raw, args.repeat)):
+                totals[i] += t
+        print()
+    enc_std, enc_fast, dec_std, dec_fast = totals
+    print(f"total encode {enc_std:.1f} -> {enc_fast:.1f} ms, decode {dec_std:.1f} -> {dec_fast:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
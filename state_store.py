@@ -0,0 +1,472 @@
+"""
+DATARADAR State Store — embedded SQLite (WAL) for mutable app state.
+
+Replaces the read-everything / rewrite-everything JSON files (price history,
+LLM cache, curation, notifications, comms log, watcher history, saved
+searches, scheduler config) with one database file and a tiny repository API.
+
+Architecture:
+  1. docs    — (ns, key) -> JSON value. One row per cache entry / curation
+               mark / config document, so a single write touches one row.
+  2. events  — append-only rows with a global monotonic seq, tagged by log
+               name and an optional key (listing id). Reads by (log, key) hit
+               an index instead of scanning the whole history.
+  3. series  — numeric time series: (name, key, t) -> value, t an integer
+               bucket (e.g. a date ordinal). Range reads by t use an index, so
+               a "last 7 days" query costs the same at 90 or 3650 days kept.
+  4. versions — per-namespace write counter, bumped inside the same
+               transaction as the write. Cheap "did anything change?" probe
+               for in-process caches and other replicas.
+
+WAL mode means readers never block on a writer and a writer never blocks
+readers; writers serialize on the database lock (busy_timeout covers the
+short waits). Each thread gets its own connection.
+
+Several processes (gunicorn workers, replicas on a shared volume) can use
+the same database. Writes are SQLite transactions, so they never interleave.
+lock() adds a named advisory file lock (flock) for work that must run in one
+process at a time, such as a sync job. watch()/poll_changes() tell each
+process when another process writes a namespace, so it can drop an in-memory
+copy.
+
+Migration from the legacy JSON files is one-shot per name: migrate() records
+the name in the migrations table and is a no-op afterwards. The JSON files are
+left on disk untouched as a backup.
+"""
+
+import fast_json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: locks degrade to in-process only
+    fcntl = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    ns TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (ns, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    log TEXT NOT NULL,
+    key TEXT,
+    value TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS events_log_key ON events (log, key, seq);
+CREATE TABLE IF NOT EXISTS series (
+    name TEXT NOT NULL,
+    key TEXT NOT NULL,
+    t INTEGER NOT NULL,
+    value REAL,
+    PRIMARY KEY (name, key, t)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS series_name_t ON series (name, t);
+CREATE TABLE IF NOT EXISTS versions (
+    ns TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    migrated_at TEXT
+);
+"""
+
+
+def _dumps(value):
+    return fast_json.dumps(value, default=str)
+
+
+def _now():
+    return datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class StateStore:
+    """Thread-safe repository over a single SQLite database in WAL mode."""
+
+    def __init__(self, path, busy_timeout_ms=5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._watches = {}  # ns -> [callback]
+        self._seen = {}  # ns -> version last reported to callbacks
+        self._watch_lock = threading.Lock()
+        self._polled_at = 0.0
+        self._thread_locks = {}  # name -> threading.Lock (fallback without fcntl)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+
+    # -------------------------------------------------------------------------
+    # Connection / transactions
+    # -------------------------------------------------------------------------
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT; nested calls join the outer transaction."""
+        conn = self._conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _bump(self, conn, ns):
+        conn.execute(
+            'INSERT INTO versions (ns, version) VALUES (?, 1) '
+            'ON CONFLICT(ns) DO UPDATE SET version = version + 1', (ns,))
+
+    def version(self, ns):
+        """Write counter for a namespace or log (0 if never written)."""
+        row = self._conn().execute('SELECT version FROM versions WHERE ns = ?', (ns,)).fetchone()
+        return row[0] if row else 0
+
+    # -------------------------------------------------------------------------
+    # Docs (namespaced key/value)
+    # -------------------------------------------------------------------------
+
+    def get(self, ns, key, default=None):
+        row = self._conn().execute(
+            'SELECT value FROM docs WHERE ns = ? AND key = ?', (ns, str(key))).fetchone()
+        return fast_json.loads(row[0]) if row else default
+
+    def put(self, ns, key, value):
+        with self.transaction() as conn:
+            conn.execute(
+                'INSERT INTO docs (ns, key, value, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(ns, key) DO UPDATE SET value = excluded.value, '
+                'updated_at = excluded.updated_at',
+                (ns, str(key), _dumps(value), _now()))
+            self._bump(conn, ns)
+
+    def put_many(self, ns, items):
+        """Upsert {key: value} (or (key, value) pairs) in one transaction."""
+        pairs = items.items() if isinstance(items, dict) else items
+        now = _now()
+        rows = [(ns, str(k), _dumps(v), now) for k, v in pairs]
+        if not rows:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO docs (ns, key, value, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(ns, key) DO UPDATE SET value = excluded.value, '
+                'updated_at = excluded.updated_at', rows)
+            self._bump(conn, ns)
+
+    def delete(self, ns, *keys):
+        if not keys:
+            return
+        with self.transaction() as conn:
+            conn.executemany('DELETE FROM docs WHERE ns = ? AND key = ?',
+                             [(ns, str(k)) for k in keys])
+            self._bump(conn, ns)
+
+    def all(self, ns):
+        """Every doc in a namespace as {key: value}."""
+        rows = self._conn().execute('SELECT key, value FROM docs WHERE ns = ?', (ns,))
+        return {k: fast_json.loads(v) for k, v in rows}
+
+    def count(self, ns):
+        return self._conn().execute('SELECT COUNT(*) FROM docs WHERE ns = ?', (ns,)).fetchone()[0]
+
+    # -------------------------------------------------------------------------
+    # Events (append-only logs)
+    # -------------------------------------------------------------------------
+
+    def append(self, log, value, key=None):
+        """Append one event; returns its seq."""
+        with self.transaction() as conn:
+            cur = conn.execute(
+                'INSERT INTO events (log, key, value, created_at) VALUES (?, ?, ?, ?)',
+                (log, None if key is None else str(key), _dumps(value), _now()))
+            self._bump(conn, log)
+            return cur.lastrowid
+
+    def events(self, log, key=None, since=0, limit=None, newest_first=False):
+        """[(seq, key, value)] for a log, optionally one key and/or after seq."""
+        sql = 'SELECT seq, key, value FROM events WHERE log = ? AND seq > ?'
+        args = [log, int(since or 0)]
+        if key is not None:
+            sql += ' AND key = ?'
+            args.append(str(key))
+        sql += ' ORDER BY seq DESC' if newest_first else ' ORDER BY seq'
+        if limit:
+            sql += ' LIMIT ?'
+            args.append(int(limit))
+        return [(s, k, fast_json.loads(v)) for s, k, v in self._conn().execute(sql, args)]
+
+    def last_event(self, log, key=None):
+        rows = self.events(log, key=key, limit=1, newest_first=True)
+        return rows[0] if rows else None
+
+    def update_event(self, seq, value):
+        with self.transaction() as conn:
+            row = conn.execute('SELECT log FROM events WHERE seq = ?', (seq,)).fetchone()
+            if not row:
+                return False
+            conn.execute('UPDATE events SET value = ? WHERE seq = ?', (_dumps(value), seq))
+            self._bump(conn, row[0])
+            return True
+
+    def trim(self, log, keep, key=None):
+        """Drop all but the newest `keep` events of a log (or of one key)."""
+        sql = 'DELETE FROM events WHERE log = ? AND {k} seq NOT IN (' \
+              'SELECT seq FROM events WHERE log = ? AND {k} 1 ORDER BY seq DESC LIMIT ?)'
+        if key is None:
+            sql = sql.format(k='')
+            args = (log, log, int(keep))
+        else:
+            sql = sql.format(k='key = ? AND')
+            args = (log, str(key), log, str(key), int(keep))
+        with self.transaction() as conn:
+            removed = conn.execute(sql, args).rowcount
+            if removed:
+                self._bump(conn, log)
+            return removed
+
+    def count_events(self, log, key=None):
+        if key is None:
+            row = self._conn().execute('SELECT COUNT(*) FROM events WHERE log = ?', (log,)).fetchone()
+        else:
+            row = self._conn().execute('SELECT COUNT(*) FROM events WHERE log = ? AND key = ?',
+                                       (log, str(key))).fetchone()
+        return row[0]
+
+    def last_seq(self, log=None):
+        if log is None:
+            row = self._conn().execute('SELECT MAX(seq) FROM events').fetchone()
+        else:
+            row = self._conn().execute('SELECT MAX(seq) FROM events WHERE log = ?', (log,)).fetchone()
+        return row[0] or 0
+
+    # -------------------------------------------------------------------------
+    # Series (numeric time series)
+    # -------------------------------------------------------------------------
+
+    def series_put(self, name, points):
+        """Upsert (key, t, value) points in one transaction; returns the count."""
+        rows = [(name, str(k), int(t), v) for k, t, v in points]
+        if not rows:
+            return 0
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT INTO series (name, key, t, value) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(name, key, t) DO UPDATE SET value = excluded.value', rows)
+            self._bump(conn, name)
+        return len(rows)
+
+    def series_range(self, name, t_from=None, t_to=None, key=None):
+        """[(key, t, value)] ordered by key then t; bounds are inclusive."""
+        sql = 'SELECT key, t, value FROM series WHERE name = ?'
+        args = [name]
+        if key is not None:
+            sql += ' AND key = ?'
+            args.append(str(key))
+        if t_from is not None:
+            sql += ' AND t >= ?'
+            args.append(int(t_from))
+        if t_to is not None:
+            sql += ' AND t <= ?'
+            args.append(int(t_to))
+        sql += ' ORDER BY key, t'
+        return self._conn().execute(sql, args).fetchall()
+
+    def series_times(self, name):
+        """Distinct t values stored for a series, ascending."""
+        rows = self._conn().execute(
+            'SELECT DISTINCT t FROM series WHERE name = ? ORDER BY t', (name,))
+        return [r[0] for r in rows]
+
+    def series_delete_before(self, name, t):
+        """Drop points older than t (retention); returns rows removed."""
+        with self.transaction() as conn:
+            removed = conn.execute('DELETE FROM series WHERE name = ? AND t < ?',
+                                   (name, int(t))).rowcount
+            if removed:
+                self._bump(conn, name)
+            return removed
+
+    # -------------------------------------------------------------------------
+    # Cross-process coordination
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def lock(self, name, timeout=None):
+        """Exclusive advisory lock shared by every process on this database.
+        Yields True when held. timeout=0 tries once; None waits forever.
+        The lock is released when the block exits or the process dies."""
+        if fcntl is None:
+            tlock = self._thread_locks.setdefault(name, threading.Lock())
+            held = tlock.acquire(timeout=-1 if timeout is None else timeout)
+            try:
+                yield held
+            finally:
+                if held:
+                    tlock.release()
+            return
+        fd = os.open(f'{self.path}.{name}.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | (0 if deadline is None else fcntl.LOCK_NB))
+                    held = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        held = False
+                        break
+                    time.sleep(0.05)
+            try:
+                yield held
+            finally:
+                if held:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def locked(self, name):
+        """True if some process (or thread) currently holds lock(name)."""
+        with self.lock(name, timeout=0) as held:
+            return not held
+
+    def watch(self, ns, callback):
+        """Call callback(ns) from poll_changes() whenever ns's version moves,
+        whichever process made the write."""
+        version = self.version(ns)
+        with self._watch_lock:
+            self._watches.setdefault(ns, []).append(callback)
+            self._seen.setdefault(ns, version)
+
+    def poll_changes(self, min_interval=0.0):
+        """One query over the watched versions; fires callbacks for namespaces
+        that changed since the last poll. Returns the changed names."""
+        now = time.monotonic()
+        with self._watch_lock:
+            if not self._watches or now - self._polled_at < min_interval:
+                return []
+            self._polled_at = now
+            names = list(self._watches)
+        marks = ','.join('?' * len(names))
+        current = dict(self._conn().execute(
+            f'SELECT ns, version FROM versions WHERE ns IN ({marks})', names).fetchall())
+        fired = []
+        with self._watch_lock:
+            for ns in names:
+                version = current.get(ns, 0)
+                if version != self._seen.get(ns):
+                    self._seen[ns] = version
+                    fired.append((ns, list(self._watches[ns])))
+        for ns, callbacks in fired:
+            for cb in callbacks:
+                try:
+                    cb(ns)
+                except Exception as e:
+                    print(f"[state] watch callback for {ns} failed: {e}")
+        return [ns for ns, _cbs in fired]
+
+    # -------------------------------------------------------------------------
+    # One-shot migration
+    # -------------------------------------------------------------------------
+
+    def migrated(self, name):
+        return self._conn().execute(
+            'SELECT 1 FROM migrations WHERE name = ?', (name,)).fetchone() is not None
+
+    def migrate(self, name, fn):
+        """Run fn(store) once, atomically, and record it under name."""
+        if self.migrated(name):
+            return False
+        with self.transaction() as conn:
+            if conn.execute('SELECT 1 FROM migrations WHERE name = ?', (name,)).fetchone():
+                return False
+            fn(self)
+            conn.execute('INSERT INTO migrations (name, migrated_at) VALUES (?, ?)', (name, _now()))
+        return True
+
+
+class LogIndex:
+    """In-memory view of one event log: all events in append order plus a
+    {key: [event, ...]} index, caught up incrementally from the store.
+
+    refresh() compares the log's version counter with the one last seen.
+    Appends bump the version by exactly one, so when the number of new rows
+    since last_seq equals the version delta they are applied in place;
+    anything else (trim, update_event, a racing writer) forces a rebuild.
+    Returned lists are shared with the index — treat them as read-only.
+    """
+
+    def __init__(self, store, log):
+        self.store = store
+        self.log = log
+        self.entries = []
+        self.by_key = {}
+        self.last_seq = 0
+        self.version = None
+        self._lock = threading.Lock()
+
+    def _apply(self, rows):
+        for seq, key, value in rows:
+            self.entries.append(value)
+            self.by_key.setdefault(key, []).append(value)
+            self.last_seq = seq
+
+    def refresh(self):
+        with self._lock:
+            version = self.store.version(self.log)
+            if version == self.version:
+                return self
+            if self.version is not None:
+                rows = self.store.events(self.log, since=self.last_seq)
+                if len(rows) == version - self.version:
+                    self._apply(rows)
+                    self.version = version
+                    return self
+            self.entries, self.by_key, self.last_seq = [], {}, 0
+            self._apply(self.store.events(self.log))
+            self.version = version
+        return self
+
+    def get(self, key):
+        return self.refresh().by_key.get(str(key), [])
+
+    def all(self):
+        return self.refresh().entries
+
+    def grouped(self):
+        return dict(self.refresh().by_key)
+
+
+def load_json_file(path, default=None):
+    """Helper for migrations: parsed JSON or default on missing/corrupt file."""
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, 'r') as f:
+            return fast_json.load(f)
+    except Exception:
+        return default
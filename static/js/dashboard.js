@@ -0,0 +1,5544 @@
+// ==========================================
+// State
+// ==========================================
+let currentTab = 'dash';
+let invData = null, promoData = null;
+
+// ==========================================
+// Navigation
+// ==========================================
+document.querySelectorAll('.nav-btn').forEach(btn => {
+    btn.addEventListener('click', () => showTab(btn.dataset.tab));
+});
+
+function showTab(tab) {
+    currentTab = tab;
+    document.querySelectorAll('.page').forEach(p => p.classList.remove('active'));
+    document.querySelectorAll('.nav-btn').forEach(n => n.classList.remove('active'));
+    document.getElementById('page-' + tab).classList.add('active');
+    document.querySelector(`[data-tab="${tab}"]`).classList.add('active');
+
+    if (tab === 'inventory' && !invData) loadInv();
+    if (tab === 'promos') loadPromos();
+    if (tab === 'lookup') {}  // Manual search only
+    if (tab === 'reports') loadReportsTab();
+    if (tab === 'comms') { loadComms(); startCommsLogAutoRefresh(); } else { stopCommsLogAutoRefresh(); }
+}
+
+function showDTab(tab) {
+    document.querySelectorAll('[data-dtab]').forEach(c => c.classList.remove('active'));
+    document.querySelector(`[data-dtab="${tab}"]`).classList.add('active');
+    ['overview','actions','market','tools'].forEach(t => {
+        const el = document.getElementById('dtab-'+t);
+        if (el) el.style.display = t===tab ? 'block' : 'none';
+    });
+}
+
+// ==========================================
+// Utilities
+// ==========================================
+function toast(msg) {
+    const t = document.getElementById('toast');
+    t.textContent = msg; t.classList.add('show');
+    setTimeout(() => t.classList.remove('show'), 2500);
+}
+
+// Progress bar — show in any element
+function showProgress(el, pct, desc, detail) {
+    if (!el) return;
+    el.innerHTML = `<div class="progress-wrap">
+        <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:6px;">
+            <span class="progress-pct">${Math.round(pct)}%</span>
+            <span class="progress-desc">${desc || ''}</span>
+        </div>
+        <div class="progress-bar"><div class="progress-fill" style="width:${pct}%;"></div></div>
+        ${detail ? `<div class="progress-detail">${detail}</div>` : ''}
+    </div>`;
+}
+
+function showProgressDone(el, msg, detail) {
+    if (!el) return;
+    el.innerHTML = `<div class="progress-wrap" style="border-color:rgba(48,209,88,0.3);">
+        <div style="display:flex;justify-content:space-between;align-items:center;">
+            <span class="progress-pct">Done</span>
+            <span style="font-size:13px;color:var(--green);font-weight:600;">${msg}</span>
+        </div>
+        ${detail ? `<div class="progress-detail" style="margin-top:4px;">${detail}</div>` : ''}
+    </div>`;
+}
+
+function showProgressError(el, msg) {
+    if (!el) return;
+    el.innerHTML = `<div class="progress-wrap" style="border-color:rgba(255,69,58,0.3);">
+        <span style="font-size:13px;color:var(--red);font-weight:600;">${msg}</span>
+    </div>`;
+}
+
+// ==========================================
+// Comp Rejection + Learning
+// ==========================================
+async function rejectComp(compTitle, compPrice, itemTitle, artist, rowEl) {
+    // Animate dismiss
+    if (rowEl) {
+        rowEl.classList.add('dismissed');
+    }
+
+    try {
+        await fetch('/api/comps/reject', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({comp_title: compTitle, comp_price: compPrice, item_title: itemTitle, artist: artist})
+        });
+        toast('Comp rejected — learning updated');
+    } catch(e) { toast('Rejection saved locally'); }
+
+    // Remove row after animation
+    setTimeout(() => { if (rowEl) rowEl.remove(); }, 400);
+}
+
+// Swipe-to-dismiss for touch devices
+function enableSwipeDismiss(tableEl) {
+    if (!tableEl) return;
+    let startX = 0, currentRow = null;
+    tableEl.addEventListener('touchstart', e => {
+        const row = e.target.closest('.comp-row');
+        if (row) { startX = e.touches[0].clientX; currentRow = row; }
+    }, {passive: true});
+    tableEl.addEventListener('touchmove', e => {
+        if (!currentRow) return;
+        const dx = e.touches[0].clientX - startX;
+        if (dx < -30) currentRow.style.transform = `translateX(${dx}px)`;
+    }, {passive: true});
+    tableEl.addEventListener('touchend', e => {
+        if (!currentRow) return;
+        const dx = e.changedTouches[0].clientX - startX;
+        if (dx < -80) {
+            // Swiped far enough — dismiss
+            const title = currentRow.dataset.compTitle || '';
+            const price = parseFloat(currentRow.dataset.compPrice || 0);
+            const item = currentRow.dataset.itemTitle || '';
+            const artist = currentRow.dataset.artist || '';
+            rejectComp(title, price, item, artist, currentRow);
+        } else {
+            currentRow.style.transform = '';
+        }
+        currentRow = null;
+    });
+}
+
+// Escape string for use in onclick attributes — strips quotes and backslashes
+function esc(s) { return (s||'').replace(/['"\\]/g, ''); }
+
+function downloadCSV(name, rows) {
+    const csv = rows.map(r => r.map(c => { const s = String(c??'').replace(/"/g,'""'); return s.includes(',') ? `"${s}"` : s; }).join(',')).join('\n');
+    const a = document.createElement('a'); a.href = URL.createObjectURL(new Blob([csv],{type:'text/csv'})); a.download = name; a.click();
+    toast('Exported ' + name);
+}
+
+// ==========================================
+// Dashboard
+// ==========================================
+async function loadDash() {
+    try {
+        const resp = await fetch('/api/executive');
+        const d = await resp.json();
+
+        const hc = d.health_score >= 70 ? 'var(--green)' : d.health_score >= 40 ? 'var(--orange)' : 'var(--red)';
+        document.getElementById('d-health').textContent = d.health_score;
+        document.getElementById('d-health').style.color = hc;
+        const hbar = document.getElementById('d-health-bar');
+        if (hbar) { hbar.style.width = d.health_score + '%'; hbar.style.background = hc; }
+
+        document.getElementById('d-listings').textContent = d.stats.total_listings;
+        document.getElementById('d-revenue').textContent = '$' + (d.stats.total_revenue_60d / 1000).toFixed(1) + 'k';
+        document.getElementById('d-adspend').textContent = '$' + Math.round(d.forecast.current_pace.revenue * 0.05);
+        document.getElementById('d-sellnow').textContent = d.quick_wins.filter(w => w.type === 'sell_now').length || d.stats.total_sold_60d;
+        document.getElementById('d-forecast').textContent = d.forecast.current_pace.items + ' items';
+        document.getElementById('d-velocity').textContent = d.forecast.velocity + '/day';
+        document.getElementById('d-avgprice').textContent = '$' + d.forecast.avg_price;
+        document.getElementById('d-watchers').textContent = d.stats.with_watchers;
+        document.getElementById('d-promoted').textContent = Math.round(d.stats.promoted / Math.max(d.stats.total_listings, 1) * 100) + '%';
+
+        // Revenue trend chart — click any point to see that week's sales
+        const trend = d.revenue_trend || {};
+        const weeks = Object.keys(trend).sort();
+        window._revTrend = trend;
+        window._revWeeks = weeks;
+        if (weeks.length) {
+            const ctx = document.getElementById('dash-rev-chart');
+            if (ctx) {
+                const revChart = new Chart(ctx, {
+                    type:'line', data:{labels:weeks.map(w=>w.substring(5)),
+                        datasets:[{data:weeks.map(w=>trend[w].revenue), borderColor:'#30d158', backgroundColor:'rgba(48,209,88,0.08)', fill:true, tension:0.4, pointRadius:5, pointHoverRadius:8, borderWidth:2}]},
+                    options:{responsive:true, plugins:{legend:{display:false},tooltip:{callbacks:{label:ctx=>'$'+ctx.raw.toLocaleString()+' · Click for details'}}},
+                        scales:{x:{ticks:{color:'#86868b',font:{size:9}},grid:{display:false}},
+                            y:{ticks:{color:'#86868b',callback:v=>'$'+(v/1000).toFixed(0)+'k'},grid:{color:'rgba(255,255,255,0.04)'}}}},
+                });
+                ctx.onclick = (evt) => {
+                    const pts = revChart.getElementsAtEventForMode(evt, 'nearest', {intersect:true}, true);
+                    if (pts.length) {
+                        const wk = weeks[pts[0].index];
+                        const wkData = trend[wk];
+                        drillWeekSales(wk, wkData);
+                    }
+                };
+            }
+        }
+
+        // Brief
+        document.getElementById('d-brief').innerHTML = d.brief.map(b =>
+            `<div style="padding:6px 0;border-bottom:1px solid var(--border);font-size:13px;line-height:1.5;">${b}</div>`
+        ).join('');
+
+        // Quick wins
+        document.getElementById('d-wins').innerHTML = d.quick_wins.slice(0, 5).map(w => {
+            const icon = w.type === 'hot_watcher' ? '👁' : w.type === 'sell_now' ? '🔥' : '📅';
+            const color = w.type === 'hot_watcher' ? 'var(--orange)' : w.type === 'sell_now' ? 'var(--green)' : 'var(--accent)';
+            return `<div class="card card-click" style="margin-bottom:6px;border-left:3px solid ${color};display:flex;justify-content:space-between;align-items:center;" onclick="${w.url ? `window.open('${w.url}','_blank')` : ''}">
+                <div><div style="font-size:13px;font-weight:500;">${icon} ${w.title}</div><div style="font-size:11px;color:var(--dim);">${w.action}</div></div>
+                <div style="font-size:15px;font-weight:700;color:var(--green);">${w.price ? '$'+Math.round(w.price) : ''}</div>
+            </div>`;
+        }).join('');
+
+        // Events
+        const sResp = await fetch('/api/analytics/seasonality');
+        const sData = await sResp.json();
+        document.getElementById('d-events').innerHTML = (sData.upcoming || []).slice(0, 5).map(u => {
+            const urgency = u.days_away <= 7 ? 'var(--red)' : u.days_away <= 14 ? 'var(--orange)' : 'var(--accent)';
+            return `<div class="card" style="flex-shrink:0;width:160px;border-left:3px solid ${urgency};">
+                <div style="font-size:13px;font-weight:600;">${u.name}</div>
+                <div style="font-size:24px;font-weight:800;color:${urgency};margin:4px 0;">${u.days_away}d</div>
+                <div style="font-size:10px;color:var(--dim);">+${u.boost}% ${u.tier}</div>
+            </div>`;
+        }).join('');
+
+        // Auto status
+        const aResp = await fetch('/api/automation');
+        const aData = await aResp.json();
+        document.getElementById('auto-label').textContent = 'Automation: ' + (aData.enabled ? 'ON' : 'OFF');
+        document.getElementById('auto-label').style.color = aData.enabled ? 'var(--green)' : 'var(--dim)';
+
+        // Time
+        document.getElementById('dash-time').textContent = new Date().toLocaleDateString('en-US', {weekday:'long', month:'long', day:'numeric', year:'numeric'});
+
+        // Load features
+        loadDailyOps();
+        loadSchedulerStatus();
+        loadAIStrategy();
+        loadSellThisWeek();
+        loadSniper();
+        loadOutreach();
+        loadTrendsAndArbitrage();
+        loadAuctions();
+        loadWatcherTrends();
+
+    } catch (e) { console.error('Dashboard error:', e); }
+}
+
+// Natural Language Query
+async function askQuestion() {
+    const q = document.getElementById('nlq-input').value.trim();
+    if (!q) return;
+    const el = document.getElementById('nlq-result');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/query', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify({question:q})});
+        const d = await resp.json();
+        el.innerHTML = `<div class="card" style="border-left:3px solid var(--accent);">
+            <div style="font-size:13px;line-height:1.6;white-space:pre-line;">${(d.answer || 'No answer').replace(/</g,'&lt;')}</div>
+            <div style="font-size:10px;color:var(--dim);margin-top:6px;">Searched ${(d.records_searched||0).toLocaleString()} records in ${d.elapsed_ms ?? '?'} ms</div>
+        </div>`;
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);">Query failed</div>'; }
+}
+document.getElementById('nlq-input')?.addEventListener('keypress', e => { if (e.key === 'Enter') askQuestion(); });
+
+// Cost Basis Bulk Input
+async function showCostBasis() {
+    const cats = ['Shepard Fairey', 'Death NYC', 'Banksy', 'KAWS', 'Space/NASA'];
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = 'Set Cost Basis by Category';
+    content.innerHTML = `<div style="font-size:13px;color:var(--dim);margin-bottom:12px;">Set what you paid on average per category. This fixes profit calculations.</div>
+        ${cats.map(c => `<div style="display:flex;justify-content:space-between;align-items:center;padding:8px 0;border-bottom:1px solid var(--border);">
+            <span style="font-weight:600;">${c}</span>
+            <div style="display:flex;align-items:center;gap:8px;">
+                <span class="d">Avg cost $</span>
+                <input type="number" id="cb-${c.replace(/[^a-zA-Z]/g,'')}" value="0" min="0" style="width:80px;background:var(--bg);border:1px solid var(--border);border-radius:8px;color:var(--text);padding:6px;font-size:13px;text-align:center;">
+                <button onclick="setCatCost('${c}','cb-${c.replace(/[^a-zA-Z]/g,'')}')" class="btn" style="background:var(--green);color:#000;padding:4px 12px;font-size:11px;">Set</button>
+            </div>
+        </div>`).join('')}
+        <div id="cb-status" style="margin-top:12px;font-size:12px;"></div>`;
+    modal.classList.add('show');
+}
+
+async function setCatCost(cat, inputId) {
+    const cost = parseFloat(document.getElementById(inputId)?.value) || 0;
+    if (!cost) { toast('Enter a cost'); return; }
+    const resp = await fetch('/api/cost-basis/bulk', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify({category:cat, category_cost:cost})});
+    const d = await resp.json();
+    document.getElementById('cb-status').innerHTML = `<span class="g">${d.updated} ${cat} items set to $${cost} cost basis</span>`;
+    toast(`${d.updated} items updated`);
+}
+
+// ==========================================
+// Feedback — Rebuilt
+// ==========================================
+let fbData = null;
+let fbTab = 'buyers';
+
+async function loadFeedback() {
+    const el = document.getElementById('fb-content');
+    const progress = document.getElementById('fb-progress');
+    showProgress(progress, 30, 'Loading from eBay...', 'Pulling sold + purchased items for feedback');
+
+    try {
+        const resp = await fetch('/api/feedback/overview');
+        fbData = await resp.json();
+        if (fbData.error) { showProgressError(progress, fbData.error); return; }
+        showProgressDone(progress, `${fbData.total} pending`, `${fbData.total_buyer_feedback} buyers · ${fbData.total_seller_feedback} sellers`);
+        renderFeedback();
+    } catch(e) { showProgressError(progress, 'Failed to load — check eBay connection'); }
+}
+
+function renderFeedback() {
+    if (!fbData) return;
+    const el = document.getElementById('fb-content');
+    const buyers = fbData.for_buyers || [];
+    const sellers = fbData.for_sellers || [];
+    const items = fbTab === 'buyers' ? buyers : sellers;
+
+    el.innerHTML = `
+        <div style="display:flex;gap:8px;margin-bottom:10px;">
+            <div class="card" style="flex:1;text-align:center;cursor:pointer;${fbTab==='buyers'?'border-color:var(--green);':'opacity:0.5;'}" onclick="fbTab='buyers';renderFeedback();">
+                <div style="font-size:22px;font-weight:700;color:var(--green);">${buyers.length}</div>
+                <div class="stat-lbl">For Buyers (you sold)</div>
+            </div>
+            <div class="card" style="flex:1;text-align:center;cursor:pointer;${fbTab==='sellers'?'border-color:var(--accent);':'opacity:0.5;'}" onclick="fbTab='sellers';renderFeedback();">
+                <div style="font-size:22px;font-weight:700;color:var(--accent);">${sellers.length}</div>
+                <div class="stat-lbl">For Sellers (you bought)</div>
+            </div>
+        </div>
+        ${items.length ? items.map((item, i) => {
+            const name = fbTab === 'buyers' ? item.buyer : item.seller;
+            const prefix = fbTab === 'buyers' ? 'fb-b' : 'fb-s';
+            return `<div class="card" style="margin-bottom:6px;border-left:3px solid ${fbTab==='buyers'?'var(--green)':'var(--accent)'};">
+                <div style="display:flex;justify-content:space-between;align-items:center;">
+                    <div style="flex:1;min-width:0;">
+                        <div style="font-size:13px;font-weight:500;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;">${item.title}</div>
+                        <div style="font-size:11px;color:var(--dim);">$${item.price} · ${name}</div>
+                    </div>
+                </div>
+                <div style="margin-top:6px;display:flex;gap:6px;align-items:center;">
+                    <input type="text" id="${prefix}-${i}" value="" placeholder="AI will generate..." maxlength="80" style="flex:1;background:var(--bg);border:1px solid var(--border);border-radius:8px;color:var(--text);padding:8px 10px;font-size:12px;">
+                    <button class="btn-ghost" style="font-size:10px;padding:4px 8px;flex-shrink:0;" onclick="generateOneFB('${prefix}-${i}','${item.title.replace(/'/g,'')}','${fbTab==='buyers'?'seller':'buyer'}')">AI</button>
+                </div>
+            </div>`;
+        }).join('') : '<div style="text-align:center;padding:20px;color:var(--dim);">No pending feedback</div>'}
+    `;
+}
+
+async function generateOneFB(inputId, title, role) {
+    const input = document.getElementById(inputId);
+    if (!input) return;
+    input.value = 'Generating...';
+    try {
+        const resp = await fetch('/api/feedback/generate', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({items: [{title, role, price: 0}]})
+        });
+        const d = await resp.json();
+        if (d.feedback?.[0]?.final) input.value = d.feedback[0].final;
+        else input.value = '';
+    } catch(e) { input.value = ''; }
+}
+
+async function generateFB() {
+    if (!fbData) { toast('Load feedback first'); return; }
+    const progress = document.getElementById('fb-progress');
+    const buyers = fbData.for_buyers || [];
+    const sellers = fbData.for_sellers || [];
+    const total = buyers.length + sellers.length;
+    let done = 0;
+
+    // Generate for buyers in batches
+    for (let i = 0; i < buyers.length; i += 20) {
+        const batch = buyers.slice(i, i + 20);
+        showProgress(progress, (done/total)*100, `Generating ${done}/${total}`, `Buyer feedback: Claude → GPT for "${batch[0]?.title?.substring(0,30)}..."`);
+        try {
+            const resp = await fetch('/api/feedback/generate', {method:'POST', headers:{'Content-Type':'application/json'},
+                body: JSON.stringify({items: batch.map(b => ({...b, role:'seller'}))})});
+            const d = await resp.json();
+            (d.feedback||[]).forEach((f,j) => {
+                const input = document.getElementById('fb-b-'+(i+j));
+                if (input) input.value = f.final;
+                done++;
+            });
+        } catch(e) { done += batch.length; }
+    }
+
+    // Generate for sellers
+    for (let i = 0; i < sellers.length; i += 20) {
+        const batch = sellers.slice(i, i + 20);
+        showProgress(progress, (done/total)*100, `Generating ${done}/${total}`, `Seller feedback: "${batch[0]?.title?.substring(0,30)}..."`);
+        try {
+            const resp = await fetch('/api/feedback/generate', {method:'POST', headers:{'Content-Type':'application/json'},
+                body: JSON.stringify({items: batch.map(s => ({...s, role:'buyer'}))})});
+            const d = await resp.json();
+            (d.feedback||[]).forEach((f,j) => {
+                const input = document.getElementById('fb-s-'+(i+j));
+                if (input) input.value = f.final;
+                done++;
+            });
+        } catch(e) { done += batch.length; }
+    }
+
+    showProgressDone(progress, `${done} generated`, 'Review each message, edit if needed, then Submit');
+}
+
+async function submitFB() {
+    if (!fbData) { toast('Load feedback first'); return; }
+    const progress = document.getElementById('fb-progress');
+    const feedbacks = [];
+
+    (fbData.for_buyers||[]).forEach((item, i) => {
+        const input = document.getElementById('fb-b-'+i);
+        if (input?.value) feedbacks.push({item_id: item.item_id, target_user: item.buyer, comment: input.value, transaction_id: item.transaction_id, title: item.title});
+    });
+    (fbData.for_sellers||[]).forEach((item, i) => {
+        const input = document.getElementById('fb-s-'+i);
+        if (input?.value) feedbacks.push({item_id: item.item_id, target_user: item.seller, comment: input.value, transaction_id: item.transaction_id, title: item.title});
+    });
+
+    if (!feedbacks.length) { toast('Generate feedback first'); return; }
+
+    let submitted = 0, failed = 0, errors = [];
+    for (let i = 0; i < feedbacks.length; i++) {
+        const fb = feedbacks[i];
+        showProgress(progress, ((i+1)/feedbacks.length)*100, `Submitting ${i+1}/${feedbacks.length}`, `Posting for ${fb.target_user} — "${fb.title?.substring(0,35)}"`);
+        try {
+            const resp = await fetch('/api/feedback/submit', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify({feedbacks:[fb]})});
+            const d = await resp.json();
+            if (d.submitted) submitted++; else { failed++; errors.push(fb.target_user+': '+(d.errors?.[0]||'failed')); }
+        } catch(e) { failed++; }
+    }
+
+    showProgressDone(progress, `${submitted} submitted · ${failed} failed`, errors.length ? errors.slice(0,3).join(' | ') : 'All posted to eBay');
+    toast(`${submitted} feedback posted`);
+}
+
+// Remove old functions that reference removed elements
+function loadFeedbackDash() { loadFeedback(); }
+function showFbTab() {}
+function submitAllFeedback() { submitFB(); }
+function generateAllFeedback() { generateFB(); }
+// Features 1-6
+async function loadSellThisWeek() {
+    const el = document.getElementById('d-sellweek');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    try {
+        const resp = await fetch('/api/sell-this-week');
+        const d = await resp.json();
+        el.innerHTML = (d.picks || []).map(p => `
+            <div class="card card-click" style="margin-bottom:6px;border-left:3px solid ${p.score>=40?'var(--green)':p.score>=20?'var(--orange)':'var(--dim)'};" onclick="${p.url ? `window.open('${p.url}','_blank')` : ''}">
+                <div style="display:flex;justify-content:space-between;align-items:center;">
+                    <div style="flex:1;">
+                        <div style="font-size:13px;font-weight:500;">${p.title}</div>
+                        <div style="font-size:11px;color:var(--dim);margin-top:2px;">${p.reasons.join(' · ')}</div>
+                    </div>
+                    <div style="text-align:right;margin-left:12px;">
+                        <div style="font-size:16px;font-weight:700;color:var(--green);">$${Math.round(p.price)}</div>
+                        <div style="font-size:10px;color:var(--dim);">${p.watchers}w · ${p.suggested_rate}%</div>
+                    </div>
+                </div>
+            </div>
+        `).join('');
+    } catch(e) { el.innerHTML = '<div class="d">Failed to load</div>'; }
+}
+
+async function loadSniper() {
+    const el = document.getElementById('d-sniper');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    toast('Scanning competitors...');
+    try {
+        const resp = await fetch('/api/price-sniper');
+        const d = await resp.json();
+        if (!d.undercuts?.length) {
+            el.innerHTML = '<div style="color:var(--green);font-size:13px;">No undercuts found — you\'re competitively priced</div>';
+            return;
+        }
+        el.innerHTML = d.undercuts.map(u => `
+            <div class="card" style="margin-bottom:6px;border-left:3px solid var(--red);">
+                <div style="font-size:13px;font-weight:500;">${u.title}</div>
+                <div style="display:flex;gap:16px;margin-top:4px;font-size:12px;">
+                    <span>You: <b>$${u.your_price}</b></span>
+                    <span style="color:var(--red);">Comp: <b>$${u.cheapest_comp}</b> (-$${u.undercut_by})</span>
+                    <span style="color:var(--accent);">Suggest: <b>$${Math.round(u.suggested_price)}</b></span>
+                </div>
+                <div style="margin-top:4px;">
+                    <button onclick="acceptPrice('${u.listing_id}',${u.suggested_price})" class="btn" style="background:var(--accent);color:#fff;padding:3px 10px;font-size:10px;">Match</button>
+                    <a href="${u.comp_url}" target="_blank" style="color:var(--dim);font-size:10px;margin-left:8px;">View comp</a>
+                </div>
+            </div>
+        `).join('');
+        toast(d.undercut_count + ' undercuts found');
+    } catch(e) { el.innerHTML = '<div class="d">Scan failed</div>'; }
+}
+
+async function loadOutreach() {
+    const el = document.getElementById('d-outreach');
+    try {
+        const resp = await fetch('/api/buyer-outreach');
+        const d = await resp.json();
+        if (!d.candidates?.length) {
+            el.innerHTML = '<div style="font-size:12px;color:var(--dim);">No outreach candidates — items are fresh</div>';
+            return;
+        }
+        el.innerHTML = `<div style="font-size:12px;color:var(--dim);margin-bottom:8px;">${d.total} items with watchers sitting 14+ days</div>` +
+            d.candidates.slice(0, 5).map(c => `
+            <div class="card" style="margin-bottom:6px;display:flex;justify-content:space-between;align-items:center;">
+                <div><div style="font-size:12px;">${c.title}</div><div style="font-size:11px;color:var(--dim);">${c.watchers}w · ${c.days_listed}d listed</div></div>
+                <div style="text-align:right;"><div style="font-size:13px;font-weight:700;color:var(--orange);">$${c.offer_price}</div><div style="font-size:10px;color:var(--dim);">${c.discount_pct}% off</div></div>
+            </div>
+        `).join('');
+    } catch(e) { el.innerHTML = '<div class="d">Failed</div>'; }
+}
+
+async function loadTrendsAndArbitrage() {
+    // Trends
+    try {
+        const resp = await fetch('/api/trends');
+        const d = await resp.json();
+        const el = document.getElementById('d-appreciate');
+        el.innerHTML = (d.appreciating || []).slice(0, 5).map(t => `
+            <div style="display:flex;justify-content:space-between;padding:4px 0;border-bottom:1px solid var(--border);font-size:12px;">
+                <span style="flex:1;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;">${t.title}</span>
+                <span style="color:var(--green);font-weight:700;margin-left:8px;">+${t.change_pct}%</span>
+            </div>
+        `).join('') || '<div class="d" style="font-size:12px;">Loading trends...</div>';
+    } catch(e) {}
+
+    // Arbitrage
+    try {
+        const resp = await fetch('/api/arbitrage');
+        const d = await resp.json();
+        const el = document.getElementById('d-arbitrage');
+        if (d.opportunities?.length) {
+            el.innerHTML = d.opportunities.slice(0, 5).map(o => `
+                <div style="display:flex;justify-content:space-between;padding:4px 0;border-bottom:1px solid var(--border);font-size:12px;">
+                    <span style="flex:1;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;">${o.title}</span>
+                    <span style="color:var(--green);font-weight:700;margin-left:8px;">+$${o.extra_profit} on ${o.platform}</span>
+                </div>
+            `).join('');
+        } else {
+            el.innerHTML = '<div class="d" style="font-size:12px;">No arbitrage opportunities</div>';
+        }
+    } catch(e) {}
+}
+
+async function loadAuctions() {
+    try {
+        const resp = await fetch('/api/auction-alerts');
+        const d = await resp.json();
+        const el = document.getElementById('d-auctions');
+        if (!d.auctions?.length) {
+            el.innerHTML = '<div style="font-size:12px;color:var(--dim);">No upcoming auctions</div>';
+            return;
+        }
+        el.innerHTML = d.auctions.slice(0, 6).map(a => `
+            <div class="card" style="margin-bottom:6px;border-left:3px solid ${a.past ? 'var(--dim)' : 'var(--accent)'};">
+                <div style="display:flex;justify-content:space-between;">
+                    <div style="font-size:13px;font-weight:500;">${a.title}</div>
+                    <div style="font-size:12px;color:var(--dim);">${a.date}</div>
+                </div>
+                <div style="font-size:11px;color:${a.past ? 'var(--orange)' : 'var(--accent)'};">${a.action}</div>
+            </div>
+        `).join('');
+    } catch(e) {}
+}
+
+async function runPriceCheck() {
+    const section = document.getElementById('price-check-section');
+    const el = document.getElementById('price-check-results');
+    section.style.display = 'block';
+    el.innerHTML = '<div class="loading"><div class="spinner"></div><div style="font-size:11px;color:var(--dim);margin-top:6px;">Comparing your prices vs market comps...</div></div>';
+
+    try {
+        const resp = await fetch('/api/price-check');
+        const d = await resp.json();
+        const items = d.items || [];
+        const s = d.summary || {};
+
+        const statusColor = st => st === 'OVERPRICED' ? 'var(--red)' : st === 'HIGH' ? 'var(--orange)' : st === 'UNDERPRICED' ? 'var(--green)' : st === 'LOW' ? 'var(--accent)' : 'var(--dim)';
+        const statusPill = st => st === 'OVERPRICED' ? 'pill-red' : st === 'HIGH' ? 'pill-orange' : st === 'UNDERPRICED' ? 'pill-green' : st === 'LOW' ? 'pill-blue' : 'pill-dim';
+
+        el.innerHTML = `
+            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:10px;">
+                <div class="section-title" style="margin-bottom:0;">Price vs Market Check</div>
+                <button class="btn-ghost" onclick="document.getElementById('price-check-section').style.display='none';">Close</button>
+            </div>
+            <div style="display:flex;gap:8px;margin-bottom:12px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--red);"><div style="font-size:20px;font-weight:700;color:var(--red);">${s.overpriced||0}</div><div class="stat-lbl">Overpriced</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--green);"><div style="font-size:20px;font-weight:700;color:var(--green);">${s.underpriced||0}</div><div class="stat-lbl">Underpriced</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;"><div style="font-size:20px;font-weight:700;">${s.ok||0}</div><div class="stat-lbl">OK</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--green);"><div style="font-size:18px;font-weight:700;color:var(--green);">$${Math.abs(s.potential_revenue||0)}</div><div class="stat-lbl">Left on Table</div></div>
+            </div>
+            ${items.length ? `<div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Your $</th><th class="r">Market $</th><th class="r">Diff</th><th>Status</th><th>Fix</th></tr></thead>
+                <tbody>${items.filter(i=>i.status!=='OK').map(i => `<tr onclick="drillItem('${i.id}','${esc(i.title)}','${i.artist}',${i.your_price})" style="cursor:pointer;">
+                    <td class="trunc">${i.title}</td>
+                    <td class="r b">$${i.your_price}</td>
+                    <td class="r" style="color:var(--accent);">$${Math.round(i.comp_median)}</td>
+                    <td class="r ${i.diff_pct>0?'rd':'g'} b">${i.diff_pct>0?'+':''}${i.diff_pct}%</td>
+                    <td><span class="pill ${statusPill(i.status)}">${i.status}</span></td>
+                    <td onclick="event.stopPropagation();"><button onclick="event.stopPropagation();setExactPrice('${i.id}',${Math.round(i.comp_median)})" class="btn-ghost" style="font-size:10px;padding:2px 8px;">Match</button></td>
+                </tr>`).join('')}</tbody>
+            </table></div>` : '<div style="text-align:center;padding:20px;color:var(--dim);">All prices look good!</div>'}
+        `;
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+async function loadDailyOps() {
+    const el = document.getElementById('d-daily-ops');
+    try {
+        const resp = await fetch('/api/daily-ops');
+        const d = await resp.json();
+        const s = d.sales || {};
+        const ship = d.shipments || {};
+        const promos = d.promo_changes || [];
+        const prods = d.product_changes || [];
+        const insights = d.insights || [];
+
+        el.innerHTML = `
+            <div style="display:flex;gap:8px;margin-bottom:10px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--green);"><div style="font-size:22px;font-weight:700;color:var(--green);">$${(s.today_revenue||0).toLocaleString()}</div><div class="stat-lbl">Today</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;"><div style="font-size:22px;font-weight:700;">$${(s.week_revenue||0).toLocaleString()}</div><div class="stat-lbl">This Week</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--orange);"><div style="font-size:22px;font-weight:700;color:var(--orange);">${ship.pending||0}</div><div class="stat-lbl">To Ship</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;"><div style="font-size:22px;font-weight:700;">${d.stats?.velocity||0}/d</div><div class="stat-lbl">Velocity</div></div>
+            </div>
+
+            ${ship.items?.length ? `<div style="margin-bottom:10px;">
+                <div style="font-size:11px;color:var(--orange);font-weight:600;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:4px;">Pending Shipments</div>
+                ${ship.items.slice(0,5).map(i => `<div style="display:flex;justify-content:space-between;padding:4px 0;border-bottom:1px solid var(--border);font-size:12px;">
+                    <span>${i.title}</span><span class="g b">$${i.price} · ${i.days_ago}d ago</span>
+                </div>`).join('')}
+            </div>` : ''}
+
+            ${promos.length ? `<div style="margin-bottom:10px;">
+                <div style="font-size:11px;color:var(--accent);font-weight:600;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:4px;">Promo Changes Needed</div>
+                ${promos.map(p => `<div class="card" style="margin-bottom:4px;border-left:3px solid ${p.priority==='high'?'var(--red)':'var(--orange)'};font-size:12px;">
+                    <b>${p.action}</b> — ${p.detail}
+                </div>`).join('')}
+            </div>` : ''}
+
+            ${prods.length ? `<div style="margin-bottom:10px;">
+                <div style="font-size:11px;color:var(--red);font-weight:600;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:4px;">Product Actions (${prods.length})</div>
+                ${prods.slice(0,5).map(p => `<div style="display:flex;justify-content:space-between;padding:3px 0;border-bottom:1px solid var(--border);font-size:11px;">
+                    <span><b style="color:${p.action==='RELIST'?'var(--red)':'var(--orange)'}">${p.action}</b> ${p.title}</span><span class="d">${p.days}d · $${p.price}</span>
+                </div>`).join('')}
+            </div>` : ''}
+
+            ${insights.length ? `<div>
+                <div style="font-size:11px;color:var(--purple);font-weight:600;text-transform:uppercase;letter-spacing:0.5px;margin-bottom:4px;">AI Insights</div>
+                ${insights.map(i => `<div style="font-size:12px;padding:3px 0;border-bottom:1px solid var(--border);">${i}</div>`).join('')}
+            </div>` : ''}
+        `;
+    } catch(e) { el.innerHTML = '<div class="d" style="font-size:12px;">Failed to load daily ops</div>'; }
+}
+
+async function loadAIStrategy() {
+    const el = document.getElementById('d-ai-strategy');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div><div style="font-size:11px;color:var(--dim);margin-top:6px;">Analyzing inventory, sales, scoring, capital data...</div></div>';
+
+    try {
+        const resp = await fetch('/api/ai/strategy');
+        const d = await resp.json();
+        const recs = d.recommendations || [];
+        const summary = d.data_summary || {};
+
+        el.innerHTML = `
+            <div style="display:flex;gap:6px;margin-bottom:12px;flex-wrap:wrap;font-size:11px;">
+                <span class="pill pill-blue">${summary.total_items||0} items</span>
+                <span class="pill pill-green">$${(summary.revenue_60d||0).toLocaleString()} rev/60d</span>
+                <span class="pill pill-dim">${summary.velocity||0}/day</span>
+                <span class="pill pill-orange">$${(summary.capital_locked||0).toLocaleString()} locked</span>
+                <span class="pill pill-dim">${summary.turnover||0}x turn</span>
+                ${summary.actions?.PROMOTE ? `<span class="pill pill-blue">${summary.actions.PROMOTE} promote</span>` : ''}
+                ${summary.actions?.DISCOUNT ? `<span class="pill pill-orange">${summary.actions.DISCOUNT} discount</span>` : ''}
+                ${summary.actions?.RELIST ? `<span class="pill pill-red">${summary.actions.RELIST} relist</span>` : ''}
+            </div>
+            ${recs.map((r, i) => {
+                const priority = r.includes('[1]') ? 'var(--red)' : r.includes('[2]') ? 'var(--orange)' : 'var(--accent)';
+                return `<div class="card" style="margin-bottom:6px;border-left:3px solid ${priority};font-size:13px;line-height:1.5;">
+                    ${r.replace(/\*\*/g, '').replace(/\[1\]/g, '<span style="color:var(--red);font-weight:700;">P1</span>').replace(/\[2\]/g, '<span style="color:var(--orange);font-weight:700;">P2</span>').replace(/\[3\]/g, '<span style="color:var(--accent);font-weight:700;">P3</span>')}
+                </div>`;
+            }).join('')}
+        `;
+    } catch(e) {
+        el.innerHTML = '<div style="color:var(--dim);font-size:12px;">AI strategy unavailable — check API key</div>';
+    }
+}
+
+// ==========================================
+// Watcher Velocity
+// ==========================================
+async function loadWatcherTrends() {
+    const el = document.getElementById('d-watcher-trends');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/watcher-trends');
+        const d = await resp.json();
+        const items = (d.items || []).filter(i => i.watchers > 0);
+
+        if (!items.length) {
+            el.innerHTML = '<div style="color:var(--dim);font-size:12px;">No items with watchers</div>';
+            return;
+        }
+
+        const trendIcon = t => t === 'hot' ? '🔥' : t === 'rising' ? '📈' : t === 'flat' ? '➡️' : t === 'cooling' ? '📉' : t === 'dropping' ? '⬇️' : '';
+        const trendColor = t => t === 'hot' ? 'var(--red)' : t === 'rising' ? 'var(--green)' : t === 'flat' ? 'var(--dim)' : t === 'cooling' ? 'var(--orange)' : 'var(--red)';
+
+        el.innerHTML = `
+            <div style="display:flex;gap:8px;margin-bottom:10px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:60px;"><div style="font-size:20px;font-weight:700;">${d.total_watchers}</div><div class="stat-lbl">Total</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:60px;"><div style="font-size:20px;font-weight:700;">${d.with_watchers}</div><div class="stat-lbl">Items</div></div>
+                ${d.hot ? `<div class="card" style="flex:1;text-align:center;min-width:60px;border-left:3px solid var(--red);"><div style="font-size:20px;font-weight:700;color:var(--red);">${d.hot}</div><div class="stat-lbl">Hot</div></div>` : ''}
+                ${d.rising ? `<div class="card" style="flex:1;text-align:center;min-width:60px;border-left:3px solid var(--green);"><div style="font-size:20px;font-weight:700;color:var(--green);">${d.rising}</div><div class="stat-lbl">Rising</div></div>` : ''}
+                ${d.dropping ? `<div class="card" style="flex:1;text-align:center;min-width:60px;border-left:3px solid var(--orange);"><div style="font-size:20px;font-weight:700;color:var(--orange);">${d.dropping}</div><div class="stat-lbl">Dropping</div></div>` : ''}
+            </div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Watch</th><th>Trend</th><th class="r">Daily</th><th class="r">7d</th><th class="r">Price</th></tr></thead>
+                <tbody>${items.slice(0, 20).map(i => `<tr onclick="drillItem('${i.id}','${esc(i.title)}','${i.category}',${i.price})" style="cursor:pointer;" title="Click for detail · ${i.history?.length || 0} days tracked">
+                    <td class="trunc">${i.title}</td>
+                    <td class="r b" style="font-size:16px;">${i.watchers}</td>
+                    <td style="color:${trendColor(i.trend)};font-weight:600;font-size:12px;">${trendIcon(i.trend)} ${i.trend}</td>
+                    <td class="r ${i.daily_change > 0 ? 'g b' : i.daily_change < 0 ? 'rd' : 'd'}">${i.daily_change > 0 ? '+' : ''}${i.daily_change}</td>
+                    <td class="r ${i.weekly_change > 0 ? 'g b' : i.weekly_change < 0 ? 'rd' : 'd'}">${i.weekly_change > 0 ? '+' : ''}${i.weekly_change}</td>
+                    <td class="r">$${i.price}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+        `;
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// ==========================================
+// Buyer CRM
+// ==========================================
+async function loadBuyerCRM() {
+    const el = document.getElementById('d-buyer-crm');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/buyers/crm');
+        const d = await resp.json();
+        const buyers = d.buyers || [];
+
+        const tierColor = t => t === 'GOLD' ? 'var(--orange)' : t === 'SILVER' ? 'var(--dim)' : t === 'REPEAT' ? 'var(--accent)' : 'var(--dim)';
+        const tierPill = t => t === 'GOLD' ? 'pill-orange' : t === 'SILVER' ? 'pill-dim' : t === 'REPEAT' ? 'pill-blue' : 'pill-dim';
+
+        el.innerHTML = `
+            <div style="display:flex;gap:8px;margin-bottom:12px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:20px;font-weight:700;">${d.total_buyers}</div><div class="stat-lbl">Buyers</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:20px;font-weight:700;color:var(--accent);">${d.repeat_buyers}</div><div class="stat-lbl">Repeat</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:20px;font-weight:700;color:var(--orange);">${d.vip_buyers}</div><div class="stat-lbl">VIP</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:20px;font-weight:700;color:var(--green);">${d.repeat_pct}%</div><div class="stat-lbl">Repeat Rev</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:20px;font-weight:700;">$${d.avg_lifetime_value}</div><div class="stat-lbl">Avg LTV</div></div>
+            </div>
+            ${buyers.filter(b => b.purchase_count >= 2).length ? `
+            <div class="table-wrap"><table>
+                <thead><tr><th>Buyer</th><th>Tier</th><th class="r">Purchases</th><th class="r">Total $</th><th class="r">Avg $</th><th>Categories</th><th>Last Buy</th></tr></thead>
+                <tbody>${buyers.filter(b => b.purchase_count >= 2).map(b => `<tr onclick="drillBuyer('${b.buyer}')" style="cursor:pointer;" title="Click to see purchase history">
+                    <td class="b">${b.buyer}</td>
+                    <td><span class="pill ${tierPill(b.tier)}">${b.tier}</span></td>
+                    <td class="r b">${b.purchase_count}</td>
+                    <td class="r g b">$${b.total_spent.toLocaleString()}</td>
+                    <td class="r">$${b.avg_purchase}</td>
+                    <td style="font-size:10px;color:var(--dim);">${b.categories.join(', ')}</td>
+                    <td class="d" style="font-size:11px;">${b.last_purchase||''}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>` : ''}
+            ${buyers.filter(b => b.purchase_count === 1).length ? `<div style="margin-top:8px;font-size:11px;color:var(--dim);">${buyers.filter(b=>b.purchase_count===1).length} one-time buyers (not shown)</div>` : ''}
+        `;
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);">Failed to load</div>'; }
+}
+
+async function drillBuyer(buyer) {
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = 'Buyer: ' + buyer;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch('/api/buyers/crm');
+        const d = await resp.json();
+        const b = (d.buyers || []).find(x => x.buyer === buyer);
+        if (!b) { content.innerHTML = '<div class="d">Buyer not found</div>'; return; }
+
+        const tierColor = b.tier === 'GOLD' ? 'var(--orange)' : b.tier === 'SILVER' ? 'var(--dim)' : 'var(--accent)';
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;color:${tierColor};">${b.tier}</div><div class="stat-lbl">Tier</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;">${b.purchase_count}</div><div class="stat-lbl">Purchases</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;color:var(--green);">$${b.total_spent.toLocaleString()}</div><div class="stat-lbl">Total Spent</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;">$${b.avg_purchase}</div><div class="stat-lbl">Avg Purchase</div></div>
+            </div>
+            <div style="font-size:12px;color:var(--dim);margin-bottom:8px;">Categories: ${b.categories.join(', ')} · First: ${b.first_purchase||'?'} · Last: ${b.last_purchase||'?'}</div>
+            <div class="section-title">Purchase History</div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Price</th><th>Date</th></tr></thead>
+                <tbody>${(b.purchases||[]).map(p => `<tr>
+                    <td class="trunc">${p.title}</td>
+                    <td class="r g b">$${p.price.toLocaleString()}</td>
+                    <td class="d" style="font-size:11px;">${p.date||'--'}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+        `;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// ==========================================
+// Listing Quality Scorer
+// ==========================================
+async function loadListingQuality() {
+    const el = document.getElementById('d-listing-quality');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/listing-quality');
+        const d = await resp.json();
+        const listings = d.listings || [];
+        const grades = d.grade_distribution || {};
+        const top = d.top_suggestions || [];
+
+        const gradeColor = g => g === 'A' ? 'var(--green)' : g === 'B' ? 'var(--accent)' : g === 'C' ? 'var(--orange)' : 'var(--red)';
+
+        el.innerHTML = `
+            <div style="display:flex;gap:8px;margin-bottom:12px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:70px;"><div style="font-size:26px;font-weight:700;color:${gradeColor(d.avg_score>=70?'B':d.avg_score>=55?'C':'D')}">${d.avg_score}</div><div class="stat-lbl">Avg Score</div></div>
+                ${['A','B','C','D','F'].map(g => `<div class="card" style="flex:1;text-align:center;min-width:50px;"><div style="font-size:20px;font-weight:700;color:${gradeColor(g)}">${grades[g]||0}</div><div class="stat-lbl">Grade ${g}</div></div>`).join('')}
+            </div>
+
+            ${top.length ? `<div style="margin-bottom:12px;">${top.slice(0,4).map(s => `
+                <div class="card" style="margin-bottom:4px;border-left:3px solid var(--orange);font-size:12px;">
+                    <b>${s.count} listings:</b> ${s.suggestion}
+                </div>
+            `).join('')}</div>` : ''}
+
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th>Grade</th><th class="r">Score</th><th class="r">Price</th><th>Top Fix</th></tr></thead>
+                <tbody>${listings.slice(0,50).map(l => `<tr onclick="drillItem('${l.id}','${l.title.replace(/'/g,'')}','${l.category}',${l.price})" style="cursor:pointer;" title="${l.suggestions?.join(' | ') || 'Good'}">
+                    <td class="trunc">${l.title}</td>
+                    <td><span style="font-size:18px;font-weight:800;color:${gradeColor(l.grade)};">${l.grade}</span></td>
+                    <td class="r b">${l.score}/100</td>
+                    <td class="r">$${l.price}</td>
+                    <td style="font-size:11px;color:var(--dim);max-width:200px;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;">${l.suggestions?.[0]||'Good'}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+        `;
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);">Failed to load</div>'; }
+}
+
+// ==========================================
+// Auto-Offer to Watchers
+// ==========================================
+async function previewOffers() {
+    const el = document.getElementById('offer-preview');
+    const status = document.getElementById('offer-status');
+    showProgress(status, 30, 'Generating AI offer messages...', 'Finding eligible items with watchers');
+
+    try {
+        const resp = await fetch('/api/watcher-offers/preview');
+        const d = await resp.json();
+        const candidates = d.candidates || [];
+
+        if (!candidates.length) {
+            status.innerHTML = '';
+            el.innerHTML = '<div style="font-size:12px;color:var(--dim);">No items eligible — need watchers + 14+ days listed</div>';
+            return;
+        }
+
+        showProgressDone(status, `${candidates.length} offers ready`, 'Review messages below, then click Send All');
+
+        el.innerHTML = candidates.map((c, i) => `
+            <div class="card" style="margin-bottom:6px;border-left:3px solid var(--green);">
+                <div style="display:flex;justify-content:space-between;align-items:start;gap:8px;">
+                    <div style="flex:1;">
+                        <div style="font-size:13px;font-weight:500;">${c.title}</div>
+                        <div style="font-size:11px;color:var(--dim);">${c.category} · ${c.watchers}w · ${c.days_listed}d listed</div>
+                    </div>
+                    <div style="text-align:right;">
+                        <div style="font-size:11px;color:var(--dim);text-decoration:line-through;">$${c.price}</div>
+                        <div style="font-size:16px;font-weight:700;color:var(--green);">$${c.offer_price}</div>
+                        <div style="font-size:10px;color:var(--orange);">${c.discount_pct}% off</div>
+                    </div>
+                </div>
+                <div style="margin-top:6px;background:var(--bg);border-radius:8px;padding:8px;font-size:12px;color:var(--text);font-style:italic;">"${c.message}"</div>
+            </div>
+        `).join('');
+    } catch(e) { showProgressError(status, 'Failed to load preview'); }
+}
+
+async function sendOffers() {
+    const status = document.getElementById('offer-status');
+    showProgress(status, 10, 'Sending offers to watchers...', 'Using eBay Negotiation API');
+
+    try {
+        const resp = await fetch('/api/watcher-offers/send', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({})});
+        const d = await resp.json();
+        if (d.error) {
+            showProgressError(status, d.error);
+        } else {
+            showProgressDone(status, `${d.sent} offers sent`, `${d.failed} failed${d.errors?.length ? ' · ' + d.errors[0] : ''}`);
+        }
+        toast(d.sent + ' offers sent to watchers');
+    } catch(e) { showProgressError(status, 'Failed to send offers'); }
+}
+
+// ==========================================
+// Auto-Reprice Engine
+// ==========================================
+async function previewReprice() {
+    const el = document.getElementById('reprice-preview');
+    const status = document.getElementById('reprice-status');
+    showProgress(status, 30, 'Calculating price changes...', 'Checking stale items against floor prices');
+
+    try {
+        const resp = await fetch('/api/reprice/preview');
+        const d = await resp.json();
+        const changes = d.changes || [];
+
+        if (!changes.length) {
+            status.innerHTML = '';
+            el.innerHTML = '<div style="font-size:12px;color:var(--dim);">No items need repricing — nothing stale enough</div>';
+            return;
+        }
+
+        const totalSaved = changes.reduce((s, c) => s + (c.current_price - c.new_price), 0);
+        showProgressDone(status, `${changes.length} items to reprice`, `Total markdown: $${Math.round(totalSaved)} · Threshold: ${d.threshold}d`);
+
+        el.innerHTML = `<div class="table-wrap"><table>
+            <thead><tr><th>Item</th><th>Cat</th><th class="r">Current</th><th class="r">New</th><th class="r">Floor</th><th class="r">Days</th><th class="r">Total Off</th></tr></thead>
+            <tbody>${changes.map(c => `<tr onclick="drillItem('${c.id}','${esc(c.title)}','${c.category}',${c.new_price})" style="cursor:pointer;" title="Click for detail">
+                <td class="trunc">${c.title}</td>
+                <td style="font-size:11px;">${c.category}</td>
+                <td class="r">$${c.current_price}</td>
+                <td class="r g b">$${c.new_price}</td>
+                <td class="r d">$${c.floor}</td>
+                <td class="r rd b">${c.days_listed}d</td>
+                <td class="r o">${c.total_markdown_pct}%</td>
+            </tr>`).join('')}</tbody>
+        </table></div>`;
+    } catch(e) { showProgressError(status, 'Failed to load preview'); }
+}
+
+async function runReprice() {
+    const status = document.getElementById('reprice-status');
+    showProgress(status, 20, 'Running auto-reprice...', 'Applying markdowns to stale items with floor protection');
+
+    try {
+        const resp = await fetch('/api/reprice/run', {method: 'POST'});
+        const d = await resp.json();
+        showProgressDone(status, `${d.applied} items repriced`, `${d.failed} failed · ${d.log?.length ? d.log[0] : 'Done'}`);
+        toast(d.applied + ' items repriced');
+        invData = null; // Force inventory refresh
+    } catch(e) { showProgressError(status, 'Reprice failed'); }
+}
+
+async function applySpeedHigh() {
+    const el = document.getElementById('speed-status');
+    showProgress(el, 10, 'Applying Speed High...', 'Creating campaigns and setting ad rates for all listings');
+    try {
+        showProgress(el, 30, 'Sending to eBay...', 'Grouping listings by category, creating campaigns');
+        const resp = await fetch('/api/promotions/apply-category-strategies', {method:'POST'});
+        const d = await resp.json();
+        if (d.error) {
+            showProgressError(el, 'Failed: ' + d.error);
+        } else {
+            showProgressDone(el, `${d.applied} listings promoted`, `${d.campaigns} campaigns created · ${d.failed||0} failed`);
+        }
+        toast(d.applied + ' listings promoted!');
+    } catch(e) {
+        showProgressError(el, 'Failed — check eBay connection');
+    }
+}
+
+// ==========================================
+// Live events — one EventSource on /api/events instead of per-panel polling
+// ==========================================
+const liveTopics = {};
+let liveSource = null;
+function onLive(topic, handler, fallback) {
+    liveTopics[topic] = {handler, fallback};
+}
+
+function liveConnected() {
+    return liveSource !== null && liveSource.readyState !== EventSource.CLOSED;
+}
+
+function startLiveFallbacks() {
+    Object.values(liveTopics).forEach(t => t.fallback && t.fallback());
+}
+
+function connectLive() {
+    if (!window.EventSource) { startLiveFallbacks(); return; }
+    liveSource = new EventSource('/api/events?topics=' + Object.keys(liveTopics).join(','));
+    for (const [topic, t] of Object.entries(liveTopics)) {
+        liveSource.addEventListener(topic, ev => {
+            try { t.handler(JSON.parse(ev.data)); } catch(e) {}
+        });
+    }
+    // EventSource reconnects by itself; it only gives up (CLOSED) on an
+    // HTTP error, e.g. a server without the endpoint — poll instead then
+    liveSource.onerror = () => {
+        if (liveSource && liveSource.readyState === EventSource.CLOSED) {
+            liveSource = null;
+            startLiveFallbacks();
+        }
+    };
+}
+
+// ==========================================
+// Scheduler
+// ==========================================
+async function loadSchedulerStatus() {
+    try {
+        const resp = await fetch('/api/scheduler/config');
+        renderSchedulerStatus(await resp.json());
+    } catch(e) {}
+}
+
+function renderSchedulerStatus(config) {
+    try {
+        const enabled = config.enabled;
+        document.getElementById('sched-toggle').textContent = enabled ? 'Stop' : 'Start';
+        document.getElementById('sched-toggle').className = enabled ? 'btn btn-red' : 'btn btn-green';
+        document.getElementById('sched-toggle').style.cssText = 'padding:6px 14px;font-size:12px;';
+        document.getElementById('sched-status').textContent = enabled ? 'Running' : 'Stopped';
+        document.getElementById('sched-status').style.color = enabled ? 'var(--green)' : 'var(--dim)';
+
+        const tasks = config.tasks || {};
+        for (const [name, task] of Object.entries(tasks)) {
+            const el = document.getElementById('sched-' + name + '-last');
+            if (el && task.last_run) {
+                const ago = Math.round((Date.now() - new Date(task.last_run).getTime()) / 3600000);
+                el.textContent = ago < 1 ? 'Ran just now' : `${ago}h ago`;
+            }
+        }
+
+        const log = config.log || [];
+        document.getElementById('sched-log').innerHTML = log.slice(0, 10).map(l => `<div style="padding:2px 0;border-bottom:1px solid var(--border);">${l}</div>`).join('');
+    } catch(e) {}
+}
+
+onLive('scheduler', renderSchedulerStatus);
+
+async function toggleScheduler() {
+    const resp = await fetch('/api/scheduler/config');
+    const config = await resp.json();
+    if (config.enabled) {
+        await fetch('/api/scheduler/stop', {method: 'POST'});
+        toast('Scheduler stopped');
+    } else {
+        await fetch('/api/scheduler/start', {method: 'POST'});
+        toast('Scheduler started — scrape every 4h, reprice Monday, offers Tuesday');
+    }
+    loadSchedulerStatus();
+}
+
+// ==========================================
+// Notifications
+// ==========================================
+let notifCursor = null;
+async function pollNotifications() {
+    try {
+        const resp = await fetch('/api/notifications/poll' + (notifCursor !== null ? '?since=' + notifCursor : ''));
+        if (resp.status === 304) return;
+        renderNotifSummary(await resp.json());
+    } catch(e) {}
+}
+
+function renderNotifSummary(d) {
+    if (d.cursor === notifCursor) return;
+    notifCursor = d.cursor;
+    try {
+        const badge = document.getElementById('notif-badge');
+        if (d.unread > 0) {
+            badge.textContent = d.unread > 9 ? '9+' : d.unread;
+            badge.style.display = 'flex';
+            // Browser notification for high-severity alerts
+            if (d.has_alerts && Notification.permission === 'granted') {
+                const latest = d.latest[0];
+                new Notification('DATARADAR', {body: latest.title + ' — ' + latest.message, icon: '/manifest.json'});
+            }
+        } else {
+            badge.style.display = 'none';
+        }
+    } catch(e) {}
+}
+
+async function showNotifications() {
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = 'Notifications';
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch('/api/notifications');
+        const d = await resp.json();
+        const notifs = d.notifications || [];
+
+        content.innerHTML = notifs.length ? notifs.map(n => {
+            const sc = n.severity === 'high' ? 'var(--red)' : n.severity === 'warning' ? 'var(--orange)' : 'var(--accent)';
+            const age = Math.round((Date.now() - new Date(n.created).getTime()) / 3600000);
+            const ageStr = age < 1 ? 'just now' : age < 24 ? age + 'h ago' : Math.round(age/24) + 'd ago';
+            return `<div class="card" style="margin-bottom:6px;border-left:3px solid ${sc};${n.read ? 'opacity:0.5;' : ''}">
+                <div style="display:flex;justify-content:space-between;align-items:start;">
+                    <div style="font-size:13px;font-weight:${n.read ? '400' : '600'};">${n.title}</div>
+                    <span style="font-size:10px;color:var(--dim);flex-shrink:0;">${ageStr}</span>
+                </div>
+                <div style="font-size:12px;color:var(--dim);margin-top:2px;">${n.message}</div>
+                ${n.data?.url ? `<a href="${n.data.url}" target="_blank" style="font-size:11px;color:var(--accent);margin-top:4px;display:inline-block;">View on eBay</a>` : ''}
+            </div>`;
+        }).join('') : '<div style="text-align:center;padding:30px;color:var(--dim);">No notifications yet</div>';
+
+        // Mark all as read
+        if (d.unread > 0) {
+            await fetch('/api/notifications/read', {method: 'POST'});
+            document.getElementById('notif-badge').style.display = 'none';
+        }
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// Request browser notification permission
+if ('Notification' in window && Notification.permission === 'default') {
+    Notification.requestPermission();
+}
+
+// Pushed over /api/events (see Live events below); polled every 30 seconds without it
+let notifPolling = null;
+onLive('notifications', renderNotifSummary, () => {
+    if (!notifPolling) notifPolling = setInterval(pollNotifications, 30000);
+    pollNotifications();
+});
+
+async function toggleAuto() {
+    const resp = await fetch('/api/automation');
+    const config = await resp.json();
+    config.enabled = !config.enabled;
+    await fetch('/api/automation', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify(config)});
+    document.getElementById('auto-label').textContent = 'Automation: ' + (config.enabled ? 'ON' : 'OFF');
+    document.getElementById('auto-label').style.color = config.enabled ? 'var(--green)' : 'var(--dim)';
+    toast(config.enabled ? 'Automation ON' : 'Automation OFF');
+}
+
+// ==========================================
+// Search / Analyze
+// ==========================================
+async function runSearch() {
+    const query = document.getElementById('search-input').value.trim();
+    if (!query) return;
+    const minPrice = parseInt(document.getElementById('search-min').value) || 0;
+    const el = document.getElementById('search-results');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/analyze', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify({query, min_price: minPrice, enrich: true})});
+        const d = await resp.json();
+        const s = d.stats || {};
+        const con = d.llm_enrichment?.consensus || {};
+        const recColor = d.recommendation === 'BUY' ? 'var(--green)' : d.recommendation === 'CONSIDER' ? 'var(--orange)' : 'var(--red)';
+
+        el.innerHTML = `
+            <div class="card">
+                <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:12px;">
+                    <div style="font-size:28px;font-weight:800;color:${recColor};">${d.recommendation}</div>
+                    <div style="font-size:11px;color:var(--dim);">${s.count||0} data points</div>
+                </div>
+                <div style="font-size:13px;color:var(--dim);margin-bottom:12px;">${d.rec_reason}</div>
+                <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:12px;">
+                    <div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Median</div><div style="font-size:18px;font-weight:700;color:var(--accent);">$${s.median||0}</div></div>
+                    <div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Range</div><div style="font-size:14px;font-weight:600;">$${s.min||0}—$${s.max||0}</div></div>
+                    <div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Velocity</div><div style="font-size:14px;font-weight:600;">${d.velocity}</div></div>
+                    ${con.fair_mid ? `<div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">AI Fair Value</div><div style="font-size:18px;font-weight:700;color:var(--green);">$${con.fair_mid}</div></div>` : ''}
+                    ${con.buy_below ? `<div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Buy Below</div><div style="font-size:16px;font-weight:700;color:var(--orange);">$${con.buy_below}</div></div>` : ''}
+                </div>
+                ${d.ai_commentary ? `<div style="background:rgba(10,132,255,0.08);border-left:3px solid var(--accent);border-radius:8px;padding:12px;font-size:13px;line-height:1.5;">${d.ai_commentary}</div>` : ''}
+                ${d.min_price_applied > 0 ? `<div style="font-size:11px;color:var(--dim);margin-top:8px;">Floor: $${d.min_price_applied} applied</div>` : ''}
+            </div>`;
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);">Analysis failed</div>'; }
+}
+document.getElementById('search-input')?.addEventListener('keypress', e => { if (e.key === 'Enter') runSearch(); });
+document.getElementById('deal-search-input')?.addEventListener('keypress', e => { if (e.key === 'Enter') searchDeals(); });
+
+// ==========================================
+// Product Deal Search
+// ==========================================
+let dealSearchData = null;
+
+let dealShowCount = 200;
+
+async function searchDeals() {
+    const query = document.getElementById('deal-search-input').value.trim();
+    if (!query) return;
+    const minPrice = document.getElementById('deal-min-val')?.value || 0;
+    const maxPrice = document.getElementById('deal-max-val')?.value || 10000;
+    const el = document.getElementById('deal-search-results');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div><div style="font-size:12px;color:var(--dim);margin-top:8px;">Searching eBay + pulling comps...</div></div>';
+    toast('Searching deals for: ' + query);
+    dealShowCount = 200;
+
+    try {
+        const resp = await fetch(`/api/deals/product-search?q=${encodeURIComponent(query)}&min_price=${minPrice}&max_price=${maxPrice}`);
+        const d = await resp.json();
+        dealSearchData = d;
+        renderDealResults(d);
+    } catch(e) { el.innerHTML = '<div style="color:var(--red);padding:20px;">Search failed</div>'; }
+}
+
+function renderDealResults(d) {
+    const el = document.getElementById('deal-search-results');
+    let products = [...(d.products || [])];
+    if (!products.length) {
+        el.innerHTML = '<div style="text-align:center;padding:30px;color:var(--dim);">No products found. Try a different search or adjust the price range.</div>';
+        return;
+    }
+
+    // Sort
+    const sort = document.getElementById('deal-search-sort')?.value || 'smart';
+    if (sort === 'price_low') products.sort((a,b) => a.price - b.price);
+    else if (sort === 'price_high') products.sort((a,b) => b.price - a.price);
+    else if (sort === 'profit') products.sort((a,b) => b.profit - a.profit);
+    else if (sort === 'discount') products.sort((a,b) => b.discount_pct - a.discount_pct);
+    else if (sort === 'newest') products.sort((a,b) => (b.listed_date||'').localeCompare(a.listed_date||''));
+    else if (sort === 'oldest') products.sort((a,b) => (a.listed_date||'').localeCompare(b.listed_date||''));
+
+    // Summary stats
+    const buys = products.filter(p => p.verdict === 'BUY').length;
+    const considers = products.filter(p => p.verdict === 'CONSIDER').length;
+    const showing = Math.min(dealShowCount, products.length);
+
+    el.innerHTML = `
+        <div style="display:flex;gap:8px;margin-bottom:12px;align-items:center;flex-wrap:wrap;">
+            <div style="font-size:13px;color:var(--dim);">${products.length} products found${d.artist ? ' · '+d.artist : ''}${showing < products.length ? ' · showing '+showing : ''}</div>
+            ${buys ? `<span class="pill pill-green">${buys} BUY</span>` : ''}
+            ${considers ? `<span class="pill pill-orange">${considers} CONSIDER</span>` : ''}
+            ${d.preferences?.signals > 5 ? `<span class="pill pill-blue" title="AI learned from ${d.preferences.signals} likes/passes${d.preferences.positive_keywords?.length ? '. Likes: '+d.preferences.positive_keywords.join(', ') : ''}${d.preferences.negative_keywords?.length ? '. Avoids: '+d.preferences.negative_keywords.join(', ') : ''}">AI Tuned (${d.preferences.signals})</span>` : ''}
+            <button class="btn-ghost" style="font-size:11px;margin-left:auto;" onclick="saveSearch('${d.query?.replace(/'/g,'') || ''}', '${d.artist || ''}')">Save This Search</button>
+        </div>
+        <div id="deal-cards" style="display:grid;grid-template-columns:repeat(auto-fill,minmax(320px,1fr));gap:12px;">
+            ${products.slice(0, showing).map((p, i) => renderDealCard(p, i)).join('')}
+        </div>
+        ${products.length > showing ? `<div style="text-align:center;padding:16px;">
+            <button class="btn btn-primary" style="padding:12px 32px;font-size:14px;" onclick="dealShowCount=Math.min(dealShowCount+200,1000);renderDealResults(dealSearchData);">Show More (${Math.min(products.length - showing, 200)} more)</button>
+            <div style="font-size:11px;color:var(--dim);margin-top:6px;">${showing} of ${products.length} shown</div>
+        </div>` : ''}
+    `;
+}
+
+function renderDealCard(p, idx) {
+    const vc = p.verdict === 'BUY' ? 'var(--green)' : p.verdict === 'CONSIDER' ? 'var(--orange)' : p.verdict === 'OVERPRICED' ? 'var(--red)' : 'var(--dim)';
+    const vpill = p.verdict === 'BUY' ? 'pill-green' : p.verdict === 'CONSIDER' ? 'pill-orange' : p.verdict === 'OVERPRICED' ? 'pill-red' : 'pill-dim';
+    const hc = p.hotness >= 60 ? 'pill-red' : p.hotness >= 30 ? 'pill-orange' : 'pill-dim';
+
+    const badges = [];
+    if (p.signed) badges.push('<span class="pill pill-blue" style="font-size:8px;">SIGNED</span>');
+    if (p.numbered) badges.push('<span class="pill pill-blue" style="font-size:8px;">NUMBERED</span>');
+    if (p.buying_option === 'AUCTION') badges.push('<span class="pill pill-orange" style="font-size:8px;">AUCTION</span>');
+
+    const prefBadge = p.pref_score > 15 ? '<span class="pref-badge pref-up">For You</span>' : p.pref_score < -15 ? '<span class="pref-badge pref-down">Not Your Type</span>' : '';
+
+    return `<div class="card card-click deal-card" id="deal-card-${idx}" style="border-left:4px solid ${vc};overflow:hidden;" onclick="showDealDetail(${idx})">
+        <div style="display:flex;gap:12px;">
+            ${p.image ? `<div style="flex-shrink:0;"><img src="${p.image}" style="width:80px;height:80px;object-fit:cover;border-radius:8px;background:var(--card2);" onerror="this.style.display='none'"></div>` : ''}
+            <div style="flex:1;min-width:0;">
+                <div style="display:flex;justify-content:space-between;align-items:start;gap:8px;">
+                    <div style="font-size:13px;font-weight:600;overflow:hidden;text-overflow:ellipsis;display:-webkit-box;-webkit-line-clamp:2;-webkit-box-orient:vertical;line-height:1.3;">${p.title}</div>
+                    <span class="pill ${vpill}" style="flex-shrink:0;">${p.verdict}</span>
+                </div>
+                <div style="display:flex;gap:6px;margin-top:4px;flex-wrap:wrap;">${badges.join('')}</div>
+                <div style="display:flex;gap:16px;margin-top:8px;align-items:baseline;">
+                    <div><span style="font-size:20px;font-weight:800;color:var(--green);">$${p.price.toLocaleString()}</span></div>
+                    ${p.median > 0 ? `<div style="font-size:12px;color:var(--dim);">Median: <b style="color:var(--accent);">$${p.median.toLocaleString()}</b></div>` : ''}
+                </div>
+            </div>
+        </div>
+        <div style="display:grid;grid-template-columns:repeat(4,1fr);gap:6px;margin-top:10px;padding-top:10px;border-top:1px solid var(--border);">
+            <div style="text-align:center;">
+                <div style="font-size:16px;font-weight:700;color:${p.profit > 0 ? 'var(--green)' : 'var(--red)'};">${p.profit > 0 ? '+' : ''}$${p.profit.toLocaleString()}</div>
+                <div style="font-size:9px;color:var(--dim);text-transform:uppercase;">Profit</div>
+            </div>
+            <div style="text-align:center;">
+                <div style="font-size:16px;font-weight:700;color:${p.discount_pct > 20 ? 'var(--green)' : 'var(--dim)'};">${p.discount_pct}%</div>
+                <div style="font-size:9px;color:var(--dim);text-transform:uppercase;">Below Mkt</div>
+            </div>
+            <div style="text-align:center;">
+                <div style="font-size:16px;font-weight:700;">${p.comp_count}</div>
+                <div style="font-size:9px;color:var(--dim);text-transform:uppercase;">Comps</div>
+            </div>
+            <div style="text-align:center;">
+                <div><span class="pill ${hc}" style="font-size:10px;">${p.hotness}</span></div>
+                <div style="font-size:9px;color:var(--dim);text-transform:uppercase;">Hot</div>
+            </div>
+        </div>
+        <div style="font-size:11px;color:var(--dim);margin-top:6px;">${p.reasons.join(' · ')}</div>
+        <div style="display:flex;justify-content:space-between;align-items:center;margin-top:4px;">
+            <div style="font-size:10px;color:var(--dim);">${p.seller ? p.seller+' · ' : ''}${p.condition || ''}${p.listed_date ? ' · '+p.listed_date : ''} ${prefBadge}</div>
+            <div class="like-pass-btns" onclick="event.stopPropagation();">
+                <button class="btn-like" onclick="likeDeal(${idx},'deal-card-${idx}')">Like</button>
+                <button class="btn-pass" onclick="passDeal(${idx},'deal-card-${idx}')">Pass</button>
+                <button class="btn-ghost" style="font-size:9px;padding:2px 8px;" onclick="saveToWatchlist('${esc(p.title)}',${p.price},'${(p.url||'').replace(/'/g,'')}','${(p.image||'').replace(/'/g,'')}')">Save</button>
+            </div>
+        </div>
+    </div>`;
+}
+
+function showDealDetail(idx) {
+    if (!dealSearchData) return;
+    const p = dealSearchData.products[idx];
+    if (!p) return;
+
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    const vc = p.verdict === 'BUY' ? 'var(--green)' : p.verdict === 'CONSIDER' ? 'var(--orange)' : p.verdict === 'OVERPRICED' ? 'var(--red)' : 'var(--dim)';
+
+    title.textContent = p.verdict + ' — ' + p.title.substring(0, 50);
+    content.innerHTML = `
+        <div style="display:flex;gap:16px;margin-bottom:16px;">
+            ${p.image ? `<img src="${p.image}" style="width:120px;height:120px;object-fit:cover;border-radius:12px;background:var(--card2);" onerror="this.style.display='none'">` : ''}
+            <div style="flex:1;">
+                <div style="font-size:15px;font-weight:600;line-height:1.4;margin-bottom:8px;">${p.title}</div>
+                <div style="display:flex;gap:12px;align-items:baseline;">
+                    <span style="font-size:28px;font-weight:800;color:${vc};">$${p.price.toLocaleString()}</span>
+                    ${p.median > 0 ? `<span style="font-size:14px;color:var(--dim);">Market: <b style="color:var(--accent);">$${p.median.toLocaleString()}</b></span>` : ''}
+                </div>
+                <div style="font-size:12px;color:var(--dim);margin-top:4px;">${p.condition || ''} · ${p.seller || ''} · ${p.buying_option || ''}</div>
+            </div>
+        </div>
+
+        <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:16px;">
+            <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;color:${p.profit > 0 ? 'var(--green)' : 'var(--red)'};">${p.profit > 0 ? '+' : ''}$${p.profit}</div><div class="stat-lbl">Profit</div></div>
+            <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;">${p.discount_pct}%</div><div class="stat-lbl">Below Market</div></div>
+            <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;">${p.comp_count}</div><div class="stat-lbl">Total Comps</div></div>
+            <div class="card" style="text-align:center;"><div style="font-size:22px;font-weight:700;">${p.liquidity}</div><div class="stat-lbl">Liquidity</div></div>
+        </div>
+
+        ${p.comp_low > 0 ? `<div style="margin-bottom:16px;">
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Price Range (${p.comp_count} comps)</div>
+            <div style="display:flex;align-items:center;gap:12px;">
+                <span style="font-size:12px;color:var(--dim);">$${p.comp_low}</span>
+                <div style="flex:1;height:8px;background:var(--border);border-radius:4px;position:relative;">
+                    <div style="position:absolute;height:100%;background:linear-gradient(to right,var(--green),var(--accent),var(--orange));border-radius:4px;width:100%;opacity:0.5;"></div>
+                    ${p.median > 0 ? `<div style="position:absolute;top:-3px;left:${Math.min(95,Math.max(5,(p.median-p.comp_low)/(p.comp_high-p.comp_low)*100))}%;width:14px;height:14px;background:var(--accent);border-radius:50%;border:2px solid var(--bg);" title="Median: $${p.median}"></div>` : ''}
+                    ${p.price > 0 && p.comp_high > p.comp_low ? `<div style="position:absolute;top:-3px;left:${Math.min(95,Math.max(5,(p.price-p.comp_low)/(p.comp_high-p.comp_low)*100))}%;width:14px;height:14px;background:var(--green);border-radius:50%;border:2px solid var(--bg);" title="Listed: $${p.price}"></div>` : ''}
+                </div>
+                <span style="font-size:12px;color:var(--dim);">$${p.comp_high}</span>
+            </div>
+            <div style="display:flex;justify-content:center;gap:16px;margin-top:6px;font-size:10px;color:var(--dim);">
+                <span>● <span style="color:var(--green);">Listed Price</span></span>
+                <span>● <span style="color:var(--accent);">Median</span></span>
+            </div>
+        </div>` : ''}
+
+        <div style="font-size:13px;color:var(--dim);margin-bottom:16px;background:rgba(10,132,255,0.06);border-radius:8px;padding:10px;">
+            ${p.reasons.join(' · ')}
+            ${p.signed ? ' · <span style="color:var(--accent);">Signed</span>' : ''}
+            ${p.numbered ? ' · <span style="color:var(--accent);">Numbered</span>' : ''}
+        </div>
+
+        ${p.comps?.length ? `
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Active Comparable Listings (${p.active_comp_count})</div>
+            <div class="table-wrap" style="margin-bottom:16px;"><table>
+                <thead><tr><th>Title</th><th class="r">Price</th><th>Link</th></tr></thead>
+                <tbody>${p.comps.map(c => `<tr>
+                    <td class="trunc">${c.title}</td>
+                    <td class="r g b">$${c.price.toLocaleString()}</td>
+                    <td>${c.url ? `<a href="${c.url}" target="_blank" style="color:var(--accent);font-size:11px;">eBay</a>` : '--'}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+        ` : ''}
+
+        ${p.historical_comps?.length ? `
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Historical Sales (${p.historical_count})</div>
+            <div class="table-wrap" style="margin-bottom:16px;"><table>
+                <thead><tr><th>Title</th><th class="r">Price</th><th>Date</th><th>Source</th></tr></thead>
+                <tbody>${p.historical_comps.map(h => `<tr>
+                    <td class="trunc">${h.name}</td>
+                    <td class="r g b">$${h.price}</td>
+                    <td class="d" style="font-size:11px;">${h.date || '--'}</td>
+                    <td class="d" style="font-size:10px;">${h.source || ''}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+        ` : ''}
+
+        <div id="deal-ai-price" style="margin-bottom:12px;"><div class="loading"><div class="spinner"></div><div style="font-size:10px;color:var(--dim);margin-top:4px;">Claude + GPT analyzing buy price...</div></div></div>
+
+        <div style="display:flex;gap:8px;">
+            ${p.url ? `<a href="${p.url}" target="_blank" class="btn btn-primary" style="flex:1;justify-content:center;">View on eBay</a>` : ''}
+            <button class="btn btn-ghost" style="flex:1;justify-content:center;" onclick="runSearch();document.getElementById('search-input').value='${esc(p.title).substring(0,40)}';showTab('dash');setTimeout(runSearch,100);">Deep Analysis</button>
+        </div>
+    `;
+    modal.classList.add('show');
+
+    // Load AI buy price async
+    loadAIBuyPrice(p.title, p.artist || '', p.price, p, 'deal-ai-price');
+}
+
+async function loadAIBuyPrice(title, artist, price, dealData, elId) {
+    const el = document.getElementById(elId);
+    if (!el) return;
+    try {
+        const resp = await fetch('/api/ai/price', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({title, artist, price, context: 'buy', comp_data: {
+                comps: dealData.comps || [],
+                pricing: {estimated: dealData.median, low: dealData.comp_low, high: dealData.comp_high},
+                stats: {confidence: dealData.liquidity, accepted: dealData.comp_count}
+            }})
+        });
+        const d = await resp.json();
+        const claude = d.claude || {};
+        const gpt = d.gpt || {};
+        const con = d.consensus || {};
+
+        el.innerHTML = `<div style="background:linear-gradient(135deg,rgba(48,209,88,0.08),rgba(255,159,10,0.08));border-radius:12px;padding:14px;border:1px solid var(--border);">
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:10px;">AI Buy Recommendation</div>
+            <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:12px;margin-bottom:10px;">
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--accent);font-weight:600;">Claude</div>
+                    <div style="font-size:18px;font-weight:800;color:var(--accent);">${claude.verdict||'--'}</div>
+                    ${claude.buy_below ? `<div style="font-size:12px;">Buy below: $${claude.buy_below}</div>` : ''}
+                    ${claude.fair_value ? `<div style="font-size:10px;color:var(--dim);">Fair: $${claude.fair_value}</div>` : ''}
+                </div>
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--green);font-weight:600;">GPT</div>
+                    <div style="font-size:18px;font-weight:800;color:var(--green);">${gpt.verdict||'--'}</div>
+                    ${gpt.buy_below ? `<div style="font-size:12px;">Buy below: $${gpt.buy_below}</div>` : ''}
+                    ${gpt.fair_value ? `<div style="font-size:10px;color:var(--dim);">Fair: $${gpt.fair_value}</div>` : ''}
+                </div>
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--purple);font-weight:600;">Consensus</div>
+                    <div style="font-size:18px;font-weight:800;color:var(--purple);">${con.buy_below ? 'BUY <$'+con.buy_below : '--'}</div>
+                    ${con.fair_value ? `<div style="font-size:10px;color:var(--dim);">Fair: $${con.fair_value}</div>` : ''}
+                </div>
+            </div>
+            <div style="font-size:11px;color:var(--dim);border-top:1px solid var(--border);padding-top:6px;">
+                ${claude.reasoning||''} ${gpt.reasoning ? '<br>GPT: '+gpt.reasoning : ''}
+            </div>
+        </div>`;
+    } catch(e) { el.innerHTML = ''; }
+}
+
+document.getElementById('deal-search-sort')?.addEventListener('change', () => { if (dealSearchData) renderDealResults(dealSearchData); });
+
+// ==========================================
+// Saved Searches
+// ==========================================
+async function loadSavedSearches() {
+    const el = document.getElementById('saved-searches-bar');
+    if (!el) return;
+    try {
+        const resp = await fetch('/api/saved-searches');
+        const searches = await resp.json();
+        if (!searches.length) { el.innerHTML = ''; return; }
+
+        el.innerHTML = `<div style="display:flex;gap:6px;align-items:center;flex-wrap:wrap;padding:8px 0;">
+            <span style="font-size:11px;color:var(--dim);">Watching:</span>
+            ${searches.map(s => `
+                <div class="chip ${s.active ? 'active' : ''}" style="display:flex;align-items:center;gap:4px;padding:5px 10px;">
+                    <span onclick="document.getElementById('deal-search-input').value='${s.query.replace(/'/g,'')}';searchDeals();" style="cursor:pointer;">${s.query}</span>
+                    <span style="font-size:9px;color:var(--dim);">${s.last_count||0}</span>
+                    <button onclick="event.stopPropagation();removeSavedSearch('${s.id}')" style="background:none;border:none;color:var(--red);cursor:pointer;font-size:12px;padding:0 2px;">✕</button>
+                </div>
+            `).join('')}
+            <button class="btn-ghost" style="font-size:10px;padding:4px 10px;" onclick="checkSavedSearches()">Check Now</button>
+        </div>`;
+    } catch(e) {}
+}
+
+async function saveSearch(query, artist) {
+    if (!query) { query = document.getElementById('deal-search-input').value.trim(); }
+    if (!query) { toast('Enter a search first'); return; }
+    const minPrice = document.getElementById('deal-min-val')?.value || 0;
+    const maxPrice = document.getElementById('deal-max-val')?.value || 10000;
+
+    const resp = await fetch('/api/saved-searches/add', {
+        method: 'POST', headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({query, artist, min_price: parseFloat(minPrice), max_price: parseFloat(maxPrice)})
+    });
+    const d = await resp.json();
+    if (d.error) toast(d.error);
+    else toast('Search saved — will auto-check every 4 hours');
+    loadSavedSearches();
+}
+
+async function removeSavedSearch(id) {
+    await fetch('/api/saved-searches/remove', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({id})});
+    toast('Search removed');
+    loadSavedSearches();
+}
+
+async function checkSavedSearches() {
+    toast('Checking saved searches...');
+    const resp = await fetch('/api/saved-searches/check', {method: 'POST'});
+    const d = await resp.json();
+    if (d.new_items > 0) {
+        toast(d.new_items + ' new items found!');
+    } else {
+        toast('No new items since last check');
+    }
+    loadSavedSearches();
+    pollNotifications();
+}
+
+// ==========================================
+// Like / Pass Learning
+// ==========================================
+async function likeDeal(idx, cardId) {
+    if (!dealSearchData) return;
+    const p = dealSearchData.products[idx];
+    if (!p) return;
+
+    const card = document.getElementById(cardId);
+    if (card) card.classList.add('liked');
+
+    await fetch('/api/deals/like', {
+        method: 'POST', headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({title: p.title, price: p.price, category: p.artist || '', url: p.url || ''})
+    });
+    toast('Liked — AI learning your preferences');
+    setTimeout(() => { if (card) card.style.display = 'none'; }, 400);
+}
+
+async function passDeal(idx, cardId) {
+    if (!dealSearchData) return;
+    const p = dealSearchData.products[idx];
+    if (!p) return;
+
+    const card = document.getElementById(cardId);
+    if (card) card.classList.add('passed');
+
+    await fetch('/api/deals/pass', {
+        method: 'POST', headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({title: p.title, price: p.price, category: p.artist || '', url: p.url || ''})
+    });
+    toast('Passed — AI learning what to skip');
+    setTimeout(() => { if (card) card.style.display = 'none'; }, 400);
+}
+
+// Swipe on deal cards — right=like, left=pass
+(function() {
+    let startX = 0, currentCard = null, currentIdx = -1;
+    document.addEventListener('touchstart', e => {
+        const card = e.target.closest('.deal-card');
+        if (card) {
+            startX = e.touches[0].clientX;
+            currentCard = card;
+            currentIdx = parseInt(card.id?.replace('deal-card-', '') || -1);
+        }
+    }, {passive: true});
+    document.addEventListener('touchmove', e => {
+        if (!currentCard) return;
+        const dx = e.touches[0].clientX - startX;
+        if (Math.abs(dx) > 20) {
+            currentCard.style.transform = `translateX(${dx}px)`;
+            currentCard.style.opacity = Math.max(0.3, 1 - Math.abs(dx) / 300);
+        }
+    }, {passive: true});
+    document.addEventListener('touchend', e => {
+        if (!currentCard) return;
+        const dx = e.changedTouches[0].clientX - startX;
+        if (dx > 80 && currentIdx >= 0) {
+            likeDeal(currentIdx, currentCard.id);
+        } else if (dx < -80 && currentIdx >= 0) {
+            passDeal(currentIdx, currentCard.id);
+        } else {
+            currentCard.style.transform = '';
+            currentCard.style.opacity = '';
+        }
+        currentCard = null;
+        currentIdx = -1;
+    });
+})();
+
+async function saveToWatchlist(title, price, url, image) {
+    await fetch('/api/watchlist/add', {
+        method: 'POST', headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({title, price, url, image, notes: 'Saved from deal search'})
+    });
+    toast('Saved to watchlist');
+}
+
+// Load saved searches on page init
+loadSavedSearches();
+
+// Full background scrape with live progress
+let scrapePolling = null;
+let scrapeActive = false;
+async function startFullScrape() {
+    const el = document.getElementById('scrape-progress');
+    showProgress(el, 0, 'Starting full scrape...', 'Launching background scraper for all 172 deal targets');
+    toast('Starting full scrape...');
+
+    try {
+        const resp = await fetch('/api/scrape/start', {method:'POST'});
+        const d = await resp.json();
+        if (d.error) {
+            showProgress(el, 50, 'Scrape in progress...', d.error);
+        } else {
+            toast('Scraping ' + d.targets + ' targets in background');
+        }
+    } catch(e) { showProgressError(el, 'Failed to start scrape'); return; }
+
+    scrapeActive = true;
+    // Progress arrives on the 'scrape' event; poll only without the stream
+    if (!liveConnected()) pollScrapeStatus();
+}
+
+function pollScrapeStatus() {
+    if (scrapePolling) clearInterval(scrapePolling);
+    scrapePolling = setInterval(async () => {
+        try {
+            const resp = await fetch('/api/scrape/status');
+            const s = await resp.json();
+            if (!s.running) {
+                clearInterval(scrapePolling);
+                scrapePolling = null;
+            }
+            renderScrapeStatus(s);
+        } catch(e) { /* ignore polling errors */ }
+    }, 2000);
+}
+
+function renderScrapeStatus(s) {
+    const el = document.getElementById('scrape-progress');
+    if (!el) return;
+    if (s.running) {
+        scrapeActive = true;
+        showProgress(el, s.pct || 0, `Scraping ${s.progress}/${s.total} targets`, `"${s.last_query}" — ${s.found} deals found so far${s.errors ? ' · '+s.errors+' errors' : ''}`);
+    } else if (scrapeActive) {
+        scrapeActive = false;
+        if (s.found > 0) {
+            showProgressDone(el, `${s.found} deals scraped`, `${s.total} targets searched in ${s.duration_sec||'?'}s${s.errors ? ' · '+s.errors+' errors' : ''}`);
+            // Refresh the deals tab
+            reportsLoaded.deals = null;
+            toast(s.found + ' deals ready — refreshing...');
+        } else if (s.last_run) {
+            showProgressDone(el, `Last scrape: ${s.found} deals`, `${new Date(s.last_run).toLocaleString()}`);
+        }
+    } else if (s.last_run && s.found > 0) {
+        const age = Math.round((Date.now() - new Date(s.last_run).getTime()) / 3600000);
+        el.innerHTML = `<div style="font-size:11px;color:var(--dim);padding:4px 0;">Last scrape: ${s.found} deals · ${age}h ago${age > 4 ? ' · <span style="color:var(--orange);">Stale — click Full Scrape</span>' : ''}</div>`;
+    }
+}
+
+// The stream sends the current scrape status on connect; without it,
+// check once on page load and keep polling if a scrape is running
+onLive('scrape', renderScrapeStatus, async () => {
+    try {
+        const resp = await fetch('/api/scrape/status');
+        const s = await resp.json();
+        renderScrapeStatus(s);
+        if (s.running) pollScrapeStatus();
+    } catch(e) {}
+});
+
+connectLive();
+
+// ==========================================
+// Inventory
+// ==========================================
+let invFilter = 'all';
+let invActionFilter = 'all';  // 'all' | 'PROMOTE' | 'DISCOUNT' | 'RELIST' | 'HOLD'
+function setInvActionFilter(action) {
+    invActionFilter = (invActionFilter === action) ? 'all' : action;
+    // Auto-switch to action sort so the filtered set is meaningful
+    const sortEl = document.getElementById('inv-sort');
+    if (sortEl && invActionFilter !== 'all') sortEl.value = 'action';
+    renderInv();
+}
+
+async function loadInv() {
+    if (invData) { renderInv(); return; }
+    document.getElementById('inv-table').innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    try {
+        const resp = await fetch('/api/inventory/full-analytics');
+        invData = await resp.json();
+        buildInvChips();
+        renderInv();
+    } catch(e) { document.getElementById('inv-table').innerHTML = '<div style="color:var(--red);">Failed to load</div>'; }
+}
+
+async function refreshInv() {
+    invData = null;
+    document.getElementById('inv-table').innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    toast('Refreshing from eBay...');
+    await loadInv();
+    toast('Refreshed');
+}
+
+function buildInvChips() {
+    const cats = {};
+    (invData?.items||[]).forEach(i => { cats[i.artist] = (cats[i.artist]||0)+1; });
+    const el = document.getElementById('inv-chips');
+    el.innerHTML = `<button class="chip active" onclick="invFilter='all';document.querySelectorAll('#inv-chips .chip').forEach(c=>c.classList.remove('active'));this.classList.add('active');renderInv();">All (${invData?.total||0})</button>` +
+        Object.entries(cats).sort((a,b)=>b[1]-a[1]).map(([cat,n]) =>
+            `<button class="chip" onclick="invFilter='${cat}';document.querySelectorAll('#inv-chips .chip').forEach(c=>c.classList.remove('active'));this.classList.add('active');renderInv();">${cat} (${n})</button>`
+        ).join('');
+}
+
+function renderInv() {
+    let items = invData?.items || [];
+    const query = document.getElementById('inv-search')?.value?.toLowerCase() || '';
+    const sort = document.getElementById('inv-sort')?.value || 'signal';
+
+    if (invFilter !== 'all') items = items.filter(i => i.artist === invFilter);
+    if (invActionFilter !== 'all') items = items.filter(i => i.action === invActionFilter);
+    if (query) items = items.filter(i => i.name.toLowerCase().includes(query));
+
+    const order = {'SELL NOW':0,'GOOD TO SELL':1,'SET PRICE':2,'HOLD':3,'WAIT':4,'RESEARCH':5};
+    const actionOrder = {'PROMOTE':0,'DISCOUNT':1,'RELIST':2,'HOLD':3};
+    if (sort === 'signal') items.sort((a,b) => (order[a.recommendation]||5) - (order[b.recommendation]||5));
+    else if (sort === 'action') items.sort((a,b) => (actionOrder[a.action]??3) - (actionOrder[b.action]??3) || (b.action_score||0) - (a.action_score||0));
+    else if (sort === 'alpha') items.sort((a,b) => a.name.localeCompare(b.name));
+    else if (sort === 'price_high') items.sort((a,b) => (b.suggested_price||0) - (a.suggested_price||0));
+    else if (sort === 'price_low') items.sort((a,b) => (a.suggested_price||0) - (b.suggested_price||0));
+    else if (sort === 'watchers') items.sort((a,b) => (b.watchers||0) - (a.watchers||0));
+    else if (sort === 'roi') items.sort((a,b) => (b.roi_est||0) - (a.roi_est||0));
+    else if (sort === 'stale') items.sort((a,b) => (b.days_listed||0) - (a.days_listed||0));
+    else if (sort === 'comp_upside') items.sort((a,b) => (a.comp_delta_pct ?? 999) - (b.comp_delta_pct ?? 999));
+    else if (sort === 'comp_overpriced') items.sort((a,b) => (b.comp_delta_pct ?? -999) - (a.comp_delta_pct ?? -999));
+    else if (sort === 'comp_count') items.sort((a,b) => (b.comp_count||0) - (a.comp_count||0));
+
+    document.getElementById('inv-count').textContent = `${items.length} items`;
+    document.getElementById('inv-sub').textContent = `${invData?.total||0} listings · $${Math.round((invData?.total_value||0)/1000)}k value`;
+
+    const el = document.getElementById('inv-table');
+    const signalPill = r => r.includes('SELL') ? 'pill-green' : r === 'HOLD' || r === 'WAIT' ? 'pill-orange' : r === 'SET PRICE' ? 'pill-blue' : 'pill-dim';
+
+    const velColor = v => v==='Blazing'?'var(--gold)':v==='Fast'?'var(--green)':v==='Moderate'?'var(--accent)':v==='Slow'?'var(--dim)':'var(--red)';
+
+    // Action summary cards
+    const acts = invData?.action_summary || {};
+    const cap = invData?.capital_efficiency || {};
+    const cs = invData?.comp_summary || {};
+    // Card style helpers — full-border card, optional action color via tinted bg, no side-stripes.
+    const isAct = (a) => invActionFilter === a;
+    const baseCard = 'flex:1;text-align:center;min-width:80px;padding:10px 6px;border:1px solid var(--border);border-radius:10px;background:var(--card);transition:background 120ms,border-color 120ms;';
+    const tintBg = (c) => `background:color-mix(in oklch, ${c} 12%, var(--card));border-color:color-mix(in oklch, ${c} 30%, var(--border));`;
+    const selRing = (c) => `box-shadow:inset 0 0 0 1.5px ${c};${tintBg(c)}`;
+    const cardStat = (label, value, color) =>
+        `<div style="font-size:19px;font-weight:700;color:${color||'var(--text)'};line-height:1;margin-bottom:4px;">${value}</div>` +
+        `<div class="stat-lbl">${label}</div>`;
+
+    const actCard = (key, label, color) => {
+        const sel = isAct(key);
+        const tip = sel ? `Click to clear filter` : `Click to filter to ${label} items`;
+        const cursor = (acts[key] || 0) > 0 ? 'cursor:pointer;' : 'cursor:default;opacity:0.5;';
+        const style = `${baseCard}${cursor}${sel ? selRing(color) : ''}`;
+        return `<div style="${style}" onclick="setInvActionFilter('${key}')" title="${tip}">${cardStat(sel ? label + ' ✓' : label, acts[key]||0, color)}</div>`;
+    };
+
+    const actBar = `<div style="display:flex;gap:6px;margin-bottom:10px;flex-wrap:wrap;">
+        ${actCard('PROMOTE',  'Promote',  'var(--accent)')}
+        ${actCard('DISCOUNT', 'Discount', 'var(--orange)')}
+        ${actCard('RELIST',   'Relist',   'var(--red)')}
+        ${actCard('HOLD',     'Hold',     'var(--green)')}
+        <div style="${baseCard}">${cardStat('Capital', '$' + Math.round(cap.total_locked||0).toLocaleString())}</div>
+        <div style="${baseCard}">${cardStat('Turns/Yr', (cap.inventory_turnover||0) + 'x')}</div>
+        <div style="${baseCard}">${cardStat('Avg Age', (cap.avg_days_listed||0) + 'd')}</div>
+    </div>
+    ${invActionFilter !== 'all' ? `<div style="font-size:11px;color:var(--dim);margin:-4px 0 8px;">
+      Showing only <b style="color:var(--text);">${invActionFilter}</b> items.
+      <a onclick="setInvActionFilter('${invActionFilter}')" style="color:var(--accent);cursor:pointer;text-decoration:underline;">Clear</a>
+    </div>` : ''}
+    <div style="display:flex;gap:6px;margin-bottom:10px;flex-wrap:wrap;">
+        <div style="${baseCard}cursor:pointer;" onclick="document.getElementById('inv-sort').value='comp_upside';renderInv();" title="Items listed below comp median — click to sort by biggest upside">${cardStat('Under Comp', cs.under_median||0, 'var(--green)')}</div>
+        <div style="${baseCard}" title="Items priced within ±5% of comp median">${cardStat('At Median', cs.at_median||0, 'var(--accent)')}</div>
+        <div style="${baseCard}cursor:pointer;" onclick="document.getElementById('inv-sort').value='comp_overpriced';renderInv();" title="Items listed above comp p75 — click to sort">${cardStat('Over p75', cs.over_p75||0, 'var(--orange)')}</div>
+        <div style="${baseCard}" title="Total $ between your prices and comp medians on under-comp items">${cardStat('Upside to Median', '$' + Math.round(cs.total_upside_to_median||0).toLocaleString(), 'var(--green)')}</div>
+        <div style="${baseCard}cursor:pointer;" onclick="document.getElementById('inv-sort').value='comp_count';renderInv();" title="Listings with ≥3 matching comps in the 54k DB">${cardStat('With Comps', cs.coverage||0)}</div>
+        <div style="${baseCard}" title="Listings with no matching comps — title may be too unique">${cardStat('No Comps', cs.no_comps||0, 'var(--dim)')}</div>
+    </div>`;
+
+    el.innerHTML = actBar + `<div class="table-wrap"><table>
+        <thead><tr>
+            <th>Item</th><th style="min-width:140px;background:rgba(48,209,88,0.05);">Set Price ✏️</th><th>Signal</th><th>Next Move</th><th>Velocity</th><th class="r">Smart $</th><th class="r">Last Sale</th>
+            <th class="r">Median</th><th class="r" title="Historical comp median · count · position vs your price">Comps</th><th class="r">Supply</th><th class="r">Ad%</th>
+            <th class="r">Margin</th><th>Season</th><th>Why</th>
+        </tr></thead>
+        <tbody>${items.slice(0, 200).map(i => {
+            const hasSuggestion = i.suggested_price && i.your_price && Math.abs(i.suggested_price - i.your_price) > 5;
+            const mc = (i.margin_pct||0) > 30 ? 'g' : (i.margin_pct||0) > 10 ? 'o' : 'rd';
+            return `<tr onclick="drillItem('${i.id}','${esc(i.name)}','${i.artist}',${i.suggested_price||0})" title="Click for full detail: chart + comps + AI validation">
+                <td class="trunc" title="${i.name}">
+                    ${i.name}
+                    <span onclick="event.stopPropagation();showChart('${i.id}',event)" style="cursor:pointer;opacity:0.4;" title="Price history chart">📊</span>
+                </td>
+                <td onclick="event.stopPropagation();" style="min-width:200px;background:rgba(48,209,88,0.04);border-left:2px solid var(--green);">
+                    <div style="font-size:9px;color:var(--dim);margin-bottom:2px;">Now: $${Math.round(i.your_price||0)} · AI: $${Math.round(i.suggested_price||0)}${i.market_median ? ' · Comp: $'+Math.round(i.market_median) : ''}</div>
+                    <div style="display:flex;gap:4px;align-items:center;margin-bottom:3px;">
+                        <span style="color:var(--green);font-size:14px;font-weight:700;">$</span>
+                        <input type="number" id="price-${i.id}" value="${Math.round(i.suggested_price||i.your_price||0)}" min="1" step="1" onclick="event.stopPropagation();" onfocus="event.stopPropagation();this.select();" style="width:75px;background:#000;border:2px solid var(--green);border-radius:8px;color:var(--green);padding:6px 8px;font-size:15px;font-weight:800;text-align:right;">
+                        <button onclick="event.stopPropagation();applyCustomPrice('${i.id}')" class="btn" style="background:var(--green);color:#000;padding:6px 12px;font-size:13px;font-weight:800;border:none;border-radius:8px;cursor:pointer;" title="Update price on eBay">GO</button>
+                    </div>
+                    <div style="display:flex;gap:3px;">
+                        <button onclick="event.stopPropagation();quickPrice('${i.id}',${i.your_price||0},-0.10)" class="btn-ghost" style="padding:2px 6px;font-size:9px;" title="-10%">-10%</button>
+                        <button onclick="event.stopPropagation();quickPrice('${i.id}',${i.your_price||0},-0.20)" class="btn-ghost" style="padding:2px 6px;font-size:9px;" title="-20%">-20%</button>
+                        ${i.market_median ? `<button onclick="event.stopPropagation();setExactPrice('${i.id}',${Math.round(i.market_median)})" class="btn-ghost" style="padding:2px 6px;font-size:9px;color:var(--accent);" title="Match comp median $${Math.round(i.market_median)}">Comp</button>` : ''}
+                        ${i.suggested_price ? `<button onclick="event.stopPropagation();setExactPrice('${i.id}',${Math.round(i.suggested_price)})" class="btn-ghost" style="padding:2px 6px;font-size:9px;color:var(--purple);" title="Match AI $${Math.round(i.suggested_price)}">AI</button>` : ''}
+                        <button onclick="event.stopPropagation();showPriceHistory('${i.id}','${esc(i.name)}')" class="btn-ghost" style="padding:2px 6px;font-size:9px;color:var(--orange);" title="Price history">📈</button>
+                    </div>
+                </td>
+                <td onclick="event.stopPropagation();invFilter='${i.signal}';document.querySelectorAll('#inv-chips .chip').forEach(c=>c.classList.remove('active'));renderInv();" style="cursor:pointer;" title="Filter by ${i.recommendation}">
+                    <span class="pill ${signalPill(i.recommendation)}">${i.recommendation}</span>
+                </td>
+                <td title="${i.action_reason||''} (score: ${i.action_score||0})">
+                    <span class="pill ${i.action==='PROMOTE'?'pill-blue':i.action==='DISCOUNT'?'pill-orange':i.action==='RELIST'?'pill-red':'pill-green'}">${i.action||'--'}</span>
+                </td>
+                <td style="color:${velColor(i.velocity)};font-size:11px;font-weight:600;cursor:help;" title="Velocity: ${i.velocity}. ${i.times_sold||0} sold, ${i.avg_days_on_market!=null?i.avg_days_on_market+'d DOM':'no DOM data'}">${i.velocity||'--'}</td>
+                <td class="r b g" onclick="event.stopPropagation();showChart('${i.id}',event)" style="cursor:pointer;" title="Click for price history. Components: ${Object.entries(i.pricing_components||{}).map(([k,v])=>k+': $'+Math.round(v.price||0)).join(', ')}">$${Math.round(i.suggested_price||0)}</td>
+                <td class="r" style="color:var(--accent);cursor:help;" title="Last sale: $${i.last_sale||'--'} on ${i.last_sale_date||'unknown'}. ${i.price_confidence||'?'} confidence.">${i.last_sale ? '$'+Math.round(i.last_sale) : '--'}</td>
+                <td class="r d" onclick="event.stopPropagation();drill('competing',{title:'${esc(i.name)}'})" style="cursor:pointer;" title="Click to see market comps">${i.market_median ? '$'+Math.round(i.market_median) : '--'}</td>
+                <td class="r" onclick="event.stopPropagation();showCompDetail('${i.id}','${esc(i.name)}','${i.artist}')" style="cursor:pointer;" title="${i.comp_count ? `${i.comp_count} comps · median $${Math.round(i.comp_median)} · p75 $${Math.round(i.comp_p75)}${i.comp_12mo_median?' · 12mo $'+Math.round(i.comp_12mo_median):''}${i.comp_signed_only?' · signed-only':''}${i.comp_delta_pct!=null?' · your price '+(i.comp_delta_pct>0?'+':'')+i.comp_delta_pct+'% vs median':''}\nClick for distribution chart.` : 'No comps found in 54k DB'}">${i.comp_count ? `<span style="color:${i.comp_position==='under'?'var(--green)':i.comp_position==='over'?'var(--orange)':'var(--accent)'};font-weight:700;">$${Math.round(i.comp_median)}</span><span style="font-size:9px;color:var(--dim);margin-left:3px;">n=${i.comp_count}</span>${i.comp_delta_pct!=null?`<div style="font-size:9px;color:${i.comp_delta_pct<-5?'var(--green)':i.comp_delta_pct>10?'var(--orange)':'var(--dim)'};">${i.comp_delta_pct>0?'+':''}${i.comp_delta_pct}%</div>`:''}` : '<span style="color:var(--dim);">--</span>'}</td>
+                <td class="r" onclick="event.stopPropagation();drill('competing',{title:'${esc(i.name)}',id:'${i.id}'})" style="cursor:pointer;color:var(--accent);text-decoration:underline;" title="${i.ebay_supply||0} competing listings — click to view">${i.ebay_supply||0}</td>
+                <td class="r ${(i.ad_rate||0)>8?'rd b':''}" onclick="event.stopPropagation();showTab('promos')" style="cursor:pointer;" title="Ad rate: ${i.ad_rate||0}%. Click to manage promotions.">${i.ad_rate ? i.ad_rate+'%' : '--'}</td>
+                <td class="r ${mc}" title="Revenue: $${Math.round(i.suggested_price||0)} — Cost est: $${Math.round((i.suggested_price||0)*0.4)} — Fee: $${Math.round((i.suggested_price||0)*0.13)} — Ad: $${Math.round(i.ad_cost||0)} — Profit: $${Math.round(i.net_profit||0)} (${i.margin_pct||0}%)">${i.net_profit ? '$'+Math.round(i.net_profit) : '--'} <span style="font-size:9px;">${i.margin_pct?i.margin_pct+'%':''}</span></td>
+                <td style="font-size:10px;color:var(--purple);max-width:80px;overflow:hidden;text-overflow:ellipsis;white-space:nowrap;${i.seasonal_event?'cursor:pointer;':''}" title="${i.seasonal_event ? i.seasonal_event+' (+'+i.seasonal_boost+'%). Click to see matching items.' : 'No active event'}" ${i.seasonal_event ? `onclick="event.stopPropagation();drill('event_items',{event:'${i.seasonal_event}'})"` : ''}>${i.seasonal_event ? '+'+i.seasonal_boost+'% '+i.seasonal_event : '--'}</td>
+                <td style="font-size:11px;color:var(--dim);min-width:150px;" title="${i.reason||''}">${i.action_reason||i.reason||''}</td>
+            </tr>`;
+        }).join('')}</tbody></table></div>` +
+        (items.length > 200 ? `<div style="text-align:center;padding:12px;font-size:12px;color:var(--dim);">Showing 200 of ${items.length}</div>` : '');
+}
+
+function quickPrice(id, currentPrice, pctChange) {
+    const newPrice = Math.round(currentPrice * (1 + pctChange));
+    setExactPrice(id, newPrice);
+}
+
+function setExactPrice(id, price) {
+    const input = document.getElementById('price-' + id);
+    if (input) {
+        input.value = price;
+        input.style.borderColor = 'var(--orange)';
+    }
+    // Auto-apply
+    acceptPrice(id, price);
+}
+
+async function showPriceHistory(id, name) {
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = 'Price History — ' + name;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch('/api/listing/price-history/' + id);
+        const d = await resp.json();
+        const history = d.history || [];
+
+        if (!history.length) {
+            content.innerHTML = '<div style="text-align:center;padding:30px;color:var(--dim);">No price changes recorded yet. History is tracked from now forward.</div>';
+            return;
+        }
+
+        content.innerHTML = `
+            <div style="display:flex;gap:8px;margin-bottom:16px;">
+                <div class="card" style="flex:1;text-align:center;"><div class="stat-val">${history.length}</div><div class="stat-lbl">Changes</div></div>
+                <div class="card" style="flex:1;text-align:center;"><div class="stat-val g">$${history[history.length-1].price}</div><div class="stat-lbl">Current</div></div>
+                <div class="card" style="flex:1;text-align:center;"><div class="stat-val">$${history[0].price}</div><div class="stat-lbl">Original</div></div>
+            </div>
+            <canvas id="price-history-chart" height="200" style="margin-bottom:16px;"></canvas>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Date</th><th class="r">Price</th><th class="r">Change</th></tr></thead>
+                <tbody>${history.map((h, i) => {
+                    const diff = i > 0 ? h.price - history[i-1].price : 0;
+                    const pct = i > 0 ? Math.round(diff / history[i-1].price * 100) : 0;
+                    return `<tr>
+                        <td class="d">${h.date.substring(0,16).replace('T',' ')}</td>
+                        <td class="r b">$${h.price}</td>
+                        <td class="r ${diff > 0 ? 'g' : diff < 0 ? 'rd' : 'd'}">${i === 0 ? 'Initial' : (diff > 0 ? '+' : '') + '$' + diff + ' (' + (pct > 0 ? '+' : '') + pct + '%)'}</td>
+                    </tr>`;
+                }).join('')}</tbody>
+            </table></div>
+        `;
+
+        setTimeout(() => {
+            const ctx = document.getElementById('price-history-chart');
+            if (ctx && history.length >= 2) {
+                new Chart(ctx, {
+                    type: 'line',
+                    data: {
+                        labels: history.map(h => h.date.substring(5,10)),
+                        datasets: [{
+                            label: 'Price',
+                            data: history.map(h => h.price),
+                            borderColor: '#30d158',
+                            backgroundColor: 'rgba(48,209,88,0.1)',
+                            fill: true,
+                            tension: 0.3,
+                            pointRadius: 5,
+                        }]
+                    },
+                    options: {
+                        responsive: true,
+                        plugins: {legend: {display: false}},
+                        scales: {
+                            x: {ticks: {color: '#86868b'}, grid: {display: false}},
+                            y: {ticks: {color: '#86868b', callback: v => '$' + v}, grid: {color: 'rgba(255,255,255,0.04)'}}
+                        }
+                    }
+                });
+            }
+        }, 100);
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed to load history</div>'; }
+}
+
+async function applyCustomPrice(id, prefix) {
+    const input = document.getElementById((prefix || 'price-') + id);
+    if (!input) return;
+    const price = parseFloat(input.value);
+    if (!price || price <= 0) { toast('Enter a valid price'); return; }
+    await acceptPrice(id, price);
+}
+
+async function acceptPrice(id, price) {
+    const btn = event?.target;
+    if (btn) { btn.disabled = true; btn.textContent = '...'; }
+    toast('Updating to $' + Math.round(price) + '...');
+
+    try {
+        const resp = await fetch('/api/pricing/apply', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify({changes:[{listing_id:id,new_price:price}]})});
+        const d = await resp.json();
+        if (d.applied) {
+            toast('Price updated to $' + Math.round(price));
+            if (btn) { btn.textContent = '✓'; btn.style.background = 'var(--green)'; }
+            const input = document.getElementById('price-' + id);
+            if (input) input.style.borderColor = 'var(--green)';
+        } else {
+            toast('Price update failed');
+            if (btn) { btn.textContent = '✗'; btn.style.background = 'var(--red)'; }
+        }
+    } catch(e) {
+        toast('Failed — network error');
+        if (btn) { btn.textContent = '✗'; btn.style.background = 'var(--red)'; }
+    }
+    setTimeout(() => { if (btn) { btn.disabled = false; btn.textContent = '✓'; } }, 2000);
+}
+
+function exportInv() {
+    if (!invData?.items) return;
+    const h = ['Name','Artist','Signal','Smart Price','Last Sale','Median','Supply','Reason'];
+    const rows = [h, ...invData.items.map(i => [i.name, i.artist, i.recommendation, i.suggested_price, i.last_sale, i.market_median, i.ebay_supply, i.reason])];
+    downloadCSV('inventory.csv', rows);
+}
+
+// ==========================================
+// Promotions
+// ==========================================
+let promosLoaded = false;
+
+async function loadPromos() {
+    if (promosLoaded) return;
+    document.getElementById('ptab-costs').innerHTML = '<div class="loading"><div class="spinner"></div><div style="font-size:11px;color:var(--dim);margin-top:6px;">Loading promotions data...</div></div>';
+    try {
+        const [dResp, hResp, aResp, sResp] = await Promise.all([
+            fetch('/api/promotions/detail'),
+            fetch('/api/analytics/sales-history'),
+            fetch('/api/analytics/ad-performance'),
+            fetch('/api/promotions/strategy')
+        ]);
+        if (!dResp.ok || !hResp.ok || !aResp.ok || !sResp.ok) {
+            throw new Error('API returned ' + [dResp.status, hResp.status, aResp.status, sResp.status].join('/'));
+        }
+        promoData = await dResp.json();
+        const histData = await hResp.json();
+        const adPerf = await aResp.json();
+        const stratData = await sResp.json();
+        promosLoaded = true;
+
+        // Category strategy table
+        const ebayRates = stratData.ebay_suggested || {};
+        const savedStrats = stratData.category_strategies || {};
+        const presets = stratData.presets || {};
+        const presetKeys = Object.keys(presets);
+        const catVel = adPerf.category_performance || {};
+
+        document.getElementById('ptab-category').innerHTML = `
+            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:12px;">
+                <div class="section-title" style="margin-bottom:0;">Category Strategy</div>
+                <button class="btn btn-green" style="padding:8px 16px;font-size:12px;" onclick="applyCatStrats()">Apply All to eBay</button>
+            </div>
+            <div id="cat-strat-status" style="margin-bottom:8px;"></div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Category</th><th class="r">Items</th><th class="r">Sold</th><th class="r">Conv%</th><th class="r">eBay Suggested</th><th>Strategy</th></tr></thead>
+                <tbody>${Object.keys(ebayRates).map(cat => {
+                    const cv = catVel[cat] || {};
+                    const saved = savedStrats[cat] || 'steady';
+                    return `<tr onclick="drillCategory('${cat}', ${cv.items||0}, ${cv.sold||0}, ${cv.conversion_rate||0})" title="Click to see all ${cat} listings" style="cursor:pointer;">
+                        <td class="b">${cat}</td>
+                        <td class="r">${cv.items||0}</td>
+                        <td class="r">${cv.sold||0}</td>
+                        <td class="r ${(cv.conversion_rate||0)>10?'g b':'d'}">${cv.conversion_rate||0}%</td>
+                        <td class="r">${ebayRates[cat]}%</td>
+                        <td><select id="cs-${cat.replace(/[^a-zA-Z]/g,'')}" style="background:var(--card2);border:1px solid var(--border);border-radius:8px;color:var(--text);padding:4px 8px;font-size:11px;">
+                            ${presetKeys.map(k => `<option value="${k}" ${k===saved?'selected':''}>${presets[k].name}</option>`).join('')}
+                        </select></td>
+                    </tr>`;
+                }).join('')}</tbody></table></div>`;
+
+        // Analytics
+        const buckets = adPerf.rate_buckets || {};
+        document.getElementById('ptab-analytics').innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(100px,1fr));gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val">${adPerf.total_items||0}</div><div class="stat-lbl">Items</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${adPerf.total_promoted||0}</div><div class="stat-lbl">Promoted</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${adPerf.total_sold||0}</div><div class="stat-lbl">Sold</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val o">$${Math.round(adPerf.total_ad_spend||0)}</div><div class="stat-lbl">Ad Spend</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${Math.round(adPerf.total_revenue||0)}</div><div class="stat-lbl">Revenue</div></div>
+            </div>
+            <div class="section-title">Conversion by Ad Rate</div>
+            <canvas id="ad-conv-chart" height="200" style="margin-bottom:16px;"></canvas>
+            <div class="section-title">Rate Buckets</div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Rate</th><th class="r">Items</th><th class="r">Sold</th><th class="r">Conv%</th><th class="r">ROI</th></tr></thead>
+                <tbody>${Object.entries(buckets).map(([name,b]) => `<tr onclick="drillRateBucket('${name}', ${b.items}, ${b.sold}, ${b.conversion_rate}, ${b.roi})" title="Click to see items in this rate bucket" style="cursor:pointer;">
+                    <td class="b">${name}</td><td class="r">${b.items}</td><td class="r">${b.sold}</td>
+                    <td class="r ${b.conversion_rate>10?'g b':''}">${b.conversion_rate}%</td>
+                    <td class="r ${b.roi>0?'g':'rd'}">${b.roi>0?'+':''}${b.roi}%</td>
+                </tr>`).join('')}</tbody></table></div>`;
+
+        // Draw conversion chart — click any bar to drill into that bucket
+        window._adBuckets = buckets;
+        setTimeout(() => {
+            const ctx = document.getElementById('ad-conv-chart');
+            if (ctx) {
+                const labels = Object.keys(buckets);
+                const adChart = new Chart(ctx, {
+                    type:'bar',
+                    data:{labels, datasets:[{data:labels.map(l=>buckets[l].conversion_rate), backgroundColor:labels.map(l=>buckets[l].conversion_rate>10?'#30d158':buckets[l].conversion_rate>0?'#ff9f0a':'#86868b'), borderRadius:6}]},
+                    options:{responsive:true, plugins:{legend:{display:false},tooltip:{callbacks:{label:ctx=>ctx.raw+'% · Click for items'}}}, scales:{x:{ticks:{color:'#86868b'},grid:{display:false}}, y:{ticks:{color:'#86868b',callback:v=>v+'%'},grid:{color:'rgba(255,255,255,0.04)'}}}}
+                });
+                ctx.onclick = (evt) => {
+                    const pts = adChart.getElementsAtEventForMode(evt, 'nearest', {intersect:true}, true);
+                    if (pts.length) {
+                        const name = labels[pts[0].index];
+                        const b = buckets[name];
+                        drillRateBucket(name, b.items, b.sold, b.conversion_rate, b.roi);
+                    }
+                };
+            }
+        }, 100);
+
+        // Costs table
+        const items = promoData?.products || [];
+        document.getElementById('ptab-costs').innerHTML = `<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">
+            <div style="font-size:12px;color:var(--dim);">${items.length} products · ${items.filter(i=>(i.ad_rate||0)>0).length} promoted</div>
+            <button class="btn btn-green" style="padding:6px 14px;font-size:12px;" onclick="applySpeedHigh()">Apply Strategy to eBay</button>
+        </div><div class="table-wrap"><table>
+            <thead><tr><th>Product</th><th>Type</th><th class="r">Price</th><th class="r">Rate</th><th class="r">Cost</th><th>Status</th></tr></thead>
+            <tbody>${items.slice(0,150).map(i => {
+                const tc = (i.funding_model||'') === 'Dynamic' ? 'var(--accent)' : (i.funding_model||'') === 'Standard' ? 'var(--green)' : 'var(--dim)';
+                const status = i.promo_status || 'none';
+                return `<tr style="${status==='none'?'opacity:0.4;':''}" onclick="drillPromoItem('${esc(i.title)}', ${i.price||0}, ${i.ad_rate||0}, ${i.total_cost||0}, '${status}')" title="Click for detail">
+                    <td class="trunc">${i.title||''}</td><td style="color:${tc};font-size:11px;font-weight:600;">${i.ad_type||'--'}</td>
+                    <td class="r">$${(i.price||0).toFixed(0)}</td><td class="r ${(i.ad_rate||0)>8?'rd b':''}">${i.ad_rate?i.ad_rate+'%':'--'}</td>
+                    <td class="r ${(i.total_cost||0)>0?'o b':'d'}">$${(i.total_cost||0).toFixed(2)}</td>
+                    <td style="font-size:10px;color:${status==='overspending'?'var(--red)':status==='none'?'var(--dim)':'var(--green)'};">${status.toUpperCase()}</td>
+                </tr>`;
+            }).join('')}</tbody></table></div>`;
+
+        // Sales history
+        document.getElementById('ptab-history').innerHTML = `<div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(100px,1fr));gap:8px;margin-bottom:12px;">
+            <div class="card" style="text-align:center;"><div class="stat-val g">${histData.total_sold||0}</div><div class="stat-lbl">Sold</div></div>
+            <div class="card" style="text-align:center;"><div class="stat-val">$${Math.round(histData.total_revenue||0).toLocaleString()}</div><div class="stat-lbl">Revenue</div></div>
+            <div class="card" style="text-align:center;"><div class="stat-val">${histData.promoted_sold||0}</div><div class="stat-lbl">Promoted</div></div>
+            <div class="card" style="text-align:center;"><div class="stat-val g">${histData.organic_sold||0}</div><div class="stat-lbl">Organic</div></div>
+        </div>
+        <div class="table-wrap"><table>
+            <thead><tr><th>Item</th><th class="r">Sold $</th><th>Listed</th><th>Sold</th><th class="r">Days</th><th>Type</th><th class="r">Ad%</th></tr></thead>
+            <tbody>${(histData.items||[]).map(i => `<tr onclick="drillSoldItem('${esc(i.title)}', ${i.price}, '${i.sold}', ${i.days_to_sell||0}, ${i.ad_rate||0}, 0, '${i.promoted?'Promoted':'Organic'}')" title="Click for comps + market data">
+                <td class="trunc">${i.title}</td><td class="r g b">$${i.price.toFixed(0)}</td>
+                <td class="d" style="font-size:11px;">${i.listed}</td><td class="d" style="font-size:11px;">${i.sold}</td>
+                <td class="r b">${i.days_to_sell!=null?i.days_to_sell+'d':'--'}</td>
+                <td style="font-size:11px;color:${i.promoted?'var(--accent)':'var(--green)'};">${i.promoted?'Promoted':'Organic'}</td>
+                <td class="r">${i.ad_rate?i.ad_rate+'%':'--'}</td>
+            </tr>`).join('')}</tbody></table></div>`;
+
+    } catch(e) {
+        console.error('Promos error:', e);
+        promosLoaded = false;
+        document.getElementById('ptab-costs').innerHTML = `<div style="color:var(--red);padding:20px;">
+            <div style="font-size:16px;font-weight:700;margin-bottom:8px;">Promotions Error</div>
+            <div style="font-size:13px;margin-bottom:12px;">${e.message || 'Unknown error'}</div>
+            <div style="font-size:11px;color:var(--dim);margin-bottom:12px;">${e.stack ? e.stack.split('\\n').slice(0,3).join('<br>') : ''}</div>
+            <button class="btn btn-primary" style="padding:8px 16px;font-size:12px;" onclick="promosLoaded=false;loadPromos();">Retry</button>
+        </div>`;
+    }
+}
+
+function showPTab(tab) {
+    document.querySelectorAll('[data-ptab]').forEach(c => c.classList.remove('active'));
+    document.querySelector(`[data-ptab="${tab}"]`).classList.add('active');
+    ['costs','repricing','category','analytics','history'].forEach(t => {
+        document.getElementById('ptab-'+t).style.display = t===tab ? 'block' : 'none';
+    });
+    if (tab === 'repricing' && !window._repricingLoaded) loadRepricingTab();
+}
+
+// ==========================================
+// Repricing Tab
+// ==========================================
+async function loadRepricingTab() {
+    const el = document.getElementById('ptab-repricing');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/reprice/full');
+        const d = await resp.json();
+        window._repricingLoaded = true;
+        window._repriceData = d;
+
+        const items = d.items || [];
+        const s = d.summary || {};
+        const config = d.config || {};
+
+        const statusColor = st => st === 'MARKDOWN' ? 'var(--red)' : st === 'OVERPRICED' ? 'var(--orange)' : st === 'UNDERPRICED' ? 'var(--green)' : st === 'AT FLOOR' ? 'var(--purple)' : 'var(--dim)';
+        const statusPill = st => st === 'MARKDOWN' ? 'pill-red' : st === 'OVERPRICED' ? 'pill-orange' : st === 'UNDERPRICED' ? 'pill-green' : st === 'AT FLOOR' ? 'pill-blue' : 'pill-dim';
+
+        el.innerHTML = `
+            <div style="display:flex;gap:8px;margin-bottom:12px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--red);"><div style="font-size:20px;font-weight:700;color:var(--red);">${s.markdown||0}</div><div class="stat-lbl">Markdown</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--orange);"><div style="font-size:20px;font-weight:700;color:var(--orange);">${s.overpriced||0}</div><div class="stat-lbl">Overpriced</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--purple);"><div style="font-size:20px;font-weight:700;">${s.at_floor||0}</div><div class="stat-lbl">At Floor</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;border-left:3px solid var(--green);"><div style="font-size:20px;font-weight:700;color:var(--green);">${s.underpriced||0}</div><div class="stat-lbl">Under</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;"><div style="font-size:20px;font-weight:700;">${s.ok||0}</div><div class="stat-lbl">OK</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:70px;"><div style="font-size:20px;font-weight:700;color:var(--red);">$${s.potential_savings||0}</div><div class="stat-lbl">Savings</div></div>
+            </div>
+
+            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:8px;">
+                <div style="font-size:12px;color:var(--dim);">${items.length} listings · Stale threshold: ${config.threshold||21}d</div>
+                <div style="display:flex;gap:6px;">
+                    <select id="reprice-filter" onchange="filterRepricingTab()" style="background:var(--bg);border:1px solid var(--border);border-radius:8px;color:var(--text);padding:4px 8px;font-size:11px;">
+                        <option value="all">All</option>
+                        <option value="MARKDOWN">Markdown Only</option>
+                        <option value="OVERPRICED">Overpriced</option>
+                        <option value="UNDERPRICED">Underpriced</option>
+                        <option value="AT FLOOR">At Floor</option>
+                        <option value="OK">OK</option>
+                    </select>
+                    <button class="btn btn-primary" style="padding:6px 14px;font-size:12px;" onclick="runReprice()">Apply Markdowns</button>
+                </div>
+            </div>
+
+            <div class="table-wrap" id="reprice-table"><table>
+                <thead><tr>
+                    <th>Item</th><th>Status</th><th class="r">Current</th><th class="r">Proposed</th>
+                    <th class="r">Floor</th><th class="r">Median</th><th class="r">Min</th><th class="r">Max</th>
+                    <th class="r">Comps</th><th class="r">Sold</th><th class="r">Days</th><th class="r">Ad%</th><th>Set Price</th>
+                </tr></thead>
+                <tbody>${items.map(i => `<tr onclick="drillItem('${i.id}','${esc(i.title)}','${i.category}',${i.current_price})" style="cursor:pointer;" title="Click for full detail">
+                    <td class="trunc">${i.title}</td>
+                    <td><span class="pill ${statusPill(i.status)}">${i.status}</span></td>
+                    <td class="r b">$${i.current_price}</td>
+                    <td class="r ${i.would_change?'g b':'d'}">${i.would_change?'$'+i.proposed_price:'—'}</td>
+                    <td class="r d">$${i.floor}</td>
+                    <td class="r" style="color:var(--accent);">${i.market_median?'$'+Math.round(i.market_median):'—'}</td>
+                    <td class="r d">${i.market_min?'$'+Math.round(i.market_min):'—'}</td>
+                    <td class="r d">${i.market_max?'$'+Math.round(i.market_max):'—'}</td>
+                    <td class="r">${i.comp_count||'—'}</td>
+                    <td class="r ${i.times_sold?'g':''}">${i.times_sold||'—'}</td>
+                    <td class="r ${i.days_listed>21?'rd b':''}">${i.days_listed}d</td>
+                    <td class="r">${i.ad_rate?i.ad_rate+'%':'—'}</td>
+                    <td onclick="event.stopPropagation();" style="min-width:110px;">
+                        <div style="display:flex;gap:3px;align-items:center;">
+                            <input type="number" id="rp-${i.id}" value="${i.would_change ? i.proposed_price : i.current_price}" min="1" step="1" style="width:65px;background:var(--bg);border:1px solid var(--border);border-radius:6px;color:var(--text);padding:3px 5px;font-size:11px;text-align:right;">
+                            <button onclick="event.stopPropagation();applyCustomPrice('${i.id}','rp-')" class="btn" style="background:var(--green);color:#000;padding:3px 6px;font-size:10px;">✓</button>
+                        </div>
+                    </td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+
+            <div style="margin-top:12px;font-size:11px;color:var(--dim);">
+                <b>Rules:</b> ${Object.entries(config.category_rules||{}).map(([cat,r]) => `${cat}: ${r.markdown_pct}%/round, max ${r.max_total_pct}%`).join(' · ')}
+            </div>
+        `;
+    } catch(e) { el.innerHTML = `<div style="color:var(--red);padding:20px;">Failed: ${e.message}</div>`; }
+}
+
+function filterRepricingTab() {
+    if (!window._repriceData) return;
+    const filter = document.getElementById('reprice-filter')?.value || 'all';
+    const items = window._repriceData.items || [];
+    const filtered = filter === 'all' ? items : items.filter(i => i.status === filter);
+
+    const statusPill = st => st === 'MARKDOWN' ? 'pill-red' : st === 'OVERPRICED' ? 'pill-orange' : st === 'UNDERPRICED' ? 'pill-green' : st === 'AT FLOOR' ? 'pill-blue' : 'pill-dim';
+    const tbody = document.querySelector('#reprice-table tbody');
+    if (tbody) {
+        tbody.innerHTML = filtered.map(i => `<tr onclick="drillItem('${i.id}','${(i.title||'').replace(/'/g,'')}','${i.category}',${i.current_price})" style="cursor:pointer;">
+            <td class="trunc">${i.title}</td>
+            <td><span class="pill ${statusPill(i.status)}">${i.status}</span></td>
+            <td class="r b">$${i.current_price}</td>
+            <td class="r ${i.would_change?'g b':'d'}">${i.would_change?'$'+i.proposed_price:'—'}</td>
+            <td class="r d">$${i.floor}</td>
+            <td class="r" style="color:var(--accent);">${i.market_median?'$'+Math.round(i.market_median):'—'}</td>
+            <td class="r d">${i.market_min?'$'+Math.round(i.market_min):'—'}</td>
+            <td class="r d">${i.market_max?'$'+Math.round(i.market_max):'—'}</td>
+            <td class="r">${i.comp_count||'—'}</td>
+            <td class="r ${i.times_sold?'g':''}">${i.times_sold||'—'}</td>
+            <td class="r ${i.days_listed>21?'rd b':''}">${i.days_listed}d</td>
+            <td class="r">${i.ad_rate?i.ad_rate+'%':'—'}</td>
+        </tr>`).join('');
+    }
+}
+
+async function applyCatStrats() {
+    const cats = ['Shepard Fairey','Death NYC','KAWS','Banksy','Bearbrick','Mr. Brainwash','Space/NASA','Signed Music','Pickguard','Other'];
+    const strats = {};
+    cats.forEach(c => {
+        const sel = document.getElementById('cs-'+c.replace(/[^a-zA-Z]/g,''));
+        if (sel) strats[c] = sel.value;
+    });
+    const statusEl = document.getElementById('cat-strat-status');
+    showProgress(statusEl, 20, 'Saving strategies...', 'Updating category settings');
+
+    await fetch('/api/promotions/category-strategy', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify(strats)});
+    showProgress(statusEl, 50, 'Applying to eBay...', 'Creating campaigns per category with new ad rates');
+
+    try {
+        const resp = await fetch('/api/promotions/apply-category-strategies', {method:'POST'});
+        const d = await resp.json();
+        if (d.error) {
+            showProgressError(statusEl, 'Failed: ' + d.error);
+        } else {
+            showProgressDone(statusEl, `${d.applied} listings · ${d.campaigns} campaigns`, `${d.failed||0} failed · Strategies saved and applied to eBay`);
+        }
+        toast(d.applied + ' updated');
+    } catch(e) {
+        showProgressError(statusEl, 'Failed — check eBay connection');
+    }
+}
+
+let selectedStrat = null;
+
+async function previewStrat(level) {
+    selectedStrat = level;
+    const el = document.getElementById('strat-preview');
+    const status = document.getElementById('strat-status');
+    showProgress(status, 30, 'Loading strategy preview...', `Analyzing ${level} strategy for all categories`);
+
+    try {
+        const resp = await fetch('/api/promotions/strategy');
+        const d = await resp.json();
+        const presets = d.presets || {};
+        const preset = presets[level] || {};
+        const ebayRates = d.ebay_suggested || {};
+        const catRates = preset.category_rates || {};
+        const defaultRate = preset.default_rate || 5;
+
+        // Build preview of what would change
+        const cats = Object.keys(ebayRates);
+        const changes = cats.map(cat => {
+            const current = ebayRates[cat] || 0;
+            const newRate = catRates[cat] || defaultRate;
+            return {cat, current, newRate, diff: newRate - current};
+        });
+
+        const descriptions = {
+            'profit': 'Lowest ad rates — maximize profit margin. Best for high-demand items.',
+            'steady': 'Moderate rates — sell a few per week. Balanced approach.',
+            'speed_low': 'Slightly above eBay suggested — gentle push for more visibility.',
+            'speed_medium': 'Aggressive rates — push hard for sales velocity.',
+            'speed_high': 'Maximum rates — spend big to move inventory fast. Use when sales are slow.',
+        };
+
+        showProgressDone(status, `${level.toUpperCase()} strategy`, descriptions[level] || '');
+
+        el.innerHTML = `
+            <div class="card" style="margin-bottom:12px;border-left:3px solid var(--accent);">
+                <div style="font-size:14px;font-weight:700;margin-bottom:6px;">${preset.name || level}</div>
+                <div style="font-size:12px;color:var(--dim);margin-bottom:10px;">${descriptions[level] || ''}</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Category</th><th class="r">Current Rate</th><th class="r">New Rate</th><th class="r">Change</th></tr></thead>
+                    <tbody>${changes.map(c => `<tr>
+                        <td class="b">${c.cat}</td>
+                        <td class="r">${c.current}%</td>
+                        <td class="r g b">${c.newRate}%</td>
+                        <td class="r ${c.diff > 0 ? 'rd' : c.diff < 0 ? 'g' : 'd'}">${c.diff > 0 ? '+' : ''}${c.diff}%</td>
+                    </tr>`).join('')}</tbody>
+                </table></div>
+                <div style="display:flex;gap:8px;margin-top:12px;">
+                    <button class="btn btn-green" style="flex:1;padding:12px;font-size:14px;font-weight:700;justify-content:center;" onclick="executeStrat('${level}')">Apply ${level.toUpperCase()} to eBay</button>
+                    <button class="btn-ghost" style="padding:12px 20px;" onclick="document.getElementById('strat-preview').innerHTML='';document.getElementById('strat-status').innerHTML='';">Cancel</button>
+                </div>
+            </div>
+
+            <div id="strat-ai" style="margin-top:8px;"><div class="loading"><div class="spinner"></div><div style="font-size:10px;color:var(--dim);margin-top:4px;">AI reviewing this strategy...</div></div></div>
+        `;
+
+        // AI review async
+        loadStratAI(level, changes, descriptions[level]);
+
+    } catch(e) { showProgressError(status, 'Failed to load strategy'); }
+}
+
+async function loadStratAI(level, changes, description) {
+    const el = document.getElementById('strat-ai');
+    if (!el) return;
+    const claude_prompt = changes.map(c => `${c.cat}: ${c.current}% → ${c.newRate}%`).join(', ');
+    try {
+        const resp = await fetch('/api/ai/price', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                title: `Strategy: ${level}`,
+                artist: '',
+                price: 0,
+                context: 'sell',
+                comp_data: {comps: [{title: `Ad rate changes: ${claude_prompt}`, price: 0, source: description}], pricing: {}, stats: {}}
+            })
+        });
+        const d = await resp.json();
+        const reasoning = d.claude?.reasoning || d.gpt?.reasoning || '';
+        if (reasoning) {
+            el.innerHTML = `<div style="background:rgba(10,132,255,0.06);border-radius:8px;padding:10px;font-size:12px;border-left:3px solid var(--accent);">
+                <b>AI Review:</b> ${reasoning}
+            </div>`;
+        } else {
+            el.innerHTML = '';
+        }
+    } catch(e) { el.innerHTML = ''; }
+}
+
+async function executeStrat(level) {
+    const status = document.getElementById('strat-status');
+    showProgress(status, 20, `Applying ${level}...`, 'Saving strategy and pushing to eBay campaigns');
+
+    try {
+        // Save all categories with this strategy
+        const cats = ['Shepard Fairey','Death NYC','KAWS','Banksy','Bearbrick','Mr. Brainwash','Space/NASA','Signed Music','Pickguard','Other'];
+        const strats = {};
+        cats.forEach(c => strats[c] = level);
+        await fetch('/api/promotions/category-strategy', {method:'POST', headers:{'Content-Type':'application/json'}, body:JSON.stringify(strats)});
+
+        showProgress(status, 60, 'Pushing to eBay...', 'Creating/updating campaigns with new rates');
+        const resp = await fetch('/api/promotions/apply-category-strategies', {method:'POST'});
+        const d = await resp.json();
+
+        if (d.error) {
+            showProgressError(status, d.error);
+        } else {
+            showProgressDone(status, `${d.applied} listings updated`, `${d.campaigns} campaigns · ${d.failed||0} failed · Strategy: ${level.toUpperCase()}`);
+            document.getElementById('strat-preview').innerHTML = '';
+            promosLoaded = false;  // Force refresh
+        }
+        toast(`${d.applied} listings set to ${level}`);
+    } catch(e) { showProgressError(status, 'Failed: ' + e.message); }
+}
+
+// Keep old function as alias
+async function applyStrat(level) { await previewStrat(level); }
+
+// ==========================================
+// Reports
+// ==========================================
+let reportsLoaded = {};
+
+// ==========================================
+// Universal table sorting for Reports page.
+// One event-delegated handler — works on every table rendered inside
+// #page-reports without requiring each renderer to opt in.
+// ==========================================
+const _reportsSortState = new WeakMap();  // table → {colIdx, dir}
+function _extractSortValue(cell) {
+    const raw = (cell.getAttribute('data-sort') || cell.textContent || '').trim();
+    // Strip currency + thousands separators, detect numeric
+    const numish = raw.replace(/[$,%\s+]/g, '').replace(/,/g, '');
+    const n = parseFloat(numish);
+    if (!isNaN(n) && /^[-$]?[0-9]/.test(raw)) return { n, s: raw.toLowerCase() };
+    return { n: NaN, s: raw.toLowerCase() };
+}
+function _sortTable(table, colIdx) {
+    const prev = _reportsSortState.get(table) || { colIdx: -1, dir: 'desc' };
+    const dir = (prev.colIdx === colIdx && prev.dir === 'desc') ? 'asc' : 'desc';
+    _reportsSortState.set(table, { colIdx, dir });
+    const tbody = table.querySelector('tbody');
+    if (!tbody) return;
+    const rows = Array.from(tbody.querySelectorAll('tr'));
+    rows.sort((a, b) => {
+        const av = _extractSortValue(a.children[colIdx]);
+        const bv = _extractSortValue(b.children[colIdx]);
+        let cmp;
+        if (!isNaN(av.n) && !isNaN(bv.n)) {
+            cmp = av.n - bv.n;
+        } else {
+            cmp = av.s.localeCompare(bv.s);
+        }
+        return dir === 'asc' ? cmp : -cmp;
+    });
+    rows.forEach(r => tbody.appendChild(r));
+    // Update header arrow indicators
+    table.querySelectorAll('thead th').forEach((th, i) => {
+        th.classList.toggle('sort-active', i === colIdx);
+        const existing = th.querySelector('.sort-arrow');
+        if (existing) existing.remove();
+        if (i === colIdx) {
+            const arrow = document.createElement('span');
+            arrow.className = 'sort-arrow';
+            arrow.textContent = dir === 'asc' ? ' ▲' : ' ▼';
+            arrow.style.cssText = 'opacity:0.7;font-size:9px;margin-left:3px;';
+            th.appendChild(arrow);
+        }
+    });
+}
+document.addEventListener('DOMContentLoaded', () => {
+    const root = document.getElementById('page-reports');
+    if (!root) return;
+    root.addEventListener('click', (e) => {
+        const th = e.target.closest('th');
+        if (!th) return;
+        const tr = th.parentElement;
+        if (!tr || !tr.parentElement || tr.parentElement.tagName !== 'THEAD') return;
+        const table = th.closest('table');
+        if (!table) return;
+        const colIdx = Array.from(tr.children).indexOf(th);
+        if (colIdx < 0) return;
+        _sortTable(table, colIdx);
+    });
+    // Hover affordance: make Reports ths look clickable
+    const style = document.createElement('style');
+    style.textContent = '#page-reports thead th{cursor:pointer;user-select:none;}#page-reports thead th:hover{color:var(--accent);}#page-reports thead th.sort-active{color:var(--accent);}';
+    document.head.appendChild(style);
+});
+
+function showRTab(tab) {
+    document.querySelectorAll('[data-rtab]').forEach(c => c.classList.remove('active'));
+    document.querySelector(`[data-rtab="${tab}"]`).classList.add('active');
+    ['deals','calendar','deep','pnl','market','historical','allsales','whatworked'].forEach(t => {
+        document.getElementById('rtab-'+t).style.display = t===tab ? 'block' : 'none';
+    });
+    loadReportTab(tab);
+}
+
+async function loadReportsTab() {
+    loadReportTab('deals');
+}
+
+async function loadReportTab(tab) {
+    if (reportsLoaded[tab]) return;
+    const el = document.getElementById('rtab-' + tab);
+
+    try {
+        if (tab === 'deals') {
+            const resp = await fetch('/api/deals/enhanced');
+            const d = await resp.json();
+            reportsLoaded.deals = d;
+            const allDeals = d.deals || [];
+
+            // Category chips
+            const dealCats = {};
+            allDeals.forEach(dl => { dealCats[dl.category] = (dealCats[dl.category]||0)+1; });
+            let dealFilter = 'all';
+
+            let dealsShowCount = 200;
+            function renderDeals(filter, showMore) {
+                dealFilter = filter;
+                if (showMore) dealsShowCount = Math.min(dealsShowCount + 200, 1000);
+                else dealsShowCount = 200;
+                const deals = filter === 'all' ? allDeals : allDeals.filter(dl => dl.category === filter);
+                const showing = Math.min(dealsShowCount, deals.length);
+                const tableEl = document.getElementById('deals-table-area');
+                if (!tableEl) return;
+                tableEl.innerHTML = `<div style="font-size:12px;color:var(--dim);margin-bottom:8px;">${showing} of ${deals.length} deals</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Title</th><th>Category</th><th class="r">Price</th><th class="r">Low</th><th class="r">Median</th><th class="r">High</th><th class="r">Profit</th><th class="r">Disc%</th><th>Hot</th><th>Liq.</th><th>Why</th><th>Link</th></tr></thead>
+                    <tbody>${deals.slice(0,showing).map(dl => {
+                        const hc = dl.hotness>=60?'pill-red':dl.hotness>=30?'pill-orange':'pill-dim';
+                        const reasons = (dl.reasons||[]).join('; ');
+                        return `<tr onclick="drillDealItem('${esc(dl.title)}', ${dl.price||0}, '${dl.category}', ${dl.median||0}, ${dl.comp_count||0}, '${dl.url||''}')" style="cursor:pointer;" title="Click for full deal analysis | ${reasons}">
+                            <td class="trunc" title="${dl.title}">${dl.title}</td>
+                            <td style="font-size:11px;" title="Filter by ${dl.category}" onclick="event.stopPropagation();renderDeals('${dl.category}')">${dl.category}</td>
+                            <td class="r g b" title="Listed at $${dl.price}">$${(dl.price||0).toLocaleString()}</td>
+                            <td class="r d" title="Lowest comp">$${(dl.price_range?.low||0).toLocaleString()}</td>
+                            <td class="r" title="Market median from ${dl.comp_count||0} comps">$${(dl.median||0).toLocaleString()}</td>
+                            <td class="r d" title="Highest comp">$${(dl.price_range?.high||0).toLocaleString()}</td>
+                            <td class="r o b" title="Potential profit if bought at $${dl.price} and sold at median $${dl.median}">+$${(dl.profit||0).toLocaleString()}</td>
+                            <td class="r" title="${(dl.discount_pct||0).toFixed(0)}% below market median">${(dl.discount_pct||0).toFixed(0)}%</td>
+                            <td title="Hotness score: ${dl.hotness}/100 based on comps + discount + profit"><span class="pill ${hc}">${dl.hotness}</span></td>
+                            <td style="font-size:11px;" title="Liquidity: ${dl.liquidity} — ${dl.comp_count||0} comparable sales">${dl.liquidity||'--'}</td>
+                            <td style="font-size:10px;color:var(--dim);min-width:120px;" title="${reasons}">${reasons||'--'}</td>
+                            <td onclick="event.stopPropagation();">${dl.url?`<a href="${dl.url}" target="_blank" style="color:var(--accent);font-size:11px;">eBay ↗</a>`:'--'}</td>
+                        </tr>`;
+                    }).join('')}</tbody></table></div>` +
+                    (deals.length > showing ? `<div style="text-align:center;padding:12px;"><button class="btn btn-primary" style="padding:10px 28px;font-size:13px;" onclick="renderDeals('${filter}',true)">Show More (${Math.min(deals.length - showing, 200)} more)</button><div style="font-size:11px;color:var(--dim);margin-top:4px;">${showing} of ${deals.length}</div></div>` : '');
+            }
+
+            el.innerHTML = `<div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:10px;flex-wrap:wrap;gap:8px;">
+                <div class="chips" id="deal-chips">
+                    <button class="chip active" onclick="document.querySelectorAll('#deal-chips .chip').forEach(c=>c.classList.remove('active'));this.classList.add('active');renderDeals('all');">All (${allDeals.length})</button>
+                    ${Object.entries(dealCats).sort((a,b)=>b[1]-a[1]).map(([cat,n]) =>
+                        `<button class="chip" onclick="document.querySelectorAll('#deal-chips .chip').forEach(c=>c.classList.remove('active'));this.classList.add('active');renderDeals('${cat}');">${cat} (${n})</button>`
+                    ).join('')}
+                </div>
+                <div style="display:flex;gap:6px;">
+                    <button class="btn-primary btn" style="padding:6px 14px;font-size:12px;" onclick="reportsLoaded.deals=null;el.innerHTML='<div class=loading><div class=spinner></div></div>';loadReportTab('deals');">Refresh</button>
+                    <button class="btn-green btn" style="padding:6px 14px;font-size:12px;" onclick="startFullScrape()">Full Scrape (172 targets)</button>
+                </div>
+            </div>
+            <div id="deals-table-area"></div>`;
+            renderDeals('all');
+
+        } else if (tab === 'pnl') {
+            const resp = await fetch('/api/reports/sales-analysis');
+            const d = await resp.json();
+            reportsLoaded.pnl = d;
+            const s = d.summary || {};
+            el.innerHTML = `<div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(100px,1fr));gap:8px;margin-bottom:12px;">
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${Math.round(s.total_revenue||0).toLocaleString()}</div><div class="stat-lbl">Revenue</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">$${Math.round(s.total_net_profit||0).toLocaleString()}</div><div class="stat-lbl">Profit</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${s.avg_margin||0}%</div><div class="stat-lbl">Margin</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${s.avg_dom||0}d</div><div class="stat-lbl">Avg DOM</div></div>
+            </div>
+            <div class="section-title">What's Working</div>
+            ${(d.good||[]).map(g => `<div style="color:var(--green);padding:4px 0;font-size:13px;border-bottom:1px solid var(--border);">✓ ${g}</div>`).join('')}
+            <div class="section-title" style="margin-top:12px;">What to Change</div>
+            ${(d.change||[]).map(c => `<div style="color:var(--red);padding:4px 0;font-size:13px;border-bottom:1px solid var(--border);">✗ ${c}</div>`).join('')}
+            <div style="margin-top:12px;"><a href="/reports/sales" target="_blank" class="btn-ghost" style="display:inline-block;">Full Report →</a> <a href="/reports/vs-market" target="_blank" class="btn-ghost" style="display:inline-block;margin-left:8px;">vs Market →</a></div>`;
+
+        } else if (tab === 'deep') {
+            const resp = await fetch('/api/analytics/deep');
+            const d = await resp.json();
+            reportsLoaded.deep = d;
+            el.innerHTML = `
+                ${(d.insights||[]).map(i => `<div class="card" style="margin-bottom:6px;border-left:3px solid var(--accent);font-size:13px;">${i}</div>`).join('')}
+                ${d.restock_signals?.length ? `<div class="section-title" style="margin-top:12px;">Restock Signals</div>${d.restock_signals.map(r => `<div class="card" style="margin-bottom:6px;border-left:3px solid ${r.urgency==='critical'?'var(--red)':'var(--orange)'};"><div style="font-size:13px;font-weight:600;">${r.category} — ${r.days_of_stock}d stock left</div><div style="font-size:12px;color:var(--dim);">${r.message}</div></div>`).join('')}` : ''}
+                ${d.dead_stock?.length ? `<div class="section-title" style="margin-top:12px;">Dead Stock (${d.dead_stock_total} items, $${(d.dead_stock_value||0).toLocaleString()})</div><div class="table-wrap"><table><thead><tr><th>Item</th><th class="r">Price</th><th class="r">Days</th></tr></thead><tbody>${d.dead_stock.slice(0,10).map(s => `<tr><td class="trunc">${s.title}</td><td class="r">$${s.price}</td><td class="r rd b">${s.days}d</td></tr>`).join('')}</tbody></table></div>` : ''}`;
+
+        } else if (tab === 'market') {
+            el.innerHTML = '<div style="text-align:center;padding:20px;"><a href="/reports/vs-market" target="_blank" class="btn btn-primary">Open Market Comparison →</a> <a href="/reports/performance" target="_blank" class="btn btn-primary" style="margin-left:8px;">Full Performance →</a></div>';
+            reportsLoaded.market = true;
+
+        } else if (tab === 'historical') {
+            const resp = await fetch('/api/historical-analysis');
+            const d = await resp.json();
+            reportsLoaded.historical = d;
+
+            const themes = d.themes || {};
+            const years = d.year_trends || {};
+            const mediums = d.mediums || {};
+            const titles = d.top_titles || [];
+
+            el.innerHTML = `
+                <div class="stats" style="display:flex;gap:8px;flex-wrap:wrap;margin-bottom:16px;">
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val">${(d.total_records||0).toLocaleString()}</div><div class="stat-lbl">Total Records</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val g">$${d.price_stats?.median||0}</div><div class="stat-lbl">Median Price</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val">$${d.price_stats?.avg||0}</div><div class="stat-lbl">Average</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val o">+${d.signed_premium||0}%</div><div class="stat-lbl">Signed Premium</div></div>
+                </div>
+
+                <div class="section-title">Theme Performance (click to drill)</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Theme</th><th class="r">Sales</th><th class="r">Median</th><th class="r">Avg</th><th class="r">Range</th></tr></thead>
+                    <tbody>${Object.entries(themes).sort((a,b)=>b[1].median-a[1].median).map(([t,v]) =>
+                        `<tr onclick="drillHistorical('${t}')" style="cursor:pointer;">
+                            <td class="b">${t}</td><td class="r">${v.count}</td>
+                            <td class="r g b">$${v.median}</td><td class="r">$${v.avg}</td>
+                            <td class="r d">$${v.min}—$${v.max}</td></tr>`
+                    ).join('')}</tbody></table></div>
+
+                <div class="section-title" style="margin-top:16px;">Price Trend by Year</div>
+                <canvas id="hist-year-chart" height="200" style="margin-bottom:16px;"></canvas>
+
+                <div class="section-title">Medium Comparison</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Medium</th><th class="r">Sales</th><th class="r">Median</th><th class="r">Avg</th></tr></thead>
+                    <tbody>${Object.entries(mediums).sort((a,b)=>b[1].count-a[1].count).map(([m,v]) =>
+                        `<tr onclick="drillHistorical('${m}')" style="cursor:pointer;" title="Click to see ${m} sales"><td class="b">${m}</td><td class="r">${v.count}</td><td class="r g">$${v.median}</td><td class="r">$${v.avg}</td></tr>`
+                    ).join('')}</tbody></table></div>
+
+                <div class="section-title" style="margin-top:16px;">Top Performing Titles (click for price history)</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Title</th><th class="r">Sales</th><th class="r">Median</th><th class="r">Range</th><th class="r">Signed%</th></tr></thead>
+                    <tbody>${titles.map(t =>
+                        `<tr onclick="drillHistoricalItem('${t.title.replace(/'/g,'')}')" style="cursor:pointer;">
+                            <td>${t.title}</td><td class="r">${t.sales}</td>
+                            <td class="r g b">$${t.median}</td><td class="r d">$${t.min}—$${t.max}</td>
+                            <td class="r">${t.signed_pct}%</td></tr>`
+                    ).join('')}</tbody></table></div>
+            `;
+
+            // Year trend chart
+            setTimeout(() => {
+                const yrs = Object.keys(years).sort();
+                const ctx = document.getElementById('hist-year-chart');
+                if (ctx && yrs.length) {
+                    new Chart(ctx, {
+                        type:'bar', data:{labels:yrs, datasets:[
+                            {label:'Median', data:yrs.map(y=>years[y].median), backgroundColor:'#0a84ff', borderRadius:4, yAxisID:'y'},
+                            {label:'Volume', data:yrs.map(y=>years[y].count), type:'line', borderColor:'#ff9f0a', pointRadius:3, yAxisID:'y1'}
+                        ]},
+                        options:{responsive:true, plugins:{legend:{labels:{color:'#86868b'}}},
+                            scales:{x:{ticks:{color:'#86868b'},grid:{display:false}},
+                                y:{ticks:{color:'#86868b',callback:v=>'$'+v},grid:{color:'rgba(255,255,255,0.04)'}},
+                                y1:{position:'right',ticks:{color:'#86868b'},grid:{display:false}}}}
+                    });
+                }
+            }, 100);
+
+        } else if (tab === 'allsales') {
+            // ALL my sales — every single one, not top 10
+            const resp = await fetch('/api/analytics/sales-history');
+            const d = await resp.json();
+            reportsLoaded.allsales = d;
+            const items = d.items || [];
+
+            el.innerHTML = `
+                <div class="stats" style="display:flex;gap:8px;flex-wrap:wrap;margin-bottom:16px;">
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val g">${d.total_sold}</div><div class="stat-lbl">Total Sold</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val">$${Math.round(d.total_revenue).toLocaleString()}</div><div class="stat-lbl">Revenue</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val">${d.promoted_sold}</div><div class="stat-lbl">Promoted</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val g">${d.organic_sold}</div><div class="stat-lbl">Organic</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val">${d.avg_dom_promoted||0}d</div><div class="stat-lbl">Avg DOM (Promo)</div></div>
+                    <div class="card" style="text-align:center;flex:1;"><div class="stat-val o">$${Math.round(d.total_ad_cost)}</div><div class="stat-lbl">Ad Cost</div></div>
+                </div>
+
+                <div style="display:flex;justify-content:space-between;margin-bottom:8px;">
+                    <span class="d">${items.length} sales — ALL shown</span>
+                    <a href="/reports/performance" target="_blank" class="btn-ghost">Full Visual Report →</a>
+                </div>
+
+                <div class="table-wrap"><table>
+                    <thead><tr>
+                        <th>Item</th><th class="r">Sold $</th><th>Listed</th><th>Sold</th>
+                        <th class="r">Days</th><th>Promo</th><th class="r">Ad%</th><th class="r">Ad Cost</th><th>Campaign</th>
+                    </tr></thead>
+                    <tbody>${items.map(i => {
+                        const domColor = i.days_to_sell != null ? (i.days_to_sell <= 7 ? 'g' : i.days_to_sell > 21 ? 'rd' : '') : 'd';
+                        return `<tr onclick="drillSoldItem('${esc(i.title)}', ${i.price||0}, '${i.sold||''}', ${i.days_to_sell||0}, ${i.ad_rate||0}, ${i.ad_cost||0}, '${i.promoted?'Promoted':'Organic'}')" title="Click for comps + market data">
+                            <td class="trunc">${i.title}</td>
+                            <td class="r g b">$${i.price.toFixed(0)}</td>
+                            <td class="d" style="font-size:11px;">${i.listed}</td>
+                            <td class="d" style="font-size:11px;">${i.sold}</td>
+                            <td class="r ${domColor} b">${i.days_to_sell!=null?i.days_to_sell+'d':'--'}</td>
+                            <td style="font-size:11px;color:${i.promoted?'var(--accent)':'var(--green)'};">${i.promoted?'Promoted':'Organic'}</td>
+                            <td class="r">${i.ad_rate?i.ad_rate+'%':'--'}</td>
+                            <td class="r o">${i.ad_cost?'$'+i.ad_cost.toFixed(0):'--'}</td>
+                            <td class="d trunc" style="font-size:10px;max-width:100px;">${i.campaign||'--'}</td>
+                        </tr>`;
+                    }).join('')}</tbody></table></div>
+            `;
+
+        } else if (tab === 'calendar') {
+            const resp = await fetch('/api/analytics/seasonality');
+            const d = await resp.json();
+            reportsLoaded.calendar = d;
+            const months = ['Jan','Feb','Mar','Apr','May','Jun','Jul','Aug','Sep','Oct','Nov','Dec'];
+            const eByMonth = d.events_by_month || {};
+            el.innerHTML = `<div class="section-title">Quarterly Strategy</div>
+                ${(d.recommendations||[]).map(r => `<div class="card" style="margin-bottom:8px;border-left:3px solid var(--accent);"><div style="font-size:16px;font-weight:700;">${r.strategy}</div><div style="font-size:13px;color:var(--dim);margin-top:4px;">${r.description}</div></div>`).join('')}
+                <div class="section-title" style="margin-top:16px;">Year at a Glance</div>
+                <div style="display:grid;grid-template-columns:repeat(auto-fill,minmax(160px,1fr));gap:8px;">
+                ${months.map(m => {
+                    const events = eByMonth[m] || [];
+                    return `<div class="card"><div style="font-size:14px;font-weight:700;margin-bottom:6px;">${m}</div>
+                        ${events.length ? events.map(e => `<div style="font-size:11px;padding:2px 0;border-bottom:1px solid var(--border);cursor:pointer;" onclick="drill('event_items',{event:'${e.name.replace(/'/g,'')}'});" title="Click to see matching inventory">
+                            <span class="pill ${e.tier==='PEAK'?'pill-red':e.tier==='MAJOR'?'pill-orange':'pill-blue'}" style="font-size:7px;margin-right:2px;">${e.tier}</span>
+                            ${e.name} <span class="g" style="font-size:10px;">+${e.boost}%</span></div>`).join('') : '<div style="font-size:11px;color:var(--dim);">—</div>'}
+                    </div>`;
+                }).join('')}
+                </div>`;
+        }
+    } catch(e) { el.innerHTML = `<div style="color:var(--red);">Failed to load ${tab}</div>`; }
+}
+
+// ==========================================
+// Drill-down
+// ==========================================
+async function drill(type, params) {
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = 'Loading...';
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const qs = params ? '?' + new URLSearchParams(params).toString() : '';
+        const resp = await fetch(`/api/drill/${type}${qs}`);
+        const d = await resp.json();
+        title.textContent = d.title || 'Detail';
+        const items = d.items || [];
+
+        if (!items.length) { content.innerHTML = '<div class="d" style="padding:20px;text-align:center;">No data</div>'; return; }
+
+        const first = items[0];
+        content.innerHTML = `<div style="font-size:12px;color:var(--dim);margin-bottom:8px;">${items.length} items</div>
+        <div class="table-wrap"><table><thead><tr>
+            <th>Item</th>
+            ${first.price!==undefined?'<th class="r">Price</th>':''}
+            ${first.dom!==undefined?'<th class="r">DOM</th>':''}
+            ${first.sold_date!==undefined?'<th>Date</th>':''}
+            ${first.watchers!==undefined?'<th class="r">Watch</th>':''}
+            ${first.reason!==undefined?'<th>Reason</th>':''}
+            <th>Link</th>
+        </tr></thead><tbody>${items.map(i => `<tr>
+            <td class="trunc">${i.title||i.name||''}</td>
+            ${i.price!==undefined?`<td class="r g b">$${(i.price||0).toLocaleString()}</td>`:''}
+            ${i.dom!==undefined?`<td class="r">${i.dom!=null?i.dom+'d':'--'}</td>`:''}
+            ${i.sold_date!==undefined?`<td class="d" style="font-size:11px;">${i.sold_date||''}</td>`:''}
+            ${i.watchers!==undefined?`<td class="r">${i.watchers}</td>`:''}
+            ${i.reason!==undefined?`<td style="font-size:11px;color:var(--dim);">${i.reason||''}</td>`:''}
+            <td>${i.url?`<a href="${i.url}" target="_blank" style="color:var(--accent);font-size:11px;">eBay</a>`:'--'}</td>
+        </tr>`).join('')}</tbody></table></div>`;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+async function drillHistorical(theme) {
+    drill('sold_history', {category: theme});
+}
+
+async function drillHistoricalItem(title) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = title;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch(`/api/historical-item?title=${encodeURIComponent(title)}`);
+        const d = await resp.json();
+        const sales = d.sales || [];
+
+        content.innerHTML = `
+            <div style="font-size:12px;color:var(--dim);margin-bottom:12px;">${sales.length} historical sales</div>
+            <canvas id="hist-item-chart" height="250" style="margin-bottom:16px;"></canvas>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Price</th><th>Date</th><th>Signed</th><th>Source</th></tr></thead>
+                <tbody>${sales.map(s => `<tr>
+                    <td class="trunc">${s.name?.substring(0,40)||''}</td>
+                    <td class="r g b">$${s.price}</td>
+                    <td class="d">${s.date||'--'}</td>
+                    <td>${s.signed ? '✓' : '--'}</td>
+                    <td class="d" style="font-size:10px;">${s.source||''}</td>
+                </tr>`).join('')}</tbody></table></div>
+        `;
+
+        // Draw chart
+        if (sales.length >= 2) {
+            const dated = sales.filter(s => s.date).sort((a,b) => a.date.localeCompare(b.date));
+            if (dated.length >= 2) {
+                setTimeout(() => {
+                    const ctx = document.getElementById('hist-item-chart');
+                    if (ctx) {
+                        new Chart(ctx, {
+                            type: 'scatter',
+                            data: { datasets: [{
+                                label: 'Sales',
+                                data: dated.map(s => ({x: s.date, y: s.price})),
+                                backgroundColor: dated.map(s => s.signed ? '#30d158' : '#0a84ff'),
+                                pointRadius: 6,
+                            }]},
+                            options: {responsive:true, plugins:{legend:{display:false},tooltip:{callbacks:{label:ctx=>{const s=dated[ctx.dataIndex];return '$'+s.price+' — '+(s.signed?'Signed':'Unsigned')+' — '+s.source;}}}},
+                                scales:{x:{type:'category',ticks:{color:'#86868b',font:{size:8},maxTicksLimit:10},grid:{color:'rgba(255,255,255,0.04)'}},
+                                    y:{ticks:{color:'#86868b',callback:v=>'$'+v},grid:{color:'rgba(255,255,255,0.04)'}}}}
+                        });
+                    }
+                }, 100);
+            }
+        }
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+async function drillItem(id, name, artist, price) {
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = name;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const [compResp, chartResp, valResp, soldResp] = await Promise.all([
+            fetch(`/api/drill/competing?title=${encodeURIComponent(name)}&id=${id}`),
+            fetch(`/api/listing/chart/${id}`),
+            fetch(`/api/comps/v2?title=${encodeURIComponent(name)}&artist=${encodeURIComponent(artist)}&price=${price}`),
+            fetch(`/api/comps/sold?title=${encodeURIComponent(name)}&artist=${encodeURIComponent(artist)}&price=${price}`)
+        ]);
+        const compData = await compResp.json();
+        const chartData = await chartResp.json();
+        const valData = await valResp.json();
+        const soldData = await soldResp.json();
+        const soldComps = soldData.sold_comps || [];
+        const soldStats = soldData.stats || {};
+
+        // V2 comp engine response — split by source
+        const v2 = valData;
+        const v2pricing = v2.pricing || {};
+        const v2stats = v2.stats || {};
+        const v2comps = v2.comps || [];
+        const comps = compData.items || [];
+        const points = chartData.chart_points || [];
+        const st = chartData.stats || {};
+
+        // Split V2 comps by source for display
+        const v2Active = v2comps.filter(c => c.source === 'eBay Active');
+        const v2Historical = v2comps.filter(c => c.source === 'WorthPoint' || c.source === 'Historical');
+        const v2Sold = v2comps.filter(c => c.source === 'eBay Sold');
+
+        const activePoints = points.filter(p => p.type === 'active');
+        const historicalPoints = points.filter(p => p.type === 'sold');
+
+        const confColor = v2stats.confidence === 'high' ? 'var(--green)' : v2stats.confidence === 'medium' ? 'var(--accent)' : 'var(--orange)';
+
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:16px;">
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--dim);">Your Price</div>
+                    <div style="display:flex;align-items:center;justify-content:center;gap:4px;margin-top:2px;">
+                        <input type="number" id="drill-price-${id}" value="${Math.round(price)}" min="1" step="1" style="width:70px;background:var(--bg);border:1px solid var(--green);border-radius:8px;color:var(--green);padding:4px 6px;font-size:18px;font-weight:700;text-align:center;">
+                        <button onclick="applyCustomPrice('${id}','drill-price-')" class="btn" style="background:var(--green);color:#000;padding:4px 8px;font-size:11px;">Update</button>
+                    </div>
+                </div>
+                ${v2pricing.estimated ? `<div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Fair Value</div><div style="font-size:20px;font-weight:700;color:var(--accent);">$${v2pricing.estimated}</div></div>` : ''}
+                ${v2pricing.low ? `<div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Range</div><div style="font-size:14px;font-weight:600;">$${v2pricing.low}—$${v2pricing.high}</div></div>` : ''}
+                <div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Comps</div><div style="font-size:20px;font-weight:700;">${v2stats.accepted||0}</div></div>
+                <div style="text-align:center;"><div style="font-size:10px;color:var(--dim);">Confidence</div><div style="font-size:16px;font-weight:700;color:${confColor};">${v2stats.confidence||'--'}</div></div>
+            </div>
+
+            <div style="background:rgba(10,132,255,0.08);border-left:3px solid var(--accent);border-radius:8px;padding:10px;font-size:12px;margin-bottom:12px;">
+                <div style="font-weight:600;margin-bottom:4px;">V2 Comp Engine (${v2stats.accepted||0} accepted / ${v2stats.rejected||0} rejected)</div>
+                ${v2pricing.weighted_median ? `Weighted median: $${v2pricing.weighted_median} · Median: $${v2pricing.median||'--'} · Avg: $${v2pricing.avg||'--'}` : 'No pricing data'}
+                ${v2.rejected?.length ? `<div style="margin-top:4px;color:var(--dim);font-size:11px;">Rejected: ${v2.rejected.slice(0,3).map(r=>r.reason+' ($'+r.price+')').join(', ')}</div>` : ''}
+            </div>
+
+            <!-- Combined line chart: Historical vs Current -->
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Price History — WorthPoint (blue) vs eBay Active (orange)</div>
+            <canvas id="drill-combo-chart" height="220" style="margin-bottom:20px;"></canvas>
+
+            <!-- Section 1: Current eBay Listings -->
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;display:flex;justify-content:space-between;align-items:center;">
+                <span style="color:var(--orange);">Current eBay Listings (${v2Active.length || comps.length})</span>
+                ${st.active_median ? `<span>Median: $${Math.round(st.active_median)}</span>` : ''}
+            </div>
+            ${(v2Active.length || comps.length) ? `<div class="table-wrap" style="margin-bottom:20px;" id="drill-comps-table"><table>
+                <thead><tr><th>Item</th><th class="r">Price</th><th>Seller</th><th>Link</th><th></th></tr></thead>
+                <tbody>${comps.slice(0,15).map(c => `<tr class="comp-row" data-comp-title="${(c.title||'').replace(/"/g,'')}" data-comp-price="${c.price||0}" data-item-title="${name.replace(/"/g,'')}" data-artist="${artist}">
+                    <td class="trunc">${c.title||''}</td>
+                    <td class="r g b">$${(c.price||0).toLocaleString()}</td>
+                    <td class="d" style="font-size:11px;">${c.seller||''}</td>
+                    <td>${c.url?`<a href="${c.url}" target="_blank" style="color:var(--accent);font-size:11px;" onclick="event.stopPropagation()">eBay</a>`:'--'}</td>
+                    <td><button class="comp-dismiss" onclick="event.stopPropagation();rejectComp('${(c.title||'').replace(/'/g,'')}',${c.price||0},'${name.replace(/'/g,'')}','${artist}',this.closest('tr'))" title="Remove this comp — AI will learn">✕</button></td>
+                </tr>`).join('')}</tbody>
+            </table></div>` : '<div style="color:var(--dim);font-size:12px;margin-bottom:20px;">No active competitors found</div>'}
+
+            <!-- Section 2: Historical Sales (WorthPoint + V2 engine) -->
+            ${(() => {
+                // Merge V2 historical comps with chart historical, dedupe
+                const allHist = [...v2Historical.map(c => ({name: c.title, price: c.price, date: c.sold_date||'', source: c.source, score: c.score})), ...historicalPoints.map(h => ({name: h.name, price: h.price, date: h.date, source: h.source}))];
+                const seen = new Set();
+                const merged = allHist.filter(h => { const k = (h.name||'').substring(0,30)+h.price; if (seen.has(k)) return false; seen.add(k); return true; });
+                const histPrices = merged.filter(h => h.price > 0).map(h => h.price);
+                const histMedian = histPrices.length ? histPrices.sort((a,b)=>a-b)[Math.floor(histPrices.length/2)] : 0;
+                return `<div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;display:flex;justify-content:space-between;align-items:center;">
+                    <span style="color:var(--accent);">Historical Sales (${merged.length})</span>
+                    ${histMedian ? '<span>Median: $'+Math.round(histMedian)+'</span>' : ''}
+                </div>` +
+                (merged.length ? `<div class="table-wrap" style="margin-bottom:16px;"><table>
+                    <thead><tr><th>Item</th><th class="r">Price</th><th>Date</th><th>Source</th><th></th></tr></thead>
+                    <tbody>${merged.slice(0,20).map(h => `<tr class="comp-row" data-comp-title="${(h.name||'').replace(/"/g,'')}" data-comp-price="${h.price||0}" data-item-title="${name.replace(/"/g,'')}" data-artist="${artist}">
+                        <td class="trunc">${h.name||''}</td>
+                        <td class="r g b">$${Math.round(h.price).toLocaleString()}</td>
+                        <td class="d" style="font-size:11px;">${h.date||'--'}</td>
+                        <td class="d" style="font-size:10px;">${h.source||''}</td>
+                        <td><button class="comp-dismiss" onclick="event.stopPropagation();rejectComp('${(h.name||'').replace(/'/g,'')}',${h.price||0},'${name.replace(/'/g,'')}','${artist}',this.closest('tr'))">✕</button></td>
+                    </tr>`).join('')}</tbody>
+                </table></div>` : '<div style="color:var(--dim);font-size:12px;">No historical data</div>');
+            })()}
+
+            <!-- Section 3: eBay Recently Sold -->
+            <div id="drill-sold-section"></div>
+
+            <!-- Overall Analytics -->
+            <div style="margin-top:16px;background:var(--card2);border-radius:12px;padding:14px;margin-bottom:16px;">
+                <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:8px;">Overall Market Summary</div>
+                <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(100px,1fr));gap:8px;">
+                    <div style="text-align:center;"><div style="font-size:9px;color:var(--orange);">eBay Active</div><div style="font-size:16px;font-weight:700;">${st.active_median ? '$'+Math.round(st.active_median) : '--'}</div><div style="font-size:9px;color:var(--dim);">${comps.length} listings</div></div>
+                    <div style="text-align:center;"><div style="font-size:9px;color:var(--accent);">WorthPoint</div><div style="font-size:16px;font-weight:700;">${st.hist_median ? '$'+Math.round(st.hist_median) : '--'}</div><div style="font-size:9px;color:var(--dim);">${historicalPoints.length} sales</div></div>
+                    <div style="text-align:center;"><div style="font-size:9px;color:var(--green);">eBay Sold</div><div style="font-size:16px;font-weight:700;">${soldStats.median ? '$'+Math.round(soldStats.median) : '--'}</div><div style="font-size:9px;color:var(--dim);">${soldComps.length} sales</div></div>
+                    <div style="text-align:center;"><div style="font-size:9px;color:var(--purple);">V2 Engine</div><div style="font-size:16px;font-weight:700;">${v2pricing.estimated ? '$'+v2pricing.estimated : '--'}</div><div style="font-size:9px;color:var(--dim);">${v2stats.confidence||'--'} conf</div></div>
+                </div>
+            </div>
+
+            <!-- AI Price Recommendations (loads async) -->
+            <div style="margin-bottom:16px;" id="drill-ai-price"><div class="loading"><div class="spinner"></div><div style="font-size:10px;color:var(--dim);margin-top:4px;">Getting AI price recommendations from Claude + GPT...</div></div></div>
+
+            ${v2.rejected?.length ? `<div style="font-size:11px;color:var(--dim);">Filtered: ${v2.rejected.slice(0,3).map(r=>r.reason+' ($'+r.price+')').join(', ')}</div>` : ''}
+        `;
+
+        // Render sold comps section separately (avoids escaping issues)
+        renderSoldSection([...v2Sold, ...soldComps], name, artist, 'drill-sold-section');
+
+        // Load AI pricing async
+        loadAIPrice(name, artist, price, v2, 'drill-ai-price');
+
+        // Draw combined line chart
+        if (points.length && document.getElementById('drill-combo-chart')) {
+            // Group historical by date for line chart
+            const histDated = historicalPoints.filter(p => p.date && p.date !== 'Unknown').sort((a,b) => a.date.localeCompare(b.date));
+            const activeDated = activePoints.sort((a,b) => a.price - b.price);
+
+            // Build datasets
+            const datasets = [];
+
+            if (histDated.length) {
+                datasets.push({
+                    label: 'WorthPoint Sales',
+                    data: histDated.map(p => ({x: p.date, y: p.price})),
+                    borderColor: '#0a84ff',
+                    backgroundColor: 'rgba(10,132,255,0.15)',
+                    fill: true,
+                    tension: 0.3,
+                    pointRadius: 5,
+                    pointHoverRadius: 8,
+                    borderWidth: 2,
+                });
+            }
+
+            if (activeDated.length) {
+                const today = new Date().toISOString().slice(0,10);
+                datasets.push({
+                    label: 'eBay Active',
+                    data: activeDated.map((p,i) => ({x: today, y: p.price})),
+                    borderColor: '#ff9f0a',
+                    backgroundColor: 'rgba(255,159,10,0.5)',
+                    pointRadius: 7,
+                    pointStyle: 'triangle',
+                    borderWidth: 0,
+                    showLine: false,
+                });
+            }
+
+            // Your price line
+            if (histDated.length >= 2) {
+                datasets.push({
+                    label: 'Your Price ($' + Math.round(price) + ')',
+                    data: [{x: histDated[0].date, y: price}, {x: histDated[histDated.length-1].date, y: price}],
+                    borderColor: '#30d158',
+                    borderWidth: 2,
+                    borderDash: [6, 4],
+                    pointRadius: 0,
+                    fill: false,
+                });
+            }
+
+        // Enable swipe-to-dismiss on comp tables
+        setTimeout(() => enableSwipeDismiss(document.getElementById('drill-comps-table')), 200);
+
+            setTimeout(() => {
+                const ctx = document.getElementById('drill-combo-chart');
+                if (ctx) {
+                    new Chart(ctx, {
+                        type: 'line',
+                        data: { datasets },
+                        options: {
+                            responsive: true,
+                            interaction: { mode: 'nearest', intersect: false },
+                            plugins: {
+                                legend: { labels: { color: '#86868b', font: { size: 10 } } },
+                                tooltip: { callbacks: { label: ctx => {
+                                    const pt = ctx.raw;
+                                    const src = ctx.dataset.label;
+                                    return src + ': $' + Math.round(pt.y);
+                                }}}
+                            },
+                            scales: {
+                                x: { type: 'category', ticks: { color: '#86868b', font: { size: 8 }, maxTicksLimit: 10 }, grid: { color: 'rgba(255,255,255,0.04)' } },
+                                y: { ticks: { color: '#86868b', callback: v => '$' + v }, grid: { color: 'rgba(255,255,255,0.04)' } }
+                            }
+                        }
+                    });
+                }
+            }, 100);
+        }
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed to load detail</div>'; }
+}
+
+// ==========================================
+// Artwork Lookup
+// ==========================================
+document.getElementById('lookup-query')?.addEventListener('keypress', e => { if (e.key === 'Enter') runLookup(); });
+
+async function searchDatabase() {
+    const query = document.getElementById('lookup-query').value.trim();
+    const artist = document.getElementById('lookup-artist').value;
+    const minPrice = parseInt(document.getElementById('lookup-min').value) || 0;
+    const maxPrice = parseInt(document.getElementById('lookup-max').value) || 999999;
+    if (!query && !artist) { toast('Enter search term or pick artist'); return; }
+
+    const el = document.getElementById('db-results');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+
+    try {
+        const resp = await fetch('/api/database/search', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({query, artist, min_price: minPrice, max_price: maxPrice})
+        });
+        const d = await resp.json();
+        if (d.error) { el.innerHTML = `<div style="color:var(--red);padding:10px;">${d.error}</div>`; return; }
+
+        const s = d.stats || {};
+        const records = d.records || [];
+
+        if (!records.length) {
+            el.innerHTML = `<div style="text-align:center;padding:20px;color:var(--dim);">No matches in database for "${query}"</div>`;
+            return;
+        }
+
+        el.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:12px;">
+                <div class="card" style="text-align:center;border-left:3px solid var(--accent);"><div style="font-size:20px;font-weight:800;">${s.count}</div><div class="stat-lbl">Sales</div></div>
+                <div class="card" style="text-align:center;border-left:3px solid var(--green);"><div style="font-size:20px;font-weight:800;color:var(--green);">$${s.median ? Math.round(s.median) : '--'}</div><div class="stat-lbl">Median</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:20px;font-weight:800;">$${s.avg || '--'}</div><div class="stat-lbl">Average</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:14px;font-weight:700;">$${s.min ? Math.round(s.min) : '--'}—$${s.max ? Math.round(s.max) : '--'}</div><div class="stat-lbl">Range</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:14px;font-weight:700;">$${s.p25 ? Math.round(s.p25) : '--'}—$${s.p75 ? Math.round(s.p75) : '--'}</div><div class="stat-lbl">25-75%</div></div>
+                <div class="card" style="text-align:center;"><div style="font-size:20px;font-weight:800;color:var(--purple);">${s.signed_pct || 0}%</div><div class="stat-lbl">Signed</div></div>
+            </div>
+
+            ${d.by_year?.length ? `<div style="margin-bottom:12px;">
+                <div style="font-size:11px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Trend by Year</div>
+                <canvas id="db-chart" height="200"></canvas>
+            </div>` : ''}
+
+            ${Object.keys(d.by_medium||{}).length ? `<div style="margin-bottom:12px;">
+                <div style="font-size:11px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">By Medium</div>
+                <div style="display:flex;gap:6px;flex-wrap:wrap;">
+                    ${Object.entries(d.by_medium).sort((a,b)=>b[1]-a[1]).map(([m,c])=>`<span class="pill pill-blue">${m||'unknown'}: ${c}</span>`).join('')}
+                </div>
+            </div>` : ''}
+
+            <div style="font-size:11px;color:var(--dim);margin-bottom:6px;">Showing ${Math.min(records.length, 50)} of ${s.count}</div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Price</th><th>Date</th><th>Signed</th><th>Medium</th><th>Source</th></tr></thead>
+                <tbody>${records.slice(0,50).map(r => `<tr>
+                    <td class="trunc">${r.name}</td>
+                    <td class="r g b">$${Math.round(r.price).toLocaleString()}</td>
+                    <td class="d" style="font-size:11px;">${r.date||'--'}</td>
+                    <td>${r.signed ? '<span style="color:var(--green);">✓</span>' : '<span class="d">--</span>'}</td>
+                    <td class="d" style="font-size:11px;">${r.medium||''}</td>
+                    <td class="d" style="font-size:10px;">${r.source||''}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+        `;
+
+        // Year chart
+        if (d.by_year?.length) {
+            setTimeout(() => {
+                const ctx = document.getElementById('db-chart');
+                if (ctx) {
+                    new Chart(ctx, {
+                        type: 'line',
+                        data: {
+                            labels: d.by_year.map(y => y.year),
+                            datasets: [
+                                {label: 'Median', data: d.by_year.map(y => y.median), borderColor: '#30d158', backgroundColor: 'rgba(48,209,88,0.1)', fill: true, tension: 0.3, pointRadius: 5},
+                                {label: 'Average', data: d.by_year.map(y => y.avg), borderColor: '#0a84ff', borderDash: [4,4], pointRadius: 3, fill: false},
+                            ]
+                        },
+                        options: {
+                            responsive: true,
+                            plugins: {legend: {labels: {color: '#86868b', font: {size: 10}}}, tooltip: {callbacks: {label: ctx => `${ctx.dataset.label}: $${ctx.raw} (${d.by_year[ctx.dataIndex].count} sales)`}}},
+                            scales: {
+                                x: {ticks: {color: '#86868b'}, grid: {color: 'rgba(255,255,255,0.04)'}},
+                                y: {ticks: {color: '#86868b', callback: v => '$' + v}, grid: {color: 'rgba(255,255,255,0.04)'}}
+                            }
+                        }
+                    });
+                }
+            }, 100);
+        }
+    } catch(e) { el.innerHTML = `<div style="color:var(--red);padding:10px;">Failed: ${e.message}</div>`; }
+}
+
+function downscaleDataUrl(dataUrl, maxDim) {
+    return new Promise((resolve) => {
+        const img = new Image();
+        img.onload = () => {
+            const scale = Math.min(1, maxDim / Math.max(img.width, img.height));
+            if (scale >= 1) { resolve(dataUrl); return; }
+            const canvas = document.createElement('canvas');
+            canvas.width = Math.round(img.width * scale);
+            canvas.height = Math.round(img.height * scale);
+            canvas.getContext('2d').drawImage(img, 0, 0, canvas.width, canvas.height);
+            resolve(canvas.toDataURL('image/jpeg', 0.85));
+        };
+        img.onerror = () => resolve(dataUrl);
+        img.src = dataUrl;
+    });
+}
+
+async function extractFromPhoto(input) {
+    const file = input.files[0];
+    if (!file) return;
+    const el = document.getElementById('photo-result');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div><div style="font-size:11px;color:var(--dim);margin-top:6px;">Claude analyzing photo...</div></div>';
+
+    // Convert to base64, downscaling large phone photos before upload
+    const reader = new FileReader();
+    reader.onload = async (e) => {
+        try {
+            const image = await downscaleDataUrl(e.target.result, 1568);
+            const resp = await fetch('/api/photo/extract', {
+                method: 'POST', headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify({image})
+            });
+            const d = await resp.json();
+            if (d.error) {
+                el.innerHTML = `<div style="color:var(--red);padding:10px;">Failed: ${d.error}</div>`;
+                return;
+            }
+
+            el.innerHTML = `<div class="card" style="border-left:3px solid var(--purple);">
+                <div style="display:flex;gap:12px;align-items:center;">
+                    <img src="${e.target.result}" style="width:80px;height:80px;object-fit:cover;border-radius:8px;">
+                    <div style="flex:1;">
+                        <div style="font-size:14px;font-weight:700;">${d.artist||'Unknown artist'}</div>
+                        <div style="font-size:13px;color:var(--accent);">${d.title||'Unknown title'}</div>
+                        <div style="font-size:11px;color:var(--dim);">${d.medium||''} ${d.edition?'· '+d.edition:''} ${d.year?'· '+d.year:''}</div>
+                        <div style="font-size:10px;color:var(--purple);margin-top:2px;">Confidence: ${d.confidence||'?'} · ${d.notes||''}${d.cached ? ' · cached' : ''}</div>
+                    </div>
+                    <button class="btn btn-primary" style="padding:8px 14px;font-size:12px;" onclick="document.getElementById('lookup-query').value='${(d.title||'').replace(/'/g,'')}';document.getElementById('lookup-artist').value='${d.artist||''}';runLookup();">Lookup This</button>
+                </div>
+            </div>`;
+        } catch(err) { el.innerHTML = '<div style="color:var(--red);">Failed to extract</div>'; }
+    };
+    reader.readAsDataURL(file);
+}
+
+async function runLookup() {
+    const query = document.getElementById('lookup-query').value.trim();
+    const artist = document.getElementById('lookup-artist').value;
+    const minPrice = parseInt(document.getElementById('lookup-min').value) || 0;
+    const maxPrice = parseInt(document.getElementById('lookup-max').value) || 50000;
+    if (!query) { toast('Enter an artwork name'); return; }
+
+    const progress = document.getElementById('lookup-progress');
+    const el = document.getElementById('lookup-results');
+    showProgress(progress, 20, 'Searching...', 'Querying database + eBay active + eBay sold');
+
+    try {
+        const resp = await fetch('/api/lookup', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({query, artist, min_price: minPrice, max_price: maxPrice})
+        });
+        const d = await resp.json();
+        showProgress(progress, 70, 'Building results...', 'Analyzing pricing from all sources');
+
+        const ms = d.my_sales || {};
+        const h = d.historical || {};
+        const a = d.active || {};
+        const s = d.sold || {};
+        const p = d.pricing || {};
+        const cs = d.comp_stats || {};
+
+        // AI pricing request (async)
+        setTimeout(() => loadAILookupPrice(query, artist, p.estimated || h.median || a.median || 0, d), 100);
+
+        showProgressDone(progress, `${(h.count||0)+(a.count||0)+(s.count||0)} results`, `Historical: ${h.count||0} · Active: ${a.count||0} · Sold: ${s.count||0}`);
+
+        el.innerHTML = `
+            <!-- Pricing Summary -->
+            <div class="section">
+                <div style="display:flex;gap:8px;margin-bottom:16px;flex-wrap:wrap;">
+                    <div class="card" style="flex:1;text-align:center;min-width:90px;border-left:3px solid var(--green);">
+                        <div style="font-size:24px;font-weight:800;color:var(--green);">${p.estimated ? '$'+p.estimated : '--'}</div>
+                        <div class="stat-lbl">Fair Value</div>
+                    </div>
+                    <div class="card" style="flex:1;text-align:center;min-width:90px;">
+                        <div style="font-size:20px;font-weight:700;">${p.low && p.high ? '$'+p.low+' — $'+p.high : '--'}</div>
+                        <div class="stat-lbl">Range</div>
+                    </div>
+                    <div class="card" style="flex:1;text-align:center;min-width:90px;">
+                        <div style="font-size:20px;font-weight:700;">${cs.accepted||0}</div>
+                        <div class="stat-lbl">Validated Comps</div>
+                    </div>
+                    <div class="card" style="flex:1;text-align:center;min-width:90px;">
+                        <div style="font-size:20px;font-weight:700;color:${cs.confidence==='high'?'var(--green)':cs.confidence==='medium'?'var(--accent)':'var(--orange)'};">${cs.confidence||'--'}</div>
+                        <div class="stat-lbl">Confidence</div>
+                    </div>
+                </div>
+            </div>
+
+            <!-- Source comparison — 4 sources -->
+            <div class="section">
+                <div style="display:grid;grid-template-columns:repeat(2,1fr);gap:8px;margin-bottom:8px;">
+                    <div class="card" style="border-top:4px solid var(--purple);">
+                        <div style="font-size:10px;color:var(--purple);text-transform:uppercase;letter-spacing:0.8px;font-weight:700;margin-bottom:6px;">⭐ MY SALES (BEST COMP)</div>
+                        <div style="font-size:24px;font-weight:800;color:var(--purple);">${ms.median ? '$'+Math.round(ms.median) : '--'}</div>
+                        <div style="font-size:11px;color:var(--dim);">${ms.count||0} of YOUR sales · ${ms.min ? '$'+Math.round(ms.min)+' — $'+Math.round(ms.max) : '--'}</div>
+                    </div>
+                    <div class="card" style="border-top:3px solid var(--green);">
+                        <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">eBay Recently Sold</div>
+                        <div style="font-size:22px;font-weight:800;color:var(--green);">${s.median ? '$'+Math.round(s.median) : '--'}</div>
+                        <div style="font-size:11px;color:var(--dim);">${s.count||0} sales · ${s.min ? '$'+Math.round(s.min)+' — $'+Math.round(s.max) : '--'}</div>
+                    </div>
+                </div>
+                <div style="display:grid;grid-template-columns:repeat(2,1fr);gap:8px;margin-bottom:16px;">
+                    <div class="card" style="border-top:3px solid var(--accent);">
+                        <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Historical Database</div>
+                        <div style="font-size:22px;font-weight:800;color:var(--accent);">${h.median ? '$'+Math.round(h.median) : '--'}</div>
+                        <div style="font-size:11px;color:var(--dim);">${h.count||0} records · ${h.min ? '$'+Math.round(h.min)+' — $'+Math.round(h.max) : '--'}</div>
+                    </div>
+                    <div class="card" style="border-top:3px solid var(--orange);">
+                        <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">eBay Active</div>
+                        <div style="font-size:22px;font-weight:800;color:var(--orange);">${a.median ? '$'+Math.round(a.median) : '--'}</div>
+                        <div style="font-size:11px;color:var(--dim);">${a.count||0} listings · ${a.min ? '$'+Math.round(a.min)+' — $'+Math.round(a.max) : '--'}</div>
+                    </div>
+                </div>
+            </div>
+
+            <!-- Price chart -->
+            <div class="section">
+                <canvas id="lookup-chart" height="250" style="margin-bottom:16px;"></canvas>
+            </div>
+
+            <!-- AI Guidance -->
+            <div class="section" id="lookup-ai"><div class="loading"><div class="spinner"></div><div style="font-size:10px;color:var(--dim);margin-top:4px;">Claude + GPT analyzing pricing...</div></div></div>
+
+            <!-- MY SALES — most relevant -->
+            ${ms.records?.length ? `<div class="section">
+                <div class="section-title" style="color:var(--purple);">⭐ Your Past Sales (${ms.count})</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Item</th><th class="r">Sold $</th><th>Date</th><th class="r">Days</th><th>Buyer</th></tr></thead>
+                    <tbody>${ms.records.map(r => `<tr>
+                        <td class="trunc">${r.title}</td>
+                        <td class="r g b" style="font-size:14px;">$${Math.round(r.price).toLocaleString()}</td>
+                        <td class="d" style="font-size:11px;">${r.sold_date||'--'}</td>
+                        <td class="r">${r.days_to_sell != null ? r.days_to_sell + 'd' : '--'}</td>
+                        <td class="d" style="font-size:11px;">${r.buyer||''}</td>
+                    </tr>`).join('')}</tbody>
+                </table></div>
+            </div>` : ''}
+
+            <!-- Historical Records -->
+            ${h.records?.length ? `<div class="section">
+                <div class="section-title" style="color:var(--accent);">Historical Sales (${h.count})</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Item</th><th class="r">Price</th><th>Date</th><th>Source</th></tr></thead>
+                    <tbody>${h.records.map(r => `<tr>
+                        <td class="trunc">${r.name}</td><td class="r g b">$${Math.round(r.price).toLocaleString()}</td>
+                        <td class="d" style="font-size:11px;">${r.date||'--'}</td><td class="d" style="font-size:10px;">${r.source}</td>
+                    </tr>`).join('')}</tbody>
+                </table></div>
+            </div>` : ''}
+
+            <!-- Active Listings -->
+            ${a.records?.length ? `<div class="section">
+                <div class="section-title" style="color:var(--orange);">eBay Active Listings (${a.count})</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Item</th><th class="r">Price</th><th>Seller</th><th>Link</th></tr></thead>
+                    <tbody>${a.records.map(r => `<tr>
+                        <td class="trunc">${r.title}</td><td class="r g b">$${Math.round(r.price).toLocaleString()}</td>
+                        <td class="d" style="font-size:11px;">${r.seller||''}</td>
+                        <td>${r.url ? `<a href="${r.url}" target="_blank" style="color:var(--accent);font-size:11px;">eBay</a>` : '--'}</td>
+                    </tr>`).join('')}</tbody>
+                </table></div>
+            </div>` : ''}
+
+            <!-- Sold Listings -->
+            ${s.records?.length ? `<div class="section">
+                <div class="section-title" style="color:var(--green);">eBay Recently Sold (${s.count})</div>
+                <div class="table-wrap"><table>
+                    <thead><tr><th>Item</th><th class="r">Sold $</th><th>Date</th><th>Link</th></tr></thead>
+                    <tbody>${s.records.map(r => `<tr>
+                        <td class="trunc">${r.title}</td><td class="r g b">$${Math.round(r.price).toLocaleString()}</td>
+                        <td class="d" style="font-size:11px;">${r.sold_date||'--'}</td>
+                        <td>${r.url ? `<a href="${r.url}" target="_blank" style="color:var(--accent);font-size:11px;">eBay</a>` : '--'}</td>
+                    </tr>`).join('')}</tbody>
+                </table></div>
+            </div>` : ''}
+        `;
+
+        // Draw chart — all sources combined
+        setTimeout(() => {
+            const ctx = document.getElementById('lookup-chart');
+            if (!ctx) return;
+            const datasets = [];
+
+            // MY sales — purple, biggest, most prominent
+            const myDated = (ms.records||[]).filter(r => r.sold_date).sort((a,b) => (a.sold_date||'').localeCompare(b.sold_date||''));
+            if (myDated.length) {
+                datasets.push({
+                    label: '⭐ MY Sales (' + myDated.length + ')',
+                    data: myDated.map(r => ({x: r.sold_date, y: r.price})),
+                    borderColor: '#bf5af2', backgroundColor: 'rgba(191,90,242,0.5)',
+                    pointRadius: 9, pointStyle: 'star', showLine: false,
+                });
+            }
+
+            // Historical scatter
+            const histDated = (h.records||[]).filter(r => r.date).sort((a,b) => (a.date||'').localeCompare(b.date||''));
+            if (histDated.length) {
+                datasets.push({
+                    label: 'Historical (' + histDated.length + ')',
+                    data: histDated.map(r => ({x: r.date, y: r.price})),
+                    borderColor: '#0a84ff', backgroundColor: 'rgba(10,132,255,0.3)',
+                    pointRadius: 5, showLine: true, tension: 0.3, borderWidth: 2, fill: false,
+                });
+            }
+
+            // Active (all at today's date)
+            const today = new Date().toISOString().slice(0,10);
+            if (a.records?.length) {
+                datasets.push({
+                    label: 'Active (' + a.records.length + ')',
+                    data: a.records.map(r => ({x: today, y: r.price})),
+                    borderColor: '#ff9f0a', backgroundColor: 'rgba(255,159,10,0.5)',
+                    pointRadius: 7, pointStyle: 'triangle', showLine: false,
+                });
+            }
+
+            // Sold
+            const soldDated = (s.records||[]).filter(r => r.sold_date).sort((a,b) => (a.sold_date||'').localeCompare(b.sold_date||''));
+            if (soldDated.length) {
+                datasets.push({
+                    label: 'Sold (' + soldDated.length + ')',
+                    data: soldDated.map(r => ({x: r.sold_date, y: r.price})),
+                    borderColor: '#30d158', backgroundColor: 'rgba(48,209,88,0.3)',
+                    pointRadius: 6, pointStyle: 'rect', showLine: false,
+                });
+            }
+
+            // Fair value line
+            if (p.estimated && histDated.length >= 2) {
+                datasets.push({
+                    label: 'Fair Value ($' + p.estimated + ')',
+                    data: [{x: histDated[0].date, y: p.estimated}, {x: today, y: p.estimated}],
+                    borderColor: '#bf5af2', borderWidth: 2, borderDash: [6,4],
+                    pointRadius: 0, fill: false,
+                });
+            }
+
+            if (datasets.length) {
+                new Chart(ctx, {
+                    type: 'line', data: {datasets},
+                    options: {
+                        responsive: true,
+                        interaction: {mode:'nearest', intersect:false},
+                        plugins: {legend:{labels:{color:'#86868b',font:{size:10}}}},
+                        scales: {
+                            x: {type:'category', ticks:{color:'#86868b',font:{size:8},maxTicksLimit:10}, grid:{color:'rgba(255,255,255,0.04)'}},
+                            y: {ticks:{color:'#86868b',callback:v=>'$'+v}, grid:{color:'rgba(255,255,255,0.04)'}}
+                        }
+                    }
+                });
+            }
+        }, 200);
+
+    } catch(e) { showProgressError(progress, 'Lookup failed: ' + e.message); }
+}
+
+async function loadAILookupPrice(query, artist, price, data) {
+    const el = document.getElementById('lookup-ai');
+    if (!el) return;
+    try {
+        const resp = await fetch('/api/ai/price', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({title: query, artist, price, context: 'buy', comp_data: {
+                comps: data.validated_comps || [],
+                pricing: data.pricing || {},
+                stats: data.comp_stats || {},
+            }})
+        });
+        const d = await resp.json();
+        const claude = d.claude || {};
+        const gpt = d.gpt || {};
+        const con = d.consensus || {};
+
+        el.innerHTML = `<div style="background:linear-gradient(135deg,rgba(10,132,255,0.08),rgba(48,209,88,0.08));border-radius:12px;padding:16px;border:1px solid var(--border);">
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:10px;">AI Market Analysis</div>
+            <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:12px;margin-bottom:10px;">
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--accent);font-weight:600;">Claude</div>
+                    <div style="font-size:20px;font-weight:800;color:var(--accent);">${claude.verdict || (claude.recommended_price ? '$'+claude.recommended_price : '--')}</div>
+                    ${claude.buy_below ? `<div style="font-size:11px;">Buy below: $${claude.buy_below}</div>` : ''}
+                    ${claude.fair_value ? `<div style="font-size:10px;color:var(--dim);">Fair: $${claude.fair_value}</div>` : ''}
+                </div>
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--green);font-weight:600;">GPT</div>
+                    <div style="font-size:20px;font-weight:800;color:var(--green);">${gpt.verdict || (gpt.recommended_price ? '$'+gpt.recommended_price : '--')}</div>
+                    ${gpt.buy_below ? `<div style="font-size:11px;">Buy below: $${gpt.buy_below}</div>` : ''}
+                    ${gpt.fair_value ? `<div style="font-size:10px;color:var(--dim);">Fair: $${gpt.fair_value}</div>` : ''}
+                </div>
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--purple);font-weight:600;">Consensus</div>
+                    <div style="font-size:20px;font-weight:800;color:var(--purple);">${con.buy_below ? '$'+con.buy_below : (con.recommended ? '$'+con.recommended : '--')}</div>
+                </div>
+            </div>
+            <div style="font-size:11px;color:var(--dim);border-top:1px solid var(--border);padding-top:6px;">
+                ${claude.reasoning||''} ${gpt.reasoning ? '<br>GPT: '+gpt.reasoning : ''}
+            </div>
+        </div>`;
+    } catch(e) { el.innerHTML = ''; }
+}
+
+function renderSoldSection(allSold, itemName, itemArtist, elId) {
+    const el = document.getElementById(elId);
+    if (!el) return;
+    // Dedup
+    const seen = new Set();
+    const merged = allSold.filter(s => {
+        const k = (s.title||'').substring(0,30) + (s.price||0);
+        if (seen.has(k)) return false;
+        seen.add(k);
+        return s.price > 0;
+    });
+    if (!merged.length) { el.innerHTML = ''; return; }
+    const prices = merged.map(s => s.price).sort((a,b) => a-b);
+    const med = prices[Math.floor(prices.length/2)];
+
+    el.innerHTML = `<div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin:16px 0 6px;display:flex;justify-content:space-between;align-items:center;">
+        <span style="color:var(--green);">eBay Recently Sold (${merged.length})</span>
+        <span>Median: $${Math.round(med)}</span>
+    </div>
+    <div class="table-wrap" style="margin-bottom:12px;"><table>
+        <thead><tr><th>Item</th><th class="r">Sold $</th><th>Date</th><th>Link</th><th></th></tr></thead>
+        <tbody>${merged.slice(0,15).map(c => {
+            return `<tr class="comp-row">
+                <td class="trunc">${c.title||''}</td>
+                <td class="r g b">$${Math.round(c.price).toLocaleString()}</td>
+                <td class="d" style="font-size:11px;">${c.sold_date||'--'}</td>
+                <td>${c.url ? `<a href="${c.url}" target="_blank" style="color:var(--accent);font-size:11px;" onclick="event.stopPropagation()">eBay</a>` : '--'}</td>
+                <td><button class="comp-dismiss" onclick="event.stopPropagation();rejectComp('${esc(c.title)}',${c.price},'${esc(itemName)}','${itemArtist}',this.closest('tr'))">✕</button></td>
+            </tr>`;
+        }).join('')}</tbody>
+    </table></div>`;
+}
+
+async function loadAIPrice(title, artist, price, compData, elId) {
+    const el = document.getElementById(elId);
+    if (!el) return;
+
+    try {
+        const resp = await fetch('/api/ai/price', {
+            method: 'POST', headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({title, artist, price, context: 'sell', comp_data: compData})
+        });
+        const d = await resp.json();
+        const claude = d.claude || {};
+        const gpt = d.gpt || {};
+        const con = d.consensus || {};
+
+        el.innerHTML = `<div style="background:linear-gradient(135deg,rgba(10,132,255,0.08),rgba(48,209,88,0.08));border-radius:12px;padding:14px;border:1px solid var(--border);">
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:10px;">AI Price Recommendations</div>
+            <div style="display:grid;grid-template-columns:1fr 1fr 1fr;gap:12px;margin-bottom:10px;">
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--accent);font-weight:600;">Claude</div>
+                    <div style="font-size:22px;font-weight:800;color:var(--accent);">${claude.recommended_price ? '$'+claude.recommended_price : '--'}</div>
+                    ${claude.aggressive_price ? `<div style="font-size:10px;color:var(--dim);">Quick: $${claude.aggressive_price} · Hold: $${claude.conservative_price||'?'}</div>` : ''}
+                </div>
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--green);font-weight:600;">GPT</div>
+                    <div style="font-size:22px;font-weight:800;color:var(--green);">${gpt.recommended_price ? '$'+gpt.recommended_price : '--'}</div>
+                    ${gpt.aggressive_price ? `<div style="font-size:10px;color:var(--dim);">Quick: $${gpt.aggressive_price} · Hold: $${gpt.conservative_price||'?'}</div>` : ''}
+                </div>
+                <div style="text-align:center;">
+                    <div style="font-size:10px;color:var(--purple);font-weight:600;">Consensus</div>
+                    <div style="font-size:22px;font-weight:800;color:var(--purple);">${con.recommended ? '$'+con.recommended : '--'}</div>
+                    ${con.aggressive ? `<div style="font-size:10px;color:var(--dim);">Quick sell: $${con.aggressive}</div>` : ''}
+                </div>
+            </div>
+            <div style="font-size:11px;color:var(--dim);border-top:1px solid var(--border);padding-top:6px;">
+                ${claude.reasoning ? `Claude: ${claude.reasoning}` : ''}
+                ${gpt.reasoning ? `<br>GPT: ${gpt.reasoning}` : ''}
+            </div>
+        </div>`;
+    } catch(e) {
+        el.innerHTML = '<div style="font-size:11px;color:var(--dim);">AI pricing unavailable</div>';
+    }
+}
+
+function closeDrill() {
+    document.getElementById('drill-modal').classList.remove('show');
+}
+document.getElementById('drill-modal').addEventListener('click', e => { if(e.target.id==='drill-modal') closeDrill(); });
+
+// ==========================================
+// Universal Drill-Downs — click anything to see data
+// ==========================================
+
+// Revenue chart → week's sales
+async function drillWeekSales(week, wkData) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = 'Week of ' + week;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch('/api/reports/sales-analysis');
+        const d = await resp.json();
+        const sales = (d.sales || []).filter(s => {
+            const sd = s.sold || '';
+            return sd >= week && sd < week.substring(0,8) + String(parseInt(week.substring(8))+7).padStart(2,'0');
+        });
+
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(3,1fr);gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${Math.round(wkData?.revenue||0).toLocaleString()}</div><div class="stat-lbl">Revenue</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${wkData?.items||sales.length}</div><div class="stat-lbl">Items Sold</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${wkData?.items ? '$'+Math.round((wkData.revenue||0)/(wkData.items||1)) : '--'}</div><div class="stat-lbl">Avg Price</div></div>
+            </div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Price</th><th>Date</th><th class="r">DOM</th><th>Type</th></tr></thead>
+                <tbody>${sales.map(s => `<tr onclick="drillSoldItem('${(s.title||'').replace(/'/g,'')}', ${s.price||0}, '${s.sold||''}', ${s.days_to_sell||0}, ${s.ad_rate||0}, ${s.ad_cost||0}, '${s.promoted?'Promoted':'Organic'}')" style="cursor:pointer;" title="Click for comps">
+                    <td class="trunc">${s.title||''}</td>
+                    <td class="r g b">$${Math.round(s.price||0)}</td>
+                    <td class="d" style="font-size:11px;">${s.sold||''}</td>
+                    <td class="r">${s.days_to_sell!=null?s.days_to_sell+'d':'--'}</td>
+                    <td style="font-size:11px;color:${s.promoted?'var(--accent)':'var(--green)'};">${s.promoted?'Promoted':'Organic'}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>
+            ${!sales.length ? '<div style="text-align:center;padding:20px;color:var(--dim);">No individual sales data for this week</div>' : ''}`;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed to load</div>'; }
+}
+
+// Sold item → comps + market context
+async function drillSoldItem(title, price, soldDate, dom, adRate, adCost, promoType) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = title;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    // Detect artist
+    const tl = title.toLowerCase();
+    let artist = '';
+    if (tl.includes('fairey') || tl.includes('obey')) artist = 'Shepard Fairey';
+    else if (tl.includes('death nyc')) artist = 'Death NYC';
+    else if (tl.includes('kaws')) artist = 'KAWS';
+    else if (tl.includes('banksy')) artist = 'Banksy';
+    else if (tl.includes('brainwash')) artist = 'Mr. Brainwash';
+
+    try {
+        const resp = await fetch(`/api/comps/smart?title=${encodeURIComponent(title)}&artist=${encodeURIComponent(artist)}&price=${price}`);
+        const d = await resp.json();
+        const vs = d.stats || {};
+
+        const profitVsMedian = vs.median ? Math.round(price - vs.median) : null;
+        const aboveBelow = profitVsMedian > 0 ? `+$${profitVsMedian} above median` : profitVsMedian < 0 ? `$${Math.abs(profitVsMedian)} below median` : '';
+
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${price}</div><div class="stat-lbl">Sold For</div></div>
+                ${vs.median ? `<div class="card" style="text-align:center;"><div class="stat-val" style="color:var(--accent);">$${Math.round(vs.median)}</div><div class="stat-lbl">Market Median</div></div>` : ''}
+                ${vs.count ? `<div class="card" style="text-align:center;"><div class="stat-val">${vs.count}</div><div class="stat-lbl">Comps Found</div></div>` : ''}
+                <div class="card" style="text-align:center;"><div class="stat-val">${dom||'--'}${dom?'d':''}</div><div class="stat-lbl">Days on Market</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${adRate||0}%</div><div class="stat-lbl">Ad Rate</div></div>
+            </div>
+
+            ${aboveBelow ? `<div style="background:rgba(10,132,255,0.06);border-radius:8px;padding:10px;font-size:13px;margin-bottom:12px;">
+                You sold <b style="color:${profitVsMedian > 0 ? 'var(--green)' : 'var(--red)'};">${aboveBelow}</b> · ${promoType} · Sold ${soldDate}
+                ${adCost > 0 ? ` · Ad cost: $${adCost}` : ''}
+            </div>` : ''}
+
+            ${vs.min ? `<div style="margin-bottom:16px;">
+                <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Market Range</div>
+                <div style="display:flex;align-items:center;gap:12px;">
+                    <span style="font-size:12px;color:var(--dim);">$${Math.round(vs.min)}</span>
+                    <div style="flex:1;height:8px;background:var(--border);border-radius:4px;position:relative;">
+                        <div style="position:absolute;height:100%;background:linear-gradient(to right,var(--green),var(--accent),var(--orange));border-radius:4px;width:100%;opacity:0.4;"></div>
+                        ${vs.median ? `<div style="position:absolute;top:-3px;left:${Math.min(95,Math.max(5,(vs.median-vs.min)/(vs.max-vs.min)*100))}%;width:14px;height:14px;background:var(--accent);border-radius:50%;border:2px solid var(--bg);" title="Median: $${Math.round(vs.median)}"></div>` : ''}
+                        <div style="position:absolute;top:-3px;left:${Math.min(95,Math.max(5,(price-vs.min)/(vs.max-vs.min)*100))}%;width:14px;height:14px;background:var(--green);border-radius:50%;border:2px solid var(--bg);" title="Your sale: $${price}"></div>
+                    </div>
+                    <span style="font-size:12px;color:var(--dim);">$${Math.round(vs.max)}</span>
+                </div>
+                <div style="display:flex;justify-content:center;gap:16px;margin-top:6px;font-size:10px;color:var(--dim);">
+                    <span>● <span style="color:var(--green);">Your Sale</span></span>
+                    <span>● <span style="color:var(--accent);">Median</span></span>
+                </div>
+            </div>` : ''}
+
+            ${d.comps?.length ? `<div class="section-title">Comparable Listings (${d.validated}/${d.raw} validated)</div>
+            ${d.reason ? `<div style="font-size:11px;color:var(--dim);margin-bottom:6px;">${d.reason}</div>` : ''}
+            <div class="table-wrap"><table>
+                <thead><tr><th>Title</th><th class="r">Price</th><th>Condition</th><th>Link</th><th></th></tr></thead>
+                <tbody>${d.comps.map(c => `<tr class="comp-row" data-comp-title="${(c.title||'').replace(/"/g,'')}" data-comp-price="${c.price||0}" data-item-title="${title.replace(/"/g,'')}" data-artist="${artist}">
+                    <td class="trunc">${c.title}</td>
+                    <td class="r g b">$${Math.round(c.price)}</td>
+                    <td class="d" style="font-size:11px;">${c.condition||''}</td>
+                    <td>${c.url ? `<a href="${c.url}" target="_blank" style="color:var(--accent);font-size:11px;" onclick="event.stopPropagation()">eBay</a>` : '--'}</td>
+                    <td><button class="comp-dismiss" onclick="event.stopPropagation();rejectComp('${(c.title||'').replace(/'/g,'')}',${c.price||0},'${title.replace(/'/g,'')}','${artist}',this.closest('tr'))" title="Remove — AI learns">✕</button></td>
+                </tr>`).join('')}</tbody>
+            </table></div>` : '<div style="color:var(--dim);text-align:center;padding:20px;">No comp data available</div>'}
+
+            ${d.removed?.length ? `<div style="margin-top:12px;font-size:11px;color:var(--dim);">Filtered out: ${d.removed.map(r => '$'+r.price+' '+r.title).join(', ')}</div>` : ''}
+        `;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed to load comps</div>'; }
+}
+
+// Deal item → full analysis
+async function drillDealItem(title, price, category, median, compCount, url) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = title;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    const profit = median > 0 ? Math.round(median - price) : 0;
+    const discount = median > 0 ? Math.round((1 - price / median) * 100) : 0;
+    const verdict = profit > 100 && discount > 25 && compCount >= 3 ? 'BUY' : profit > 50 && discount > 15 ? 'CONSIDER' : profit < 0 ? 'OVERPRICED' : 'RESEARCH';
+    const vc = verdict === 'BUY' ? 'var(--green)' : verdict === 'CONSIDER' ? 'var(--orange)' : verdict === 'OVERPRICED' ? 'var(--red)' : 'var(--dim)';
+
+    try {
+        const resp = await fetch(`/api/comps/smart?title=${encodeURIComponent(title)}&artist=${encodeURIComponent(category)}&price=${price}`);
+        const d = await resp.json();
+        const vs = d.stats || {};
+
+        content.innerHTML = `
+            <div style="display:flex;justify-content:space-between;align-items:center;margin-bottom:16px;">
+                <div style="font-size:32px;font-weight:800;color:${vc};">${verdict}</div>
+                <div style="text-align:right;font-size:12px;color:var(--dim);">${category}</div>
+            </div>
+
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${price}</div><div class="stat-lbl">Listed At</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val" style="color:var(--accent);">$${median || (vs.median ? Math.round(vs.median) : '--')}</div><div class="stat-lbl">Median</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val" style="color:${profit>0?'var(--green)':'var(--red)'};">${profit>0?'+':''}$${profit}</div><div class="stat-lbl">Profit</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${vs.count || compCount}</div><div class="stat-lbl">Comps</div></div>
+            </div>
+
+            ${d.comps?.length ? `<div class="section-title">Validated Comps (${d.validated}/${d.raw})</div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Title</th><th class="r">Price</th><th>Link</th><th></th></tr></thead>
+                <tbody>${d.comps.map(c => `<tr class="comp-row" data-comp-title="${(c.title||'').replace(/"/g,'')}" data-comp-price="${c.price||0}" data-item-title="${title.replace(/"/g,'')}" data-artist="${category}">
+                    <td class="trunc">${c.title}</td>
+                    <td class="r g b">$${Math.round(c.price)}</td>
+                    <td>${c.url ? `<a href="${c.url}" target="_blank" style="color:var(--accent);font-size:11px;" onclick="event.stopPropagation()">eBay</a>` : '--'}</td>
+                    <td><button class="comp-dismiss" onclick="event.stopPropagation();rejectComp('${(c.title||'').replace(/'/g,'')}',${c.price||0},'${title.replace(/'/g,'')}','${category}',this.closest('tr'))" title="Remove — AI learns">✕</button></td>
+                </tr>`).join('')}</tbody>
+            </table></div>` : ''}
+
+            ${d.removed?.length ? `<div style="margin-top:8px;font-size:11px;color:var(--dim);">Filtered: ${d.removed.map(r => '$'+r.price+' '+r.title).join(', ')}</div>` : ''}
+
+            <div style="display:flex;gap:8px;margin-top:16px;">
+                ${url ? `<a href="${url}" target="_blank" class="btn btn-primary" style="flex:1;justify-content:center;">View on eBay</a>` : ''}
+            </div>
+        `;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// Promo item → detail + comps
+async function drillPromoItem(title, price, adRate, totalCost, status) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = title;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    const tl = title.toLowerCase();
+    let artist = '';
+    if (tl.includes('fairey') || tl.includes('obey')) artist = 'Shepard Fairey';
+    else if (tl.includes('death nyc')) artist = 'Death NYC';
+    else if (tl.includes('kaws')) artist = 'KAWS';
+    else if (tl.includes('banksy')) artist = 'Banksy';
+
+    try {
+        const resp = await fetch(`/api/comps/smart?title=${encodeURIComponent(title)}&artist=${encodeURIComponent(artist)}&price=${price}`);
+        const d = await resp.json();
+        const vs = d.stats || {};
+
+        const statusColor = status === 'overspending' ? 'var(--red)' : status === 'optimized' ? 'var(--green)' : 'var(--dim)';
+
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(auto-fit,minmax(80px,1fr));gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${price}</div><div class="stat-lbl">Price</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${adRate}%</div><div class="stat-lbl">Ad Rate</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val o">$${totalCost.toFixed(2)}</div><div class="stat-lbl">Ad Cost/30d</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val" style="color:${statusColor};">${status.toUpperCase()}</div><div class="stat-lbl">Status</div></div>
+            </div>
+
+            ${vs.median ? `<div style="background:rgba(10,132,255,0.06);border-radius:8px;padding:10px;font-size:13px;margin-bottom:12px;">
+                Market median: <b>$${Math.round(vs.median)}</b> from ${vs.count} comps · Range: $${Math.round(vs.min)} — $${Math.round(vs.max)}
+                ${price > vs.median * 1.3 ? ' · <span style="color:var(--red);">Overpriced vs market</span>' : price < vs.median * 0.8 ? ' · <span style="color:var(--green);">Below market — should sell fast</span>' : ''}
+            </div>` : ''}
+
+            ${d.comps?.length ? `<div class="section-title">Market Comps (${d.validated} validated)</div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Title</th><th class="r">Price</th><th>Link</th><th></th></tr></thead>
+                <tbody>${d.comps.map(c => `<tr class="comp-row" data-comp-title="${(c.title||'').replace(/"/g,'')}" data-comp-price="${c.price||0}" data-item-title="${title.replace(/"/g,'')}" data-artist="${artist}">
+                    <td class="trunc">${c.title}</td>
+                    <td class="r g b">$${Math.round(c.price)}</td>
+                    <td>${c.url ? `<a href="${c.url}" target="_blank" style="color:var(--accent);font-size:11px;" onclick="event.stopPropagation()">eBay</a>` : '--'}</td>
+                    <td><button class="comp-dismiss" onclick="event.stopPropagation();rejectComp('${(c.title||'').replace(/'/g,'')}',${c.price||0},'${title.replace(/'/g,'')}','${artist}',this.closest('tr'))" title="Remove — AI learns">✕</button></td>
+                </tr>`).join('')}</tbody>
+            </table></div>` : '<div style="color:var(--dim);text-align:center;padding:20px;">No comp data</div>'}
+        `;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// Rate bucket → show items at that rate
+async function drillRateBucket(name, items, sold, convRate, roi) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = 'Ad Rate: ' + name;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch('/api/promotions/costs');
+        const d = await resp.json();
+        const all = d?.products || [];
+
+        // Parse bucket range
+        const match = name.match(/(\d+)/g);
+        let lo = 0, hi = 100;
+        if (match) {
+            if (match.length === 2) { lo = parseInt(match[0]); hi = parseInt(match[1]); }
+            else if (name.includes('+') || name.includes('>')) { lo = parseInt(match[0]); hi = 100; }
+            else { lo = 0; hi = parseInt(match[0]); }
+        }
+        if (name.toLowerCase().includes('none') || name === '0%') { lo = 0; hi = 0.01; }
+
+        const filtered = all.filter(i => {
+            const rate = i.ad_rate || 0;
+            if (lo === 0 && hi < 1) return rate === 0;
+            return rate >= lo && rate < hi;
+        });
+
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(4,1fr);gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val">${items}</div><div class="stat-lbl">Items</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val g">${sold}</div><div class="stat-lbl">Sold</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val ${convRate>10?'g':''}">${convRate}%</div><div class="stat-lbl">Conv Rate</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val ${roi>0?'g':'rd'}">${roi>0?'+':''}${roi}%</div><div class="stat-lbl">ROI</div></div>
+            </div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th class="r">Price</th><th class="r">Rate</th><th class="r">Cost/30d</th><th>Status</th></tr></thead>
+                <tbody>${filtered.slice(0,100).map(i => `<tr onclick="drillPromoItem('${(i.title||'').replace(/'/g,'')}', ${i.price||0}, ${i.ad_rate||0}, ${i.total_cost||0}, '${i.promo_status||''}')" style="cursor:pointer;" title="Click for comps">
+                    <td class="trunc">${i.title||''}</td>
+                    <td class="r g b">$${(i.price||0).toFixed(0)}</td>
+                    <td class="r">${i.ad_rate||0}%</td>
+                    <td class="r o">$${(i.total_cost||0).toFixed(2)}</td>
+                    <td style="font-size:10px;">${(i.promo_status||'').toUpperCase()}</td>
+                </tr>`).join('')}</tbody>
+            </table></div>`;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// Category → show all items in that category
+async function drillCategory(cat, items, sold, convRate) {
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = cat + ' — ' + items + ' listings';
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch('/api/inventory/full-analytics');
+        const d = await resp.json();
+        const filtered = (d.items || []).filter(i => i.artist === cat);
+
+        content.innerHTML = `
+            <div style="display:grid;grid-template-columns:repeat(4,1fr);gap:8px;margin-bottom:16px;">
+                <div class="card" style="text-align:center;"><div class="stat-val">${filtered.length}</div><div class="stat-lbl">Listings</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val g">${sold}</div><div class="stat-lbl">Sold</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val">${convRate}%</div><div class="stat-lbl">Conv Rate</div></div>
+                <div class="card" style="text-align:center;"><div class="stat-val g">$${Math.round(filtered.reduce((s,i)=>s+(i.suggested_price||0),0)).toLocaleString()}</div><div class="stat-lbl">Total Value</div></div>
+            </div>
+            <div class="table-wrap"><table>
+                <thead><tr><th>Item</th><th>Signal</th><th class="r">Price</th><th class="r">Median</th><th class="r">Ad%</th><th>Velocity</th></tr></thead>
+                <tbody>${filtered.map(i => {
+                    const sp = i.recommendation?.includes('SELL') ? 'pill-green' : i.recommendation === 'HOLD' ? 'pill-orange' : 'pill-dim';
+                    return `<tr onclick="drillItem('${i.id}','${(i.name||'').replace(/'/g,'')}','${i.artist||''}',${i.suggested_price||0})" style="cursor:pointer;" title="Click for full detail">
+                        <td class="trunc">${i.name||''}</td>
+                        <td><span class="pill ${sp}">${i.recommendation||'--'}</span></td>
+                        <td class="r g b">$${Math.round(i.suggested_price||0)}</td>
+                        <td class="r d">${i.market_median ? '$'+Math.round(i.market_median) : '--'}</td>
+                        <td class="r">${i.ad_rate ? i.ad_rate+'%' : '--'}</td>
+                        <td style="font-size:11px;">${i.velocity||'--'}</td>
+                    </tr>`;
+                }).join('')}</tbody>
+            </table></div>`;
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// ==========================================
+// Price chart popup
+// ==========================================
+async function showCompDetail(listingId, name, artist) {
+    // Comp detail modal: hits /api/prices/search with listing title → shows distribution vs your price
+    const modal = document.getElementById('drill-modal');
+    const titleEl = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    titleEl.textContent = 'Comp Comparison — ' + name;
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    // Find the listing to pull your_price and cached comp_evidence
+    const item = (invData?.items || []).find(x => x.id === listingId) || {};
+    const yourPrice = item.your_price || 0;
+
+    try {
+        const params = new URLSearchParams({title: name, artist: artist || '', limit: 100});
+        if ((name || '').toLowerCase().includes('signed')) params.set('signed', '1');
+        const resp = await fetch('/api/prices/search?' + params.toString());
+        const d = await resp.json();
+        const stats = d.stats || {};
+        const comps = d.comps || [];
+        const trend = d.trend || [];
+
+        if (!stats.count) {
+            content.innerHTML = `<div style="padding:24px;text-align:center;color:var(--dim);">No comps found in the 54k historical DB for this title.<br><br>Try searching more broadly in <a href="/prices?title=${encodeURIComponent(name)}" target="_blank" style="color:var(--accent);">Price Radar</a>.</div>`;
+            return;
+        }
+
+        const delta = yourPrice > 0 && stats.median > 0 ? Math.round((yourPrice - stats.median) / stats.median * 100) : null;
+        const deltaColor = delta == null ? 'var(--dim)' : delta < -5 ? 'var(--green)' : delta > 10 ? 'var(--orange)' : 'var(--accent)';
+
+        content.innerHTML = `
+            <div style="display:flex;gap:6px;margin-bottom:12px;flex-wrap:wrap;">
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:18px;font-weight:700;">$${Math.round(yourPrice)}</div><div class="stat-lbl">Your Price</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:18px;font-weight:700;">${stats.count}</div><div class="stat-lbl">Comps</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:18px;font-weight:700;color:var(--accent);">$${stats.median}</div><div class="stat-lbl">Median</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:18px;font-weight:700;">$${stats.p25} – $${stats.p75}</div><div class="stat-lbl">p25–p75</div></div>
+                <div class="card" style="flex:1;text-align:center;min-width:80px;"><div style="font-size:18px;font-weight:700;color:${deltaColor};">${delta != null ? (delta > 0 ? '+' : '') + delta + '%' : '--'}</div><div class="stat-lbl">vs Median</div></div>
+            </div>
+            <canvas id="comp-dist-chart" height="180" style="margin-bottom:14px;"></canvas>
+            ${trend.length ? `<div style="font-size:11px;color:var(--dim);margin-bottom:6px;">Median by year:</div>
+            <div style="display:flex;gap:4px;margin-bottom:14px;flex-wrap:wrap;">
+                ${trend.map(t => `<div style="background:var(--card);border:1px solid var(--border);border-radius:6px;padding:4px 8px;font-size:11px;"><b>${t.year}</b> · $${t.median} <span style="color:var(--dim);">(n=${t.count})</span></div>`).join('')}
+            </div>` : ''}
+            <div style="font-size:11px;color:var(--dim);margin-bottom:6px;">Recent sales (top 15):</div>
+            <div class="table-wrap"><table style="font-size:11px;">
+                <thead><tr><th>Title</th><th class="r">Price</th><th>Date</th><th>Signed</th><th>Source</th></tr></thead>
+                <tbody>${comps.slice(0,15).map(c => `
+                    <tr>
+                        <td class="trunc" title="${(c.name||'').replace(/"/g,'&quot;')}">${(c.name||'').substring(0,50)}</td>
+                        <td class="r b">$${Math.round(c.price||0)}</td>
+                        <td class="d">${(c.date||'').substring(0,10)}</td>
+                        <td>${c.signed ? '✓' : ''}</td>
+                        <td class="d">${c.source||''}</td>
+                    </tr>`).join('')}</tbody>
+            </table></div>
+            <div style="margin-top:12px;text-align:right;">
+                <button class="btn" onclick="setExactPrice('${listingId}',${stats.median});toast('Price set to comp median $${stats.median}');" style="background:var(--accent);color:#fff;">Match Median $${stats.median}</button>
+                <button class="btn" onclick="setExactPrice('${listingId}',${stats.p75});toast('Price set to p75 $${stats.p75}');" style="background:var(--green);color:#000;">Match p75 $${stats.p75}</button>
+                <a href="/prices?title=${encodeURIComponent(name)}" target="_blank" class="btn-ghost" style="margin-left:8px;">Open in Price Radar ↗</a>
+            </div>
+        `;
+
+        // Histogram
+        const buckets = 12;
+        const prices = comps.map(c => c.price).filter(p => p > 0);
+        if (prices.length) {
+            const lo = Math.min(...prices), hi = Math.max(...prices);
+            const step = (hi - lo) / buckets || 1;
+            const counts = new Array(buckets).fill(0);
+            const labels = [];
+            for (let i = 0; i < buckets; i++) {
+                labels.push('$' + Math.round(lo + step * i));
+            }
+            prices.forEach(p => {
+                const idx = Math.min(buckets - 1, Math.floor((p - lo) / step));
+                counts[idx]++;
+            });
+            const yourBucket = yourPrice > 0 ? Math.min(buckets - 1, Math.max(0, Math.floor((yourPrice - lo) / step))) : -1;
+            const bg = counts.map((_, i) => i === yourBucket ? 'rgba(48,209,88,0.9)' : 'rgba(100,150,255,0.4)');
+            new Chart(document.getElementById('comp-dist-chart'), {
+                type: 'bar',
+                data: { labels, datasets: [{ label: 'Comps', data: counts, backgroundColor: bg, borderWidth: 0 }] },
+                options: {
+                    plugins: { legend: { display: false }, tooltip: { callbacks: { title: (c) => c[0].label + '+' } } },
+                    scales: {
+                        x: { ticks: { color: '#888', font: { size: 10 } }, grid: { display: false } },
+                        y: { ticks: { color: '#888' }, grid: { color: 'rgba(255,255,255,0.05)' } }
+                    }
+                }
+            });
+        }
+    } catch (e) {
+        content.innerHTML = `<div style="padding:20px;color:var(--red);">Failed to load comps: ${e.message}</div>`;
+    }
+}
+
+async function showChart(listingId, event) {
+    // Open in drill modal with chart
+    const modal = document.getElementById('drill-modal');
+    const title = document.getElementById('drill-title');
+    const content = document.getElementById('drill-content');
+    title.textContent = 'Price History';
+    content.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    modal.classList.add('show');
+
+    try {
+        const resp = await fetch(`/api/listing/chart/${listingId}`);
+        const d = await resp.json();
+        title.textContent = d.title;
+        const s = d.stats || {};
+
+        content.innerHTML = `<div style="font-size:12px;color:var(--dim);margin-bottom:8px;">${s.historical_count||0} historical · ${s.active_count||0} active · Your price: $${d.your_price}</div>
+            <canvas id="popup-chart" height="250"></canvas>
+            <div style="margin-top:12px;">${(d.chart_points||[]).filter(p=>p.type==='sold').slice(0,10).map(p =>
+                `<div style="display:flex;justify-content:space-between;padding:4px 0;border-bottom:1px solid var(--border);font-size:12px;">
+                    <span class="d">${p.name?.substring(0,35)||''}</span><span class="b">$${p.price}</span><span class="d">${p.date||''}</span></div>`
+            ).join('')}</div>`;
+
+        const points = d.chart_points || [];
+        if (points.length) {
+            new Chart(document.getElementById('popup-chart'), {
+                type: 'scatter',
+                data: {
+                    datasets: [
+                        {label:'Historical', data:points.filter(p=>p.type==='sold').map(p=>({x:p.date,y:p.price})), backgroundColor:'rgba(10,132,255,0.7)', pointRadius:5},
+                        {label:'Active', data:points.filter(p=>p.type==='active').map(p=>({x:p.date,y:p.price})), backgroundColor:'rgba(255,159,10,0.7)', pointRadius:6, pointStyle:'triangle'},
+                        {label:'Yours', data:points.filter(p=>p.type==='yours').map(p=>({x:p.date,y:p.price})), backgroundColor:'rgba(48,209,88,1)', pointRadius:8, pointStyle:'star'},
+                    ]
+                },
+                options: {responsive:true, plugins:{legend:{labels:{color:'#86868b',font:{size:10}}}},
+                    scales:{x:{type:'category',ticks:{color:'#86868b',font:{size:8},maxTicksLimit:8},grid:{color:'rgba(255,255,255,0.04)'}},
+                        y:{ticks:{color:'#86868b',callback:v=>'$'+v},grid:{color:'rgba(255,255,255,0.04)'}}}}
+            });
+        }
+    } catch(e) { content.innerHTML = '<div style="color:var(--red);">Failed</div>'; }
+}
+
+// ==========================================
+// Swipe mode — full-screen card-by-card inventory with Comps + LLM Consensus tabs
+// ==========================================
+let swipeItems = [];
+let swipeIdx = 0;
+let swipeTab = 'comps';
+let llmReviewCache = {};
+let swipeKeyHandler = null;
+let swipePointerState = null;
+
+function openSwipeMode() {
+    if (!invData || !invData.items) {
+        toast('Load the inventory first.');
+        return;
+    }
+    // Default focus to Shepard Fairey if no filter active
+    if (invFilter === 'all') {
+        const hasFairey = (invData.items || []).some(i => i.artist === 'Shepard Fairey');
+        if (hasFairey) {
+            invFilter = 'Shepard Fairey';
+            // sync chip UI if present
+            document.querySelectorAll('#inv-chips .chip').forEach(c => {
+                c.classList.toggle('active', c.textContent.startsWith('Shepard Fairey'));
+            });
+        }
+    }
+    // Replicate renderInv() filtering+sorting to get the same visible list
+    let items = invData.items.slice();
+    const query = (document.getElementById('inv-search')?.value || '').toLowerCase();
+    const sort = document.getElementById('inv-sort')?.value || 'signal';
+    if (invFilter !== 'all') items = items.filter(i => i.artist === invFilter);
+    if (query) items = items.filter(i => (i.name || '').toLowerCase().includes(query));
+    const order = {'SELL NOW':0,'GOOD TO SELL':1,'SET PRICE':2,'HOLD':3,'WAIT':4,'RESEARCH':5};
+    const actionOrder = {'PROMOTE':0,'DISCOUNT':1,'RELIST':2,'HOLD':3};
+    if (sort === 'signal') items.sort((a,b) => (order[a.recommendation]||5) - (order[b.recommendation]||5));
+    else if (sort === 'action') items.sort((a,b) => (actionOrder[a.action]??3) - (actionOrder[b.action]??3) || (b.action_score||0) - (a.action_score||0));
+    else if (sort === 'alpha') items.sort((a,b) => a.name.localeCompare(b.name));
+    else if (sort === 'price_high') items.sort((a,b) => (b.suggested_price||0) - (a.suggested_price||0));
+    else if (sort === 'price_low') items.sort((a,b) => (a.suggested_price||0) - (b.suggested_price||0));
+    else if (sort === 'watchers') items.sort((a,b) => (b.watchers||0) - (a.watchers||0));
+    else if (sort === 'roi') items.sort((a,b) => (b.roi_est||0) - (a.roi_est||0));
+    else if (sort === 'stale') items.sort((a,b) => (b.days_listed||0) - (a.days_listed||0));
+    else if (sort === 'comp_upside') items.sort((a,b) => (a.comp_delta_pct ?? 999) - (b.comp_delta_pct ?? 999));
+    else if (sort === 'comp_overpriced') items.sort((a,b) => (b.comp_delta_pct ?? -999) - (a.comp_delta_pct ?? -999));
+    else if (sort === 'comp_count') items.sort((a,b) => (b.comp_count||0) - (a.comp_count||0));
+
+    if (!items.length) {
+        toast('No items match the current filter.');
+        return;
+    }
+    swipeItems = items;
+    swipeIdx = 0;
+    swipeTab = 'comps';
+    const modal = document.getElementById('swipe-modal');
+    modal.classList.add('show');
+    renderSwipeCard();
+
+    // Keyboard navigation
+    swipeKeyHandler = (e) => {
+        if (e.key === 'Escape') { closeSwipeMode(); return; }
+        // When Train Comps tab is active, arrow/J/L/U route to comp-swipe
+        if (swipeTab === 'train') {
+            if (e.key === 'ArrowLeft' || e.key === 'j' || e.key === 'J') { e.preventDefault(); trainSwipeAction('reject'); }
+            else if (e.key === 'ArrowRight' || e.key === 'l' || e.key === 'L') { e.preventDefault(); trainSwipeAction('approve'); }
+            else if (e.key === 'u' || e.key === 'U') { e.preventDefault(); trainUndo(); }
+            return;
+        }
+        if (e.key === 'ArrowLeft') { swipePrev(); }
+        else if (e.key === 'ArrowRight') { swipeNext(); }
+    };
+    document.addEventListener('keydown', swipeKeyHandler);
+
+    // Pointer (touch/mouse) drag for swipe
+    const body = document.getElementById('swipe-body');
+    body.addEventListener('pointerdown', swipePointerDown);
+    body.addEventListener('pointerup', swipePointerUp);
+    body.addEventListener('pointercancel', swipePointerUp);
+}
+
+function closeSwipeMode() {
+    const modal = document.getElementById('swipe-modal');
+    modal.classList.remove('show');
+    if (swipeKeyHandler) {
+        document.removeEventListener('keydown', swipeKeyHandler);
+        swipeKeyHandler = null;
+    }
+    const body = document.getElementById('swipe-body');
+    body.removeEventListener('pointerdown', swipePointerDown);
+    body.removeEventListener('pointerup', swipePointerUp);
+    body.removeEventListener('pointercancel', swipePointerUp);
+    swipePointerState = null;
+}
+
+function swipePointerDown(e) {
+    // Train Comps tab owns its own pointer handling
+    if (swipeTab === 'train') return;
+    // Ignore drags initiated on interactive elements
+    const tag = (e.target.tagName || '').toLowerCase();
+    if (['button','input','a','select','textarea','canvas'].includes(tag)) return;
+    swipePointerState = { x: e.clientX, y: e.clientY, t: Date.now() };
+}
+function swipePointerUp(e) {
+    if (swipeTab === 'train') { swipePointerState = null; return; }
+    if (!swipePointerState) return;
+    const dx = e.clientX - swipePointerState.x;
+    const dy = e.clientY - swipePointerState.y;
+    const dt = Date.now() - swipePointerState.t;
+    swipePointerState = null;
+    // Require mostly-horizontal, sufficient distance, and not a long press
+    if (dt > 800) return;
+    if (Math.abs(dx) < 60) return;
+    if (Math.abs(dy) > Math.abs(dx)) return;
+    if (dx > 0) swipePrev(); else swipeNext();
+}
+
+function swipePrev() {
+    if (!swipeItems.length) return;
+    swipeIdx = (swipeIdx - 1 + swipeItems.length) % swipeItems.length;
+    swipeTab = 'comps';
+    renderSwipeCard();
+}
+function swipeNext() {
+    if (!swipeItems.length) return;
+    swipeIdx = (swipeIdx + 1) % swipeItems.length;
+    swipeTab = 'comps';
+    renderSwipeCard();
+}
+
+function renderSwipeCard() {
+    const item = swipeItems[swipeIdx];
+    if (!item) return;
+    const head = document.getElementById('swipe-head-info');
+    const total = swipeItems.length;
+    const filterLbl = invFilter === 'all' ? 'All' : invFilter;
+    head.innerHTML = `<b>Item ${swipeIdx + 1}</b> of ${total} <span style="color:var(--dim);margin:0 6px;">·</span> ${filterLbl}`;
+
+    const body = document.getElementById('swipe-body');
+    const your = Math.round(item.your_price || 0);
+    const med = item.comp_median != null ? Math.round(item.comp_median) : null;
+    const p75 = item.comp_p75 != null ? Math.round(item.comp_p75) : null;
+    const n = item.comp_count || 0;
+    const delta = item.comp_delta_pct;
+    const deltaColor = delta == null ? 'var(--dim)' : delta < -5 ? 'var(--green)' : delta > 10 ? 'var(--orange)' : 'var(--accent)';
+
+    body.innerHTML = `
+        <div class="swipe-card" id="swipe-card-inner">
+            <div class="swipe-title">${item.name || '(untitled)'}</div>
+            <div class="swipe-hero">
+                <div style="flex:1;">
+                    <div class="swipe-price-big">$${your}</div>
+                    <div class="swipe-price-lbl">Your Price</div>
+                </div>
+                <div class="swipe-price-side">
+                    ${med != null ? `<div>Comp median <b>$${med}</b>${n ? ` <span style="color:var(--dim);">(n=${n})</span>` : ''}</div>` : '<div>No comp data</div>'}
+                    ${p75 != null ? `<div>p75 <b>$${p75}</b></div>` : ''}
+                    ${delta != null ? `<div style="color:${deltaColor};">${delta>0?'+':''}${delta}% vs median</div>` : ''}
+                    <div style="color:var(--dim);">${item.artist || ''} · ${item.recommendation || ''}</div>
+                </div>
+            </div>
+            <div class="swipe-tabs">
+                <button class="swipe-tab ${swipeTab==='comps'?'active':''}" onclick="swipeSwitchTab('comps')">Comps</button>
+                <button class="swipe-tab ${swipeTab==='llm'?'active':''}" onclick="swipeSwitchTab('llm')">LLM Consensus</button>
+                <button class="swipe-tab ${swipeTab==='train'?'active':''}" onclick="swipeSwitchTab('train')">Train Comps</button>
+            </div>
+            <div class="swipe-tab-content" id="swipe-tab-content">
+                <div class="loading"><div class="spinner"></div></div>
+            </div>
+        </div>
+    `;
+
+    // Disable Match button until LLM tab loads consensus
+    const matchBtn = document.getElementById('swipe-match');
+    matchBtn.disabled = true;
+    matchBtn.textContent = 'Match Consensus';
+
+    if (swipeTab === 'comps') renderSwipeCompsTab(item);
+    else if (swipeTab === 'train') renderSwipeTrainTab(item);
+    else renderSwipeLLMTab(item);
+}
+
+function swipeSwitchTab(tab) {
+    if (tab === swipeTab) return;
+    swipeTab = tab;
+    // Update active tab button classes without full re-render
+    const labelMap = { comps: 'Comps', llm: 'LLM', train: 'Train' };
+    const want = labelMap[tab] || 'Comps';
+    document.querySelectorAll('#swipe-body .swipe-tab').forEach(btn => {
+        btn.classList.toggle('active', btn.textContent.trim().startsWith(want));
+    });
+    const item = swipeItems[swipeIdx];
+    const matchBtn = document.getElementById('swipe-match');
+    if (tab === 'comps') {
+        matchBtn.disabled = true;
+        matchBtn.textContent = 'Match Consensus';
+        renderSwipeCompsTab(item);
+    } else if (tab === 'train') {
+        matchBtn.disabled = true;
+        matchBtn.textContent = 'Match Consensus';
+        renderSwipeTrainTab(item);
+    } else {
+        renderSwipeLLMTab(item);
+    }
+}
+
+async function renderSwipeCompsTab(item) {
+    const el = document.getElementById('swipe-tab-content');
+    if (!el) return;
+    const yourPrice = item.your_price || 0;
+    // Use cached comp_evidence for stats + year trend
+    const ev = item.comp_evidence || {};
+    const stats = {
+        count: item.comp_count || ev.count || 0,
+        median: item.comp_median != null ? Math.round(item.comp_median) : (ev.median ? Math.round(ev.median) : 0),
+        p25: item.comp_p25 != null ? Math.round(item.comp_p25) : (ev.p25 ? Math.round(ev.p25) : 0),
+        p75: item.comp_p75 != null ? Math.round(item.comp_p75) : (ev.p75 ? Math.round(ev.p75) : 0),
+        trailing_12mo_median: item.comp_12mo_median || ev.trailing_12mo_median || null,
+        signed_only: item.comp_signed_only || ev.signed_only || false
+    };
+    const trend = ev.trend || ev.year_trend || [];
+
+    if (!stats.count) {
+        el.innerHTML = `<div style="padding:24px;text-align:center;color:var(--dim);">No comps found in the 54k DB for this item.</div>`;
+        return;
+    }
+
+    const delta = yourPrice > 0 && stats.median > 0 ? Math.round((yourPrice - stats.median) / stats.median * 100) : null;
+    const deltaColor = delta == null ? 'var(--dim)' : delta < -5 ? 'var(--green)' : delta > 10 ? 'var(--orange)' : 'var(--accent)';
+
+    el.innerHTML = `
+        <div style="display:flex;gap:6px;margin-bottom:12px;flex-wrap:wrap;">
+            <div class="card" style="flex:1;text-align:center;min-width:72px;"><div style="font-size:18px;font-weight:700;">${stats.count}</div><div class="stat-lbl">Comps</div></div>
+            <div class="card" style="flex:1;text-align:center;min-width:72px;"><div style="font-size:18px;font-weight:700;color:var(--accent);">$${stats.median}</div><div class="stat-lbl">Median</div></div>
+            <div class="card" style="flex:1;text-align:center;min-width:72px;"><div style="font-size:18px;font-weight:700;">$${stats.p25} – $${stats.p75}</div><div class="stat-lbl">p25–p75</div></div>
+            ${stats.trailing_12mo_median ? `<div class="card" style="flex:1;text-align:center;min-width:72px;"><div style="font-size:18px;font-weight:700;">$${Math.round(stats.trailing_12mo_median)}</div><div class="stat-lbl">12mo median</div></div>` : ''}
+            <div class="card" style="flex:1;text-align:center;min-width:72px;"><div style="font-size:18px;font-weight:700;color:${deltaColor};">${delta != null ? (delta>0?'+':'')+delta+'%' : '--'}</div><div class="stat-lbl">vs Median</div></div>
+        </div>
+        <canvas id="swipe-comp-chart" height="170" style="margin-bottom:14px;"></canvas>
+        ${trend.length ? `<div style="font-size:11px;color:var(--dim);margin-bottom:6px;">Median by year:</div>
+        <div style="display:flex;gap:4px;margin-bottom:14px;flex-wrap:wrap;">
+            ${trend.map(t => `<div style="background:var(--card);border:1px solid var(--border);border-radius:6px;padding:4px 8px;font-size:11px;"><b>${t.year}</b> · $${Math.round(t.median)} <span style="color:var(--dim);">(n=${t.count})</span></div>`).join('')}
+        </div>` : ''}
+        <div style="font-size:11px;color:var(--dim);margin-bottom:6px;">Recent comparable sales:</div>
+        <div id="swipe-comps-list"><div class="loading"><div class="spinner"></div></div></div>
+        <div style="margin-top:12px;display:flex;gap:8px;flex-wrap:wrap;">
+            ${stats.median ? `<button class="btn" onclick="setExactPrice('${item.id}',${stats.median});toast('Price set to comp median $${stats.median}');" style="background:var(--accent);color:#fff;padding:8px 14px;font-size:12px;">Match Median $${stats.median}</button>` : ''}
+            ${stats.p75 ? `<button class="btn" onclick="setExactPrice('${item.id}',${stats.p75});toast('Price set to p75 $${stats.p75}');" style="background:var(--green);color:#000;padding:8px 14px;font-size:12px;">Match p75 $${stats.p75}</button>` : ''}
+        </div>
+    `;
+
+    // Fetch recent sales list (top 10) + histogram data
+    try {
+        const params = new URLSearchParams({ title: item.name || '', artist: item.artist || '', limit: 100 });
+        if ((item.name || '').toLowerCase().includes('signed')) params.set('signed', '1');
+        const resp = await fetch('/api/prices/search?' + params.toString());
+        const d = await resp.json();
+        const comps = d.comps || [];
+        const listEl = document.getElementById('swipe-comps-list');
+        if (listEl) {
+            if (!comps.length) {
+                listEl.innerHTML = '<div style="color:var(--dim);font-size:12px;padding:8px;">No recent sales returned.</div>';
+            } else {
+                listEl.innerHTML = `<div class="table-wrap"><table style="font-size:11px;">
+                    <thead><tr><th>Title</th><th class="r">Price</th><th>Date</th><th>Signed</th><th>Source</th></tr></thead>
+                    <tbody>${comps.slice(0,10).map(c => `
+                        <tr>
+                            <td class="trunc" title="${(c.name||'').replace(/"/g,'&quot;')}">${(c.name||'').substring(0,50)}</td>
+                            <td class="r b">$${Math.round(c.price||0)}</td>
+                            <td class="d">${(c.date||'').substring(0,10)}</td>
+                            <td>${c.signed ? '✓' : ''}</td>
+                            <td class="d">${c.source||''}</td>
+                        </tr>`).join('')}</tbody>
+                </table></div>`;
+            }
+        }
+
+        // Render histogram (12 buckets, highlight yourPrice bucket green)
+        const canvas = document.getElementById('swipe-comp-chart');
+        const prices = comps.map(c => c.price).filter(p => p > 0);
+        if (canvas && prices.length) {
+            const buckets = 12;
+            const lo = Math.min(...prices), hi = Math.max(...prices);
+            const step = (hi - lo) / buckets || 1;
+            const counts = new Array(buckets).fill(0);
+            const labels = [];
+            for (let i = 0; i < buckets; i++) labels.push('$' + Math.round(lo + step * i));
+            prices.forEach(p => {
+                const idx = Math.min(buckets - 1, Math.floor((p - lo) / step));
+                counts[idx]++;
+            });
+            const yourBucket = yourPrice > 0 ? Math.min(buckets - 1, Math.max(0, Math.floor((yourPrice - lo) / step))) : -1;
+            const bg = counts.map((_, i) => i === yourBucket ? 'rgba(48,209,88,0.9)' : 'rgba(100,150,255,0.4)');
+            new Chart(canvas, {
+                type: 'bar',
+                data: { labels, datasets: [{ label: 'Comps', data: counts, backgroundColor: bg, borderWidth: 0 }] },
+                options: {
+                    plugins: { legend: { display: false }, tooltip: { callbacks: { title: (c) => c[0].label + '+' } } },
+                    scales: {
+                        x: { ticks: { color: '#888', font: { size: 10 } }, grid: { display: false } },
+                        y: { ticks: { color: '#888' }, grid: { color: 'rgba(255,255,255,0.05)' } }
+                    }
+                }
+            });
+        }
+    } catch (e) {
+        const listEl = document.getElementById('swipe-comps-list');
+        if (listEl) listEl.innerHTML = `<div style="color:var(--red);font-size:12px;">Failed to load recent sales: ${e.message}</div>`;
+    }
+}
+
+async function renderSwipeLLMTab(item) {
+    const el = document.getElementById('swipe-tab-content');
+    if (!el) return;
+    const listingId = item.id;
+
+    if (llmReviewCache[listingId]) {
+        renderLLMPayload(el, item, llmReviewCache[listingId]);
+        return;
+    }
+
+    el.innerHTML = `<div class="loading"><div class="spinner"></div><div style="font-size:12px;color:var(--dim);">Asking Claude, GPT, Gemini, and Grok… (5–10s)</div></div>`;
+
+    try {
+        const data = window.EventSource
+            ? await streamLLMReview(listingId, (partial) => {
+                if (swipeItems[swipeIdx]?.id === listingId && swipeTab === 'llm') {
+                    renderLLMPayload(el, item, partial);
+                }
+            })
+            : await fetchLLMReview(listingId);
+        llmReviewCache[listingId] = data;
+        // Only render if still on the same card/tab
+        if (swipeItems[swipeIdx]?.id === listingId && swipeTab === 'llm') {
+            renderLLMPayload(el, item, data);
+        }
+    } catch (e) {
+        el.innerHTML = `
+            <div style="padding:20px;text-align:center;">
+                <div style="color:var(--red);font-weight:600;margin-bottom:8px;">LLM review failed</div>
+                <div style="color:var(--dim);font-size:12px;margin-bottom:12px;">${(e.message || 'fetch error').replace(/</g,'&lt;')}</div>
+                <button class="btn btn-primary" onclick="retryLLM('${listingId}')">Retry</button>
+            </div>`;
+    }
+}
+
+async function fetchLLMReview(listingId) {
+    const resp = await fetch('/api/inventory/llm-price-review/' + encodeURIComponent(listingId));
+    if (!resp.ok) throw new Error('HTTP ' + resp.status);
+    return resp.json();
+}
+
+// Stream the review over SSE: comp stats, live competition and each model
+// verdict render as they land instead of waiting for the slowest model.
+// If the stream itself fails before a result arrives (proxy buffering,
+// dropped connection), fall back to the plain JSON endpoint.
+function streamLLMReview(listingId, onPartial) {
+    return new Promise((resolve, reject) => {
+        const partial = { models: {}, _streaming: true };
+        ['claude','gpt','gemini','grok'].forEach(k => { partial.models[k] = { status: 'pending' }; });
+        const es = new EventSource('/api/inventory/llm-price-review/' + encodeURIComponent(listingId) + '/stream');
+        let settled = false;
+        const finish = (fn, arg) => { if (!settled) { settled = true; es.close(); fn(arg); } };
+        es.addEventListener('comp_stats', (ev) => {
+            Object.assign(partial, JSON.parse(ev.data));
+            onPartial(partial);
+        });
+        es.addEventListener('active_competition', (ev) => {
+            partial.active_competition = JSON.parse(ev.data).active_competition;
+            partial._active_loaded = true;
+            onPartial(partial);
+        });
+        es.addEventListener('model', (ev) => {
+            const msg = JSON.parse(ev.data);
+            partial.models[msg.model] = msg.result;
+            onPartial(partial);
+        });
+        es.addEventListener('consensus', (ev) => finish(resolve, JSON.parse(ev.data)));
+        es.addEventListener('review_error', (ev) => {
+            let msg = 'review failed';
+            try { msg = JSON.parse(ev.data).error || msg; } catch (_) {}
+            finish(reject, new Error(msg));
+        });
+        // Connection error: EventSource would reconnect and rerun the review,
+        // so close it and ask the JSON endpoint instead.
+        es.onerror = () => {
+            if (settled) return;
+            settled = true;
+            es.close();
+            fetchLLMReview(listingId).then(resolve, reject);
+        };
+        es.addEventListener('done', () => finish(reject, new Error('stream ended without consensus')));
+    });
+}
+
+function retryLLM(listingId) {
+    delete llmReviewCache[listingId];
+    const item = swipeItems[swipeIdx];
+    if (item && item.id === listingId) renderSwipeLLMTab(item);
+}
+
+function renderLLMPayload(el, item, data) {
+    const models = data.models || {};
+    const modelColors = {
+        claude: { border: 'var(--purple)', val: 'var(--purple)' },
+        gpt:    { border: 'var(--green)',  val: 'var(--green)' },
+        gemini: { border: 'var(--accent)', val: 'var(--accent)' },
+        grok:   { border: 'var(--gold)',   val: 'var(--gold)' }
+    };
+    const modelEnvKey = { claude: 'ANTHROPIC_API_KEY', gpt: 'OPENAI_API_KEY', gemini: 'GEMINI_API_KEY', grok: 'GROK_API_KEY' };
+    const order = ['claude','gpt','gemini','grok'];
+    const yp = Math.round(item.your_price || 0);
+
+    // Global range for the per-card range bar — span all low/high across all valid models
+    const allLows = order.map(k => models[k]?.low).filter(v => typeof v === 'number' && v > 0);
+    const allHighs = order.map(k => models[k]?.high).filter(v => typeof v === 'number' && v > 0);
+    const globalLo = allLows.length ? Math.min(...allLows, yp || Infinity) : null;
+    const globalHi = allHighs.length ? Math.max(...allHighs, yp || 0) : null;
+
+    const cardHTML = order.map(key => {
+        const m = models[key] || { status: 'not_configured' };
+        const c = modelColors[key];
+        const statusOff = (m.status && m.status !== 'ok');
+        let body = '';
+        if (m.status === 'ok' && m.recommended != null) {
+            const low = m.low ?? m.recommended;
+            const high = m.high ?? m.recommended;
+            const rec = m.recommended;
+            // Range bar — show low | rec | high with your_price marker
+            let barHTML = '';
+            if (globalLo != null && globalHi != null && globalHi > globalLo) {
+                const pos = (v) => Math.max(0, Math.min(100, ((v - globalLo) / (globalHi - globalLo)) * 100));
+                const lowPct = pos(low), recPct = pos(rec), highPct = pos(high);
+                const ypPct = yp > 0 ? pos(yp) : null;
+                barHTML = `<div style="position:relative;height:6px;background:rgba(255,255,255,0.06);border-radius:3px;margin:6px 0 4px;">
+                    <div style="position:absolute;left:${lowPct}%;width:${Math.max(2, highPct - lowPct)}%;top:0;bottom:0;background:${c.border};opacity:0.35;border-radius:3px;"></div>
+                    <div style="position:absolute;left:${recPct}%;top:-3px;width:2px;height:12px;background:${c.val};" title="recommended $${rec}"></div>
+                    ${ypPct != null ? `<div style="position:absolute;left:${ypPct}%;top:-4px;width:10px;height:14px;margin-left:-5px;background:transparent;border:1.5px solid var(--text);border-radius:2px;" title="your price $${yp}"></div>` : ''}
+                </div>
+                <div style="display:flex;justify-content:space-between;font-size:9px;color:var(--dim);margin-bottom:4px;">
+                    <span>$${low}</span><span style="color:${c.val};font-weight:700;">$${rec}</span><span>$${high}</span>
+                </div>`;
+            } else {
+                barHTML = `<div class="llm-card-price" style="color:${c.val};">$${rec}</div>`;
+            }
+            body = `${barHTML}
+                <div class="llm-card-reason" title="${(m.reason||'').replace(/"/g,'&quot;')}">${(m.reason||'').replace(/</g,'&lt;') || '—'}</div>`;
+        } else if (m.status === 'pending') {
+            body = `<div class="llm-card-price" style="color:var(--dim);font-size:14px;">…</div>
+                <div class="llm-card-reason">thinking…</div>`;
+        } else if (m.status === 'not_configured') {
+            body = `<div class="llm-card-price" style="color:var(--dim);font-size:14px;">—</div>
+                <div class="llm-card-reason">Add ${modelEnvKey[key] || 'API_KEY'} env var</div>`;
+        } else if (m.status === 'parse_error') {
+            body = `<div class="llm-card-price" style="color:var(--orange);font-size:14px;">parse</div>
+                <div class="llm-card-reason" title="${(m.reason||'').replace(/"/g,'&quot;')}">parse issue — check logs</div>`;
+        } else {
+            body = `<div class="llm-card-price" style="color:var(--red);font-size:14px;">error</div>
+                <div class="llm-card-reason" title="${(m.reason||'').replace(/"/g,'&quot;')}">${((m.reason || m.status || 'error') + '').substring(0, 120).replace(/</g,'&lt;')}</div>`;
+        }
+        return `<div class="llm-card ${statusOff?'status-off':''}" style="border-left-color:${c.border};">
+            <div class="llm-card-name" style="color:${c.val};">${key}</div>
+            ${body}
+        </div>`;
+    }).join('');
+
+    const cons = data.consensus || {};
+    const recCons = cons.recommended ?? data.consensus_median;
+    const count = data.consensus_count || 0;
+    const cs = data.comp_stats || {};
+    const ac = data.active_competition;
+
+    // Active competition strip — only if present
+    const activeHTML = (data._streaming && !data._active_loaded) ? `
+        <div style="margin-bottom:8px;padding:6px 10px;background:rgba(255,255,255,0.03);border-radius:8px;font-size:11px;color:var(--dim);">Checking live eBay competition…</div>` : ac ? `
+        <div style="margin-bottom:8px;padding:8px 10px;background:rgba(74,158,255,0.08);border:1px solid rgba(74,158,255,0.25);border-radius:8px;font-size:11px;">
+            <span style="color:var(--accent);font-weight:600;">Live eBay competition:</span>
+            <b style="color:var(--text);">${ac.count}</b> active ·
+            range <b style="color:var(--text);">$${Math.round(ac.min)}–$${Math.round(ac.max)}</b> ·
+            median <b style="color:var(--text);">$${Math.round(ac.median)}</b>
+        </div>` : `<div style="margin-bottom:8px;padding:6px 10px;background:rgba(255,255,255,0.03);border-radius:8px;font-size:11px;color:var(--dim);">No live competition data (eBay Browse API unavailable in local dev)</div>`;
+
+    // Confidence badge + Why? panel (Feature 3)
+    const confScore = data.confidence_score;
+    const confLevel = (data.confidence_level || '').toUpperCase();
+    const reasoningChain = Array.isArray(data.reasoning_chain) ? data.reasoning_chain : [];
+    let confidenceHTML = '';
+    if (confScore != null || confLevel) {
+        let badgeBg = 'rgba(255,69,58,0.15)', badgeColor = 'var(--red)', badgeBorder = 'rgba(255,69,58,0.35)';
+        if (confLevel === 'HIGH') { badgeBg = 'rgba(48,209,88,0.15)'; badgeColor = 'var(--green)'; badgeBorder = 'rgba(48,209,88,0.35)'; }
+        else if (confLevel === 'MEDIUM') { badgeBg = 'rgba(255,159,10,0.18)'; badgeColor = 'var(--orange)'; badgeBorder = 'rgba(255,159,10,0.35)'; }
+        const panelId = 'conf-why-' + (item.id || 'x').replace(/[^a-zA-Z0-9_-]/g, '_');
+        const whyItems = reasoningChain.map(r => `<li style="padding:4px 0;border-bottom:1px dashed rgba(255,255,255,0.06);color:var(--text);">${String(r).replace(/</g,'&lt;')}</li>`).join('');
+        confidenceHTML = `
+        <div style="display:flex;justify-content:space-between;align-items:center;gap:10px;margin-bottom:8px;padding:8px 10px;background:${badgeBg};border:1px solid ${badgeBorder};border-radius:8px;">
+            <div style="display:flex;align-items:center;gap:10px;">
+                <span style="font-size:11px;font-weight:700;color:${badgeColor};letter-spacing:0.5px;">${confLevel || 'N/A'}${confScore != null ? ' ' + Math.round(confScore) + ' / 100' : ''}</span>
+                <span style="font-size:10px;color:var(--dim);">consensus confidence</span>
+            </div>
+            ${reasoningChain.length ? `<a href="#" onclick="event.preventDefault();toggleConfidenceWhy('${panelId}');" style="font-size:11px;color:var(--accent);text-decoration:none;font-weight:600;">Why?</a>` : ''}
+        </div>
+        ${reasoningChain.length ? `<div id="${panelId}" data-open="0" style="max-height:0;opacity:0;overflow:hidden;transition:max-height 0.25s ease, opacity 0.25s ease;margin-bottom:8px;">
+            <div style="padding:10px 12px;background:rgba(255,255,255,0.03);border:1px solid var(--border);border-radius:8px;">
+                <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;font-weight:600;margin-bottom:6px;">Reasoning chain</div>
+                <ul style="list-style:none;padding:0;margin:0;font-size:11px;">${whyItems}</ul>
+            </div>
+        </div>` : ''}`;
+    }
+
+    el.innerHTML = `
+        ${confidenceHTML}
+        ${activeHTML}
+        <div class="llm-grid">${cardHTML}</div>
+        <div class="llm-consensus-row" style="align-items:flex-start;">
+            <div>
+                <div class="llm-consensus-lbl">Consensus range (${count} model${count===1?'':'s'})</div>
+                <div style="display:flex;gap:14px;align-items:baseline;margin-top:2px;">
+                    <div style="font-size:11px;color:var(--dim);">floor<br><b style="color:var(--text);font-size:16px;">${cons.low != null ? '$'+Math.round(cons.low) : '—'}</b></div>
+                    <div class="llm-consensus-val" title="median recommended across models">${recCons != null ? '$'+Math.round(recCons) : '—'}</div>
+                    <div style="font-size:11px;color:var(--dim);">ceiling<br><b style="color:var(--text);font-size:16px;">${cons.high != null ? '$'+Math.round(cons.high) : '—'}</b></div>
+                </div>
+            </div>
+            <div style="font-size:11px;color:var(--dim);text-align:right;">
+                Your price <b style="color:var(--text);">$${yp}</b><br>
+                Comp median ${cs.median != null ? '<b style="color:var(--text);">$'+Math.round(cs.median)+'</b>' : '—'}${cs.count ? ' <span>(n='+cs.count+')</span>' : ''}<br>
+                ${cs.trailing_12mo_median ? '12mo <b style="color:var(--text);">$'+Math.round(cs.trailing_12mo_median)+'</b>' : ''}${cs.signed_only ? ' · signed-only' : ''}
+            </div>
+        </div>
+        ${data.cached_at ? `<div style="font-size:10px;color:var(--dim);margin-top:8px;text-align:right;">Cached ${(data.cached_at||'').replace('T',' ').substring(0,16)}</div>` : ''}
+    `;
+
+    const matchBtn = document.getElementById('swipe-match');
+    if (recCons != null) {
+        matchBtn.disabled = false;
+        matchBtn.textContent = `Match $${Math.round(recCons)}`;
+        matchBtn.title = cons.low != null && cons.high != null
+            ? `Match recommended $${Math.round(recCons)} · range $${Math.round(cons.low)}–$${Math.round(cons.high)}`
+            : `Match consensus $${Math.round(recCons)}`;
+    } else {
+        matchBtn.disabled = true;
+        matchBtn.textContent = 'Match Consensus';
+        matchBtn.title = '';
+    }
+}
+
+function swipeMatchConsensus() {
+    const item = swipeItems[swipeIdx];
+    if (!item) return;
+    const data = llmReviewCache[item.id];
+    if (!data) return;
+    const price = data.consensus?.recommended ?? data.consensus_median;
+    if (price == null) return;
+    setExactPrice(item.id, Math.round(price));
+    toast(`Price set to consensus $${Math.round(price)}`);
+}
+
+// Click-outside-container closes the swipe modal
+document.getElementById('swipe-modal').addEventListener('click', (e) => {
+    if (e.target.id === 'swipe-modal') closeSwipeMode();
+});
+
+// ==========================================
+// FEATURE 1: Opportunities card (Dashboard)
+// ==========================================
+let opportunitiesData = null;
+
+async function loadOpportunities(force) {
+    const el = document.getElementById('opp-content');
+    const sub = document.getElementById('opp-sub');
+    if (!el) return;
+    if (opportunitiesData && !force) { renderOpportunities(); return; }
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    if (sub) sub.textContent = 'Loading…';
+    try {
+        const resp = await fetch('/api/inventory/opportunities');
+        if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+        opportunitiesData = await resp.json();
+    } catch (e) {
+        el.innerHTML = '<div style="color:var(--red);font-size:12px;padding:12px;">Failed to load opportunities</div>';
+        return;
+    }
+    renderOpportunities();
+}
+
+function renderOpportunities() {
+    const el = document.getElementById('opp-content');
+    const sub = document.getElementById('opp-sub');
+    if (!el || !opportunitiesData) return;
+    const opps = opportunitiesData.opportunities || [];
+    const total = opportunitiesData.total_candidates || opps.length;
+    const totalUp = opportunitiesData.total_potential_upside || 0;
+    if (sub) {
+        sub.textContent = total > 0
+            ? `${total} candidates · projected upside $${Math.round(totalUp).toLocaleString()}`
+            : 'No upside right now';
+    }
+    if (!opps.length) {
+        el.innerHTML = '<div style="color:var(--dim);font-size:12px;padding:20px;text-align:center;">No opportunities right now — your inventory is priced at or above comp median. Nice.</div>';
+        return;
+    }
+    const rowsHTML = opps.slice(0, 10).map((o, idx) => {
+        const name = (o.name || '').length > 40 ? (o.name || '').substring(0, 40) + '…' : (o.name || '');
+        const artist = o.artist || '—';
+        const yp = Math.round(o.your_price || 0);
+        const cm = Math.round(o.comp_median || 0);
+        const up = Math.round(o.upside_dollars || 0);
+        const upPct = (o.upside_pct != null) ? (o.upside_pct).toFixed(1) : '--';
+        const cn = o.comp_count || 0;
+        return `<tr onclick="jumpToOpportunity('${(o.id||'').replace(/'/g,'')}')" style="cursor:pointer;" title="Open in Swipe Mode">
+            <td style="color:var(--dim);font-variant-numeric:tabular-nums;width:28px;">${idx+1}</td>
+            <td class="trunc" title="${(o.name||'').replace(/"/g,'&quot;')}">${name.replace(/</g,'&lt;')}</td>
+            <td><span class="pill pill-blue">${artist.replace(/</g,'&lt;')}</span></td>
+            <td class="r"><span style="color:var(--dim);">$${yp}</span> <span style="color:var(--dim);margin:0 2px;">→</span> <b style="color:var(--text);">$${cm}</b></td>
+            <td class="r"><span class="g b">+$${up}</span> <span style="color:var(--green);font-size:10px;">+${upPct}%</span></td>
+            <td class="r"><span class="pill pill-dim">n=${cn}</span></td>
+        </tr>`;
+    }).join('');
+    el.innerHTML = `<div class="table-wrap" style="border:none;background:transparent;">
+        <table>
+            <thead><tr>
+                <th style="width:28px;">#</th>
+                <th>Item</th>
+                <th>Artist</th>
+                <th class="r">Your → Comp</th>
+                <th class="r">Upside</th>
+                <th class="r">Comps</th>
+            </tr></thead>
+            <tbody>${rowsHTML}</tbody>
+        </table>
+    </div>`;
+}
+
+function jumpToOpportunity(id) {
+    // Ensure inventory loaded first. If not, load it then open.
+    if (!invData || !invData.items) {
+        toast('Loading inventory…');
+        loadInv().then(() => { setTimeout(() => jumpToOpportunity(id), 300); });
+        return;
+    }
+    // Reset filter to 'all' so every item is in the swipe list
+    invFilter = 'all';
+    const searchEl = document.getElementById('inv-search');
+    if (searchEl) searchEl.value = '';
+    openSwipeMode();
+    // After openSwipeMode, swipeItems is populated; advance to the matching id
+    const idx = (swipeItems || []).findIndex(i => i.id === id);
+    if (idx >= 0) {
+        swipeIdx = idx;
+        swipeTab = 'comps';
+        renderSwipeCard();
+    } else {
+        toast('Item not found in current inventory');
+    }
+}
+
+// Hook into showTab — fetch opportunities on Dashboard activation
+(function hookDashboardOpportunities() {
+    const origShowTab = window.showTab;
+    window.showTab = function(tab) {
+        origShowTab(tab);
+        if (tab === 'dash') { loadOpportunities(false); loadDriftAlerts(false); }
+    };
+})();
+
+// ==========================================
+// FEATURE: Drift Alerts (Dashboard)
+// ==========================================
+let driftAlertsData = null;
+
+async function loadDriftAlerts(force) {
+    const el = document.getElementById('drift-content');
+    const sub = document.getElementById('drift-sub');
+    if (!el) return;
+    if (driftAlertsData && !force) { renderDriftAlerts(); return; }
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    if (sub) sub.textContent = 'Loading…';
+    try {
+        const resp = await fetch('/api/drift-alerts');
+        driftAlertsData = await resp.json();
+    } catch (e) {
+        el.innerHTML = '<div style="color:var(--red);font-size:12px;padding:12px;">Failed to load drift alerts</div>';
+        if (sub) sub.textContent = 'Error';
+        return;
+    }
+    renderDriftAlerts();
+}
+
+function renderDriftAlerts() {
+    const el = document.getElementById('drift-content');
+    const sub = document.getElementById('drift-sub');
+    const badge = document.getElementById('drift-badge');
+    if (!el || !driftAlertsData) return;
+    const alerts = driftAlertsData.alerts || [];
+    const total = (typeof driftAlertsData.total === 'number') ? driftAlertsData.total : alerts.length;
+    if (badge) {
+        badge.textContent = total > 0 ? `${total}` : '0';
+        badge.classList.toggle('zero', total === 0);
+    }
+    if (sub) {
+        sub.textContent = total > 0
+            ? `${total} listing${total === 1 ? '' : 's'} drifting vs comp median`
+            : 'Everything in range';
+    }
+    if (!alerts.length) {
+        el.innerHTML = '<div style="color:var(--dim);font-size:12px;padding:18px;text-align:center;"><span style="color:var(--green);">&#10003;</span> All listings in range — no drift alerts.</div>';
+        return;
+    }
+    const rowsHTML = alerts.slice(0, 15).map((a, idx) => {
+        const name = (a.name || '').length > 42 ? (a.name || '').substring(0, 42) + '…' : (a.name || '');
+        const artist = a.artist || '—';
+        const yp = Math.round(a.your_price || 0);
+        const cm = Math.round(a.comp_median || 0);
+        const cn = a.comp_count || 0;
+        const dir = a.direction || 'up';
+        const drift = (a.drift_pct != null) ? Number(a.drift_pct).toFixed(1) : '--';
+        const driftLabel = dir === 'up' ? `+${drift}%` : `-${drift}%`;
+        const driftCls = dir === 'up' ? 'drift-arrow-up' : 'drift-arrow-down';
+        const days = a.days_since_change;
+        const daysLabel = (days == null) ? 'never' : `${days} day${days === 1 ? '' : 's'}`;
+        const idRaw = (a.id || '').replace(/'/g,'');
+        return `<tr class="drift-row" onclick="jumpToOpportunity('${idRaw}')" style="cursor:pointer;" title="Open in Swipe Mode">
+            <td style="color:var(--dim);font-variant-numeric:tabular-nums;width:24px;">${idx+1}</td>
+            <td class="trunc" title="${(a.name||'').replace(/"/g,'&quot;')}">${name.replace(/</g,'&lt;')}</td>
+            <td><span class="pill pill-blue">${artist.replace(/</g,'&lt;')}</span></td>
+            <td class="r"><span style="color:var(--dim);">$${yp}</span> <span class="${driftCls}" style="margin:0 2px;">${dir === 'up' ? '&uarr;' : '&darr;'}</span> <b style="color:var(--text);">$${cm}</b> <span style="color:var(--dim);font-size:10px;">(n=${cn})</span></td>
+            <td class="r"><span class="${driftCls} b">${driftLabel}</span></td>
+            <td class="r" style="color:var(--dim);font-size:11px;">${daysLabel}</td>
+        </tr>`;
+    }).join('');
+    el.innerHTML = `<div class="table-wrap" style="border:none;background:transparent;">
+        <table>
+            <thead><tr>
+                <th style="width:24px;">#</th>
+                <th>Item</th>
+                <th>Artist</th>
+                <th class="r">Your &harr; Comp</th>
+                <th class="r">Drift</th>
+                <th class="r">Last change</th>
+            </tr></thead>
+            <tbody>${rowsHTML}</tbody>
+        </table>
+    </div>`;
+}
+
+// ==========================================
+// FEATURE: Train Comps (Swipe Mode tab)
+// ==========================================
+// Per-item cache: { queue:[], approved:[], rejected:[], history:[], total_available, loaded }
+const comp_train_state = {};
+const TRAIN_HISTORY_MAX = 10;
+
+function trainState(itemId) {
+    if (!comp_train_state[itemId]) {
+        comp_train_state[itemId] = {
+            queue: [], approved: [], rejected: [], history: [],
+            total_available: 0, loaded: false, loading: false
+        };
+    }
+    return comp_train_state[itemId];
+}
+
+async function renderSwipeTrainTab(item) {
+    const el = document.getElementById('swipe-tab-content');
+    if (!el || !item) return;
+    const st = trainState(item.id);
+    if (!st.loaded && !st.loading) {
+        el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+        await loadTrainQueue(item, false);
+    }
+    paintTrainTab(item);
+}
+
+async function loadTrainQueue(item, append) {
+    const st = trainState(item.id);
+    st.loading = true;
+    try {
+        const params = new URLSearchParams({
+            title: item.name || '', artist: item.artist || '', limit: 50
+        });
+        const resp = await fetch('/api/comps/train-queue?' + params.toString());
+        const d = await resp.json();
+        const newComps = d.comps || [];
+        if (append) {
+            st.queue = st.queue.concat(newComps);
+        } else {
+            st.queue = newComps;
+            st.approved = [];
+            st.rejected = [];
+            st.history = [];
+        }
+        st.total_available = d.total_available || newComps.length;
+        // Seed approved/rejected counts from server (for accurate stats pre-swipe)
+        if (!append) {
+            st.approved_seed = d.approved_count || 0;
+            st.rejected_seed = d.rejected_count || 0;
+        }
+        st.loaded = true;
+    } catch (e) {
+        const el = document.getElementById('swipe-tab-content');
+        if (el) el.innerHTML = '<div style="color:var(--red);font-size:12px;padding:16px;">Failed to load training queue</div>';
+    } finally {
+        st.loading = false;
+    }
+}
+
+function paintTrainTab(item) {
+    const el = document.getElementById('swipe-tab-content');
+    if (!el) return;
+    const st = trainState(item.id);
+    const approvedN = (st.approved_seed || 0) + st.approved.length;
+    const rejectedN = (st.rejected_seed || 0) + st.rejected.length;
+    const remaining = st.queue.length;
+    const reviewed = approvedN + rejectedN;
+    const denom = Math.max(1, reviewed + remaining);
+    const pct = Math.round((reviewed / denom) * 100);
+
+    const statsHTML = `
+        <div class="train-stats">
+            <span><b>${approvedN}</b> approved</span>
+            <span class="sep">&middot;</span>
+            <span><b>${rejectedN}</b> rejected</span>
+            <span class="sep">&middot;</span>
+            <span><b>${remaining}</b> remaining</span>
+        </div>
+        <div class="train-progress-bar"><div class="train-progress-fill" style="width:${pct}%;"></div></div>
+    `;
+
+    if (!remaining) {
+        el.innerHTML = statsHTML + `
+            <div class="train-done">
+                <div class="tdc-check">&#10003;</div>
+                <div class="tdc-title">Comp curation complete for this item</div>
+                <div class="tdc-sub">${reviewed} reviewed &middot; ${approvedN} approved &middot; ${rejectedN} rejected</div>
+                <div style="display:flex;gap:8px;justify-content:center;flex-wrap:wrap;">
+                    <button class="btn-ghost" onclick="trainReset()">Reset all</button>
+                    <button class="btn-ghost" onclick="trainFetchMore()" style="color:var(--accent);border-color:var(--accent);">Fetch 50 more</button>
+                </div>
+            </div>
+        `;
+        return;
+    }
+
+    const top = st.queue[0];
+    const peek = st.queue[1];
+    el.innerHTML = statsHTML + `
+        <div class="train-stack" id="train-stack">
+            ${peek ? `<div class="train-comp-card peek">${renderTrainCompInner(peek)}</div>` : ''}
+            <div class="train-comp-card top" id="train-top-card">${renderTrainCompInner(top)}</div>
+        </div>
+        <div class="train-actions">
+            <button class="train-btn reject" onclick="trainSwipeAction('reject')" title="&larr; or J">&times; REJECT</button>
+            <button class="train-btn undo" onclick="trainUndo()" ${st.history.length ? '' : 'disabled'} title="U">&#8630; Undo</button>
+            <button class="train-btn approve" onclick="trainSwipeAction('approve')" title="&rarr; or L">&#10003; APPROVE</button>
+        </div>
+        <div class="train-hint">&larr;/J reject &middot; &rarr;/L approve &middot; U undo &middot; drag to swipe</div>
+    `;
+    attachTrainPointerHandlers();
+}
+
+function renderTrainCompInner(c) {
+    if (!c) return '';
+    const name = (c.name || '(untitled)').replace(/</g,'&lt;');
+    const price = c.price != null ? `$${Math.round(c.price)}` : '--';
+    const date = (c.date || '').substring(0,10) || '—';
+    const source = (c.source || '').replace(/</g,'&lt;');
+    const pills = [];
+    if (c.signed) pills.push('<span class="pill pill-green">SIGNED</span>');
+    if (c.medium) pills.push(`<span class="pill pill-dim">${String(c.medium).replace(/</g,'&lt;')}</span>`);
+    const linkHTML = c.url ? `<a class="tc-link" href="${String(c.url).replace(/"/g,'&quot;')}" target="_blank" rel="noopener" onclick="event.stopPropagation();">Open eBay &#8599;</a>` : '';
+    return `
+        <div class="tc-title">${name}</div>
+        <div class="tc-meta">
+            <b>${price}</b>
+            <span class="sep">&middot;</span>
+            <span>${date}</span>
+            ${source ? `<span class="sep">&middot;</span><span>${source}</span>` : ''}
+        </div>
+        ${pills.length ? `<div class="tc-pills">${pills.join('')}</div>` : ''}
+        ${linkHTML}
+    `;
+}
+
+let _trainPointer = null;
+function attachTrainPointerHandlers() {
+    const card = document.getElementById('train-top-card');
+    if (!card) return;
+    card.addEventListener('pointerdown', trainPointerDown);
+    card.addEventListener('pointermove', trainPointerMove);
+    card.addEventListener('pointerup', trainPointerUp);
+    card.addEventListener('pointercancel', trainPointerUp);
+}
+function trainPointerDown(e) {
+    const tag = (e.target.tagName || '').toLowerCase();
+    if (['a','button','input','select','textarea'].includes(tag)) return;
+    _trainPointer = { x: e.clientX, y: e.clientY, t: Date.now(), el: e.currentTarget };
+    try { e.currentTarget.setPointerCapture(e.pointerId); } catch(_){}
+}
+function trainPointerMove(e) {
+    if (!_trainPointer) return;
+    const dx = e.clientX - _trainPointer.x;
+    const el = _trainPointer.el;
+    if (!el) return;
+    el.style.transform = `translateX(${dx}px) rotate(${dx/30}deg)`;
+    el.style.opacity = String(Math.max(0.4, 1 - Math.abs(dx)/400));
+}
+function trainPointerUp(e) {
+    if (!_trainPointer) return;
+    const dx = e.clientX - _trainPointer.x;
+    const dy = e.clientY - _trainPointer.y;
+    const el = _trainPointer.el;
+    _trainPointer = null;
+    if (!el) return;
+    if (Math.abs(dx) >= 80 && Math.abs(dx) > Math.abs(dy)) {
+        trainSwipeAction(dx > 0 ? 'approve' : 'reject');
+    } else {
+        el.style.transform = '';
+        el.style.opacity = '';
+    }
+}
+
+async function trainSwipeAction(action) {
+    const item = swipeItems[swipeIdx];
+    if (!item) return;
+    const st = trainState(item.id);
+    if (!st.queue.length) return;
+    const comp = st.queue[0];
+    // Visual flash + slide-out
+    const topCard = document.getElementById('train-top-card');
+    if (topCard) {
+        topCard.classList.add(action === 'approve' ? 'flash-approve' : 'flash-reject');
+        // Force out animation direction
+        topCard.style.transform = '';
+        topCard.style.opacity = '';
+        requestAnimationFrame(() => {
+            topCard.classList.add(action === 'approve' ? 'out-right' : 'out-left');
+        });
+    }
+    // Persist state
+    st.queue = st.queue.slice(1);
+    if (action === 'approve') st.approved.push(comp);
+    else st.rejected.push(comp);
+    st.history.push({ action, comp });
+    if (st.history.length > TRAIN_HISTORY_MAX) st.history.shift();
+
+    // Fire API in background
+    trainPostAction(item, action, comp).catch(() => {});
+
+    // Repaint after animation
+    setTimeout(() => paintTrainTab(item), 210);
+}
+
+async function trainPostAction(item, action, comp) {
+    try {
+        await fetch('/api/comps/train', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title: item.name || '',
+                artist: item.artist || '',
+                action: action,
+                comp: {
+                    name: comp.name, price: comp.price,
+                    date: comp.date, source: comp.source,
+                    comp_key: comp.comp_key
+                }
+            })
+        });
+    } catch (e) {
+        toast('Training signal saved locally');
+    }
+}
+
+async function trainUndo() {
+    const item = swipeItems[swipeIdx];
+    if (!item) return;
+    const st = trainState(item.id);
+    const last = st.history.pop();
+    if (!last) { toast('Nothing to undo'); return; }
+    // Remove from approved/rejected arrays
+    if (last.action === 'approve') {
+        const idx = st.approved.lastIndexOf(last.comp);
+        if (idx >= 0) st.approved.splice(idx, 1);
+    } else {
+        const idx = st.rejected.lastIndexOf(last.comp);
+        if (idx >= 0) st.rejected.splice(idx, 1);
+    }
+    st.queue.unshift(last.comp);
+    trainPostAction(item, 'unmark', last.comp).catch(() => {});
+    paintTrainTab(item);
+}
+
+async function trainReset() {
+    const item = swipeItems[swipeIdx];
+    if (!item) return;
+    delete comp_train_state[item.id];
+    const el = document.getElementById('swipe-tab-content');
+    if (el) el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    await loadTrainQueue(item, false);
+    paintTrainTab(item);
+    toast('Training queue reset');
+}
+
+async function trainFetchMore() {
+    const item = swipeItems[swipeIdx];
+    if (!item) return;
+    const el = document.getElementById('swipe-tab-content');
+    if (el) el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    await loadTrainQueue(item, true);
+    paintTrainTab(item);
+}
+
+// ==========================================
+// FEATURE 2: Bulk Consensus Reprice
+// ==========================================
+let bulkRepriceCandidates = [];
+
+function openBulkRepriceModal() {
+    if (!invData || !invData.items) {
+        toast('Load inventory first.');
+        return;
+    }
+    // Populate artist dropdown
+    const artists = Array.from(new Set((invData.items || []).map(i => i.artist).filter(Boolean))).sort();
+    const sel = document.getElementById('brp-artist');
+    sel.innerHTML = '<option value="">All artists</option>' +
+        artists.map(a => `<option value="${a.replace(/"/g,'&quot;')}">${a.replace(/</g,'&lt;')}</option>`).join('');
+    document.getElementById('brp-results').innerHTML = '<div style="color:var(--dim);font-size:12px;padding:20px;text-align:center;">Set your filters and click Preview to see candidates.</div>';
+    document.getElementById('brp-footer').style.display = 'none';
+    bulkRepriceCandidates = [];
+    document.getElementById('bulk-reprice-modal').classList.add('show');
+    document.addEventListener('keydown', bulkRepriceKeyHandler);
+}
+
+function closeBulkRepriceModal() {
+    document.getElementById('bulk-reprice-modal').classList.remove('show');
+    document.removeEventListener('keydown', bulkRepriceKeyHandler);
+}
+
+function bulkRepriceKeyHandler(e) {
+    if (e.key === 'Escape') closeBulkRepriceModal();
+}
+
+// Click outside closes modal
+document.getElementById('bulk-reprice-modal').addEventListener('click', (e) => {
+    if (e.target.id === 'bulk-reprice-modal') closeBulkRepriceModal();
+});
+
+async function previewBulkReprice() {
+    const upside = document.getElementById('brp-upside').value;
+    const comps = document.getElementById('brp-comps').value;
+    const artist = document.getElementById('brp-artist').value;
+    const forceLLM = document.getElementById('brp-force-llm')?.checked;
+    const el = document.getElementById('brp-results');
+    el.innerHTML = forceLLM
+        ? `<div style="padding:30px;text-align:center;">
+             <div class="loading"><div class="spinner"></div></div>
+             <div style="font-size:12px;color:var(--dim);margin-top:12px;">Querying 4 LLMs per candidate — this can take 30-90s…</div>
+           </div>`
+        : '<div class="loading"><div class="spinner"></div></div>';
+    document.getElementById('brp-footer').style.display = 'none';
+    const params = new URLSearchParams({ min_upside_pct: upside, min_comp_count: comps });
+    if (artist) params.append('artist', artist);
+    if (forceLLM) params.append('force_llm', '1');
+    try {
+        const resp = await fetch('/api/inventory/bulk-consensus-preview?' + params.toString());
+        const data = await resp.json();
+        bulkRepriceCandidates = (data.candidates || []).map(c => ({ ...c, _selected: true }));
+        renderBulkRepriceResults(data);
+        if (forceLLM) toast(`Re-queried LLMs — ${data.total_candidates || 0} candidates`);
+    } catch (e) {
+        el.innerHTML = '<div style="color:var(--red);padding:20px;text-align:center;font-size:12px;">Failed to fetch preview</div>';
+    }
+}
+
+function renderBulkRepriceResults(data) {
+    const el = document.getElementById('brp-results');
+    const cands = bulkRepriceCandidates;
+    if (!cands.length) {
+        el.innerHTML = '<div style="color:var(--dim);font-size:12px;padding:20px;text-align:center;">No candidates match these filters. Try loosening thresholds.</div>';
+        document.getElementById('brp-footer').style.display = 'none';
+        return;
+    }
+    const rowsHTML = cands.map((c, idx) => {
+        const name = (c.name || '').length > 45 ? (c.name || '').substring(0, 45) + '…' : (c.name || '');
+        const up = Math.round(c.upside_dollars || 0);
+        const upPct = (c.upside_pct != null) ? (c.upside_pct).toFixed(1) : '--';
+        const conf = c.confidence_score || 0;
+        let confClass = 'pill-red', confLbl = 'LOW';
+        if (conf >= 70) { confClass = 'pill-green'; confLbl = 'HIGH'; }
+        else if (conf >= 40) { confClass = 'pill-orange'; confLbl = 'MEDIUM'; }
+        const models = c.models_agreed || 0;
+        return `<tr data-brp-idx="${idx}">
+            <td style="width:24px;"><input type="checkbox" ${c._selected?'checked':''} onchange="toggleBrpRow(${idx}, this.checked)"></td>
+            <td class="trunc" title="${(c.name||'').replace(/"/g,'&quot;')}">${name.replace(/</g,'&lt;')}</td>
+            <td><span class="pill pill-blue">${(c.artist||'—').replace(/</g,'&lt;')}</span></td>
+            <td class="r">$${Math.round(c.your_price||0)}</td>
+            <td class="r">
+                <b style="color:var(--text);">$${Math.round(c.suggested_price||0)}</b>
+                <div style="font-size:9px;color:var(--dim);">$${Math.round(c.consensus_low||0)}–$${Math.round(c.consensus_high||0)}</div>
+            </td>
+            <td class="r"><span class="g b">+$${up}</span> <span style="color:var(--green);font-size:10px;">+${upPct}%</span></td>
+            <td class="r"><span class="pill ${confClass}">${confLbl} ${conf}</span></td>
+            <td class="r"><span style="font-size:11px;color:var(--dim);">${models}/4</span></td>
+        </tr>`;
+    }).join('');
+    el.innerHTML = `<div class="table-wrap" style="max-height:50vh;overflow:auto;">
+        <table>
+            <thead><tr>
+                <th style="width:24px;"><input type="checkbox" id="brp-check-all" checked onchange="toggleAllBrpRows(this.checked)"></th>
+                <th>Item</th>
+                <th>Artist</th>
+                <th class="r">Current</th>
+                <th class="r">Suggested</th>
+                <th class="r">Upside</th>
+                <th class="r">Confidence</th>
+                <th class="r">Models</th>
+            </tr></thead>
+            <tbody>${rowsHTML}</tbody>
+        </table>
+    </div>`;
+    document.getElementById('brp-footer').style.display = 'flex';
+    updateBrpFooter();
+}
+
+function toggleBrpRow(idx, checked) {
+    if (bulkRepriceCandidates[idx]) bulkRepriceCandidates[idx]._selected = checked;
+    updateBrpFooter();
+}
+
+function toggleAllBrpRows(checked) {
+    bulkRepriceCandidates.forEach(c => c._selected = checked);
+    document.querySelectorAll('#brp-results tbody input[type=checkbox]').forEach(cb => cb.checked = checked);
+    updateBrpFooter();
+}
+
+function updateBrpFooter() {
+    const selected = bulkRepriceCandidates.filter(c => c._selected);
+    const total = bulkRepriceCandidates.length;
+    const upside = selected.reduce((s, c) => s + (c.upside_dollars || 0), 0);
+    const sumEl = document.getElementById('brp-footer-summary');
+    if (sumEl) sumEl.textContent = `Selected ${selected.length} of ${total} items · Projected upside: $${Math.round(upside).toLocaleString()}`;
+    const btn = document.getElementById('brp-apply-btn');
+    if (btn) {
+        btn.disabled = selected.length === 0;
+        btn.textContent = selected.length === 0
+            ? 'Apply'
+            : `Apply ${selected.length} items — $${Math.round(upside).toLocaleString()} upside`;
+    }
+}
+
+async function applyBulkReprice() {
+    const selected = bulkRepriceCandidates.filter(c => c._selected);
+    if (!selected.length) { toast('No items selected'); return; }
+    const body = { items: selected.map(c => ({ id: c.id, price: Math.round(c.suggested_price || 0) })) };
+    const el = document.getElementById('brp-results');
+    el.innerHTML = '<div class="loading"><div class="spinner"></div></div>';
+    try {
+        const resp = await fetch('/api/inventory/bulk-consensus-apply', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(body)
+        });
+        const data = await resp.json();
+        renderBulkRepriceSuccess(data);
+        setTimeout(() => {
+            closeBulkRepriceModal();
+            refreshInv();
+        }, 3000);
+    } catch (e) {
+        el.innerHTML = '<div style="color:var(--red);padding:20px;text-align:center;font-size:12px;">Failed to apply — check network and try again.</div>';
+    }
+}
+
+function renderBulkRepriceSuccess(data) {
+    const el = document.getElementById('brp-results');
+    const applied = data.applied || 0;
+    const failed = data.failed || 0;
+    const rev = data.total_new_revenue || 0;
+    const results = data.results || [];
+    const rowsHTML = results.map(r => {
+        const ok = r.status === 'ok';
+        return `<tr>
+            <td style="width:18px;"><span style="color:${ok?'var(--green)':'var(--red)'};font-size:14px;">${ok?'✓':'✗'}</span></td>
+            <td class="trunc">${(r.id||'').replace(/</g,'&lt;')}</td>
+            <td class="r">$${Math.round(r.price||0)}</td>
+            <td><span class="pill ${ok?'pill-green':'pill-red'}">${(r.status||'').toUpperCase()}</span></td>
+        </tr>`;
+    }).join('');
+    el.innerHTML = `
+        <div style="padding:14px;background:rgba(48,209,88,0.08);border:1px solid rgba(48,209,88,0.25);border-radius:10px;margin-bottom:12px;">
+            <div style="font-size:14px;font-weight:700;color:var(--green);">Applied ${applied} · Failed ${failed}</div>
+            <div style="font-size:11px;color:var(--dim);margin-top:4px;">Projected new revenue: $${Math.round(rev).toLocaleString()}. Closing in 3s…</div>
+        </div>
+        <div class="table-wrap" style="max-height:40vh;overflow:auto;">
+            <table>
+                <thead><tr><th></th><th>Item ID</th><th class="r">Price</th><th>Status</th></tr></thead>
+                <tbody>${rowsHTML}</tbody>
+            </table>
+        </div>`;
+    document.getElementById('brp-footer').style.display = 'none';
+}
+
+// ==========================================
+// FEATURE 3: Confidence badge + Why? helper (attached to window for reuse)
+// ==========================================
+window.toggleConfidenceWhy = function(id) {
+    const panel = document.getElementById(id);
+    if (!panel) return;
+    const isOpen = panel.getAttribute('data-open') === '1';
+    if (isOpen) {
+        panel.style.maxHeight = '0px';
+        panel.style.opacity = '0';
+        panel.setAttribute('data-open', '0');
+    } else {
+        panel.style.maxHeight = panel.scrollHeight + 'px';
+        panel.style.opacity = '1';
+        panel.setAttribute('data-open', '1');
+    }
+};
+
+// ==========================================
+// Comms Automation module
+// ==========================================
+let commsRulesData = null;
+let commsLogData = null;
+let commsStatusData = null;
+let commsFilter = { search: '', trigger: 'all', status: 'all' };
+let commsLogInterval = null;
+
+function commsFmtTime(ts) {
+    if (!ts) return '--';
+    const t = new Date(ts);
+    if (isNaN(t)) return String(ts);
+    const diff = (Date.now() - t.getTime()) / 1000;
+    if (diff < 60) return Math.round(diff) + 's ago';
+    if (diff < 3600) return Math.round(diff/60) + 'm ago';
+    if (diff < 86400) return Math.round(diff/3600) + 'h ago';
+    return Math.round(diff/86400) + 'd ago';
+}
+
+async function loadComms(force) {
+    if (commsRulesData && !force) { renderComms(); return; }
+    try {
+        const [rulesResp, statusResp, logResp] = await Promise.all([
+            fetch('/api/comms/rules'),
+            fetch('/api/comms/status'),
+            fetch('/api/comms/log?limit=20')
+        ]);
+        if (!rulesResp.ok || !statusResp.ok || !logResp.ok) throw new Error('api');
+        commsRulesData = await rulesResp.json();
+        commsStatusData = await statusResp.json();
+        commsLogData = await logResp.json();
+    } catch (e) {
+        renderCommsError();
+        return;
+    }
+    renderComms();
+}
+
+function renderCommsError() {
+    const wrap = document.getElementById('comms-rules-wrap');
+    const lwrap = document.getElementById('comms-log-wrap');
+    const msg = '<div class="loading" style="color:var(--red);">Comms backend not responding. Endpoints may not be deployed yet.</div>';
+    if (wrap) wrap.innerHTML = msg;
+    if (lwrap) lwrap.innerHTML = msg;
+    const sub = document.getElementById('comms-header-sub');
+    if (sub) sub.textContent = 'Backend unreachable';
+    const dashSub = document.getElementById('comms-dash-sub');
+    if (dashSub) dashSub.textContent = 'Backend offline';
+}
+
+function commsRulesList() {
+    if (!commsRulesData) return [];
+    if (Array.isArray(commsRulesData)) return commsRulesData;
+    if (Array.isArray(commsRulesData.rules)) return commsRulesData.rules;
+    return [];
+}
+
+function commsLogList() {
+    if (!commsLogData) return [];
+    if (Array.isArray(commsLogData)) return commsLogData;
+    if (Array.isArray(commsLogData.entries)) return commsLogData.entries;
+    if (Array.isArray(commsLogData.log)) return commsLogData.log;
+    return [];
+}
+
+function renderComms() {
+    const rules = commsRulesList();
+    const status = commsStatusData || {};
+    const enabled = rules.filter(r => r.enabled).length;
+    const total = status.total_rules != null ? status.total_rules : rules.length;
+    const week = status.fired_this_week != null ? status.fired_this_week : '--';
+    const dryRun = status.dry_run_active;
+
+    const sub = document.getElementById('comms-header-sub');
+    if (sub) sub.textContent = `${total} rules · ${enabled} enabled · ${week} fired this week`;
+    const meta = document.getElementById('comms-header-meta');
+    if (meta) meta.textContent = `${total} rules loaded · ${enabled} active`;
+    const dryBadge = document.getElementById('comms-dry-badge');
+    if (dryBadge) {
+        dryBadge.textContent = 'Dry-run: ' + (dryRun ? 'ON' : 'OFF');
+        dryBadge.className = 'pill ' + (dryRun ? 'pill-orange' : 'pill-green');
+    }
+
+    document.getElementById('comms-stat-today').textContent = status.fired_today != null ? status.fired_today : '--';
+    document.getElementById('comms-stat-week').textContent = week;
+    document.getElementById('comms-stat-last').textContent = commsFmtTime(status.last_fire_at);
+    document.getElementById('comms-stat-active').textContent = enabled;
+
+    // Dashboard tile
+    const dashSub = document.getElementById('comms-dash-sub');
+    if (dashSub) {
+        const today = status.fired_today != null ? status.fired_today : 0;
+        dashSub.textContent = `${today} fired today · ${enabled} enabled rules${dryRun ? ' · dry-run ON' : ''}`;
+    }
+
+    // Populate trigger filter
+    const triggerSel = document.getElementById('comms-filter-trigger');
+    if (triggerSel && triggerSel.options.length <= 1) {
+        const triggers = [...new Set(rules.map(r => r.trigger_type).filter(Boolean))].sort();
+        triggers.forEach(t => {
+            const opt = document.createElement('option');
+            opt.value = t; opt.textContent = t;
+            triggerSel.appendChild(opt);
+        });
+    }
+
+    renderCommsRules();
+    renderCommsLog();
+}
+
+function onCommsFilterChange() {
+    commsFilter.search = (document.getElementById('comms-search').value || '').toLowerCase();
+    commsFilter.trigger = document.getElementById('comms-filter-trigger').value;
+    commsFilter.status = document.getElementById('comms-filter-status').value;
+    renderCommsRules();
+}
+
+function renderCommsRules() {
+    const wrap = document.getElementById('comms-rules-wrap');
+    if (!wrap) return;
+    const rules = commsRulesList();
+    if (!rules.length) {
+        wrap.innerHTML = '<div class="loading" style="color:var(--dim);">Import your automation rules — see data/comm_rules.json</div>';
+        return;
+    }
+    const f = commsFilter;
+    const filtered = rules.filter(r => {
+        if (f.trigger !== 'all' && r.trigger_type !== f.trigger) return false;
+        if (f.status === 'enabled' && !r.enabled) return false;
+        if (f.status === 'disabled' && r.enabled) return false;
+        if (f.search) {
+            const hay = ((r.name||'') + ' ' + (r.trigger_type||'') + ' ' + (r.id||'')).toLowerCase();
+            if (!hay.includes(f.search)) return false;
+        }
+        return true;
+    });
+    if (!filtered.length) {
+        wrap.innerHTML = '<div class="loading" style="color:var(--dim);">No rules match filters.</div>';
+        return;
+    }
+    wrap.innerHTML = `<table>
+        <thead><tr>
+            <th style="width:40px;">On</th>
+            <th>Rule name</th>
+            <th>Trigger</th>
+            <th>Priority</th>
+            <th class="r">Fires</th>
+            <th style="width:220px;">Actions</th>
+        </tr></thead>
+        <tbody>${filtered.map(r => {
+            const rid = esc(String(r.id||''));
+            const name = esc(r.name||r.id||'(unnamed)');
+            const trig = esc(r.trigger_type||'--');
+            const prio = esc(r.priority||'--');
+            const fires = (r.fire_count != null ? r.fire_count : (r.fires != null ? r.fires : 0));
+            const checked = r.enabled ? 'checked' : '';
+            return `<tr>
+                <td><input type="checkbox" ${checked} onchange="toggleCommsRule('${rid}', this)" style="accent-color:var(--accent);cursor:pointer;"></td>
+                <td><b>${name}</b><div style="font-size:10px;color:var(--dim);">${rid}</div></td>
+                <td><span class="pill pill-blue">${trig}</span></td>
+                <td><span class="pill pill-dim">${prio}</span></td>
+                <td class="r b">${fires}</td>
+                <td>
+                    <button class="btn-ghost" style="font-size:10px;padding:4px 10px;" onclick="openCommsPreview('${rid}', false)">Preview</button>
+                    <button class="btn-ghost" style="font-size:10px;padding:4px 10px;color:var(--orange);border-color:rgba(255,159,10,0.3);" onclick="openCommsPreview('${rid}', true)">Test fire</button>
+                </td>
+            </tr>`;
+        }).join('')}</tbody>
+    </table>`;
+}
+
+function renderCommsLog() {
+    const wrap = document.getElementById('comms-log-wrap');
+    if (!wrap) return;
+    const log = commsLogList();
+    if (!log.length) {
+        wrap.innerHTML = '<div class="loading" style="color:var(--dim);">No comms fired yet. Toggle dry-run and hit Test fire on any rule to see a preview.</div>';
+        return;
+    }
+    wrap.innerHTML = `<table>
+        <thead><tr>
+            <th>Time</th>
+            <th>Rule</th>
+            <th>Order</th>
+            <th>Status</th>
+            <th>Preview</th>
+        </tr></thead>
+        <tbody>${log.slice(0, 50).map(e => {
+            const status = esc(e.status || (e.dry_run ? 'dry_run' : 'fired'));
+            const pillClass = status === 'fired' ? 'pill-green' : status === 'dry_run' ? 'pill-orange' : status.includes('err') || status.includes('fail') ? 'pill-red' : 'pill-dim';
+            const preview = esc((e.preview || e.rendered_text || '').substring(0, 80));
+            return `<tr>
+                <td class="d">${commsFmtTime(e.fired_at || e.timestamp || e.ts)}</td>
+                <td><b>${esc(e.rule_name || e.rule_id || '--')}</b></td>
+                <td class="d">${esc(e.order_id || '--')}</td>
+                <td><span class="pill ${pillClass}">${status}</span></td>
+                <td class="trunc d" title="${preview}">${preview || '--'}</td>
+            </tr>`;
+        }).join('')}</tbody>
+    </table>`;
+}
+
+async function toggleCommsRule(ruleId, checkbox) {
+    const desired = checkbox.checked;
+    // optimistic
+    const rule = commsRulesList().find(r => String(r.id) === String(ruleId));
+    if (rule) rule.enabled = desired;
+    try {
+        const resp = await fetch(`/api/comms/rules/${encodeURIComponent(ruleId)}/toggle`, { method:'POST' });
+        if (!resp.ok) throw new Error('toggle failed');
+        const data = await resp.json();
+        if (rule && typeof data.enabled === 'boolean') rule.enabled = data.enabled;
+        toast(`Rule ${desired ? 'enabled' : 'disabled'}`);
+        renderComms();
+    } catch (e) {
+        if (rule) rule.enabled = !desired;
+        checkbox.checked = !desired;
+        toast('Toggle failed');
+    }
+}
+
+async function toggleCommsDryRun() {
+    const current = commsStatusData && commsStatusData.dry_run_active;
+    try {
+        const resp = await fetch('/api/comms/status', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ dry_run_active: !current })
+        });
+        if (!resp.ok) throw new Error('fail');
+        commsStatusData = await resp.json();
+        toast('Dry-run ' + (commsStatusData.dry_run_active ? 'ON' : 'OFF'));
+        renderComms();
+    } catch (e) {
+        toast('Dry-run toggle not available yet');
+    }
+}
+
+function closeCommsPreview() {
+    document.getElementById('comms-preview-modal').classList.remove('show');
+}
+
+function openCommsPreview(ruleId, asTestFire) {
+    const rule = commsRulesList().find(r => String(r.id) === String(ruleId));
+    if (!rule) { toast('Rule not found'); return; }
+    const modal = document.getElementById('comms-preview-modal');
+    const title = document.getElementById('comms-preview-title');
+    const body = document.getElementById('comms-preview-body');
+    title.textContent = (asTestFire ? 'Test fire: ' : 'Preview: ') + (rule.name || rule.id);
+    body.innerHTML = `
+        <div style="font-size:12px;color:var(--dim);margin-bottom:12px;">
+            Trigger: <b style="color:var(--text);">${esc(rule.trigger_type||'--')}</b>
+            &nbsp;&middot;&nbsp; Action: <b style="color:var(--text);">${esc(rule.action_type||'--')}</b>
+        </div>
+        <div class="card" style="padding:12px;margin-bottom:12px;">
+            <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;margin-bottom:8px;">Test context</div>
+            <label style="display:flex;align-items:center;gap:6px;font-size:12px;margin-bottom:6px;cursor:pointer;">
+                <input type="radio" name="cpx-ctx" value="mock" checked style="accent-color:var(--accent);"> Mock buyer (default)
+            </label>
+            <label style="display:flex;align-items:center;gap:6px;font-size:12px;cursor:pointer;">
+                <input type="radio" name="cpx-ctx" value="order" style="accent-color:var(--accent);"> Real eBay order:
+                <input type="text" id="cpx-order-id" placeholder="order_id" style="background:var(--card2);border:1px solid var(--border);color:var(--text);border-radius:6px;padding:4px 8px;font-size:12px;margin-left:4px;">
+            </label>
+        </div>
+        <div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;margin-bottom:6px;">Rendered text</div>
+        <div id="cpx-rendered" class="card" style="padding:12px;min-height:90px;font-size:13px;line-height:1.5;white-space:pre-wrap;">
+            <div class="loading" style="padding:12px;"><div class="spinner"></div>Rendering&hellip;</div>
+        </div>
+        <div id="cpx-unresolved" style="margin-top:10px;"></div>
+        <div style="display:flex;gap:10px;align-items:center;justify-content:flex-end;margin-top:14px;flex-wrap:wrap;">
+            <label style="display:flex;align-items:center;gap:6px;font-size:12px;color:var(--dim);cursor:pointer;margin-right:auto;">
+                <input type="checkbox" id="cpx-dryrun" ${asTestFire ? '' : 'checked disabled'} ${asTestFire ? 'checked' : ''} style="accent-color:var(--accent);"> Dry run only
+            </label>
+            <button class="btn-ghost" onclick="closeCommsPreview()">Cancel</button>
+            <button class="btn btn-primary" style="padding:8px 18px;font-size:13px;" id="cpx-rerender" onclick="rerenderCommsPreview('${esc(String(rule.id))}')">Re-render</button>
+            ${asTestFire ? `<button class="btn btn-green" style="padding:8px 18px;font-size:13px;" onclick="fireCommsRule('${esc(String(rule.id))}')">Fire</button>` : ''}
+        </div>
+    `;
+    modal.classList.add('show');
+    // initial render (mock)
+    rerenderCommsPreview(rule.id);
+}
+
+async function rerenderCommsPreview(ruleId) {
+    const renderedEl = document.getElementById('cpx-rendered');
+    const unresEl = document.getElementById('cpx-unresolved');
+    const ctxRadio = document.querySelector('input[name="cpx-ctx"]:checked');
+    const ctx = ctxRadio ? ctxRadio.value : 'mock';
+    const orderId = (document.getElementById('cpx-order-id')||{}).value || '';
+    renderedEl.innerHTML = '<div class="loading" style="padding:12px;"><div class="spinner"></div>Rendering&hellip;</div>';
+    unresEl.innerHTML = '';
+    try {
+        const body = { rule_id: ruleId };
+        if (ctx === 'order' && orderId) body.test_order = orderId;
+        const resp = await fetch('/api/comms/dry-run', {
+            method:'POST',
+            headers:{'Content-Type':'application/json'},
+            body: JSON.stringify(body)
+        });
+        if (!resp.ok) throw new Error('dry-run fail');
+        const data = await resp.json();
+        renderedEl.textContent = data.rendered_text || '(no output)';
+        const unresolved = data.unknown_vars_left || data.unresolved_tokens || [];
+        if (unresolved.length) {
+            unresEl.innerHTML = `<div style="font-size:10px;color:var(--dim);text-transform:uppercase;letter-spacing:0.8px;margin-bottom:6px;">Unresolved tokens</div>
+                <div style="display:flex;gap:6px;flex-wrap:wrap;">${unresolved.map(t =>
+                    `<span class="pill pill-orange" style="cursor:pointer;" onclick="toast('Unresolved: ' + ${JSON.stringify(t)} + ' — not in template context')">{${esc(t)}}</span>`
+                ).join('')}</div>`;
+        }
+    } catch (e) {
+        renderedEl.innerHTML = '<div style="color:var(--red);font-size:12px;">Render failed. Backend may be offline.</div>';
+    }
+}
+
+async function fireCommsRule(ruleId) {
+    const dryRun = (document.getElementById('cpx-dryrun')||{}).checked !== false;
+    const orderInput = (document.getElementById('cpx-order-id')||{}).value || '';
+    if (!orderInput) {
+        if (!confirm('No order_id entered — fire with mock buyer?')) return;
+    }
+    try {
+        const resp = await fetch('/api/comms/fire-manual', {
+            method:'POST',
+            headers:{'Content-Type':'application/json'},
+            body: JSON.stringify({ rule_id: ruleId, order_id: orderInput, dry_run: dryRun })
+        });
+        if (!resp.ok) throw new Error('fire fail');
+        const data = await resp.json();
+        toast(dryRun ? 'Dry-run complete' : 'Fired!');
+        // append to local log
+        if (!commsLogData) commsLogData = { entries: [] };
+        const list = commsLogData.entries || commsLogData.log || commsLogData;
+        if (Array.isArray(list)) {
+            list.unshift({
+                fired_at: new Date().toISOString(),
+                rule_id: ruleId,
+                rule_name: (commsRulesList().find(r => String(r.id)===String(ruleId))||{}).name || ruleId,
+                order_id: orderInput || '(mock)',
+                status: dryRun ? 'dry_run' : 'fired',
+                preview: data.rendered_text || ''
+            });
+        }
+        renderCommsLog();
+        closeCommsPreview();
+    } catch (e) {
+        toast('Fire failed');
+    }
+}
+
+async function refreshCommsLog() {
+    try {
+        const resp = await fetch('/api/comms/log?limit=20');
+        if (!resp.ok) return;
+        commsLogData = await resp.json();
+        const statusResp = await fetch('/api/comms/status');
+        if (statusResp.ok) commsStatusData = await statusResp.json();
+        renderCommsLog();
+        // refresh stats
+        const status = commsStatusData || {};
+        const el1 = document.getElementById('comms-stat-today');
+        if (el1) el1.textContent = status.fired_today != null ? status.fired_today : '--';
+        const el2 = document.getElementById('comms-stat-week');
+        if (el2) el2.textContent = status.fired_this_week != null ? status.fired_this_week : '--';
+        const el3 = document.getElementById('comms-stat-last');
+        if (el3) el3.textContent = commsFmtTime(status.last_fire_at);
+    } catch (e) { /* ignore */ }
+}
+
+function startCommsLogAutoRefresh() {
+    stopCommsLogAutoRefresh();
+    commsLogInterval = setInterval(refreshCommsLog, 30000);
+}
+
+function stopCommsLogAutoRefresh() {
+    if (commsLogInterval) { clearInterval(commsLogInterval); commsLogInterval = null; }
+}
+
+// Preload status for dashboard tile (lightweight)
+async function loadCommsDashTile() {
+    try {
+        const resp = await fetch('/api/comms/status');
+        if (!resp.ok) throw new Error('fail');
+        const data = await resp.json();
+        commsStatusData = data;
+        const el = document.getElementById('comms-dash-sub');
+        if (el) {
+            const today = data.fired_today != null ? data.fired_today : 0;
+            const enabled = data.enabled_count != null ? data.enabled_count : '--';
+            el.textContent = `${today} fired today · ${enabled} enabled rules${data.dry_run_active ? ' · dry-run ON' : ''}`;
+        }
+    } catch (e) {
+        const el = document.getElementById('comms-dash-sub');
+        if (el) el.textContent = 'Backend offline';
+    }
+}
+
+// ==========================================
+// Init
+// ==========================================
+loadDash();
+loadOpportunities(false);
+loadDriftAlerts(false);
+loadCommsDashTile();
+
+// Precaches the hashed bundles so repeat loads only fetch the HTML shell
+if ('serviceWorker' in navigator) {
+    navigator.serviceWorker.register('/sw.js').catch(() => {});
+}
@@ -0,0 +1,185 @@
+const $ = id => document.getElementById(id);
+const esc = s => String(s ?? '').replace(/[&<>"']/g, c => ({'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;',"'":'&#39;'}[c]));
+const money = n => '$' + Math.round(n).toLocaleString();
+
+let ARTISTS = [];
+
+async function loadArtists(){
+  try{
+    const r = await fetch('/api/prices/artists');
+    ARTISTS = await r.json();
+    const sel = $('artist');
+    ARTISTS.forEach(a => {
+      const o = document.createElement('option');
+      o.value = a.artist;
+      o.textContent = `${a.artist} (${a.count.toLocaleString()})`;
+      sel.appendChild(o);
+    });
+    const total = ARTISTS.reduce((s,a)=>s+a.count,0);
+    $('db-count').textContent = total.toLocaleString() + ' records';
+    // Quick tags for top 5 artists
+    const qt = $('quick-tags');
+    ARTISTS.slice(0,5).forEach(a => {
+      const q = document.createElement('div');
+      q.className = 'q';
+      q.textContent = a.artist;
+      q.onclick = () => { $('artist').value = a.artist; $('title').value=''; runSearch(); };
+      qt.appendChild(q);
+    });
+  }catch(e){ console.error(e); }
+}
+
+async function runSearch(){
+  const title = $('title').value.trim();
+  const artist = $('artist').value;
+  const signed = $('signed-only').checked;
+  if(!title && !artist){ $('results').innerHTML = '<div class="empty">Type a title or pick an artist</div>'; return; }
+
+  $('results').innerHTML = '<div class="loading"><span class="spinner"></span>searching…</div>';
+
+  const params = new URLSearchParams();
+  if(title) params.set('title', title);
+  if(artist) params.set('artist', artist);
+  if(signed) params.set('signed', '1');
+  params.set('limit', '100');
+
+  try{
+    const r = await fetch('/api/prices/search?' + params);
+    const d = await r.json();
+    renderResults(d);
+  }catch(e){
+    $('results').innerHTML = '<div class="empty">Search failed</div>';
+  }
+}
+
+function renderResults(d){
+  const s = d.stats || {};
+  const comps = d.comps || [];
+  const trend = d.trend || [];
+  const works = d.top_works || [];
+
+  if(!s.count){
+    $('results').innerHTML = '<div class="empty">No matches. Try different keywords.</div>';
+    return;
+  }
+
+  const statsHtml = `
+    <div class="stats">
+      <div class="s"><div class="v">${money(s.median)}</div><div class="l">Median</div></div>
+      <div class="s"><div class="v">${money(s.p25)}</div><div class="l">P25 (buy)</div></div>
+      <div class="s"><div class="v">${money(s.p75)}</div><div class="l">P75 (sell)</div></div>
+      <div class="s"><div class="v">${s.count.toLocaleString()}</div><div class="l">Sales</div></div>
+    </div>`;
+
+  let trendHtml = '';
+  if(trend.length > 1){
+    const maxM = Math.max(...trend.map(t=>t.median));
+    trendHtml = `
+      <div class="section">
+        <h2>Price trend by year</h2>
+        <div class="trend">
+          ${trend.map(t=>`
+            <div class="bar" style="height:${Math.max(3, (t.median/maxM)*100)}%" title="${t.year}: ${money(t.median)} (${t.count} sales)">
+              <div class="amt">${money(t.median)}</div>
+              <div class="lbl">${t.year}</div>
+            </div>`).join('')}
+        </div>
+      </div>`;
+  }
+
+  let worksHtml = '';
+  if(works.length){
+    worksHtml = `
+      <div class="section">
+        <h2>Top matching works</h2>
+        <div class="works">
+          ${works.map(w => `
+            <div class="work-chip" onclick="drillWork('${esc(w.work_id)}')">
+              <span>${esc(w.work_id.split('::').pop())}</span>
+              <span class="c">${w.count} · ${money(w.median)}</span>
+            </div>`).join('')}
+        </div>
+      </div>`;
+  }
+
+  const compsHtml = `
+    <div class="section">
+      <h2>Recent sales (${d.total_matches.toLocaleString()} total)</h2>
+      <div class="comps">
+        ${comps.map(c=>`
+          <div class="comp">
+            <div>
+              <div class="t">${c.url ? `<a href="${esc(c.url)}" target="_blank" rel="noopener">${esc(c.name)}</a>` : esc(c.name)}</div>
+              <div class="meta">
+                ${c.artist ? `<span class="pill">${esc(c.artist)}</span>` : ''}
+                ${c.signed ? `<span class="pill" style="color:var(--green)">signed</span>` : ''}
+                ${c.numbered ? `<span class="pill">#</span>` : ''}
+                ${c.medium ? `<span>${esc(c.medium)}</span>` : ''}
+                ${c.colorway ? `<span>${esc(c.colorway)}</span>` : ''}
+                <span>${esc(c.source||'')}</span>
+              </div>
+            </div>
+            <div>
+              <div class="p">${money(c.price)}</div>
+              <div class="d">${esc(c.date||'—')}</div>
+            </div>
+          </div>`).join('')}
+      </div>
+    </div>`;
+
+  $('results').innerHTML = statsHtml + worksHtml + trendHtml + compsHtml;
+}
+
+async function drillWork(workId){
+  $('results').innerHTML = '<div class="loading"><span class="spinner"></span>loading work…</div>';
+  try{
+    const r = await fetch('/api/prices/work/' + encodeURIComponent(workId));
+    const d = await r.json();
+    const s = d.stats || {};
+    const name = workId.split('::').pop();
+    const statsHtml = `
+      <div style="margin-bottom:8px"><a href="#" onclick="runSearch();return false;" style="font-size:12px">← back</a></div>
+      <div class="section" style="margin-top:0"><h2>${esc(name)}</h2></div>
+      <div class="stats">
+        <div class="s"><div class="v">${money(s.median)}</div><div class="l">Median</div></div>
+        <div class="s"><div class="v">${money(s.p25)}</div><div class="l">P25</div></div>
+        <div class="s"><div class="v">${money(s.p75)}</div><div class="l">P75</div></div>
+        <div class="s"><div class="v">${s.count}</div><div class="l">Sales</div></div>
+      </div>`;
+    const colorsHtml = d.colors.length > 1 ? `
+      <div class="section"><h2>By colorway</h2>
+        <div class="works">
+          ${d.colors.map(c=>`<div class="work-chip"><span>${esc(c.colorway)}</span><span class="c">${c.count} · ${money(c.median)}</span></div>`).join('')}
+        </div>
+      </div>` : '';
+    const salesHtml = `
+      <div class="section"><h2>All sales</h2>
+        <div class="comps">
+          ${d.sales.slice(0,200).map(c=>`
+            <div class="comp">
+              <div>
+                <div class="t">${c.url?`<a href="${esc(c.url)}" target="_blank" rel="noopener">${esc(c.name)}</a>`:esc(c.name)}</div>
+                <div class="meta">
+                  ${c.signed?'<span class="pill" style="color:var(--green)">signed</span>':''}
+                  ${c.colorway?`<span>${esc(c.colorway)}</span>`:''}
+                  <span>${esc(c.source||'')}</span>
+                </div>
+              </div>
+              <div>
+                <div class="p">${money(c.price)}</div>
+                <div class="d">${esc(c.date||'—')}</div>
+              </div>
+            </div>`).join('')}
+        </div>
+      </div>`;
+    $('results').innerHTML = statsHtml + colorsHtml + salesHtml;
+    window.scrollTo(0,0);
+  }catch(e){ $('results').innerHTML = '<div class="empty">Failed to load</div>'; }
+}
+
+$('title').addEventListener('keydown', e => { if(e.key==='Enter') runSearch(); });
+$('artist').addEventListener('change', () => { if(!$('title').value.trim()) runSearch(); });
+
+loadArtists();
+
+if ('serviceWorker' in navigator) navigator.serviceWorker.register('/sw.js').catch(() => {});
@@ -0,0 +1,132 @@
+"""
+DATARADAR Static Assets — content-hashed CSS/JS bundles and their service worker.
+
+The dashboard's stylesheet and script live in static/ as ordinary files and
+are served under URLs that carry a hash of their contents:
+
+  1. URLs — asset_url('js/dashboard.js') in a template gives
+     /assets/js/dashboard.<hash>.js. The hash changes exactly when the file
+     does, so the response can be cached forever: Cache-Control says
+     immutable for a year, and the page (whose ETag includes version())
+     picks up the new URL after an edit or deploy.
+  2. Serving — files are read and hashed once, and again only when their
+     mtime or size changes (checked at most every `check_interval` seconds).
+     A request for an older hash gets the current file with no-cache, so a
+     tab still open on the previous page keeps working.
+  3. Service worker — precache() lists every bundle URL for /sw.js, which
+     stores them at install and answers /assets/ requests from that cache,
+     so a repeat visit downloads only the HTML shell (usually a 304).
+
+Responses go out as plain bodies, so the HttpCache hook still adds the ETag
+and gzip/brotli and keeps the encoded copy.
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+import threading
+import time
+
+from flask import abort, current_app
+
+HASH_LEN = 12
+IMMUTABLE = 'public, max-age=31536000, immutable'
+EXTENSIONS = ('.css', '.js', '.svg', '.png', '.ico', '.webmanifest')
+
+_HASHED = re.compile(r'^(?P<stem>.+)\.(?P<hash>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$' % HASH_LEN)
+
+
+class StaticAssets:
+    """Hashed URLs for the files under folder, and the route that serves them."""
+
+    def __init__(self, app=None, folder=None, url_prefix='/assets', check_interval=1.0):
+        self.folder = folder
+        self.url_prefix = url_prefix.rstrip('/')
+        self.check_interval = check_interval
+        self._files = {}          # 'js/dashboard.js' -> (mtime_ns, size, hash, body)
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        if self.folder is None:
+            self.folder = os.path.join(app.root_path, 'static')
+        app.add_url_rule(f'{self.url_prefix}/<path:filename>', 'hashed_asset', self.serve)
+        app.jinja_env.globals['asset_url'] = self.url
+        app.extensions['static_assets'] = self
+
+    # -------------------------------------------------------------------------
+    # Manifest
+    # -------------------------------------------------------------------------
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return self._files
+        with self._lock:
+            if not force and now - self._checked_at < self.check_interval:
+                return self._files
+            files = {}
+            for root, _dirs, names in os.walk(self.folder):
+                for fname in names:
+                    if not fname.endswith(EXTENSIONS):
+                        continue
+                    path = os.path.join(root, fname)
+                    name = os.path.relpath(path, self.folder).replace(os.sep, '/')
+                    st = os.stat(path)
+                    known = self._files.get(name)
+                    if known and known[:2] == (st.st_mtime_ns, st.st_size):
+                        files[name] = known
+                        continue
+                    with open(path, 'rb') as f:
+                        body = f.read()
+                    digest = hashlib.sha256(body).hexdigest()[:HASH_LEN]
+                    files[name] = (st.st_mtime_ns, st.st_size, digest, body)
+            self._files = files
+            self._checked_at = now
+        return files
+
+    def url(self, name):
+        """Hashed URL for a file under the folder (raises KeyError if it isn't there)."""
+        entry = self._refresh().get(name)
+        if entry is None:
+            raise KeyError(f"no static asset {name!r} in {self.folder}")
+        stem, ext = os.path.splitext(name)
+        return f'{self.url_prefix}/{stem}.{entry[2]}{ext}'
+
+    def manifest(self):
+        """{name: hashed url} for every asset."""
+        return {name: self.url(name) for name in sorted(self._refresh())}
+
+    def precache(self):
+        """Bundle URLs the service worker stores at install."""
+        return [url for name, url in self.manifest().items() if name.endswith(('.css', '.js'))]
+
+    def version(self):
+        """One hash over every asset hash; changes whenever any file does."""
+        files = self._refresh()
+        return hashlib.sha1(repr(sorted((n, e[2]) for n, e in files.items())).encode()).hexdigest()[:HASH_LEN]
+
+    # -------------------------------------------------------------------------
+    # Route
+    # -------------------------------------------------------------------------
+
+    def serve(self, filename):
+        m = _HASHED.match(filename)
+        if not m:
+            abort(404)
+        name = m.group('stem') + m.group('ext')
+        entry = self._refresh().get(name)
+        if entry is None:
+            abort(404)
+        mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        response = current_app.response_class(entry[3], mimetype=mimetype)
+        if m.group('hash') == entry[2]:
+            response.headers['Cache-Control'] = IMMUTABLE
+        else:
+            # an older build's URL: serve what we have, but don't pin it
+            response.headers['Cache-Control'] = 'no-cache'
+        response.set_etag(entry[2], weak=True)
+        return response
@@ -0,0 +1,30 @@
+// DATARADAR service worker — rendered by /sw.js with the current bundle list.
+// Hashed bundles are precached at install and served from the cache; their
+// URLs change with their contents, so a cached copy is never stale. Pages and
+// API calls always go to the network. A new build changes this file, which
+// installs a new worker that precaches the new bundles and drops the old cache.
+const CACHE = 'dataradar-assets-{{ version }}';
+const PRECACHE = {{ precache|tojson }};
+
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting()));
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(k => k.startsWith('dataradar-assets-') && k !== CACHE).map(k => caches.delete(k))))
+            .then(() => self.clients.claim())
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const url = new URL(event.request.url);
+    if (event.request.method !== 'GET' || url.origin !== location.origin || !url.pathname.startsWith('{{ prefix }}/')) return;
+    event.respondWith(caches.open(CACHE).then(cache => cache.match(event.request).then(hit => hit || fetch(event.request).then(resp => {
+        if (resp.ok && resp.headers.get('Cache-Control') && resp.headers.get('Cache-Control').includes('immutable')) {
+            cache.put(event.request, resp.clone());
+        }
+        return resp;
+    }))));
+});
@@ -0,0 +1,175 @@
+"""
+DATARADAR Write-Behind — coalesced, atomic JSON file persistence.
+
+Request handlers and background loops call write_json() instead of opening
+the file themselves. The document is serialized immediately (so later
+mutation by the caller can't race the writer) and parked in a pending map
+keyed by path; a single flusher thread writes each path once its oldest
+pending write is `window` seconds old. Ten status updates inside the window
+become one disk write.
+
+Writes are atomic: temp file in the same directory -> flush -> fsync ->
+os.replace, so a crash leaves either the old or the new file, never a
+truncated one.
+
+read_json() checks the pending map first, so callers always read their own
+writes even before the flush lands. flush() drains everything synchronously
+(call it at shutdown); stats() exposes pending/flush counters.
+"""
+
+import fast_json
+import os
+import tempfile
+import threading
+import time
+
+
+class WriteBehind:
+    """Per-path coalescing write-behind queue for JSON files."""
+
+    def __init__(self, window=0.5):
+        self.window = window
+        self._pending = {}  # path -> (text, first_queued_at)
+        self._inflight = {}  # path -> text currently being written
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()  # one disk writer at a time, in take order
+        self._thread = None
+        self._closed = False
+        self._counters = {
+            'writes_requested': 0,
+            'writes_coalesced': 0,
+            'files_written': 0,
+            'flushes': 0,
+            'errors': 0,
+            'last_flush_at': None,
+            'last_error': None,
+        }
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def write_json(self, path, data, indent=None):
+        """Queue data for path; the flusher writes it within `window` seconds."""
+        text = fast_json.dumps(data, indent=indent, default=str)
+        with self._cond:
+            self._counters['writes_requested'] += 1
+            prev = self._pending.get(path)
+            if prev is not None:
+                self._counters['writes_coalesced'] += 1
+                self._pending[path] = (text, prev[1])
+            else:
+                self._pending[path] = (text, time.monotonic())
+            if not self._closed:
+                self._ensure_thread()
+                self._cond.notify()
+                return
+        self.flush(path)
+
+    def read_json(self, path):
+        """Parsed document for path, pending write first; None if missing.
+        Parse errors propagate so callers keep their own fallback handling."""
+        with self._cond:
+            pending = self._pending.get(path)
+            text = pending[0] if pending is not None else self._inflight.get(path)
+        if text is not None:
+            return fast_json.loads(text)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return fast_json.load(f)
+
+    def flush(self, path=None):
+        """Write pending documents now (all of them, or just one path)."""
+        self._write(lambda: [path] if path else list(self._pending))
+
+    def close(self):
+        """Flush and switch to synchronous writes (used at interpreter exit)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+
+    def stats(self):
+        with self._cond:
+            out = dict(self._counters)
+            out['pending'] = len(self._pending)
+            out['pending_files'] = sorted(os.path.basename(p) for p in self._pending)
+            out['window_s'] = self.window
+        return out
+
+    # -------------------------------------------------------------------------
+    # Flusher
+    # -------------------------------------------------------------------------
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                oldest = min(at for _t, at in self._pending.values())
+                if now - oldest < self.window:
+                    self._cond.wait(max(0.01, self.window - (now - oldest)))
+                    continue
+            self._write(lambda: [p for p, (_t, at) in self._pending.items()
+                                 if time.monotonic() - at >= self.window])
+
+    def _write(self, select):
+        """Take the selected pending paths and write them outside the queue lock,
+        so writers never wait on disk I/O. Readers see in-flight text meanwhile."""
+        with self._io_lock:
+            with self._cond:
+                batch = []
+                for path in select():
+                    entry = self._pending.pop(path, None)
+                    if entry is not None:
+                        self._inflight[path] = entry[0]
+                        batch.append((path, entry[0]))
+            written, errors = 0, []
+            for path, text in batch:
+                try:
+                    _atomic_write(path, text)
+                    written += 1
+                except Exception as e:
+                    errors.append(f"{os.path.basename(path)}: {e}")
+                    print(f"[write-behind] write error {path}: {e}")
+            with self._cond:
+                for path, text in batch:
+                    if self._inflight.get(path) is text:
+                        del self._inflight[path]
+                self._counters['files_written'] += written
+                self._counters['errors'] += len(errors)
+                if errors:
+                    self._counters['last_error'] = errors[-1]
+                if written:
+                    self._counters['flushes'] += 1
+                    self._counters['last_flush_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _atomic_write(path, text):
+    """temp file in the same directory -> fsync -> rename over the target."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        os.chmod(tmp, 0o644)
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise